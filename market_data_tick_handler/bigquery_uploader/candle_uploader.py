@@ -16,6 +16,7 @@ from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
 
 from ..data_client.data_client import DataClient
+from ..data_client.gcs_object_index import get_gcs_object_index
 
 logger = logging.getLogger(__name__)
 
@@ -224,27 +225,16 @@ class CandleUploader:
     async def _get_candle_files(self, date: datetime, timeframe: str) -> List[Dict[str, Any]]:
         """Get list of candle files for a specific date and timeframe"""
         
-        date_str = date.strftime('%Y-%m-%d')
-        blob_pattern = f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/"
-        
-        # List all blobs matching the pattern
-        blobs = list(self.data_client.client.list_blobs(
-            self.data_client.gcs_bucket, 
-            prefix=blob_pattern
-        ))
+        # Pattern: processed_candles/by_date/day-{date}/timeframe-{timeframe}/{instrument_id}.parquet
+        object_index = get_gcs_object_index(self.data_client.client.bucket(self.data_client.gcs_bucket))
         
         files = []
-        for blob in blobs:
-            if blob.name.endswith('.parquet'):
-                # Extract instrument ID from filename
-                filename = blob.name.split('/')[-1]
-                instrument_id = filename.replace('.parquet', '')
-                
-                files.append({
-                    'blob_name': blob.name,
-                    'instrument_id': instrument_id,
-                    'file_size': blob.size or 0
-                })
+        for entry in object_index.entries(date.strftime('%Y-%m-%d'), 'processed_candles', timeframe):
+            files.append({
+                'blob_name': entry['blob_name'],
+                'instrument_id': entry['instrument_key'],
+                'file_size': entry['size'] or 0
+            })
         
         return files
     
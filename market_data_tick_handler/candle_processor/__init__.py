@@ -9,10 +9,12 @@ from .historical_candle_processor import HistoricalCandleProcessor
 from .aggregated_candle_processor import AggregatedCandleProcessor
 from .book_snapshot_processor import BookSnapshotProcessor
 from .hft_feature_processor import HFTFeatureProcessor
+from .multi_timeframe_candle_processor import MultiTimeframeCandleProcessor
 
 __all__ = [
     'HistoricalCandleProcessor',
     'AggregatedCandleProcessor', 
     'BookSnapshotProcessor',
-    'HFTFeatureProcessor'
+    'HFTFeatureProcessor',
+    'MultiTimeframeCandleProcessor'
 ]
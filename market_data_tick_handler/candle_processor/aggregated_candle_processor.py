@@ -7,12 +7,14 @@ Shares logic with historical processor for modular design.
 
 import logging
 import pandas as pd
-import numpy as np
-from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 
 from ..data_client.data_client import DataClient
+from ..data_client.gcs_object_index import get_gcs_object_index
+from .candle_engine import TIMEFRAME_SECONDS, timestamps_to_us
+from .candle_rollup import HFT_AGGREGATION_RULES, aggregate_hft_features, bucket_candles, rollup_candles
 from ..streaming_service.tick_streamer.utc_timestamp_manager import UTCTimestampManager
 
 logger = logging.getLogger(__name__)
@@ -78,13 +80,14 @@ class AggregatedCandleProcessor:
                 logger.warning(f"No 1m candles found for {instrument_id} on {date.strftime('%Y-%m-%d')}")
                 return results
             
-            # Process each aggregation timeframe
-            for timeframe in self.config.timeframes:
+            # Roll every aggregation timeframe up from the 1m candles in one call
+            all_aggregated = await self._aggregate_timeframes(
+                one_minute_candles, instrument_id, self.config.timeframes, date
+            )
+            
+            # Upload each timeframe
+            for timeframe, aggregated_candles in all_aggregated.items():
                 try:
-                    aggregated_candles = await self._aggregate_timeframe(
-                        one_minute_candles, instrument_id, timeframe, date
-                    )
-                    
                     if not aggregated_candles.empty:
                         # Upload to GCS
                         await self._upload_candles(aggregated_candles, instrument_id, timeframe, date, output_bucket)
@@ -106,6 +109,9 @@ class AggregatedCandleProcessor:
                     logger.error(error_msg)
                     results['errors'].append(error_msg)
             
+            # One object index update for all timeframes written today
+            get_gcs_object_index(self.data_client.client.bucket(output_bucket)).flush()
+            
             return results
             
         except Exception as e:
@@ -141,139 +147,26 @@ class AggregatedCandleProcessor:
     ) -> pd.DataFrame:
         """Aggregate 1m candles into a higher timeframe"""
         
-        if one_minute_candles.empty:
-            return pd.DataFrame()
-        
-        # Generate aligned timestamps for the target timeframe
-        aligned_timestamps = self._generate_aligned_timestamps(date, timeframe)
-        
-        aggregated_candles = []
-        
-        for i, timestamp in enumerate(aligned_timestamps):
-            # Get next timestamp for filtering
-            next_timestamp = aligned_timestamps[i + 1] if i + 1 < len(aligned_timestamps) else date + timedelta(days=1)
-            
-            # Filter 1m candles for this interval
-            interval_candles = one_minute_candles[
-                (one_minute_candles['timestamp'] >= timestamp) & 
-                (one_minute_candles['timestamp'] < next_timestamp)
-            ].copy()
-            
-            if not interval_candles.empty:
-                # Aggregate the candles
-                aggregated_candle = self._aggregate_candles(
-                    interval_candles, instrument_id, timeframe, timestamp
-                )
-                
-                if aggregated_candle is not None:
-                    aggregated_candles.append(aggregated_candle)
-            else:
-                # Create empty candle with NaN values
-                empty_candle = self._create_empty_candle(instrument_id, timeframe, timestamp)
-                aggregated_candles.append(empty_candle)
-        
-        if not aggregated_candles:
-            return pd.DataFrame()
-        
-        # Convert to DataFrame
-        result_df = pd.DataFrame(aggregated_candles)
-        
-        # Add aggregated HFT features if enabled
-        if self.config.enable_hft_features:
-            result_df = self._add_aggregated_hft_features(result_df, one_minute_candles, timeframe)
-        
-        return result_df
+        aggregated = await self._aggregate_timeframes(one_minute_candles, instrument_id, [timeframe], date)
+        return aggregated.get(timeframe, pd.DataFrame())
     
-    def _aggregate_candles(
+    async def _aggregate_timeframes(
         self, 
-        candles: pd.DataFrame, 
+        one_minute_candles: pd.DataFrame, 
         instrument_id: str, 
-        timeframe: str, 
-        timestamp: datetime
-    ) -> Optional[Dict[str, Any]]:
-        """Aggregate a group of 1m candles into a single higher timeframe candle"""
-        
-        if candles.empty:
-            return None
-        
-        # Calculate timestamp_out based on latest timestamp_out from 1m candles + 200ms
-        timestamp_out = self._calculate_timestamp_out(candles, timestamp)
-        
-        # Basic OHLCV aggregation
-        aggregated = {
-            'symbol': candles['symbol'].iloc[0] if 'symbol' in candles.columns else instrument_id.split(':')[-1],
-            'exchange': candles['exchange'].iloc[0] if 'exchange' in candles.columns else 'unknown',
-            'timeframe': timeframe,
-            'timestamp': timestamp,
-            'timestamp_out': timestamp_out,
-            'open': candles['open'].iloc[0],
-            'high': candles['high'].max(),
-            'low': candles['low'].min(),
-            'close': candles['close'].iloc[-1],
-            'volume': candles['volume'].sum(),
-            'trade_count': candles['trade_count'].sum(),
-            'vwap': self._calculate_aggregated_vwap(candles)
-        }
-        
-        return aggregated
-    
-    def _create_empty_candle(self, instrument_id: str, timeframe: str, timestamp: datetime) -> Dict[str, Any]:
-        """Create an empty candle with NaN values"""
-        
-        symbol = instrument_id.split(':')[-1] if ':' in instrument_id else instrument_id
-        
-        # Calculate timestamp_out as timestamp + 200ms for empty candles
-        timestamp_out = timestamp + timedelta(milliseconds=200)
-        
-        return {
-            'symbol': symbol,
-            'exchange': 'unknown',
-            'timeframe': timeframe,
-            'timestamp': timestamp,
-            'timestamp_out': timestamp_out,
-            'open': np.nan,
-            'high': np.nan,
-            'low': np.nan,
-            'close': np.nan,
-            'volume': 0.0,
-            'trade_count': 0,
-            'vwap': np.nan
-        }
-    
-    def _calculate_timestamp_out(self, candles: pd.DataFrame, fallback_timestamp: datetime) -> datetime:
-        """Calculate timestamp_out based on latest timestamp_out from 1m candles + 200ms"""
-        
-        if candles.empty:
-            # Use fallback timestamp + 200ms
-            return fallback_timestamp + timedelta(milliseconds=200)
-        
-        # Get the latest timestamp_out from candles
-        if 'timestamp_out' in candles.columns:
-            latest_timestamp_out = candles['timestamp_out'].max()
-            if pd.notna(latest_timestamp_out):
-                # timestamp_out is already a datetime, just add 200ms
-                if isinstance(latest_timestamp_out, datetime):
-                    return latest_timestamp_out + timedelta(milliseconds=200)
-                else:
-                    # Convert if it's not a datetime
-                    return pd.to_datetime(latest_timestamp_out) + timedelta(milliseconds=200)
-        
-        # Fallback to using fallback_timestamp + 200ms
-        return fallback_timestamp + timedelta(milliseconds=200)
-    
-    def _calculate_aggregated_vwap(self, candles: pd.DataFrame) -> float:
-        """Calculate VWAP for aggregated candles"""
+        timeframes: List[str], 
+        date: datetime
+    ) -> Dict[str, pd.DataFrame]:
+        """Aggregate 1m candles into several higher timeframes at once"""
         
-        if candles.empty or 'vwap' not in candles.columns:
-            return np.nan
+        if one_minute_candles.empty:
+            return {}
         
-        # Use volume-weighted average of VWAPs
-        total_volume = candles['volume'].sum()
-        if total_volume == 0:
-            return np.nan
+        symbol, exchange = self._symbol_and_exchange(one_minute_candles, instrument_id)
         
-        vwap_sum = (candles['vwap'] * candles['volume']).sum()
-        return vwap_sum / total_volume
+        # Empty intervals become NaN candles; HFT features follow the per-column rules
+        hft_rules = HFT_AGGREGATION_RULES if self.config.enable_hft_features else None
+        return rollup_candles(one_minute_candles, date, timeframes, symbol, exchange, hft_rules)
     
     def _add_aggregated_hft_features(
         self, 
@@ -281,136 +174,27 @@ class AggregatedCandleProcessor:
         one_minute_candles: pd.DataFrame, 
         timeframe: str
     ) -> pd.DataFrame:
-        """Add aggregated HFT features to candles DataFrame"""
+        """Add aggregated HFT features to candles DataFrame (contiguous, aligned candles)"""
         
-        # Initialize feature columns
-        hft_columns = [
-            'buy_volume_sum', 'sell_volume_sum', 'size_avg', 'price_vwap', 'trade_count',
-            'delay_median', 'delay_max', 'delay_min', 'delay_mean',
-            'liquidation_buy_volume', 'liquidation_sell_volume', 'liquidation_count',
-            'funding_rate', 'index_price', 'mark_price', 'open_interest', 'predicted_funding_rate',
-            'oi_change', 'liquidation_with_rising_oi', 'liquidation_with_falling_oi',
-            'skew_25d_put_call_ratio', 'atm_mark_iv'
-        ]
+        if aggregated_df.empty:
+            return aggregated_df
         
-        for col in hft_columns:
-            aggregated_df[col] = np.nan
+        # Bucket the 1m candles into the aggregated candles once
+        interval_us = TIMEFRAME_SECONDS[timeframe] * 1_000_000
+        start_us = int(timestamps_to_us(aggregated_df['timestamp'])[0])
+        one_minute_candles, buckets = bucket_candles(one_minute_candles, start_us, interval_us, len(aggregated_df))
         
-        # Process each aggregated candle
-        for i, candle in aggregated_df.iterrows():
-            timestamp = candle['timestamp']
-            
-            # Get 1m candles for this interval
-            interval_candles = one_minute_candles[
-                (one_minute_candles['timestamp'] >= timestamp) & 
-                (one_minute_candles['timestamp'] < timestamp + self._get_timeframe_delta(timeframe))
-            ]
-            
-            if not interval_candles.empty:
-                # Aggregate HFT features
-                features = self._aggregate_hft_features(interval_candles, timeframe)
-                
-                # Update DataFrame
-                for col, value in features.items():
-                    aggregated_df.at[i, col] = value
+        features = aggregate_hft_features(one_minute_candles, buckets)
+        for col, values in features.items():
+            aggregated_df[col] = values
         
         return aggregated_df
     
-    def _aggregate_hft_features(self, candles: pd.DataFrame, timeframe: str) -> Dict[str, float]:
-        """Aggregate HFT features from 1m candles"""
-        
-        features = {}
-        
-        # Features that should be summed
-        sum_features = [
-            'buy_volume_sum', 'sell_volume_sum', 'trade_count',
-            'liquidation_buy_volume', 'liquidation_sell_volume', 'liquidation_count'
-        ]
-        
-        for col in sum_features:
-            if col in candles.columns:
-                features[col] = candles[col].sum()
-            else:
-                features[col] = np.nan
-        
-        # Features that should be recalculated (averages, medians, etc.)
-        if 'size_avg' in candles.columns:
-            # Recalculate average trade size
-            total_trades = candles['trade_count'].sum()
-            if total_trades > 0:
-                features['size_avg'] = (candles['size_avg'] * candles['trade_count']).sum() / total_trades
-            else:
-                features['size_avg'] = np.nan
-        else:
-            features['size_avg'] = np.nan
-        
-        # VWAP should be recalculated
-        if 'price_vwap' in candles.columns and 'volume' in candles.columns:
-            total_volume = candles['volume'].sum()
-            if total_volume > 0:
-                features['price_vwap'] = (candles['price_vwap'] * candles['volume']).sum() / total_volume
-            else:
-                features['price_vwap'] = np.nan
-        else:
-            features['price_vwap'] = np.nan
-        
-        # Delay features should be recalculated
-        delay_features = ['delay_median', 'delay_max', 'delay_min', 'delay_mean']
-        for col in delay_features:
-            if col in candles.columns:
-                # For aggregated timeframes, we need to recalculate from raw data
-                # For now, use the median of medians as approximation
-                features[col] = candles[col].median()
-            else:
-                features[col] = np.nan
-        
-        # Last value features (derivatives ticker)
-        last_value_features = [
-            'funding_rate', 'index_price', 'mark_price', 'open_interest', 'predicted_funding_rate'
-        ]
-        
-        for col in last_value_features:
-            if col in candles.columns:
-                # Use last non-NaN value
-                non_nan_values = candles[col].dropna()
-                features[col] = non_nan_values.iloc[-1] if not non_nan_values.empty else np.nan
-            else:
-                features[col] = np.nan
-        
-        # Open interest change signals
-        features['oi_change'] = np.nan  # Would need previous candle's OI
-        features['liquidation_with_rising_oi'] = np.nan
-        features['liquidation_with_falling_oi'] = np.nan
-        
-        # Options chain features
-        features['skew_25d_put_call_ratio'] = np.nan
-        features['atm_mark_iv'] = np.nan
-        
-        return features
-    
-    def _get_timeframe_delta(self, timeframe: str) -> timedelta:
-        """Get timedelta for a timeframe"""
-        seconds = self.timestamp_manager.TIMEFRAMES.get(timeframe, 60)
-        return timedelta(seconds=seconds)
-    
-    def _generate_aligned_timestamps(self, date: datetime, timeframe: str) -> List[datetime]:
-        """Generate UTC-aligned timestamps for a day"""
-        
-        # Get interval in seconds
-        interval_seconds = self.timestamp_manager.TIMEFRAMES.get(timeframe, 60)
-        
-        # Start from midnight UTC
-        start_time = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_time = start_time + timedelta(days=1)
-        
-        timestamps = []
-        current = start_time
-        
-        while current < end_time:
-            timestamps.append(current)
-            current += timedelta(seconds=interval_seconds)
-        
-        return timestamps
+    def _symbol_and_exchange(self, candles: pd.DataFrame, instrument_id: str) -> Tuple[str, str]:
+        """Symbol and exchange from the 1m candles, or from the instrument ID"""
+        symbol = candles['symbol'].iloc[0] if 'symbol' in candles.columns else instrument_id.split(':')[-1]
+        exchange = candles['exchange'].iloc[0] if 'exchange' in candles.columns else 'unknown'
+        return symbol, exchange
     
     async def _upload_candles(
         self, 
@@ -441,6 +225,7 @@ class AggregatedCandleProcessor:
         bucket = self.data_client.client.bucket(output_bucket)
         blob = bucket.blob(blob_name)
         blob.upload_from_string(parquet_buffer)
+        get_gcs_object_index(bucket).record_upload(blob, data=parquet_buffer)
         
         logger.info(f"📤 Uploaded {len(candles_df)} {timeframe} candles to gs://{output_bucket}/{blob_name}")
     
@@ -467,7 +252,9 @@ class AggregatedCandleProcessor:
             table,
             buffer,
             compression='snappy',
-            use_dictionary=True,
+            # Dictionary-encode the string columns only - it cannot be combined with column_encoding
+            use_dictionary=[field.name for field in table.schema
+                            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)],
             row_group_size=100000,  # ~1MB per row group for efficient filtering
             data_page_size=1024 * 1024,  # 1MB data pages
             write_statistics=True,  # Enable statistics for predicate pushdown
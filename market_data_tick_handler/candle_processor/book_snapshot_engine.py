@@ -0,0 +1,174 @@
+"""
+Vectorized Book Snapshot Engine
+
+Samples order book snapshots at UTC-aligned boundaries for several
+timeframes at once. The book's timestamps are sorted once and every
+boundary of every timeframe is resolved with ``np.searchsorted`` to the
+first snapshot at or after it (the closest one inside its interval).
+Raw levels are read once into (rows x levels) matrices and the derived
+features (mid, spread, distances, imbalances, volume ratios, bid/ask
+VWAP, level counts) are NumPy operations over the sampled rows.
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .candle_engine import (
+    SECONDS_PER_DAY, TIMEFRAME_SECONDS, TIMESTAMP_OUT_DELAY_US, day_start_us, timestamps_to_us
+)
+
+SIDES = ('bid', 'ask')
+
+
+def level_matrices(book_data: pd.DataFrame, levels: int) -> Dict[str, np.ndarray]:
+    """bid/ask price and volume (rows x levels) matrices; missing level columns are NaN"""
+    matrices = {}
+    for side in SIDES:
+        for field in ('price', 'volume'):
+            columns = [f'{side}_{field}_{level}' for level in range(1, levels + 1)]
+            matrix = np.full((len(book_data), levels), np.nan)
+            for position, column in enumerate(columns):
+                if column in book_data.columns:
+                    matrix[:, position] = book_data[column].to_numpy(dtype=np.float64)
+            matrices[f'{side}_{field}'] = matrix
+    return matrices
+
+
+def sample_positions(sorted_us: np.ndarray, start_us: int, interval_us: int, num_buckets: int) -> np.ndarray:
+    """Index into sorted_us of the first snapshot in each bucket, -1 for buckets without one"""
+    boundaries = start_us + np.arange(num_buckets + 1, dtype=np.int64) * interval_us
+    positions = np.searchsorted(sorted_us, boundaries, side='left')
+    # The first snapshot at or after a boundary belongs to the bucket only if it precedes the next boundary
+    has_snapshot = positions[:-1] < positions[1:]
+    return np.where(has_snapshot, positions[:-1], -1)
+
+
+def derived_features(matrices: Dict[str, np.ndarray], levels: int) -> Dict[str, np.ndarray]:
+    """Derived book features of every row of the level matrices"""
+    bid_price, bid_volume = matrices['bid_price'], matrices['bid_volume']
+    ask_price, ask_volume = matrices['ask_price'], matrices['ask_volume']
+    features = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Basic price features (NaN unless both sides have a top level)
+        mid_price = (bid_price[:, 0] + ask_price[:, 0]) / 2
+        features['mid_price'] = mid_price
+        features['spread_abs'] = ask_price[:, 0] - bid_price[:, 0]
+        features['spread_bps'] = features['spread_abs'] / mid_price * 10000
+        features['bid_ask_ratio'] = bid_price[:, 0] / ask_price[:, 0]
+
+        # Level distance features (bps from mid)
+        bid_distance = (bid_price - mid_price[:, None]) / mid_price[:, None] * 10000
+        ask_distance = (ask_price - mid_price[:, None]) / mid_price[:, None] * 10000
+        for level in range(levels):
+            features[f'bid_distance_{level + 1}'] = bid_distance[:, level]
+            features[f'ask_distance_{level + 1}'] = ask_distance[:, level]
+
+        # Volume imbalance features (a missing volume makes the side's total NaN)
+        total_bid_volume = bid_volume.sum(axis=1)
+        total_ask_volume = ask_volume.sum(axis=1)
+        features['total_bid_volume'] = total_bid_volume
+        features['total_ask_volume'] = total_ask_volume
+        total_volume = total_bid_volume + total_ask_volume
+        features['volume_imbalance'] = np.where(
+            total_volume > 0, (total_bid_volume - total_ask_volume) / total_volume, np.nan
+        )
+
+        # Volume ratios for each level
+        bid_has_volume = (total_bid_volume > 0)[:, None]
+        ask_has_volume = (total_ask_volume > 0)[:, None]
+        bid_ratio = np.where(bid_has_volume, bid_volume / total_bid_volume[:, None], np.nan)
+        ask_ratio = np.where(ask_has_volume, ask_volume / total_ask_volume[:, None], np.nan)
+        for level in range(levels):
+            features[f'bid_volume_ratio_{level + 1}'] = bid_ratio[:, level]
+            features[f'ask_volume_ratio_{level + 1}'] = ask_ratio[:, level]
+
+        # Weighted price features
+        features['bid_vwap'] = np.where(
+            bid_has_volume[:, 0], (bid_price * bid_volume).sum(axis=1) / total_bid_volume, np.nan
+        )
+        features['ask_vwap'] = np.where(
+            ask_has_volume[:, 0], (ask_price * ask_volume).sum(axis=1) / total_ask_volume, np.nan
+        )
+        features['vwap_spread'] = features['ask_vwap'] - features['bid_vwap']
+
+    # Shape features
+    bid_levels_filled = (~np.isnan(bid_price)).sum(axis=1)
+    ask_levels_filled = (~np.isnan(ask_price)).sum(axis=1)
+    features['bid_levels_filled'] = bid_levels_filled
+    features['ask_levels_filled'] = ask_levels_filled
+    features['book_imbalance'] = (bid_levels_filled - ask_levels_filled) / levels
+
+    return features
+
+
+def sample_book_snapshots(
+    book_data: pd.DataFrame,
+    date: datetime,
+    timeframes: List[str],
+    levels: int,
+    symbol: str,
+    exchange: str
+) -> Dict[str, pd.DataFrame]:
+    """One snapshot row per aligned interval of the day for each timeframe
+
+    Intervals without a book snapshot keep NaN features, a snapshot_timestamp
+    equal to the interval start and timestamp_out 200ms after it.
+    """
+    start_us = day_start_us(date)
+    time_column = 'timestamp' if 'timestamp' in book_data.columns else 'local_timestamp'
+
+    # Sort the book once; rows without a timestamp can never be sampled
+    if time_column in book_data.columns and not book_data.empty:
+        snapshot_us = timestamps_to_us(book_data[time_column])
+        rows = np.flatnonzero(book_data[time_column].notna().to_numpy())
+        rows = rows[np.argsort(snapshot_us[rows], kind='stable')]
+        sorted_us = snapshot_us[rows]
+    else:
+        rows, sorted_us = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Level matrices in sorted order plus a trailing all-NaN row for intervals without a snapshot
+    matrices = {
+        name: np.vstack([matrix[rows], np.full((1, levels), np.nan)])
+        for name, matrix in level_matrices(book_data, levels).items()
+    }
+    padded_us = np.append(sorted_us, 0)
+
+    snapshots = {}
+    for timeframe in timeframes:
+        interval_seconds = TIMEFRAME_SECONDS[timeframe]
+        interval_us = interval_seconds * 1_000_000
+        num_buckets = -(-SECONDS_PER_DAY // interval_seconds)
+        timestamps_us = start_us + np.arange(num_buckets, dtype=np.int64) * interval_us
+
+        positions = sample_positions(sorted_us, start_us, interval_us, num_buckets)
+        empty = positions < 0
+        picked = np.where(empty, len(rows), positions)
+        snapshot_timestamps_us = np.where(empty, timestamps_us, padded_us[picked])
+        sampled = {name: matrix[picked] for name, matrix in matrices.items()}
+
+        frame = {
+            'symbol': symbol,
+            'exchange': exchange,
+            'timeframe': timeframe,
+            'timestamp': pd.to_datetime(timestamps_us, unit='us', utc=True),
+            'timestamp_out': pd.to_datetime(snapshot_timestamps_us + TIMESTAMP_OUT_DELAY_US, unit='us', utc=True),
+            'snapshot_timestamp': pd.to_datetime(snapshot_timestamps_us, unit='us', utc=True)
+        }
+        for level in range(levels):
+            for side in SIDES:
+                frame[f'{side}_price_{level + 1}'] = sampled[f'{side}_price'][:, level]
+                frame[f'{side}_volume_{level + 1}'] = sampled[f'{side}_volume'][:, level]
+
+        features = derived_features(sampled, levels)
+        # Intervals without a snapshot have no book shape either
+        for name in ('bid_levels_filled', 'ask_levels_filled', 'book_imbalance'):
+            features[name] = np.where(empty, np.nan, features[name])
+        frame.update(features)
+
+        snapshots[timeframe] = pd.DataFrame(frame)
+
+    return snapshots
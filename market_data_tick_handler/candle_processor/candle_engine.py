@@ -0,0 +1,257 @@
+"""
+Vectorized Candle Engine
+
+Builds a full day of UTC-aligned OHLCV candles in one pass over the trades.
+Trades get a bucket id by integer division of their int64 microsecond
+timestamps; per-bucket open/high/low/close/volume/count/vwap/timestamp_out
+then come from segment reductions (``reduceat``) over contiguous buckets
+instead of one boolean mask and one ``CandleBuilder`` per interval.
+
+Values match ``CandleBuilder`` exactly: trades are taken in frame order
+within each bucket and sums are accumulated left to right, so candles are
+bit-identical to feeding the same trades through ``add_trade``. Buckets
+without trades are NaN candles with zero volume.
+
+Coarser timeframes are rolled up from the finest one in memory
+(15s -> 1m -> 5m -> 15m -> 1h -> 4h -> 24h), so one scan of the trades
+serves every timeframe.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+SECONDS_PER_DAY = 86400
+
+# Candle timeframes, finest first; each one divides the next, so buckets roll up exactly
+TIMEFRAME_SECONDS = {
+    '15s': 15,
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '4h': 14400,
+    '24h': 86400
+}
+
+# timestamp_out is the latest local_timestamp of the bucket (or the bucket start) plus this delay
+TIMESTAMP_OUT_DELAY_US = 200_000
+
+
+def timestamps_to_us(values: pd.Series) -> np.ndarray:
+    """int64 epoch microseconds of a datetime (naive = UTC) or integer microsecond column"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        return values.to_numpy(dtype='datetime64[us]').astype(np.int64)
+    return values.to_numpy(dtype=np.int64)
+
+
+def day_start_us(date: datetime) -> int:
+    """Epoch microseconds of UTC midnight of the date (naive dates are UTC)"""
+    midnight = pd.Timestamp(date.replace(hour=0, minute=0, second=0, microsecond=0))
+    if midnight.tzinfo is None:
+        midnight = midnight.tz_localize(timezone.utc)
+    return midnight.value // 1_000
+
+
+def sequential_sums(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Sum of each segment accumulated left to right from 0.0, like a running ``total += value``
+
+    NumPy's float reductions sum pairwise, which can differ from a running
+    sum in the last bits; reducing Python floats keeps the order exact.
+    """
+    if len(starts) == 0:
+        return np.zeros(0)
+    # + 0.0 mirrors the builder's 0.0 starting value (turns an all -0.0 segment into 0.0)
+    return np.add.reduceat(values.astype(object), starts).astype(np.float64) + 0.0
+
+
+@dataclass
+class BucketAggregates:
+    """Per-bucket trade aggregates for every aligned interval of one day (index = bucket id)"""
+    day_start_us: int
+    interval_us: int
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    volume_weighted_sum: np.ndarray
+    trade_count: np.ndarray
+    last_local_us: np.ndarray  # -1 when the bucket has no trades or no local_timestamp
+
+    @property
+    def timestamps_us(self) -> np.ndarray:
+        """Aligned start of every bucket"""
+        return self.day_start_us + np.arange(len(self.trade_count), dtype=np.int64) * self.interval_us
+
+    @property
+    def vwap(self) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.volume != 0, self.volume_weighted_sum / self.volume, np.nan)
+
+    @property
+    def timestamps_out_us(self) -> np.ndarray:
+        return np.where(self.last_local_us >= 0, self.last_local_us, self.timestamps_us) + TIMESTAMP_OUT_DELAY_US
+
+
+def aggregate_trades(trades: pd.DataFrame, date: datetime, interval_seconds: int,
+                     time_column: str = 'timestamp') -> BucketAggregates:
+    """Aggregate one day of trades into aligned buckets of interval_seconds"""
+    start_us = day_start_us(date)
+    interval_us = interval_seconds * 1_000_000
+    num_buckets = -(-SECONDS_PER_DAY // interval_seconds)
+
+    if trades.empty or time_column not in trades.columns:
+        return _empty_aggregates(start_us, interval_us, num_buckets)
+
+    ts = timestamps_to_us(trades[time_column])
+    buckets = (ts - start_us) // interval_us
+    in_day = (buckets >= 0) & (buckets < num_buckets)
+
+    # Missing columns behave like the builder's trade.get(..., 0.0)
+    prices = trades['price'].to_numpy(dtype=np.float64) if 'price' in trades.columns else np.zeros(len(trades))
+    amounts = trades['amount'].to_numpy(dtype=np.float64) if 'amount' in trades.columns else np.zeros(len(trades))
+    local_us = timestamps_to_us(trades['local_timestamp']) if 'local_timestamp' in trades.columns else None
+
+    # Keep frame order within each bucket (stable), so open/close and sums follow the builder
+    order = np.flatnonzero(in_day)
+    if len(order) > 1 and np.any(np.diff(buckets[order]) < 0):
+        order = order[np.argsort(buckets[order], kind='stable')]
+    if len(order) == 0:
+        return _empty_aggregates(start_us, interval_us, num_buckets)
+
+    buckets, prices, amounts = buckets[order], prices[order], amounts[order]
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)]
+    ids = buckets[starts]
+
+    aggregates = _empty_aggregates(start_us, interval_us, num_buckets)
+    aggregates.open[ids] = prices[starts]
+    aggregates.close[ids] = prices[ends - 1]
+    # The builder's `price > high` never replaces a NaN first price and skips later NaNs
+    first_is_nan = np.isnan(prices[starts])
+    aggregates.high[ids] = np.where(first_is_nan, np.nan, np.fmax.reduceat(prices, starts))
+    aggregates.low[ids] = np.where(first_is_nan, np.nan, np.fmin.reduceat(prices, starts))
+    aggregates.volume[ids] = sequential_sums(amounts, starts)
+    aggregates.volume_weighted_sum[ids] = sequential_sums(prices * amounts, starts)
+    aggregates.trade_count[ids] = ends - starts
+    if local_us is not None:
+        aggregates.last_local_us[ids] = np.maximum.reduceat(local_us[order], starts)
+    return aggregates
+
+
+def rollup(aggregates: BucketAggregates, interval_seconds: int) -> BucketAggregates:
+    """Roll buckets up into a coarser interval that is a whole multiple of theirs
+
+    open/close are the first/last non-empty bucket's, high/low ignore empty
+    buckets, and volumes, volume-weighted sums and counts add up. Sums are
+    added per bucket rather than per trade, so they can differ from a direct
+    build in the last bits.
+    """
+    interval_us = interval_seconds * 1_000_000
+    if interval_us % aggregates.interval_us:
+        raise ValueError(f"{interval_seconds}s is not a multiple of {aggregates.interval_us // 1_000_000}s buckets")
+    factor = interval_us // aggregates.interval_us
+    num_buckets = -(-len(aggregates.trade_count) // factor)
+    padding = num_buckets * factor - len(aggregates.trade_count)
+
+    def grouped(values: np.ndarray, fill) -> np.ndarray:
+        return np.append(values, np.full(padding, fill, dtype=values.dtype)).reshape(num_buckets, factor)
+
+    counts = grouped(aggregates.trade_count, 0)
+    has_trades = counts > 0
+    first = np.argmax(has_trades, axis=1)
+    last = factor - 1 - np.argmax(has_trades[:, ::-1], axis=1)
+    rows = np.arange(num_buckets)
+    empty = ~has_trades.any(axis=1)
+
+    return BucketAggregates(
+        day_start_us=aggregates.day_start_us,
+        interval_us=interval_us,
+        open=np.where(empty, np.nan, grouped(aggregates.open, np.nan)[rows, first]),
+        high=np.fmax.reduce(grouped(aggregates.high, np.nan), axis=1),
+        low=np.fmin.reduce(grouped(aggregates.low, np.nan), axis=1),
+        close=np.where(empty, np.nan, grouped(aggregates.close, np.nan)[rows, last]),
+        volume=grouped(aggregates.volume, 0.0).sum(axis=1),
+        volume_weighted_sum=grouped(aggregates.volume_weighted_sum, 0.0).sum(axis=1),
+        trade_count=counts.sum(axis=1),
+        last_local_us=grouped(aggregates.last_local_us, -1).max(axis=1)
+    )
+
+
+def aggregate_timeframes(trades: pd.DataFrame, date: datetime, timeframes: List[str],
+                         time_column: str = 'timestamp') -> Dict[str, BucketAggregates]:
+    """Bucket aggregates for several timeframes from one scan of the trades
+
+    The finest requested timeframe is built from the trades; every coarser
+    one is rolled up from the previous level (15s -> 1m -> 5m -> ... -> 24h).
+    """
+    unknown = [timeframe for timeframe in timeframes if timeframe not in TIMEFRAME_SECONDS]
+    if unknown:
+        raise ValueError(f"Unsupported timeframes: {unknown}. Supported: {list(TIMEFRAME_SECONDS)}")
+
+    ordered = sorted(set(timeframes), key=TIMEFRAME_SECONDS.get)
+    results = {}
+    previous = None
+    for timeframe in ordered:
+        interval_seconds = TIMEFRAME_SECONDS[timeframe]
+        if previous is None:
+            previous = aggregate_trades(trades, date, interval_seconds, time_column)
+        else:
+            previous = rollup(previous, interval_seconds)
+        results[timeframe] = previous
+    return results
+
+
+def candle_frame(aggregates: BucketAggregates, symbol: str, exchange: str, timeframe: str) -> pd.DataFrame:
+    """Candle DataFrame (CandleData fields, boundary as ``timestamp``) from bucket aggregates"""
+    timestamps_us = aggregates.timestamps_us
+    timestamps_out_us = aggregates.timestamps_out_us
+    price_change = aggregates.close - aggregates.open
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change_pct = np.where(aggregates.open == 0, 0.0, price_change / aggregates.open * 100)
+
+    return pd.DataFrame({
+        'symbol': symbol,
+        'exchange': exchange,
+        'timeframe': timeframe,
+        'timestamp': pd.to_datetime(timestamps_us, unit='us', utc=True),
+        'timestamp_out': pd.to_datetime(timestamps_out_us, unit='us', utc=True),
+        'open': aggregates.open,
+        'high': aggregates.high,
+        'low': aggregates.low,
+        'close': aggregates.close,
+        'volume': aggregates.volume,
+        'trade_count': aggregates.trade_count,
+        'vwap': aggregates.vwap,
+        'latency_ms': (timestamps_out_us - timestamps_us) / 1_000_000 * 1000,
+        'price_change': price_change,
+        'price_change_pct': price_change_pct,
+        'is_green': aggregates.close >= aggregates.open
+    })
+
+
+def build_candles(trades: pd.DataFrame, date: datetime, interval_seconds: int, symbol: str,
+                  exchange: str, timeframe: str, time_column: str = 'timestamp') -> pd.DataFrame:
+    """One day of aligned candles (empty intervals as NaN candles) from a trades DataFrame"""
+    return candle_frame(aggregate_trades(trades, date, interval_seconds, time_column), symbol, exchange, timeframe)
+
+
+def _empty_aggregates(start_us: int, interval_us: int, num_buckets: int) -> BucketAggregates:
+    return BucketAggregates(
+        day_start_us=start_us,
+        interval_us=interval_us,
+        open=np.full(num_buckets, np.nan),
+        high=np.full(num_buckets, np.nan),
+        low=np.full(num_buckets, np.nan),
+        close=np.full(num_buckets, np.nan),
+        volume=np.zeros(num_buckets),
+        volume_weighted_sum=np.zeros(num_buckets),
+        trade_count=np.zeros(num_buckets, dtype=np.int64),
+        last_local_us=np.full(num_buckets, -1, dtype=np.int64)
+    )
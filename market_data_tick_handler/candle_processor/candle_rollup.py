@@ -0,0 +1,209 @@
+"""
+Candle Roll-up
+
+Rolls 1m candles up into coarser UTC-aligned timeframes (5m to 24h) in one
+call. Each 1m candle gets a bucket id per target timeframe by integer
+division of its microsecond timestamp, and every column is reduced per
+bucket with ``reduceat``/``bincount`` instead of one boolean mask and one
+dict per interval. OHLCV follows first/max/min/last/sum with a
+volume-weighted vwap; HFT features follow the per-column rules in
+``HFT_AGGREGATION_RULES``.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .candle_engine import SECONDS_PER_DAY, TIMEFRAME_SECONDS, TIMESTAMP_OUT_DELAY_US, day_start_us, timestamps_to_us
+from .hft_feature_engine import grouped_order_stats
+
+# How each 1m HFT feature combines into a coarser candle: counts and volumes add up,
+# averages are re-weighted by what they average over, extremes stay extremes, the
+# median of medians approximates the raw median, and ticker values keep the last one
+HFT_AGGREGATION_RULES = {
+    'buy_volume_sum': 'sum',
+    'sell_volume_sum': 'sum',
+    'size_avg': 'trade_weighted_mean',
+    'price_vwap': 'volume_weighted_mean',
+    'trade_count': 'sum',
+    'delay_median': 'median',
+    'delay_max': 'max',
+    'delay_min': 'min',
+    'delay_mean': 'trade_weighted_mean',
+    'liquidation_buy_volume': 'sum',
+    'liquidation_sell_volume': 'sum',
+    'liquidation_count': 'sum',
+    'funding_rate': 'last',
+    'index_price': 'last',
+    'mark_price': 'last',
+    'open_interest': 'last',
+    'predicted_funding_rate': 'last',
+    # Need the previous candle's OI / options chain processing
+    'oi_change': 'nan',
+    'liquidation_with_rising_oi': 'nan',
+    'liquidation_with_falling_oi': 'nan',
+    'skew_25d_put_call_ratio': 'nan',
+    'atm_mark_iv': 'nan'
+}
+
+
+class CandleBuckets:
+    """Rows of time-sorted candles grouped into the buckets of one coarser timeframe"""
+
+    def __init__(self, ids: np.ndarray, num_buckets: int):
+        self.ids = ids
+        self.num_buckets = num_buckets
+        self.starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.zeros(0, dtype=np.int64)
+        self.counts = np.bincount(ids, minlength=num_buckets)
+
+    def scatter(self, values: np.ndarray) -> np.ndarray:
+        """Per-group values spread over all buckets (NaN for buckets without rows)"""
+        result = np.full(self.num_buckets, np.nan)
+        result[self.ids[self.starts]] = values
+        return result
+
+    def sum(self, values: np.ndarray) -> np.ndarray:
+        """Sum skipping NaN values (0.0 for buckets without values)"""
+        return np.bincount(self.ids, weights=np.where(np.isnan(values), 0.0, values), minlength=self.num_buckets)
+
+    def weighted_mean(self, values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """sum(values * weights) / sum(weights), NaN where the weights add up to nothing"""
+        total = self.sum(weights)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, self.sum(values * weights) / total, np.nan)
+
+    def max(self, values: np.ndarray) -> np.ndarray:
+        return self._reduceat(np.fmax, values)
+
+    def min(self, values: np.ndarray) -> np.ndarray:
+        return self._reduceat(np.fmin, values)
+
+    def median(self, values: np.ndarray) -> np.ndarray:
+        return grouped_order_stats(self.ids, values, self.num_buckets)[1]
+
+    def first(self, values: np.ndarray) -> np.ndarray:
+        """First non-NaN value of each bucket"""
+        positions = np.where(np.isnan(values), len(values), np.arange(len(values)))
+        return self._pick(values, self._reduceat(np.minimum, positions))
+
+    def last(self, values: np.ndarray) -> np.ndarray:
+        """Last non-NaN value of each bucket"""
+        positions = np.where(np.isnan(values), -1, np.arange(len(values)))
+        return self._pick(values, self._reduceat(np.maximum, positions))
+
+    def _reduceat(self, ufunc, values: np.ndarray) -> np.ndarray:
+        if len(self.starts) == 0:
+            return np.full(self.num_buckets, np.nan)
+        return self.scatter(ufunc.reduceat(values, self.starts))
+
+    def _pick(self, values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """values at per-bucket positions; NaN, -1 or len(values) mean nothing to pick"""
+        found = ~np.isnan(positions) & (positions >= 0) & (positions < len(values))
+        result = np.full(self.num_buckets, np.nan)
+        result[found] = values[positions[found].astype(np.int64)]
+        return result
+
+
+def aggregate_hft_features(candles: pd.DataFrame, buckets: CandleBuckets,
+                           rules: Dict[str, str] = None) -> Dict[str, np.ndarray]:
+    """HFT feature columns of the coarser candles, reduced column by column by rule"""
+    rules = rules or HFT_AGGREGATION_RULES
+    trade_weights = _column(candles, 'trade_count')
+    volume_weights = _column(candles, 'volume')
+
+    features = {}
+    for col, rule in rules.items():
+        if rule == 'nan' or col not in candles.columns:
+            features[col] = np.full(buckets.num_buckets, np.nan)
+            continue
+        values = _column(candles, col)
+        if rule == 'sum':
+            result = buckets.sum(values)
+        elif rule == 'trade_weighted_mean':
+            result = buckets.weighted_mean(values, trade_weights)
+        elif rule == 'volume_weighted_mean':
+            result = buckets.weighted_mean(values, volume_weights)
+        elif rule == 'mean':
+            result = buckets.weighted_mean(values, np.where(np.isnan(values), np.nan, 1.0))
+        elif rule in ('max', 'min', 'median', 'first', 'last'):
+            result = getattr(buckets, rule)(values)
+        else:
+            raise ValueError(f"Unknown HFT aggregation rule for {col}: {rule}")
+        # Buckets without any 1m candle have no features
+        features[col] = np.where(buckets.counts > 0, result, np.nan)
+    return features
+
+
+def bucket_candles(candles: pd.DataFrame, start_us: int, interval_us: int,
+                   num_buckets: int) -> Tuple[pd.DataFrame, CandleBuckets]:
+    """Candles falling inside the buckets, in time order, with their bucket grouping"""
+    candles = candles[candles['timestamp'].notna()]
+    ids = (timestamps_to_us(candles['timestamp']) - start_us) // interval_us
+    order = np.argsort(ids, kind='stable')
+    order = order[(ids[order] >= 0) & (ids[order] < num_buckets)]
+    return candles.iloc[order], CandleBuckets(ids[order], num_buckets)
+
+
+def rollup_candles(
+    candles: pd.DataFrame,
+    date: datetime,
+    timeframes: List[str],
+    symbol: str,
+    exchange: str,
+    hft_rules: Optional[Dict[str, str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """Full days of candles for each target timeframe from one day of 1m candles
+
+    Intervals without 1m candles are NaN candles with zero volume. HFT
+    features are only added when hft_rules is given.
+    """
+    start_us = day_start_us(date)
+
+    results = {}
+    for timeframe in timeframes:
+        interval_seconds = TIMEFRAME_SECONDS[timeframe]
+        interval_us = interval_seconds * 1_000_000
+        num_buckets = -(-SECONDS_PER_DAY // interval_seconds)
+        timestamps_us = start_us + np.arange(num_buckets, dtype=np.int64) * interval_us
+        day_candles, buckets = bucket_candles(candles, start_us, interval_us, num_buckets)
+
+        volume = _column(day_candles, 'volume')
+        total_volume = buckets.sum(volume)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.where(total_volume != 0, buckets.sum(_column(day_candles, 'vwap') * volume) / total_volume, np.nan)
+
+        # Latest 1m timestamp_out of the interval plus the delay, or the interval start plus the delay
+        latest_out_us = np.full(num_buckets, -1, dtype=np.int64)
+        if 'timestamp_out' in day_candles.columns:
+            has_out = day_candles['timestamp_out'].notna().to_numpy()
+            np.maximum.at(latest_out_us, buckets.ids[has_out], timestamps_to_us(day_candles['timestamp_out'])[has_out])
+        timestamp_out = np.where(latest_out_us >= 0, latest_out_us, timestamps_us) + TIMESTAMP_OUT_DELAY_US
+
+        frame = {
+            'symbol': symbol,
+            'exchange': exchange,
+            'timeframe': timeframe,
+            'timestamp': pd.to_datetime(timestamps_us, unit='us', utc=True),
+            'timestamp_out': pd.to_datetime(timestamp_out, unit='us', utc=True),
+            'open': buckets.first(_column(day_candles, 'open')),
+            'high': buckets.max(_column(day_candles, 'high')),
+            'low': buckets.min(_column(day_candles, 'low')),
+            'close': buckets.last(_column(day_candles, 'close')),
+            'volume': total_volume,
+            'trade_count': buckets.sum(_column(day_candles, 'trade_count')).astype(np.int64),
+            'vwap': vwap
+        }
+        if hft_rules is not None:
+            frame.update(aggregate_hft_features(day_candles, buckets, hft_rules))
+
+        results[timeframe] = pd.DataFrame(frame)
+
+    return results
+
+
+def _column(candles: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in candles.columns:
+        return np.full(len(candles), np.nan)
+    return candles[col].to_numpy(dtype=np.float64)
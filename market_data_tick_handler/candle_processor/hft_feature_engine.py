@@ -0,0 +1,181 @@
+"""
+Vectorized HFT Feature Engine
+
+Computes the HFT features of every candle of a day in one pass per data
+type. Trades and liquidations are assigned to candle buckets once by
+integer division of their microsecond timestamps; counts, sums and means
+come from ``bincount`` and delay min/median/max from a single ``lexsort``
+by (bucket, delay). Derivative ticker fields are the last values as of
+each candle's close, joined with ``merge_asof``. Cost is O(N log N) in the
+rows of the day instead of one scan of the whole day per candle.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .candle_engine import timestamps_to_us
+
+TRADE_FEATURES = [
+    'buy_volume_sum', 'sell_volume_sum', 'size_avg', 'price_vwap', 'trade_count',
+    'delay_median', 'delay_max', 'delay_min', 'delay_mean'
+]
+LIQUIDATION_FEATURES = ['liquidation_buy_volume', 'liquidation_sell_volume', 'liquidation_count']
+DERIVATIVE_FEATURES = ['funding_rate', 'index_price', 'mark_price', 'open_interest', 'predicted_funding_rate']
+
+# Need the previous candle's OI / options chain processing; always NaN for now
+OI_CHANGE_FEATURES = ['oi_change', 'liquidation_with_rising_oi', 'liquidation_with_falling_oi']
+OPTIONS_FEATURES = ['skew_25d_put_call_ratio', 'atm_mark_iv']
+
+HFT_FEATURE_COLUMNS = (TRADE_FEATURES + LIQUIDATION_FEATURES + DERIVATIVE_FEATURES
+                       + OI_CHANGE_FEATURES + OPTIONS_FEATURES)
+
+
+def assign_buckets(df: pd.DataFrame, start_us: int, interval_us: int,
+                   num_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Bucket id of every row and the mask of rows falling inside the candles"""
+    time_column = 'timestamp' if 'timestamp' in df.columns else 'local_timestamp'
+    if df.empty or time_column not in df.columns:
+        return np.zeros(0, dtype=np.int64), np.zeros(len(df), dtype=bool)
+    timestamps_us = timestamps_to_us(df[time_column])
+    # NaT converts to the minimum int64 and lands outside the day
+    buckets = (timestamps_us - start_us) // interval_us
+    in_range = (buckets >= 0) & (buckets < num_buckets)
+    return buckets[in_range], in_range
+
+
+def grouped_sum(ids: np.ndarray, values: np.ndarray, num_buckets: int) -> np.ndarray:
+    """Per-bucket sum skipping NaN values (0.0 for buckets without values)"""
+    return np.bincount(ids, weights=np.where(np.isnan(values), 0.0, values), minlength=num_buckets)
+
+
+def grouped_count(ids: np.ndarray, values: np.ndarray, num_buckets: int) -> np.ndarray:
+    """Per-bucket number of non-NaN values"""
+    return np.bincount(ids[~np.isnan(values)], minlength=num_buckets)
+
+
+def grouped_order_stats(ids: np.ndarray, values: np.ndarray,
+                        num_buckets: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-bucket min, median and max skipping NaN values (NaN for buckets without values)"""
+    valid = ~np.isnan(values)
+    ids, values = ids[valid], values[valid]
+    counts = np.bincount(ids, minlength=num_buckets)
+    ordered = values[np.lexsort((values, ids))]
+    offsets = np.cumsum(counts) - counts
+    present = counts > 0
+    if not present.any():
+        empty = np.full(num_buckets, np.nan)
+        return empty, empty.copy(), empty.copy()
+
+    # Positions of empty buckets are clipped into range; their results are masked below
+    last = len(ordered) - 1
+    def at(positions: np.ndarray) -> np.ndarray:
+        return np.where(present, ordered[np.clip(positions, 0, last)], np.nan)
+
+    minimum = at(offsets)
+    median = (at(offsets + (counts - 1) // 2) + at(offsets + counts // 2)) / 2
+    maximum = at(offsets + counts - 1)
+    return minimum, median, maximum
+
+
+def trade_features(trades: pd.DataFrame, start_us: int, interval_us: int,
+                   num_buckets: int) -> Dict[str, np.ndarray]:
+    """Trade features per candle; candles without trades are NaN"""
+    ids, in_range = assign_buckets(trades, start_us, interval_us, num_buckets)
+    trades = trades[in_range] if not in_range.all() else trades
+    counts = np.bincount(ids, minlength=num_buckets)
+
+    nan_column = np.full(len(ids), np.nan)
+    amounts = trades['amount'].to_numpy(dtype=np.float64) if 'amount' in trades.columns else nan_column
+    prices = trades['price'].to_numpy(dtype=np.float64) if 'price' in trades.columns else nan_column
+
+    total_volume = grouped_sum(ids, amounts, num_buckets)
+    amount_counts = grouped_count(ids, amounts, num_buckets)
+    notional = grouped_sum(ids, prices * amounts, num_buckets)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features = {
+            'trade_count': counts.astype(np.float64),
+            'size_avg': np.where(amount_counts > 0, total_volume / amount_counts, np.nan),
+            'price_vwap': np.where(total_volume > 0, notional / total_volume, np.nan),
+            # Side-based volume (simplified - would need trade side information)
+            'buy_volume_sum': total_volume / 2,  # Placeholder
+            'sell_volume_sum': total_volume / 2,  # Placeholder
+        }
+
+    if 'local_timestamp' in trades.columns and 'timestamp' in trades.columns:
+        delays_ms = (timestamps_to_us(trades['local_timestamp']) - timestamps_to_us(trades['timestamp'])) / 1000
+        delay_counts = grouped_count(ids, delays_ms, num_buckets)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features['delay_mean'] = np.where(delay_counts > 0,
+                                              grouped_sum(ids, delays_ms, num_buckets) / delay_counts, np.nan)
+        features['delay_min'], features['delay_median'], features['delay_max'] = \
+            grouped_order_stats(ids, delays_ms, num_buckets)
+    else:
+        for col in ['delay_median', 'delay_max', 'delay_min', 'delay_mean']:
+            features[col] = np.full(num_buckets, np.nan)
+
+    empty = counts == 0
+    return {col: np.where(empty, np.nan, features[col]) for col in TRADE_FEATURES}
+
+
+def liquidation_features(liquidations: pd.DataFrame, start_us: int, interval_us: int,
+                         num_buckets: int) -> Dict[str, np.ndarray]:
+    """Liquidation features per candle; candles without liquidations are NaN"""
+    ids, in_range = assign_buckets(liquidations, start_us, interval_us, num_buckets)
+    counts = np.bincount(ids, minlength=num_buckets)
+
+    if 'amount' in liquidations.columns:
+        volume = grouped_sum(ids, liquidations['amount'].to_numpy(dtype=np.float64)[in_range], num_buckets)
+    else:
+        volume = np.zeros(num_buckets)
+
+    empty = counts == 0
+    return {
+        'liquidation_count': np.where(empty, np.nan, counts),
+        # Side-based liquidation volume (simplified)
+        'liquidation_buy_volume': np.where(empty, np.nan, volume / 2),  # Placeholder
+        'liquidation_sell_volume': np.where(empty, np.nan, volume / 2),  # Placeholder
+    }
+
+
+def derivative_features(derivative_ticker: pd.DataFrame, close_us: np.ndarray) -> Dict[str, np.ndarray]:
+    """Last derivative ticker values published before each candle's close (as-of join)"""
+    num_buckets = len(close_us)
+    time_column = 'timestamp' if 'timestamp' in derivative_ticker.columns else 'local_timestamp'
+    if derivative_ticker.empty or time_column not in derivative_ticker.columns:
+        return {col: np.full(num_buckets, np.nan) for col in DERIVATIVE_FEATURES}
+
+    ticker = pd.DataFrame({'ticker_us': timestamps_to_us(derivative_ticker[time_column])})
+    for col in DERIVATIVE_FEATURES:
+        ticker[col] = (derivative_ticker[col].to_numpy(dtype=np.float64)
+                       if col in derivative_ticker.columns else np.nan)
+    ticker = ticker.sort_values('ticker_us', kind='stable')
+
+    # A candle's close belongs to the next candle, so only strictly earlier updates count
+    joined = pd.merge_asof(
+        pd.DataFrame({'close_us': close_us}), ticker,
+        left_on='close_us', right_on='ticker_us', direction='backward', allow_exact_matches=False
+    )
+    return {col: joined[col].to_numpy(dtype=np.float64) for col in DERIVATIVE_FEATURES}
+
+
+def compute_hft_features(day_data: Dict[str, pd.DataFrame], timestamps_us: np.ndarray,
+                         interval_us: int) -> Dict[str, np.ndarray]:
+    """All HFT feature columns for evenly spaced candles starting at timestamps_us"""
+    num_buckets = len(timestamps_us)
+    if num_buckets == 0:
+        return {col: np.zeros(0) for col in HFT_FEATURE_COLUMNS}
+    start_us = int(timestamps_us[0])
+
+    features = {}
+    features.update(trade_features(day_data.get('trades', pd.DataFrame()), start_us, interval_us, num_buckets))
+    features.update(liquidation_features(day_data.get('liquidations', pd.DataFrame()),
+                                         start_us, interval_us, num_buckets))
+    features.update(derivative_features(day_data.get('derivative_ticker', pd.DataFrame()),
+                                        timestamps_us + interval_us))
+    for col in OI_CHANGE_FEATURES + OPTIONS_FEATURES:
+        features[col] = np.full(num_buckets, np.nan)
+    return features
+
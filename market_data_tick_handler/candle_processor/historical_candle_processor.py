@@ -7,14 +7,15 @@ Uses UTC-aligned boundaries and handles empty intervals with NaN values.
 
 import logging
 import pandas as pd
-import numpy as np
-from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 import asyncio
 
 from ..data_client.data_client import DataClient
-from ..streaming_service.candle_processor.candle_data import CandleBuilder, CandleData
+from ..data_client.gcs_object_index import get_gcs_object_index
+from .candle_engine import build_candles, timestamps_to_us
+from .hft_feature_engine import HFT_FEATURE_COLUMNS, compute_hft_features
 from ..streaming_service.tick_streamer.utc_timestamp_manager import UTCTimestampManager
 
 logger = logging.getLogger(__name__)
@@ -113,6 +114,9 @@ class HistoricalCandleProcessor:
                     logger.error(error_msg)
                     results['errors'].append(error_msg)
             
+            # One object index update for all timeframes written today
+            get_gcs_object_index(self.data_client.client.bucket(output_bucket)).flush()
+            
             return results
             
         except Exception as e:
@@ -170,36 +174,9 @@ class HistoricalCandleProcessor:
         # Extract symbol and exchange from instrument_id
         symbol, exchange = self._parse_instrument_id(instrument_id)
         
-        # Generate aligned timestamps for the day
-        aligned_timestamps = self._generate_aligned_timestamps(date, timeframe)
-        
-        # Process candles
-        candles = []
-        
-        for i, timestamp in enumerate(aligned_timestamps):
-            # Get next timestamp for filtering
-            next_timestamp = aligned_timestamps[i + 1] if i + 1 < len(aligned_timestamps) else date + timedelta(days=1)
-            
-            # Filter trades for this interval
-            interval_trades = trades_df[
-                (trades_df['timestamp'] >= timestamp) & 
-                (trades_df['timestamp'] < next_timestamp)
-            ].copy()
-            
-            # Create candle
-            candle = self._create_candle(
-                symbol, exchange, timeframe, timestamp, 
-                interval_trades, day_data
-            )
-            
-            if candle is not None:
-                candles.append(candle)
-        
-        if not candles:
-            return pd.DataFrame()
-        
-        # Convert to DataFrame
-        result_df = pd.DataFrame([candle.to_dict() for candle in candles])
+        # Bucket every trade of the day once and reduce each bucket (empty intervals become NaN candles)
+        interval_seconds = self.timestamp_manager.TIMEFRAMES.get(timeframe, 60)
+        result_df = build_candles(trades_df, date, interval_seconds, symbol, exchange, timeframe)
         
         # Add HFT features if enabled
         if self.config.enable_hft_features:
@@ -207,285 +184,27 @@ class HistoricalCandleProcessor:
         
         return result_df
     
-    def _create_candle(
-        self, 
-        symbol: str, 
-        exchange: str, 
-        timeframe: str, 
-        timestamp: datetime,
-        trades: pd.DataFrame,
-        day_data: Dict[str, pd.DataFrame]
-    ) -> Optional[CandleData]:
-        """Create a single candle from trades data"""
-        
-        # Calculate timestamp_out based on local_timestamp + 200ms
-        timestamp_out = self._calculate_timestamp_out(trades, timestamp)
-        
-        if trades.empty:
-            # Create empty candle with NaN values
-            return CandleData(
-                symbol=symbol,
-                exchange=exchange,
-                timeframe=timeframe,
-                timestamp_in=timestamp,
-                timestamp_out=timestamp_out,
-                open=np.nan,
-                high=np.nan,
-                low=np.nan,
-                close=np.nan,
-                volume=0.0,
-                trade_count=0,
-                vwap=np.nan
-            )
-        
-        # Use CandleBuilder to accumulate trades
-        builder = CandleBuilder(
-            symbol=symbol,
-            exchange=exchange,
-            timeframe=timeframe,
-            timestamp_in=timestamp
-        )
-        
-        # Add trades to builder
-        for _, trade in trades.iterrows():
-            price = trade.get('price', 0.0)
-            amount = trade.get('amount', 0.0)
-            builder.add_trade(price, amount)
-        
-        # Finalize candle with calculated timestamp_out
-        return builder.finalize(timestamp_out)
-    
-    def _calculate_timestamp_out(self, trades: pd.DataFrame, fallback_timestamp: datetime) -> datetime:
-        """Calculate timestamp_out as local_timestamp + 200ms"""
-        
-        if trades.empty:
-            # Use fallback timestamp + 200ms
-            return fallback_timestamp + timedelta(milliseconds=200)
-        
-        # Get the latest local_timestamp from trades
-        if 'local_timestamp' in trades.columns:
-            # Convert microseconds to datetime
-            latest_local_timestamp = trades['local_timestamp'].max()
-            if pd.notna(latest_local_timestamp):
-                # Convert microseconds to datetime
-                latest_dt = datetime.fromtimestamp(latest_local_timestamp / 1_000_000, tz=timezone.utc)
-                return latest_dt + timedelta(milliseconds=200)
-        
-        # Fallback to using fallback_timestamp + 200ms
-        return fallback_timestamp + timedelta(milliseconds=200)
-    
     def _add_hft_features(
         self, 
         candles_df: pd.DataFrame, 
         day_data: Dict[str, pd.DataFrame], 
         timeframe: str
     ) -> pd.DataFrame:
-        """Add HFT features to candles DataFrame"""
+        """Add HFT features to candles DataFrame, each computed over its own candle interval"""
         
-        # Initialize feature columns
-        for col in self._get_hft_feature_columns():
-            candles_df[col] = np.nan
+        # Rows of every data type are bucketed into the candles once instead of once per candle
+        interval_us = self.timestamp_manager.TIMEFRAMES.get(timeframe, 60) * 1_000_000
+        timestamps_us = timestamps_to_us(candles_df['timestamp'])
+        features = compute_hft_features(day_data, timestamps_us, interval_us)
         
-        # Process each candle
-        for i, candle in candles_df.iterrows():
-            timestamp = candle['timestamp']
-            
-            # Get data for this timestamp
-            candle_data = self._get_candle_data_at_timestamp(day_data, timestamp)
-            
-            # Calculate HFT features
-            features = self._calculate_hft_features(candle_data, timeframe)
-            
-            # Update DataFrame
-            for col, value in features.items():
-                candles_df.at[i, col] = value
+        for col in self._get_hft_feature_columns():
+            candles_df[col] = features[col]
         
         return candles_df
     
     def _get_hft_feature_columns(self) -> List[str]:
         """Get list of HFT feature column names"""
-        return [
-            # Trade data features
-            'buy_volume_sum', 'sell_volume_sum', 'size_avg', 'price_vwap', 'trade_count',
-            'delay_median', 'delay_max', 'delay_min', 'delay_mean',
-            
-            # Liquidation features
-            'liquidation_buy_volume', 'liquidation_sell_volume', 'liquidation_count',
-            
-            # Derivatives ticker features
-            'funding_rate', 'index_price', 'mark_price', 'open_interest', 'predicted_funding_rate',
-            
-            # Open interest change signals
-            'oi_change', 'liquidation_with_rising_oi', 'liquidation_with_falling_oi',
-            
-            # Options chain features (if enabled)
-            'skew_25d_put_call_ratio', 'atm_mark_iv'
-        ]
-    
-    def _get_candle_data_at_timestamp(
-        self, 
-        day_data: Dict[str, pd.DataFrame], 
-        timestamp: datetime
-    ) -> Dict[str, pd.DataFrame]:
-        """Get relevant data for a specific timestamp"""
-        
-        # For now, return all data - more sophisticated filtering can be added
-        return day_data
-    
-    def _calculate_hft_features(
-        self, 
-        candle_data: Dict[str, pd.DataFrame], 
-        timeframe: str
-    ) -> Dict[str, float]:
-        """Calculate HFT features for a candle"""
-        
-        features = {}
-        
-        # Trade data features
-        trades = candle_data.get('trades', pd.DataFrame())
-        if not trades.empty:
-            features.update(self._calculate_trade_features(trades))
-        else:
-            # Set NaN for all trade features
-            for col in ['buy_volume_sum', 'sell_volume_sum', 'size_avg', 'price_vwap', 'trade_count',
-                       'delay_median', 'delay_max', 'delay_min', 'delay_mean']:
-                features[col] = np.nan
-        
-        # Liquidation features
-        liquidations = candle_data.get('liquidations', pd.DataFrame())
-        if not liquidations.empty:
-            features.update(self._calculate_liquidation_features(liquidations))
-        else:
-            for col in ['liquidation_buy_volume', 'liquidation_sell_volume', 'liquidation_count']:
-                features[col] = np.nan
-        
-        # Derivatives ticker features
-        derivative_ticker = candle_data.get('derivative_ticker', pd.DataFrame())
-        if not derivative_ticker.empty:
-            features.update(self._calculate_derivative_features(derivative_ticker))
-        else:
-            for col in ['funding_rate', 'index_price', 'mark_price', 'open_interest', 'predicted_funding_rate']:
-                features[col] = np.nan
-        
-        # Open interest change signals
-        features.update(self._calculate_oi_change_signals(candle_data))
-        
-        # Options chain features (if enabled)
-        if self.config.enable_options_skew:
-            features.update(self._calculate_options_features(candle_data))
-        else:
-            features['skew_25d_put_call_ratio'] = np.nan
-            features['atm_mark_iv'] = np.nan
-        
-        return features
-    
-    def _calculate_trade_features(self, trades: pd.DataFrame) -> Dict[str, float]:
-        """Calculate trade-based HFT features"""
-        features = {}
-        
-        if trades.empty:
-            return features
-        
-        # Basic OHLCV features
-        features['trade_count'] = len(trades)
-        features['size_avg'] = trades['amount'].mean() if 'amount' in trades.columns else np.nan
-        
-        # Volume features
-        total_volume = trades['amount'].sum() if 'amount' in trades.columns else 0
-        features['price_vwap'] = (trades['price'] * trades['amount']).sum() / total_volume if total_volume > 0 else np.nan
-        
-        # Side-based volume (simplified - would need trade side information)
-        features['buy_volume_sum'] = total_volume / 2  # Placeholder
-        features['sell_volume_sum'] = total_volume / 2  # Placeholder
-        
-        # Delay features
-        if 'local_timestamp' in trades.columns and 'timestamp' in trades.columns:
-            delays = (trades['local_timestamp'] - trades['timestamp']).dt.total_seconds() * 1000
-            features['delay_median'] = delays.median()
-            features['delay_max'] = delays.max()
-            features['delay_min'] = delays.min()
-            features['delay_mean'] = delays.mean()
-        else:
-            for col in ['delay_median', 'delay_max', 'delay_min', 'delay_mean']:
-                features[col] = np.nan
-        
-        return features
-    
-    def _calculate_liquidation_features(self, liquidations: pd.DataFrame) -> Dict[str, float]:
-        """Calculate liquidation-based HFT features"""
-        features = {}
-        
-        if liquidations.empty:
-            return features
-        
-        features['liquidation_count'] = len(liquidations)
-        
-        # Side-based liquidation volume (simplified)
-        if 'amount' in liquidations.columns:
-            features['liquidation_buy_volume'] = liquidations['amount'].sum() / 2  # Placeholder
-            features['liquidation_sell_volume'] = liquidations['amount'].sum() / 2  # Placeholder
-        else:
-            features['liquidation_buy_volume'] = 0.0
-            features['liquidation_sell_volume'] = 0.0
-        
-        return features
-    
-    def _calculate_derivative_features(self, derivative_ticker: pd.DataFrame) -> Dict[str, float]:
-        """Calculate derivative ticker features (last values)"""
-        features = {}
-        
-        if derivative_ticker.empty:
-            return features
-        
-        # Get last values
-        last_row = derivative_ticker.iloc[-1]
-        
-        for col in ['funding_rate', 'index_price', 'mark_price', 'open_interest', 'predicted_funding_rate']:
-            features[col] = last_row.get(col, np.nan)
-        
-        return features
-    
-    def _calculate_oi_change_signals(self, candle_data: Dict[str, pd.DataFrame]) -> Dict[str, float]:
-        """Calculate open interest change signals"""
-        features = {}
-        
-        # This would need previous candle's OI for comparison
-        # For now, set to NaN
-        features['oi_change'] = np.nan
-        features['liquidation_with_rising_oi'] = np.nan
-        features['liquidation_with_falling_oi'] = np.nan
-        
-        return features
-    
-    def _calculate_options_features(self, candle_data: Dict[str, pd.DataFrame]) -> Dict[str, float]:
-        """Calculate options chain features (25-delta skew)"""
-        features = {}
-        
-        # This would need complex options chain processing
-        # For now, set to NaN
-        features['skew_25d_put_call_ratio'] = np.nan
-        features['atm_mark_iv'] = np.nan
-        
-        return features
-    
-    def _generate_aligned_timestamps(self, date: datetime, timeframe: str) -> List[datetime]:
-        """Generate UTC-aligned timestamps for a day"""
-        
-        # Get interval in seconds
-        interval_seconds = self.timestamp_manager.TIMEFRAMES.get(timeframe, 60)
-        
-        # Start from midnight UTC
-        start_time = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_time = start_time + timedelta(days=1)
-        
-        timestamps = []
-        current = start_time
-        
-        while current < end_time:
-            timestamps.append(current)
-            current += timedelta(seconds=interval_seconds)
-        
-        return timestamps
+        return list(HFT_FEATURE_COLUMNS)
     
     def _parse_instrument_id(self, instrument_id: str) -> Tuple[str, str]:
         """Parse instrument ID to extract symbol and exchange"""
@@ -522,10 +241,6 @@ class HistoricalCandleProcessor:
         # Create optimized Parquet file
         blob_name = f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet"
         
-        # Use ParquetOptimizer for efficient timestamp-based queries
-        from ..data_client.parquet_optimizer import ParquetOptimizer
-        optimizer = ParquetOptimizer(self.data_client.client, output_bucket)
-        
         # Create optimized Parquet with timestamp-based row groups
         parquet_buffer = self._create_optimized_parquet_buffer(candles_df)
         
@@ -533,6 +248,7 @@ class HistoricalCandleProcessor:
         bucket = self.data_client.client.bucket(output_bucket)
         blob = bucket.blob(blob_name)
         blob.upload_from_string(parquet_buffer)
+        get_gcs_object_index(bucket).record_upload(blob, data=parquet_buffer)
         
         logger.info(f"📤 Uploaded {len(candles_df)} {timeframe} candles to gs://{output_bucket}/{blob_name}")
     
@@ -559,7 +275,9 @@ class HistoricalCandleProcessor:
             table,
             buffer,
             compression='snappy',
-            use_dictionary=True,
+            # Dictionary-encode the string columns only - it cannot be combined with column_encoding
+            use_dictionary=[field.name for field in table.schema
+                            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)],
             row_group_size=100000,  # ~1MB per row group for efficient filtering
             data_page_size=1024 * 1024,  # 1MB data pages
             write_statistics=True,  # Enable statistics for predicate pushdown
@@ -0,0 +1,194 @@
+"""
+Multi-Timeframe Candle Processor
+
+Builds every candle timeframe (15s to 24h) and the book snapshots of an
+instrument-day from a single load of its tick data. Trades are bucketed
+once at the finest timeframe and rolled up in memory to the coarser ones,
+and the loaded book data is reused for snapshots, so nothing is read back
+from GCS between stages. All outputs are uploaded once the day is built.
+"""
+
+import logging
+import pandas as pd
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from ..data_client.data_client import DataClient
+from ..data_client.gcs_object_index import get_gcs_object_index
+from .candle_engine import TIMEFRAME_SECONDS, aggregate_timeframes, candle_frame
+from .historical_candle_processor import HistoricalCandleProcessor, ProcessingConfig
+from .aggregated_candle_processor import AggregatedCandleProcessor, AggregationConfig
+from .book_snapshot_processor import BookSnapshotProcessor, BookSnapshotConfig
+
+logger = logging.getLogger(__name__)
+
+class MultiTimeframeCandleProcessor:
+    """Processes one instrument-day into all candle timeframes and book snapshots in a single pass"""
+
+    def __init__(
+        self,
+        data_client: DataClient,
+        processing_config: ProcessingConfig = None,
+        aggregation_config: AggregationConfig = None,
+        book_config: Optional[BookSnapshotConfig] = None
+    ):
+        self.data_client = data_client
+        self.historical_processor = HistoricalCandleProcessor(data_client, processing_config)
+        self.aggregated_processor = AggregatedCandleProcessor(data_client, aggregation_config)
+        self.book_processor = BookSnapshotProcessor(data_client, book_config) if book_config else None
+
+        # Base timeframes get features from ticks, coarser ones from the in-memory 1m candles
+        self.base_timeframes = self.historical_processor.config.timeframes
+        self.aggregated_timeframes = self.aggregated_processor.config.timeframes
+        self.timeframes = sorted(set(self.base_timeframes) | set(self.aggregated_timeframes), key=TIMEFRAME_SECONDS.get)
+
+    async def process_day(
+        self,
+        instrument_id: str,
+        date: datetime,
+        output_bucket: str = None
+    ) -> Dict[str, Any]:
+        """
+        Process a full day of tick data into every configured timeframe
+
+        Args:
+            instrument_id: Instrument key (e.g., 'BINANCE:SPOT_PAIR:BTC-USDT')
+            date: Date to process (UTC)
+            output_bucket: GCS bucket for output (defaults to data_client bucket)
+
+        Returns:
+            Dictionary with per-timeframe candle and book snapshot results
+        """
+        logger.info(f"🕯️ Processing all timeframes for {instrument_id} on {date.strftime('%Y-%m-%d')}")
+
+        output_bucket = output_bucket or self.data_client.gcs_bucket
+        results = {
+            'instrument_id': instrument_id,
+            'date': date.strftime('%Y-%m-%d'),
+            'timeframes': {},
+            'book_timeframes': {},
+            'errors': []
+        }
+
+        try:
+            # Load every required data type once
+            day_data = await self.historical_processor._load_day_data(instrument_id, date)
+
+            if day_data['trades'].empty:
+                logger.warning(f"No trade data found for {instrument_id} on {date.strftime('%Y-%m-%d')}")
+                candles = {}
+            else:
+                candles = self._build_candles(day_data, instrument_id, date, results['errors'])
+
+            snapshots = {}
+            if self.book_processor is not None:
+                snapshots = await self._build_book_snapshots(day_data, instrument_id, date, results['errors'])
+
+            # Upload only once everything for the day has been built
+            for timeframe, candles_df in candles.items():
+                try:
+                    await self.historical_processor._upload_candles(candles_df, instrument_id, timeframe, date, output_bucket)
+                    results['timeframes'][timeframe] = {
+                        'candle_count': len(candles_df),
+                        'time_range': {
+                            'start': candles_df['timestamp'].min().isoformat(),
+                            'end': candles_df['timestamp'].max().isoformat()
+                        }
+                    }
+                except Exception as e:
+                    error_msg = f"Failed to upload {timeframe} candles: {e}"
+                    logger.error(error_msg)
+                    results['errors'].append(error_msg)
+
+            for timeframe, snapshots_df in snapshots.items():
+                try:
+                    await self.book_processor._upload_snapshots(snapshots_df, instrument_id, timeframe, date, output_bucket)
+                    results['book_timeframes'][timeframe] = {
+                        'snapshot_count': len(snapshots_df),
+                        'time_range': {
+                            'start': snapshots_df['timestamp'].min().isoformat(),
+                            'end': snapshots_df['timestamp'].max().isoformat()
+                        }
+                    }
+                except Exception as e:
+                    error_msg = f"Failed to upload {timeframe} book snapshots: {e}"
+                    logger.error(error_msg)
+                    results['errors'].append(error_msg)
+
+            if candles:
+                # One object index update for all timeframes written today
+                get_gcs_object_index(self.data_client.client.bucket(output_bucket)).flush()
+
+            logger.info(f"✅ Processed {len(results['timeframes'])} candle and {len(results['book_timeframes'])} "
+                        f"book snapshot timeframes for {instrument_id}")
+            return results
+
+        except Exception as e:
+            error_msg = f"Failed to process day for {instrument_id}: {e}"
+            logger.error(error_msg)
+            results['errors'].append(error_msg)
+            return results
+
+    def _build_candles(
+        self,
+        day_data: Dict[str, pd.DataFrame],
+        instrument_id: str,
+        date: datetime,
+        errors: List[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """Candles for every timeframe from one bucketing of the day's trades"""
+        symbol, exchange = self.historical_processor._parse_instrument_id(instrument_id)
+
+        # Coarser timeframes take their HFT features from the 1m candles, so 1m is built even if not written
+        needed = set(self.timeframes)
+        if self.aggregated_processor.config.enable_hft_features and self.aggregated_timeframes:
+            needed.add('1m')
+        aggregates = aggregate_timeframes(day_data['trades'], date, list(needed))
+
+        built = {}
+        for timeframe in sorted(needed, key=TIMEFRAME_SECONDS.get):
+            try:
+                candles_df = candle_frame(aggregates[timeframe], symbol, exchange, timeframe)
+
+                if timeframe in self.historical_processor.base_timeframes:
+                    if self.historical_processor.config.enable_hft_features:
+                        candles_df = self.historical_processor._add_hft_features(candles_df, day_data, timeframe)
+                elif self.aggregated_processor.config.enable_hft_features:
+                    candles_df = self.aggregated_processor._add_aggregated_hft_features(candles_df, built['1m'], timeframe)
+
+                built[timeframe] = candles_df
+
+            except Exception as e:
+                error_msg = f"Failed to process {timeframe} candles: {e}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+
+        return {timeframe: built[timeframe] for timeframe in self.timeframes if timeframe in built}
+
+    async def _build_book_snapshots(
+        self,
+        day_data: Dict[str, pd.DataFrame],
+        instrument_id: str,
+        date: datetime,
+        errors: List[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """Book snapshots for every book timeframe, reusing the book data already loaded with the ticks"""
+        book_data = day_data.get('book_snapshot_5')
+        if book_data is None:
+            book_data = await self.book_processor._load_book_data(instrument_id, date)
+
+        if book_data.empty:
+            logger.warning(f"No book snapshot data found for {instrument_id} on {date.strftime('%Y-%m-%d')}")
+            return {}
+
+        try:
+            snapshots = await self.book_processor._process_timeframes(
+                book_data, instrument_id, self.book_processor.config.timeframes, date
+            )
+        except Exception as e:
+            error_msg = f"Failed to process book snapshots: {e}"
+            logger.error(error_msg)
+            errors.append(error_msg)
+            return {}
+
+        return {timeframe: df for timeframe, df in snapshots.items() if not df.empty}
@@ -32,6 +32,21 @@ class TardisConfig:
     max_parallel_uploads: int = 20
     download_max_workers: int = 2  # 2 workers for VM deployment (leaving 2 vCPUs for system)
     rate_limit_per_vm: int = 1000000  # 1M calls per day per VM
+    streaming_download: bool = False  # Decode gzip/CSV incrementally instead of buffering whole files
+    stream_block_size: int = 8 * 1024 * 1024  # Decompressed CSV bytes parsed per Arrow block
+    pipeline_scheduler: bool = False  # Continuous download/parse/upload pipeline instead of fixed batches
+    parse_workers: int = 4  # Threads decoding downloaded files in the pipeline parse stage
+    max_bytes_in_flight_mb: int = 2048  # Pipeline backpressure: admitted-but-not-uploaded data limit
+    size_aware_scheduling: bool = False  # Start the largest files first using historical file sizes
+    size_history_path: str = ""  # Optional local JSON index of file sizes (updated after each run)
+    size_history_lookback_days: int = 1  # Previous days of GCS blob sizes used to seed the history
+    backfill_checkpoint_path: str = ""  # Local path or gs:// URI for resumable multi-day backfill progress
+    adaptive_concurrency: bool = False  # AIMD request concurrency starting at max_concurrent instead of a fixed limit
+    min_concurrent: int = 4  # Adaptive concurrency floor
+    adaptive_max_concurrent: int = 200  # Adaptive concurrency ceiling (capped by connection_pool_size)
+    connection_pool_size: int = 200  # Keep-alive HTTP connections to the Tardis datasets host
+    skip_existing: bool = False  # Incremental mode: skip files already present in GCS before requesting Tardis
+    existing_manifest_path: str = ""  # Optional local JSON cache of the GCS listings used by skip_existing
     
     def __post_init__(self):
         """Validate Tardis configuration with enhanced error messages"""
@@ -72,6 +87,26 @@ class TardisConfig:
         elif self.rate_limit_per_vm < 100000:
             validation_errors.append(f"Rate limit per VM seems too low ({self.rate_limit_per_vm}), consider increasing for better throughput")
         
+        if self.stream_block_size <= 0:
+            validation_errors.append(f"Stream block size must be positive, got {self.stream_block_size}")
+        
+        if self.parse_workers <= 0:
+            validation_errors.append(f"Parse workers must be positive, got {self.parse_workers}")
+        
+        if self.max_bytes_in_flight_mb <= 0:
+            validation_errors.append(f"Max bytes in flight must be positive, got {self.max_bytes_in_flight_mb}MB")
+        
+        if self.size_history_lookback_days < 0:
+            validation_errors.append(f"Size history lookback must be non-negative, got {self.size_history_lookback_days} days")
+        
+        if self.min_concurrent <= 0:
+            validation_errors.append(f"Min concurrent must be positive, got {self.min_concurrent}")
+        elif self.min_concurrent > self.adaptive_max_concurrent:
+            validation_errors.append(f"Min concurrent ({self.min_concurrent}) must not exceed adaptive max concurrent ({self.adaptive_max_concurrent})")
+        
+        if self.connection_pool_size <= 0:
+            validation_errors.append(f"Connection pool size must be positive, got {self.connection_pool_size}")
+        
         if validation_errors:
             error_message = "Tardis configuration validation failed:\n" + "\n".join(f"  - {error}" for error in validation_errors)
             raise ValueError(error_message)
@@ -90,6 +125,8 @@ class GCPConfig:
     upload_buffer_small: int = 30
     upload_buffer_medium: int = 60
     upload_buffer_large: int = 120
+    upload_chunk_size_mb: int = 16  # Resumable upload chunk size for large files
+    upload_spill_threshold_mb: int = 256  # Parquet upload buffers spill to local disk above this size
     
     def __post_init__(self):
         """Validate GCP configuration with enhanced error messages"""
@@ -119,6 +156,12 @@ class GCPConfig:
         elif not self.region.replace('-', '').replace('_', '').isalnum():
             validation_errors.append(f"GCP region contains invalid characters: '{self.region}'")
         
+        if self.upload_chunk_size_mb <= 0:
+            validation_errors.append(f"Upload chunk size must be positive, got {self.upload_chunk_size_mb}MB")
+        
+        if self.upload_spill_threshold_mb < 0:
+            validation_errors.append(f"Upload spill threshold must be non-negative, got {self.upload_spill_threshold_mb}MB")
+        
         if validation_errors:
             error_message = "GCP configuration validation failed:\n" + "\n".join(f"  - {error}" for error in validation_errors)
             raise ValueError(error_message)
@@ -133,6 +176,10 @@ class ServiceConfig:
     memory_efficient: bool = False
     enable_caching: bool = True
     cache_ttl: int = 3600  # 1 hour
+    local_cache_dir: Optional[str] = None  # Local disk cache for DataClient reads of GCS Parquet files (disabled if unset)
+    local_cache_max_gb: float = 20.0  # Disk budget for the local cache
+    local_cache_policy: str = 'lru'  # Local cache eviction: 'lru' or 'lfu'
+    read_max_workers: int = 16  # Parallel object reads for DataClient bulk (multi-day, multi-instrument) reads
     
     def __post_init__(self):
         """Validate service configuration"""
@@ -150,6 +197,12 @@ class ServiceConfig:
             raise ValueError("Batch size must be positive")
         if self.cache_ttl <= 0:
             raise ValueError("Cache TTL must be positive")
+        if self.local_cache_max_gb <= 0:
+            raise ValueError("Local cache size must be positive")
+        if self.local_cache_policy not in ['lru', 'lfu']:
+            raise ValueError(f"Invalid local cache policy: {self.local_cache_policy}. Must be 'lru' or 'lfu'")
+        if self.read_max_workers <= 0:
+            raise ValueError("Read max workers must be positive")
 
 @dataclass
 class ShardingConfig:
@@ -157,6 +210,8 @@ class ShardingConfig:
     shard_index: int = 0
     total_shards: int = 30
     instruments_per_shard: int = 2
+    mode: str = "hash"  # 'hash' (stable blake2b) or 'weighted' (balanced by expected bytes)
+    size_snapshot: str = ""  # Pinned size index for weighted mode: gs://bucket/object#generation or a local path
     
     def __post_init__(self):
         """Validate sharding configuration"""
@@ -166,6 +221,11 @@ class ShardingConfig:
             raise ValueError("Total shards must be positive")
         if self.instruments_per_shard <= 0:
             raise ValueError("Instruments per shard must be positive")
+        if self.mode not in ('hash', 'weighted'):
+            raise ValueError(f"Invalid sharding mode: {self.mode} (expected 'hash' or 'weighted')")
+        if self.size_snapshot.startswith('gs://') and '#' not in self.size_snapshot:
+            raise ValueError(f"Sharding size snapshot must pin a generation (gs://bucket/object#generation), "
+                             f"got {self.size_snapshot}")
 
 @dataclass
 class OutputConfig:
@@ -367,7 +427,22 @@ class ConfigManager:
             'max_concurrent': int(os.getenv('TARDIS_MAX_CONCURRENT', '50')),
             'max_parallel_uploads': int(os.getenv('MAX_PARALLEL_UPLOADS', '20')),
             'download_max_workers': int(os.getenv('DOWNLOAD_MAX_WORKERS', '2')),
-            'rate_limit_per_vm': int(os.getenv('RATE_LIMIT_PER_VM', '1000000'))
+            'rate_limit_per_vm': int(os.getenv('RATE_LIMIT_PER_VM', '1000000')),
+            'streaming_download': os.getenv('TARDIS_STREAMING_DOWNLOAD', 'false').lower() == 'true',
+            'stream_block_size': int(os.getenv('TARDIS_STREAM_BLOCK_SIZE', str(8 * 1024 * 1024))),
+            'pipeline_scheduler': os.getenv('TARDIS_PIPELINE_SCHEDULER', 'false').lower() == 'true',
+            'parse_workers': int(os.getenv('TARDIS_PARSE_WORKERS', '4')),
+            'max_bytes_in_flight_mb': int(os.getenv('TARDIS_MAX_BYTES_IN_FLIGHT_MB', '2048')),
+            'size_aware_scheduling': os.getenv('TARDIS_SIZE_AWARE_SCHEDULING', 'false').lower() == 'true',
+            'size_history_path': os.getenv('TARDIS_SIZE_HISTORY_PATH', ''),
+            'size_history_lookback_days': int(os.getenv('TARDIS_SIZE_HISTORY_LOOKBACK_DAYS', '1')),
+            'backfill_checkpoint_path': os.getenv('TARDIS_BACKFILL_CHECKPOINT_PATH', ''),
+            'adaptive_concurrency': os.getenv('TARDIS_ADAPTIVE_CONCURRENCY', 'false').lower() == 'true',
+            'min_concurrent': int(os.getenv('TARDIS_MIN_CONCURRENT', '4')),
+            'adaptive_max_concurrent': int(os.getenv('TARDIS_ADAPTIVE_MAX_CONCURRENT', '200')),
+            'connection_pool_size': int(os.getenv('TARDIS_CONNECTION_POOL_SIZE', '200')),
+            'skip_existing': os.getenv('TARDIS_SKIP_EXISTING', 'false').lower() == 'true',
+            'existing_manifest_path': os.getenv('TARDIS_EXISTING_MANIFEST_PATH', '')
         }
         
         # GCP configuration
@@ -389,7 +464,9 @@ class ConfigManager:
             'upload_rate_large': float(os.getenv('GCS_UPLOAD_RATE_LARGE', '5.0')),  # MB/s for files > 100MB
             'upload_buffer_small': int(os.getenv('GCS_UPLOAD_BUFFER_SMALL', '30')),  # Buffer time for small files
             'upload_buffer_medium': int(os.getenv('GCS_UPLOAD_BUFFER_MEDIUM', '60')),  # Buffer time for medium files
-            'upload_buffer_large': int(os.getenv('GCS_UPLOAD_BUFFER_LARGE', '120'))  # Buffer time for large files
+            'upload_buffer_large': int(os.getenv('GCS_UPLOAD_BUFFER_LARGE', '120')),  # Buffer time for large files
+            'upload_chunk_size_mb': int(os.getenv('GCS_UPLOAD_CHUNK_SIZE_MB', '16')),  # Resumable upload chunk size
+            'upload_spill_threshold_mb': int(os.getenv('GCS_UPLOAD_SPILL_THRESHOLD_MB', '256'))  # In-memory upload buffer limit
         }
         
         # Service configuration
@@ -400,16 +477,24 @@ class ConfigManager:
             'batch_size': int(os.getenv('BATCH_SIZE', '1')),  # Set to 1 for immediate uploads and better performance
             'memory_efficient': os.getenv('MEMORY_EFFICIENT', 'true').lower() == 'true',  # Default to true
             'enable_caching': os.getenv('ENABLE_CACHING', 'true').lower() == 'true',
-            'cache_ttl': int(os.getenv('CACHE_TTL', '3600'))
+            'cache_ttl': int(os.getenv('CACHE_TTL', '3600')),
+            'local_cache_dir': os.getenv('LOCAL_CACHE_DIR') or None,
+            'local_cache_max_gb': float(os.getenv('LOCAL_CACHE_MAX_GB', '20')),
+            'local_cache_policy': os.getenv('LOCAL_CACHE_POLICY', 'lru'),
+            'read_max_workers': int(os.getenv('DATA_CLIENT_READ_WORKERS', '16'))
         }
         
         # Sharding configuration
+        config['sharding'] = {
+            'mode': os.getenv('SHARDING_MODE', 'hash'),
+            'size_snapshot': os.getenv('SHARDING_SIZE_SNAPSHOT', '')
+        }
         if os.getenv('SHARD_INDEX') is not None:
-            config['sharding'] = {
+            config['sharding'].update({
                 'shard_index': int(os.getenv('SHARD_INDEX', '0')),
                 'total_shards': int(os.getenv('TOTAL_SHARDS', '30')),
                 'instruments_per_shard': int(os.getenv('INSTRUMENTS_PER_SHARD', '2'))
-            }
+            })
         
         # Output configuration
         config['output'] = {
@@ -437,7 +522,22 @@ class ConfigManager:
             max_concurrent=config_dict.get('tardis', {}).get('max_concurrent', 50),
             max_parallel_uploads=config_dict.get('tardis', {}).get('max_parallel_uploads', 20),
             download_max_workers=config_dict.get('tardis', {}).get('download_max_workers', 1),
-            rate_limit_per_vm=config_dict.get('tardis', {}).get('rate_limit_per_vm', 1000000)
+            rate_limit_per_vm=config_dict.get('tardis', {}).get('rate_limit_per_vm', 1000000),
+            streaming_download=config_dict.get('tardis', {}).get('streaming_download', False),
+            stream_block_size=config_dict.get('tardis', {}).get('stream_block_size', 8 * 1024 * 1024),
+            pipeline_scheduler=config_dict.get('tardis', {}).get('pipeline_scheduler', False),
+            parse_workers=config_dict.get('tardis', {}).get('parse_workers', 4),
+            max_bytes_in_flight_mb=config_dict.get('tardis', {}).get('max_bytes_in_flight_mb', 2048),
+            size_aware_scheduling=config_dict.get('tardis', {}).get('size_aware_scheduling', False),
+            size_history_path=config_dict.get('tardis', {}).get('size_history_path', ''),
+            size_history_lookback_days=config_dict.get('tardis', {}).get('size_history_lookback_days', 1),
+            backfill_checkpoint_path=config_dict.get('tardis', {}).get('backfill_checkpoint_path', ''),
+            adaptive_concurrency=config_dict.get('tardis', {}).get('adaptive_concurrency', False),
+            min_concurrent=config_dict.get('tardis', {}).get('min_concurrent', 4),
+            adaptive_max_concurrent=config_dict.get('tardis', {}).get('adaptive_max_concurrent', 200),
+            connection_pool_size=config_dict.get('tardis', {}).get('connection_pool_size', 200),
+            skip_existing=config_dict.get('tardis', {}).get('skip_existing', False),
+            existing_manifest_path=config_dict.get('tardis', {}).get('existing_manifest_path', '')
         )
         
         # Create GCP config
@@ -452,7 +552,9 @@ class ConfigManager:
             upload_rate_large=config_dict.get('gcp', {}).get('upload_rate_large', 5.0),
             upload_buffer_small=config_dict.get('gcp', {}).get('upload_buffer_small', 30),
             upload_buffer_medium=config_dict.get('gcp', {}).get('upload_buffer_medium', 60),
-            upload_buffer_large=config_dict.get('gcp', {}).get('upload_buffer_large', 120)
+            upload_buffer_large=config_dict.get('gcp', {}).get('upload_buffer_large', 120),
+            upload_chunk_size_mb=config_dict.get('gcp', {}).get('upload_chunk_size_mb', 16),
+            upload_spill_threshold_mb=config_dict.get('gcp', {}).get('upload_spill_threshold_mb', 256)
         )
         
         # Create service config
@@ -463,14 +565,20 @@ class ConfigManager:
             batch_size=config_dict.get('service', {}).get('batch_size', 1000),
             memory_efficient=config_dict.get('service', {}).get('memory_efficient', False),
             enable_caching=config_dict.get('service', {}).get('enable_caching', True),
-            cache_ttl=config_dict.get('service', {}).get('cache_ttl', 3600)
+            cache_ttl=config_dict.get('service', {}).get('cache_ttl', 3600),
+            local_cache_dir=config_dict.get('service', {}).get('local_cache_dir'),
+            local_cache_max_gb=config_dict.get('service', {}).get('local_cache_max_gb', 20.0),
+            local_cache_policy=config_dict.get('service', {}).get('local_cache_policy', 'lru'),
+            read_max_workers=config_dict.get('service', {}).get('read_max_workers', 16)
         )
         
         # Create sharding config
         sharding_config = ShardingConfig(
             shard_index=config_dict.get('sharding', {}).get('shard_index', 0),
             total_shards=config_dict.get('sharding', {}).get('total_shards', 30),
-            instruments_per_shard=config_dict.get('sharding', {}).get('instruments_per_shard', 2)
+            instruments_per_shard=config_dict.get('sharding', {}).get('instruments_per_shard', 2),
+            mode=config_dict.get('sharding', {}).get('mode', 'hash'),
+            size_snapshot=config_dict.get('sharding', {}).get('size_snapshot', '')
         )
         
         # Create output config
@@ -520,7 +628,9 @@ class ConfigManager:
             'sharding': {
                 'shard_index': config.sharding.shard_index,
                 'total_shards': config.sharding.total_shards,
-                'instruments_per_shard': config.sharding.instruments_per_shard
+                'instruments_per_shard': config.sharding.instruments_per_shard,
+                'mode': config.sharding.mode,
+                'size_snapshot': config.sharding.size_snapshot
             },
             'output': {
                 'default_format': config.output.default_format,
@@ -7,9 +7,15 @@ Supports all timeframes: 15s, 1m, 5m, 15m, 1h, 4h, 24h
 
 import logging
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
-from .data_client import DataClient
+from typing import List, Dict, Any, Optional, Union
+from .data_client import DataClient, date_strings, summary_time_range
+from .parquet_metadata_cache import CachedFooter, get_parquet_metadata_cache
+from .parquet_optimizer import (
+    filter_table_by_time, project_columns, validate_return_type, combine_tables_by_key, convert_table
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +26,26 @@ class CandleDataReader:
         self.data_client = data_client
         self.client = data_client.client
         self.bucket = data_client.bucket
+        self._metadata_cache = get_parquet_metadata_cache()
         
         # Supported timeframes
         self.timeframes = ['15s', '1m', '5m', '15m', '1h', '4h', '24h']
+        
+        # Default projection: OHLCV candle columns (features are read by the HFT/MFT readers)
+        self.candle_columns = [
+            'symbol', 'exchange', 'timeframe', 'timestamp', 'timestamp_out',
+            'open', 'high', 'low', 'close', 'volume', 'trade_count', 'vwap'
+        ]
     
     def get_candles(
         self, 
         instrument_id: str, 
         timeframe: str, 
         start_date: datetime, 
-        end_date: datetime
-    ) -> pd.DataFrame:
+        end_date: datetime,
+        columns: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Union[pd.DataFrame, pa.Table]:
         """
         Get candle data for a specific instrument and timeframe using optimized Parquet queries
         
@@ -39,118 +54,129 @@ class CandleDataReader:
             timeframe: Candle timeframe ('15s', '1m', '5m', '15m', '1h', '4h', '24h')
             start_date: Start date (UTC)
             end_date: End date (UTC)
+            columns: Columns to read (default: OHLCV candle columns)
+            return_type: 'pandas', 'arrow' or 'polars'
             
         Returns:
-            DataFrame with candle data
+            DataFrame (or Arrow table / polars DataFrame) with candle data
         """
-        if timeframe not in self.timeframes:
-            raise ValueError(f"Unsupported timeframe: {timeframe}. Supported: {self.timeframes}")
-        
-        # Use ParquetOptimizer for efficient timestamp-based queries
-        from .parquet_optimizer import ParquetOptimizer
-        optimizer = ParquetOptimizer(self.data_client.client, self.data_client.gcs_bucket)
+        return self.get_candles_for_instruments(
+            [instrument_id], timeframe, start_date, end_date, columns, return_type
+        )[instrument_id]
+    
+    def get_candles_for_instruments(
+        self,
+        instrument_ids: List[str],
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+        columns: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Dict[str, Union[pd.DataFrame, pa.Table]]:
+        """
+        Get candle data for several instruments over a date range
         
-        all_candles = []
-        current_date = start_date
+        Every (instrument, day) file is read concurrently through
+        DataClient.read_parquet_files. Filtering and concatenation stay in
+        Arrow; results are converted once at the end.
         
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            # Construct file path based on GCS structure
-            # Pattern: processed_candles/by_date/day-{date}/timeframe-{timeframe}/{instrument_id}.parquet
-            blob_name = f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet"
-            
-            try:
-                # Use optimized Parquet reading with predicate pushdown
-                df = self._read_candles_with_optimization(blob_name, start_date, end_date)
-                
-                if not df.empty:
-                    all_candles.append(df)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to read {timeframe} candles for {instrument_id} on {date_str}: {e}")
-                continue
+        Args:
+            instrument_ids: Instrument keys
+            timeframe: Candle timeframe ('15s', '1m', '5m', '15m', '1h', '4h', '24h')
+            start_date: Start date (UTC)
+            end_date: End date (UTC)
+            columns: Columns to read (default: OHLCV candle columns)
+            return_type: 'pandas', 'arrow' or 'polars'
             
-            # Move to next day
-            from datetime import timedelta
-            current_date += timedelta(days=1)
-        
-        if not all_candles:
-            return pd.DataFrame()
+        Returns:
+            Dictionary mapping instrument key to candle data, in request order
+        """
+        validate_return_type(return_type)
+        if timeframe not in self.timeframes:
+            raise ValueError(f"Unsupported timeframe: {timeframe}. Supported: {self.timeframes}")
         
-        # Combine all days
-        result = pd.concat(all_candles, ignore_index=True)
+        # Pattern: processed_candles/by_date/day-{date}/timeframe-{timeframe}/{instrument_id}.parquet
+        requests = [
+            (instrument_id, f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet")
+            for instrument_id in instrument_ids
+            for date_str in date_strings(start_date, end_date)
+        ]
         
-        # Sort by timestamp
-        if 'timestamp' in result.columns:
-            result = result.sort_values('timestamp')
+        # Use optimized Parquet reading with predicate pushdown
+        tables = self.data_client.read_parquet_files(
+            [blob_name for _, blob_name in requests],
+            reader=lambda blob_name: self._read_candle_table(blob_name, start_date, end_date, columns)
+        )
         
-        return result
+        return combine_tables_by_key(
+            instrument_ids,
+            [(instrument_id, table) for (instrument_id, _), table in zip(requests, tables)],
+            sort_column='timestamp',
+            return_type=return_type
+        )
     
-    def _read_candles_with_optimization(self, blob_name: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-        """Read candles with Parquet optimization for efficient timestamp filtering"""
-        import pyarrow.parquet as pq
-        import pyarrow as pa
+    def _read_candle_table(
+        self,
+        blob_name: str,
+        start_date: datetime,
+        end_date: datetime,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pa.Table]:
+        """Read one candle file as an Arrow table filtered to [start_date, end_date]
         
+        Only the footer and the projected column chunks of overlapping row groups
+        are fetched, via HTTP Range requests. Footers come from the shared metadata cache.
+        With a local cache configured, the file is read memory-mapped from local disk instead.
+        """
         try:
-            # Download the Parquet file
-            blob = self.bucket.blob(blob_name)
-            parquet_data = blob.download_as_bytes()
-            
-            # Create PyArrow file from bytes
-            parquet_file = pa.BufferReader(parquet_data)
-            parquet_table = pq.ParquetFile(parquet_file)
-            
-            # Get metadata for row group statistics
-            metadata = parquet_table.metadata
-            
             # Convert timestamps to microseconds for comparison
             start_us = int(start_date.timestamp() * 1_000_000)
             end_us = int(end_date.timestamp() * 1_000_000)
             
-            # Filter row groups using metadata statistics
-            relevant_row_groups = []
-            for i in range(metadata.num_row_groups):
-                row_group = metadata.row_group(i)
-                col_stats = row_group.column(0)  # Assuming timestamp is first column
+            def read_relevant_row_groups(footer, parquet_table, _):
+                # Filter row groups using cached row group statistics
+                if 'timestamp' in footer.metadata.schema.names:
+                    relevant_row_groups = footer.row_groups_in_range('timestamp', start_us, end_us)
+                else:
+                    relevant_row_groups = list(range(footer.metadata.num_row_groups))
                 
-                if col_stats.statistics:
-                    min_val = col_stats.statistics.min
-                    max_val = col_stats.statistics.max
-                    
-                    # Check if this row group overlaps with our time range
-                    if not (max_val < start_us or min_val > end_us):
-                        relevant_row_groups.append(i)
-            
-            if not relevant_row_groups:
-                return pd.DataFrame()
-            
-            # Read only relevant row groups
-            table = parquet_table.read_row_groups(relevant_row_groups)
-            df = table.to_pandas()
+                # Read only relevant row groups and projected columns
+                projection = project_columns(footer.metadata.schema.names, self._projection(columns))
+                return parquet_table.read_row_groups(relevant_row_groups, columns=projection) if relevant_row_groups else None
             
-            # Convert timestamp columns to datetime
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            if 'timestamp_out' in df.columns:
-                df['timestamp_out'] = pd.to_datetime(df['timestamp_out'])
+            blob = self.bucket.blob(blob_name)
+            local_cache = self.data_client.local_cache
+            if local_cache is not None:
+                with local_cache.open(blob) as source:
+                    parquet_file = pq.ParquetFile(source)
+                    footer = CachedFooter(name=blob_name, generation=blob.generation, size=blob.size,
+                                          metadata=parquet_file.metadata)
+                    table = read_relevant_row_groups(footer, parquet_file, source)
+            else:
+                table = self._metadata_cache.read(blob, read_relevant_row_groups)
             
-            # Final filtering by timestamp range
-            if 'timestamp' in df.columns:
-                df = df[(df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)]
+            # Final filtering by timestamp range, in Arrow
+            if table is not None and 'timestamp' in table.column_names:
+                table = filter_table_by_time(table, 'timestamp', start_us, end_us)
             
-            return df
+            return table
             
         except Exception as e:
             logger.error(f"Error reading optimized candles from {blob_name}: {e}")
-            return pd.DataFrame()
+            return None
+    
+    def _projection(self, columns: Optional[List[str]] = None) -> List[str]:
+        """Columns to read, always including the timestamp used for filtering"""
+        return ['timestamp'] + list(columns or self.candle_columns)
     
     def get_candles_for_timeframe(
         self, 
         instrument_id: str, 
         timeframe: str, 
-        date: datetime
-    ) -> pd.DataFrame:
+        date: datetime,
+        columns: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Union[pd.DataFrame, pa.Table]:
         """
         Get candle data for a specific instrument, timeframe, and single date
         
@@ -158,24 +184,23 @@ class CandleDataReader:
             instrument_id: Instrument key
             timeframe: Candle timeframe
             date: Specific date
+            columns: Columns to read (default: OHLCV candle columns)
+            return_type: 'pandas', 'arrow' or 'polars'
             
         Returns:
-            DataFrame with candle data for that date
+            Candle data for that date
         """
+        validate_return_type(return_type)
         date_str = date.strftime('%Y-%m-%d')
         blob_name = f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet"
         
         try:
-            df = self.data_client.read_parquet_file(blob_name)
-            
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            return df
+            table = self.data_client.read_parquet_table(blob_name, columns=self._projection(columns))
+            return convert_table(table, return_type)
             
         except Exception as e:
             logger.warning(f"Failed to read {timeframe} candles for {instrument_id} on {date_str}: {e}")
-            return pd.DataFrame()
+            return convert_table(None, return_type)
     
     def get_available_timeframes(self, instrument_id: str, date: datetime) -> List[str]:
         """
@@ -211,51 +236,68 @@ class CandleDataReader:
         Returns:
             Dictionary with candle data summary
         """
+        return self.get_candle_summaries([instrument_id], date)[instrument_id]
+    
+    def get_candle_summaries(self, instrument_ids: List[str], date: datetime) -> Dict[str, Dict[str, Any]]:
+        """
+        Get candle summaries for many instruments from Parquet footers only
+        
+        Candle counts, columns, sizes and time ranges all come from the footer,
+        so no candle data is downloaded. Files are summarised concurrently.
+        
+        Args:
+            instrument_ids: Instrument keys
+            date: Date to check
+            
+        Returns:
+            Dictionary mapping instrument key to its candle data summary
+        """
         date_str = date.strftime('%Y-%m-%d')
-        summary = {
-            'instrument_id': instrument_id,
-            'date': date_str,
-            'timeframes': {},
-            'total_candles': 0
+        
+        requests = [
+            (instrument_id, timeframe, f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet")
+            for instrument_id in instrument_ids
+            for timeframe in self.timeframes
+        ]
+        file_summaries = self.data_client.summarize_parquet_files([blob_name for _, _, blob_name in requests])
+        
+        summaries = {
+            instrument_id: {
+                'instrument_id': instrument_id,
+                'date': date_str,
+                'timeframes': {},
+                'total_candles': 0
+            }
+            for instrument_id in instrument_ids
         }
         
-        for timeframe in self.timeframes:
-            blob_name = f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet"
-            blob = self.bucket.blob(blob_name)
+        for (instrument_id, timeframe, _), file_summary in zip(requests, file_summaries):
+            summary = summaries[instrument_id]
+            if not file_summary['available'] or 'error' in file_summary:
+                summary['timeframes'][timeframe] = file_summary
+                continue
             
-            if blob.exists():
-                try:
-                    df = self.data_client.read_parquet_file(blob_name)
-                    summary['timeframes'][timeframe] = {
-                        'available': True,
-                        'candle_count': len(df),
-                        'file_size': blob.size or 0,
-                        'columns': list(df.columns),
-                        'time_range': {
-                            'start': df['timestamp'].min() if 'timestamp' in df.columns else None,
-                            'end': df['timestamp'].max() if 'timestamp' in df.columns else None
-                        }
-                    }
-                    summary['total_candles'] += len(df)
-                except Exception as e:
-                    summary['timeframes'][timeframe] = {
-                        'available': True,
-                        'error': str(e)
-                    }
-            else:
-                summary['timeframes'][timeframe] = {
-                    'available': False
-                }
+            summary['timeframes'][timeframe] = {
+                'available': True,
+                'candle_count': file_summary['num_rows'],
+                'file_size': file_summary['file_size'],
+                'compressed_size': file_summary['compressed_size'],
+                'columns': file_summary['columns'],
+                'time_range': summary_time_range(file_summary)
+            }
+            summary['total_candles'] += file_summary['num_rows']
         
-        return summary
+        return summaries
     
     def get_multiple_timeframes(
         self, 
         instrument_id: str, 
         timeframes: List[str], 
         start_date: datetime, 
-        end_date: datetime
-    ) -> Dict[str, pd.DataFrame]:
+        end_date: datetime,
+        columns: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Dict[str, Union[pd.DataFrame, pa.Table]]:
         """
         Get candle data for multiple timeframes at once
         
@@ -264,18 +306,20 @@ class CandleDataReader:
             timeframes: List of timeframes to retrieve
             start_date: Start date
             end_date: End date
+            columns: Columns to read (default: OHLCV candle columns)
+            return_type: 'pandas', 'arrow' or 'polars'
             
         Returns:
-            Dictionary mapping timeframe to DataFrame
+            Dictionary mapping timeframe to candle data
         """
+        validate_return_type(return_type)
         result = {}
         
         for timeframe in timeframes:
             try:
-                df = self.get_candles(instrument_id, timeframe, start_date, end_date)
-                result[timeframe] = df
+                result[timeframe] = self.get_candles(instrument_id, timeframe, start_date, end_date, columns, return_type)
             except Exception as e:
                 logger.warning(f"Failed to get {timeframe} candles for {instrument_id}: {e}")
-                result[timeframe] = pd.DataFrame()
+                result[timeframe] = convert_table(None, return_type)
         
         return result
@@ -12,9 +12,13 @@ Removes REST API specific logic and focuses on clean data access.
 
 import asyncio
 import logging
+import time
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional, Tuple, Set
+from typing import List, Dict, Any, Optional, Tuple, Set, Callable
 from pathlib import Path
 import io
 from google.cloud import storage
@@ -24,6 +28,10 @@ from ..utils.gcs_client import get_shared_gcs_client, get_shared_gcs_bucket
 from ..utils.logger import log_operation_start, log_operation_success, log_operation_failure
 from ..utils.error_handler import ErrorHandler, ErrorContext, ErrorCategory
 from ..models import InstrumentDefinition
+from .gcs_object_index import get_gcs_object_index
+from .local_block_cache import LocalBlockCache
+from .parquet_metadata_cache import get_parquet_metadata_cache
+from .parquet_optimizer import project_columns
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +40,24 @@ class AuthenticationError(Exception):
     pass
 
 
+def date_strings(start_date: datetime, end_date: datetime) -> List[str]:
+    """YYYY-MM-DD for every day touched by [start_date, end_date]"""
+    dates = []
+    current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    while current_date <= end_date:
+        dates.append(current_date.strftime('%Y-%m-%d'))
+        current_date += timedelta(days=1)
+    return dates
+
+
+def summary_time_range(file_summary: Dict[str, Any]) -> Dict[str, Optional[pd.Timestamp]]:
+    """Start/end timestamps (UTC) of a summarize_parquet_files entry"""
+    return {
+        'start': pd.Timestamp(file_summary['min_timestamp_us'], unit='us', tz='UTC') if file_summary['min_timestamp_us'] is not None else None,
+        'end': pd.Timestamp(file_summary['max_timestamp_us'], unit='us', tz='UTC') if file_summary['max_timestamp_us'] is not None else None
+    }
+
+
 class DataClient:
     """Clean data access client for GCS data retrieval"""
     
@@ -40,6 +66,9 @@ class DataClient:
         self.config = config
         self.error_handler = ErrorHandler(logger)
         self._is_mock = False
+        self.local_cache = None
+        self.read_max_workers = config.service.read_max_workers
+        self.last_read_stats: Dict[str, Any] = {}
         
         # Initialize client based on authentication mode
         self._initialize_client()
@@ -58,6 +87,7 @@ class DataClient:
             self.client = get_shared_gcs_client()
             self.bucket = get_shared_gcs_bucket(self.gcs_bucket)
             self._is_mock = False
+            self.local_cache = self._create_local_cache()
             
         except Exception as e:
             if self.config.auth.use_mock_data:
@@ -68,6 +98,19 @@ class DataClient:
             else:
                 raise AuthenticationError(f"GCS authentication failed: {e}")
     
+    def _create_local_cache(self) -> Optional[LocalBlockCache]:
+        """Local disk cache for Parquet reads, if a cache directory is configured"""
+        service = self.config.service
+        if not service.local_cache_dir or not service.enable_caching:
+            return None
+        logger.info(f"💾 Local GCS cache enabled: {service.local_cache_dir} "
+                    f"({service.local_cache_max_gb}GB, {service.local_cache_policy})")
+        return LocalBlockCache(
+            service.local_cache_dir,
+            max_bytes=int(service.local_cache_max_gb * 1024 ** 3),
+            policy=service.local_cache_policy
+        )
+    
     @property
     def is_mock(self) -> bool:
         """Check if using mock data client"""
@@ -223,16 +266,154 @@ class DataClient:
             enhanced_error = self.error_handler.handle_error(e, context)
             raise enhanced_error
     
-    async def read_parquet_file(self, blob_name: str) -> pd.DataFrame:
+    def read_parquet_file(self, blob_name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """Read a parquet file from GCS and return as DataFrame"""
+        return self.read_parquet_table(blob_name, columns=columns).to_pandas()
+    
+    def read_parquet_table(self, blob_name: str, columns: Optional[List[str]] = None) -> pa.Table:
+        """Read a parquet file from GCS and return as an Arrow table
+        
+        With a local cache configured, the current generation of the object is
+        read memory-mapped from local disk and downloaded only on a miss.
+        Otherwise a column projection fetches just those column chunks through
+        ranged reads. Requested columns missing from the file are skipped.
+        """
+        def read_projection(parquet_file: pq.ParquetFile) -> pa.Table:
+            projection = project_columns(parquet_file.schema_arrow.names, columns)
+            return parquet_file.read(columns=projection, use_pandas_metadata=True)
+        
         try:
             blob = self.bucket.blob(blob_name)
+            if self.local_cache is not None:
+                with self.local_cache.open(blob) as source:
+                    return read_projection(pq.ParquetFile(source))
+            if columns is not None:
+                return get_parquet_metadata_cache().read(blob, lambda _, parquet_file, __: read_projection(parquet_file))
             parquet_data = blob.download_as_bytes()
-            return pd.read_parquet(io.BytesIO(parquet_data))
+            return pq.read_table(pa.BufferReader(parquet_data))
         except Exception as e:
             logger.error(f"Failed to read parquet file {blob_name}: {e}")
             raise
     
+    def read_parquet_files(
+        self,
+        blob_names: List[str],
+        columns: Optional[List[str]] = None,
+        reader: Optional[Callable[[str], Any]] = None,
+        max_workers: Optional[int] = None
+    ) -> List[Any]:
+        """Read many parquet files concurrently on a bounded thread pool
+        
+        Fetch and decode both release the GIL, so (instrument, day) objects are
+        downloaded and decoded in parallel. Results are returned in the order of
+        blob_names, with None for files that could not be read. Per-file latency
+        and overall throughput are kept in last_read_stats.
+        
+        Args:
+            blob_names: Objects to read
+            columns: Column projection passed to read_parquet_file
+            reader: Per-blob read function returning a DataFrame or Arrow table
+                (default: read_parquet_file)
+            max_workers: Concurrent reads (default: service.read_max_workers)
+            
+        Returns:
+            One reader result (or None) per blob name
+        """
+        if reader is None:
+            reader = lambda blob_name: self.read_parquet_file(blob_name, columns=columns)
+        
+        def timed_read(blob_name: str) -> Tuple[Any, Dict[str, Any]]:
+            started = time.perf_counter()
+            try:
+                data = reader(blob_name)
+                error = None
+            except Exception as e:
+                logger.warning(f"Failed to read {blob_name}: {e}")
+                data, error = None, str(e)
+            request = {
+                'blob_name': blob_name,
+                'seconds': time.perf_counter() - started,
+                'rows': len(data) if data is not None else 0,
+                'bytes': self._decoded_bytes(data),
+                'error': error
+            }
+            return data, request
+        
+        started = time.perf_counter()
+        workers = max(1, min(max_workers or self.read_max_workers, len(blob_names)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gcs-read') as executor:
+            results = list(executor.map(timed_read, blob_names))
+        
+        self.last_read_stats = self._read_stats([request for _, request in results], time.perf_counter() - started, workers)
+        logger.debug(f"Read {len(blob_names)} parquet files with {workers} workers in "
+                     f"{self.last_read_stats['elapsed_seconds']:.2f}s "
+                     f"({self.last_read_stats['files_per_second']:.1f} files/s)")
+        return [data for data, _ in results]
+    
+    def summarize_parquet_files(self, blob_names: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Footer-only summaries of many parquet files, fetched concurrently
+        
+        Each file costs one metadata request plus, on a footer cache miss, a
+        ranged read of its last few KB - no row data is downloaded. Summaries
+        are returned in the order of blob_names: {'available': False} for
+        missing objects, {'available': True, 'error': ...} for unreadable ones,
+        otherwise the row count, schema, sizes and timestamp range.
+        """
+        metadata_cache = get_parquet_metadata_cache()
+        
+        def summarize(blob_name: str) -> Dict[str, Any]:
+            try:
+                footer = metadata_cache.footer(self.bucket.blob(blob_name))
+            except NotFound:
+                return {'available': False}
+            except Exception as e:
+                logger.warning(f"Failed to read parquet footer of {blob_name}: {e}")
+                return {'available': True, 'error': str(e)}
+            return {'available': True, **footer.summary()}
+        
+        workers = max(1, min(max_workers or self.read_max_workers, len(blob_names)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gcs-footer') as executor:
+            return list(executor.map(summarize, blob_names))
+    
+    def get_read_stats(self) -> Dict[str, Any]:
+        """Latency and throughput of the last read_parquet_files call"""
+        return self.last_read_stats
+    
+    @staticmethod
+    def _decoded_bytes(data: Any) -> int:
+        """In-memory size of a reader result"""
+        if data is None:
+            return 0
+        if isinstance(data, pa.Table):
+            return data.nbytes
+        return int(data.memory_usage(index=False, deep=True).sum())  # deep - count string payloads, not just pointers
+    
+    @staticmethod
+    def _read_stats(requests: List[Dict[str, Any]], elapsed: float, workers: int) -> Dict[str, Any]:
+        """Summarise per-file read timings"""
+        latencies = sorted(request['seconds'] for request in requests)
+        rows = sum(request['rows'] for request in requests)
+        decoded_bytes = sum(request['bytes'] for request in requests)
+        
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+        
+        return {
+            'files': len(requests),
+            'failed': sum(1 for request in requests if request['error'] is not None),
+            'workers': workers,
+            'rows': rows,
+            'bytes': decoded_bytes,
+            'elapsed_seconds': elapsed,
+            'files_per_second': len(requests) / elapsed if elapsed > 0 else 0.0,
+            'rows_per_second': rows / elapsed if elapsed > 0 else 0.0,
+            'mb_per_second': decoded_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+            'latency_p50_seconds': percentile(0.5),
+            'latency_p95_seconds': percentile(0.95),
+            'latency_max_seconds': latencies[-1] if latencies else 0.0,
+            'requests': requests
+        }
+    
     def generate_signed_url(self, blob_name: str, expiry_hours: int = 168) -> str:
         """Generate a signed URL for a GCS blob"""
         blob = self.bucket.blob(blob_name)
@@ -256,19 +437,17 @@ class DataClient:
         available_dates = []
         missing_dates = []
         
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            
+        # Day indexes load concurrently; each check is then answered in memory
+        object_index = get_gcs_object_index(self.bucket)
+        dates = date_strings(start_date, end_date)
+        object_index.load_days(dates)
+        
+        for date_str in dates:
             # Check for instrument definitions
-            instrument_blob = self.bucket.blob(f"instrument_availability/by_date/day-{date_str}/instruments.parquet")
-            
-            if instrument_blob.exists():
+            if object_index.exists(f"instrument_availability/by_date/day-{date_str}/instruments.parquet"):
                 available_dates.append(date_str)
             else:
                 missing_dates.append(date_str)
-            
-            current_date += timedelta(days=1)
         
         return {
             "available_dates": available_dates,
@@ -314,23 +493,23 @@ class DataClient:
         file_paths = []
         missing_dates = []
         
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
+        object_index = get_gcs_object_index(self.bucket)
+        dates = date_strings(start_date, end_date)
+        object_index.load_days(dates)
+        
+        for date_str in dates:
             blob_name = f"instrument_availability/by_date/day-{date_str}/instruments.parquet"
-            blob = self.bucket.blob(blob_name)
+            entry = object_index.get(blob_name)
             
-            if blob.exists():
+            if entry is not None:
                 file_paths.append({
                     "date": date_str,
                     "file_path": f"gs://{self.gcs_bucket}/{blob_name}",
                     "blob_name": blob_name,
-                    "file_size": blob.size or 0
+                    "file_size": entry['size'] or 0
                 })
             else:
                 missing_dates.append(date_str)
-            
-            current_date += timedelta(days=1)
         
         if not file_paths:
             raise FileNotFoundError(f"No instrument definition files found for date range {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
@@ -358,34 +537,27 @@ class DataClient:
     ) -> List[Dict[str, Any]]:
         """Get file paths for tick data from market-data-tick bucket"""
         file_paths = []
-        current_date = start_date
         
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            
+        # Pattern: raw_tick_data/by_date/day-2023-05-23/data_type-trades/{instrument_key}.parquet
+        object_index = get_gcs_object_index(self.client.bucket("market-data-tick"))
+        dates = date_strings(start_date, end_date)
+        object_index.load_days(dates)
+        requested = set(instrument_ids or ())
+        
+        for date_str in dates:
             for data_type in data_types:
-                # Construct file path based on actual GCS structure
-                # Pattern: raw_tick_data/by_date/day-2023-05-23/data_type-trades/
-                blob_pattern = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/"
-                
-                # List all blobs matching the pattern
-                blobs = list(self.client.list_blobs("market-data-tick", prefix=blob_pattern))
-                
-                for blob in blobs:
-                    if blob.name.endswith('.csv.zst') or blob.name.endswith('.parquet'):  # Process compressed CSV and parquet files
-                        # Extract instrument ID from filename if possible, otherwise use first requested
-                        instrument_id = instrument_ids[0] if instrument_ids else "unknown"
-                        
-                        file_paths.append({
-                            "date": date_str,
-                            "data_type": data_type,
-                            "instrument_id": instrument_id,
-                            "file_path": f"gs://market-data-tick/{blob.name}",
-                            "blob_name": blob.name,
-                            "file_size": blob.size or 0
-                        })
-            
-            current_date += timedelta(days=1)
+                for entry in object_index.entries(date_str, 'raw_tick_data', data_type):
+                    if requested and entry['instrument_key'] not in requested:
+                        continue
+                    file_paths.append({
+                        "date": date_str,
+                        "data_type": data_type,
+                        "instrument_id": entry['instrument_key'],
+                        "file_path": f"gs://market-data-tick/{entry['blob_name']}",
+                        "blob_name": entry['blob_name'],
+                        "file_size": entry['size'] or 0,
+                        "row_count": entry['row_count']
+                    })
         
         return file_paths
     
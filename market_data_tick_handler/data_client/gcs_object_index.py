@@ -0,0 +1,338 @@
+"""
+GCS Object Index for Instrument/Date Discovery
+
+Compact per-day Parquet index of the objects under the by_date layouts
+(``raw_tick_data``, ``processed_candles`` and ``instrument_availability``),
+stored in the same bucket at ``_index/by_date/day-{date}.parquet``. Each row
+describes one object: dataset, date, data type (or timeframe), instrument
+key, blob name, size, generation, and - when the writer recorded it - row
+count and timestamp range from the Parquet footer.
+
+Writers (download orchestrator, candle processors, instrument uploader)
+record their uploads and flush them with a generation-matched
+read-modify-write, so concurrent writers never drop each other's entries.
+Readers answer discovery queries from the in-memory index instead of
+listing the bucket; a day's index is re-checked (one metadata request)
+only after GCS_OBJECT_INDEX_TTL_SECONDS. A day with no index yet is built
+once from prefix listings and persisted.
+"""
+
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.cloud.exceptions import PreconditionFailed
+
+from .parquet_metadata_cache import CachedFooter
+
+logger = logging.getLogger(__name__)
+
+# Datasets laid out as {dataset}/by_date/day-{date}/...
+INDEXED_DATASETS = ('raw_tick_data', 'processed_candles', 'instrument_availability')
+
+# Seconds a loaded day is trusted before its index generation is re-checked
+DEFAULT_INDEX_TTL_SECONDS = 300
+
+# Attempts at the generation-matched index update before giving up
+MAX_FLUSH_ATTEMPTS = 5
+
+INDEX_SCHEMA = pa.schema([
+    ('dataset', pa.string()),
+    ('date', pa.string()),
+    ('data_type', pa.string()),
+    ('instrument_key', pa.string()),
+    ('blob_name', pa.string()),
+    ('size', pa.int64()),
+    ('generation', pa.int64()),
+    ('row_count', pa.int64()),
+    ('min_ts', pa.timestamp('us', tz='UTC')),
+    ('max_ts', pa.timestamp('us', tz='UTC')),
+])
+
+
+def index_blob_name(date_str: str) -> str:
+    return f"_index/by_date/day-{date_str}.parquet"
+
+
+def parse_blob_name(blob_name: str) -> Optional[Tuple[str, str, str, str]]:
+    """(dataset, date, data_type, instrument_key) of an indexed object, or None for other names
+
+    raw_tick_data/by_date/day-{date}/data_type-{data_type}/{instrument_key}.parquet
+    processed_candles/by_date/day-{date}/timeframe-{timeframe}/{instrument_key}.parquet
+    instrument_availability/by_date/day-{date}/instruments.parquet
+    """
+    parts = blob_name.split('/')
+    if len(parts) < 4 or parts[0] not in INDEXED_DATASETS or parts[1] != 'by_date' \
+            or not parts[2].startswith('day-') or not blob_name.endswith('.parquet'):
+        return None
+    dataset, date_str = parts[0], parts[2][len('day-'):]
+
+    if dataset == 'instrument_availability':
+        return (dataset, date_str, 'instruments', '') if parts[3:] == ['instruments.parquet'] else None
+
+    if len(parts) != 5:
+        return None
+    partition = 'data_type-' if dataset == 'raw_tick_data' else 'timeframe-'
+    if not parts[3].startswith(partition):
+        return None
+    return dataset, date_str, parts[3][len(partition):], parts[4][:-len('.parquet')]
+
+
+def index_entry(blob_name: str, size: int, generation: int,
+                metadata: Optional[pq.FileMetaData] = None) -> Optional[Dict[str, Any]]:
+    """Index row for an object, with row count and time range when its footer is given"""
+    parsed = parse_blob_name(blob_name)
+    if parsed is None:
+        return None
+    dataset, date_str, data_type, instrument_key = parsed
+    entry = {
+        'dataset': dataset, 'date': date_str, 'data_type': data_type, 'instrument_key': instrument_key,
+        'blob_name': blob_name, 'size': size, 'generation': generation,
+        'row_count': None, 'min_ts': None, 'max_ts': None
+    }
+    if metadata is not None:
+        summary = CachedFooter(name=blob_name, generation=generation, size=size, metadata=metadata).summary()
+        entry.update(row_count=summary['num_rows'], min_ts=summary['min_timestamp_us'],
+                     max_ts=summary['max_timestamp_us'])
+    return entry
+
+
+@dataclass
+class _IndexedDay:
+    """Index entries of one day keyed by blob name, with the index object's generation (0 = not persisted)"""
+    entries: Dict[str, Dict[str, Any]]
+    generation: int
+    checked_at: float = field(default_factory=time.monotonic)
+
+
+class GCSObjectIndex:
+    """Per-day object index of one bucket, queried in memory and updated incrementally by writers"""
+
+    def __init__(self, bucket, ttl_seconds: float = DEFAULT_INDEX_TTL_SECONDS, max_workers: int = 16):
+        self.bucket = bucket
+        self.ttl_seconds = ttl_seconds
+        self.max_workers = max_workers
+        self._days: Dict[str, _IndexedDay] = {}
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}  # date -> blob name -> entry
+        self._lock = threading.Lock()
+
+    def entries(self, date_str: str, dataset: Optional[str] = None,
+                data_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Index rows of a day, optionally restricted to a dataset and data type/timeframe"""
+        return sorted(
+            (entry for entry in self._day(date_str).entries.values()
+             if (dataset is None or entry['dataset'] == dataset)
+             and (data_type is None or entry['data_type'] == data_type)),
+            key=lambda entry: entry['blob_name']
+        )
+
+    def instruments(self, date_str: str, dataset: str = 'raw_tick_data',
+                    data_type: Optional[str] = None) -> List[str]:
+        """Sorted instrument keys with a non-empty object for the day"""
+        return sorted({entry['instrument_key'] for entry in self.entries(date_str, dataset, data_type)
+                       if entry['size']})
+
+    def exists(self, blob_name: str) -> bool:
+        """Whether an indexed object exists (answered from the index of its day)"""
+        parsed = parse_blob_name(blob_name)
+        if parsed is None:
+            raise ValueError(f"{blob_name} is not an indexed object name")
+        return blob_name in self._day(parsed[1]).entries
+
+    def get(self, blob_name: str) -> Optional[Dict[str, Any]]:
+        parsed = parse_blob_name(blob_name)
+        if parsed is None:
+            raise ValueError(f"{blob_name} is not an indexed object name")
+        return self._day(parsed[1]).entries.get(blob_name)
+
+    def load_days(self, date_strs: Iterable[str]):
+        """Load (or refresh) several days concurrently, e.g. before a date-range query"""
+        date_strs = list(dict.fromkeys(date_strs))
+        if len(date_strs) <= 1:
+            for date_str in date_strs:
+                self._day(date_str)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(date_strs)),
+                                thread_name_prefix='gcs-index') as executor:
+            list(executor.map(self._day, date_strs))
+
+    def record(self, blob_name: str, size: int, generation: int,
+               metadata: Optional[pq.FileMetaData] = None):
+        """Queue an uploaded object for the next flush (names outside the indexed layouts are ignored)"""
+        entry = index_entry(blob_name, size, generation, metadata)
+        if entry is None:
+            return
+        with self._lock:
+            self._pending.setdefault(entry['date'], {})[blob_name] = entry
+            day = self._days.get(entry['date'])
+            if day is not None:
+                day.entries[blob_name] = entry
+
+    def record_upload(self, blob, data: Optional[bytes] = None, source=None):
+        """Queue a just-uploaded blob, reading row count and time range from the Parquet footer
+
+        Pass the uploaded bytes as ``data`` or a seekable file-like ``source``;
+        size and generation come from the blob's upload response.
+        """
+        metadata = None
+        try:
+            if data is not None:
+                metadata = pq.read_metadata(io.BytesIO(data))
+            elif source is not None:
+                source.seek(0)
+                metadata = pq.read_metadata(source)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read footer of {blob.name} for the object index: {e}")
+        size = blob.size if blob.size is not None else (len(data) if data is not None else 0)
+        self.record(blob.name, size, blob.generation or 0, metadata)
+
+    def flush(self) -> int:
+        """Merge queued entries into each day's index object; failed days stay queued for the next flush"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        flushed = 0
+        for date_str, entries in pending.items():
+            try:
+                self._flush_day(date_str, entries)
+                flushed += len(entries)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not update object index for {date_str}: {e}")
+                with self._lock:
+                    queued = self._pending.setdefault(date_str, {})
+                    for blob_name, entry in entries.items():
+                        queued.setdefault(blob_name, entry)
+        return flushed
+
+    def rebuild(self, date_str: str) -> int:
+        """Rebuild a day's index from prefix listings (e.g. after objects were written outside the indexed writers)"""
+        entries = self._list_day(date_str)
+        for _ in range(MAX_FLUSH_ATTEMPTS):
+            current = self._fetch_day(date_str)
+            # Keep footer stats already recorded for unchanged objects
+            for blob_name, entry in entries.items():
+                known = current.entries.get(blob_name) if current else None
+                if known is not None and known['generation'] == entry['generation']:
+                    entries[blob_name] = known
+            try:
+                self._store_day(date_str, entries, current.generation if current else 0)
+                return len(entries)
+            except PreconditionFailed:
+                continue
+        raise RuntimeError(f"Object index for {date_str} kept changing during rebuild")
+
+    def _day(self, date_str: str) -> _IndexedDay:
+        with self._lock:
+            day = self._days.get(date_str)
+        if day is not None and time.monotonic() - day.checked_at < self.ttl_seconds:
+            return day
+
+        blob = self.bucket.get_blob(index_blob_name(date_str))
+        if blob is not None and day is not None and blob.generation == day.generation:
+            day.checked_at = time.monotonic()
+            return day
+
+        day = self._download_day(blob) if blob is not None else self._build_day(date_str)
+        with self._lock:
+            # Uploads recorded but not yet flushed are visible to this process's queries
+            day.entries.update(self._pending.get(date_str, {}))
+            self._days[date_str] = day
+        return day
+
+    def _build_day(self, date_str: str) -> _IndexedDay:
+        """Index a day from prefix listings, persisting it when the day has any objects
+
+        Persisting is best effort: clients without write access (e.g. research
+        readers) keep the listing in memory only.
+        """
+        entries = self._list_day(date_str)
+        if not entries:
+            return _IndexedDay(entries, 0)
+        try:
+            return self._store_day(date_str, entries, 0)
+        except PreconditionFailed:
+            # Another process created the index meanwhile - use theirs
+            return self._fetch_day(date_str) or _IndexedDay(entries, 0)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not persist object index for {date_str}, using the listing in memory: {e}")
+            return _IndexedDay(entries, 0)
+
+    def _list_day(self, date_str: str) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        for dataset in INDEXED_DATASETS:
+            for blob in self.bucket.list_blobs(prefix=f"{dataset}/by_date/day-{date_str}/"):
+                entry = index_entry(blob.name, blob.size or 0, blob.generation or 0)
+                if entry is not None:
+                    entries[blob.name] = entry
+        logger.info(f"🗂️  Indexed {len(entries)} objects for {date_str} from GCS listings")
+        return entries
+
+    def _fetch_day(self, date_str: str) -> Optional[_IndexedDay]:
+        blob = self.bucket.get_blob(index_blob_name(date_str))
+        return self._download_day(blob) if blob is not None else None
+
+    def _download_day(self, blob) -> _IndexedDay:
+        # The blob carries its generation, so the download is pinned to it
+        table = pq.read_table(io.BytesIO(blob.download_as_bytes()))
+        # Entries hold timestamps as epoch microseconds, like the footer summaries
+        for column in ('min_ts', 'max_ts'):
+            table = table.set_column(table.schema.get_field_index(column), column,
+                                     table.column(column).cast(pa.int64()))
+        rows = table.to_pylist()
+        return _IndexedDay({row['blob_name']: row for row in rows}, blob.generation)
+
+    def _flush_day(self, date_str: str, new_entries: Dict[str, Dict[str, Any]]):
+        for _ in range(MAX_FLUSH_ATTEMPTS):
+            current = self._fetch_day(date_str)
+            if current is None:
+                # First writer of the day indexes what is already there
+                current = _IndexedDay(self._list_day(date_str), 0)
+            entries = {**current.entries, **new_entries}
+            try:
+                self._store_day(date_str, entries, current.generation)
+                return
+            except PreconditionFailed:
+                logger.debug(f"Object index for {date_str} changed concurrently, retrying")
+        raise RuntimeError(f"Object index for {date_str} kept changing after {MAX_FLUSH_ATTEMPTS} attempts")
+
+    def _store_day(self, date_str: str, entries: Dict[str, Dict[str, Any]], generation: int) -> _IndexedDay:
+        """Upload the day's index only if its generation is still the one read (0 = must not exist)"""
+        rows = sorted(entries.values(), key=lambda entry: entry['blob_name'])
+        table = pa.Table.from_pylist(rows, schema=INDEX_SCHEMA)
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression='zstd')
+
+        blob = self.bucket.blob(index_blob_name(date_str))
+        blob.upload_from_string(buffer.getvalue(), content_type='application/octet-stream',
+                                if_generation_match=generation)
+
+        day = _IndexedDay(dict(entries), blob.generation)
+        with self._lock:
+            # Keep uploads recorded while this write was in flight visible
+            day.entries.update(self._pending.get(date_str, {}))
+            self._days[date_str] = day
+        return day
+
+
+_object_indexes: Dict[str, GCSObjectIndex] = {}
+_object_indexes_lock = threading.Lock()
+
+
+def get_gcs_object_index(bucket) -> GCSObjectIndex:
+    """Process-wide object index for a bucket, re-checked after GCS_OBJECT_INDEX_TTL_SECONDS"""
+    with _object_indexes_lock:
+        index = _object_indexes.get(bucket.name)
+        if index is None:
+            index = GCSObjectIndex(
+                bucket,
+                ttl_seconds=float(os.getenv('GCS_OBJECT_INDEX_TTL_SECONDS', str(DEFAULT_INDEX_TTL_SECONDS)))
+            )
+            _object_indexes[bucket.name] = index
+        return index
@@ -0,0 +1,199 @@
+"""
+Local Disk Cache for GCS Parquet Objects
+
+Keeps whole GCS objects under a local directory with a byte budget, so hot
+instrument-days are read from local disk (memory-mapped) instead of being
+downloaded again. Entries are keyed by blob name and generation: every read
+checks the blob's current generation, so an overwritten object is fetched
+fresh and the stale copy dropped. Eviction is LRU or LFU once the budget is
+exceeded; recency survives restarts through file modification times.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+EVICTION_POLICIES = ('lru', 'lfu')
+
+
+@dataclass
+class _CacheEntry:
+    name: str
+    generation: int
+    path: str
+    size: int
+    last_access: float
+    hits: int = 0
+
+
+class LocalBlockCache:
+    """Size-bounded local copy of GCS objects, validated against the blob generation"""
+
+    def __init__(self, cache_dir: str, max_bytes: int, policy: str = 'lru'):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction policy: {policy}. Must be one of {EVICTION_POLICIES}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._entries: Dict[str, _CacheEntry] = {}  # blob name -> cached generation
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan()
+
+    def open(self, blob) -> pa.NativeFile:
+        """Memory-mapped local copy of the blob's current generation, downloading it on a miss"""
+        path = self.get_path(blob)
+        if path is None:
+            # Larger than the whole budget - serve it from memory without caching
+            return pa.BufferReader(blob.download_as_bytes())
+        return pa.memory_map(path)
+
+    def get_path(self, blob) -> Optional[str]:
+        """Local path of the blob's current generation, or None if it can never fit the budget"""
+        blob.reload()  # One metadata request: current size and generation
+        with self._lock:
+            entry = self._entries.get(blob.name)
+            if entry is not None and entry.generation == blob.generation and os.path.exists(entry.path):
+                entry.hits += 1
+                entry.last_access = time.time()
+                self.hits += 1
+                path = entry.path
+            else:
+                path = None
+                self.misses += 1
+                if entry is not None:
+                    self._remove(entry)
+
+        if path is not None:
+            try:
+                os.utime(path)  # Keep recency across restarts
+            except OSError:
+                pass
+            return path
+
+        if blob.size > self.max_bytes:
+            return None
+        return self._download(blob)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _download(self, blob) -> str:
+        path = self._entry_path(blob.name, blob.generation)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            blob.download_to_filename(tmp_path, if_generation_match=blob.generation)
+            with open(f"{path}.name", 'w') as f:
+                f.write(blob.name)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self._lock:
+            previous = self._entries.get(blob.name)
+            if previous is not None and previous.path != path:
+                self._remove(previous)
+            if previous is None or previous.path != path:
+                self._entries[blob.name] = _CacheEntry(blob.name, blob.generation, path, blob.size, time.time())
+                self.total_bytes += blob.size
+            self._evict(keep=blob.name)
+
+        logger.debug(f"💾 Cached {blob.name} ({blob.size / 1024 / 1024:.1f}MB, "
+                     f"{self.total_bytes / 1024 / 1024:.0f}MB of {self.max_bytes / 1024 / 1024:.0f}MB used)")
+        return path
+
+    def _evict(self, keep: str):
+        """Drop entries until the budget holds (called with the lock held)"""
+        while self.total_bytes > self.max_bytes:
+            candidates = [entry for entry in self._entries.values() if entry.name != keep]
+            if not candidates:
+                break
+            if self.policy == 'lfu':
+                victim = min(candidates, key=lambda entry: (entry.hits, entry.last_access))
+            else:
+                victim = min(candidates, key=lambda entry: entry.last_access)
+            self._remove(victim)
+            self.evictions += 1
+
+    def _remove(self, entry: _CacheEntry):
+        """Forget an entry and delete its file (called with the lock held)"""
+        if self._entries.get(entry.name) is entry:
+            del self._entries[entry.name]
+            self.total_bytes -= entry.size
+        self._remove_file(entry)
+
+    def _remove_file(self, entry: _CacheEntry):
+        # Open memory maps keep their pages until closed
+        _discard(entry.path)
+        _discard(f"{entry.path}.name")
+
+    def _entry_path(self, name: str, generation: int) -> str:
+        return os.path.join(self.cache_dir, f"{hashlib.sha1(name.encode('utf-8')).hexdigest()}-{generation}.parquet")
+
+    def _scan(self):
+        """Rebuild the index from files left by earlier runs
+
+        Blob names are hashed in file names, so an entry is re-attached to its
+        blob through a sidecar ``.name`` file written next to it.
+        """
+        for file_name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, file_name)
+            if file_name.endswith('.tmp') or (file_name.endswith('.name') and not os.path.exists(path[:-len('.name')])):
+                _discard(path)
+                continue
+            if not file_name.endswith('.parquet'):
+                continue
+            try:
+                generation = int(file_name[:-len('.parquet')].rsplit('-', 1)[1])
+                with open(f"{path}.name") as f:
+                    name = f.read()
+                stat = os.stat(path)
+            except (ValueError, IndexError, OSError):
+                _discard(path)
+                continue
+            entry = _CacheEntry(name, generation, path, stat.st_size, stat.st_mtime)
+            previous = self._entries.get(name)
+            if previous is not None:
+                # Keep only the newest generation of an object
+                if previous.generation > generation:
+                    self._remove_file(entry)
+                    continue
+                self._remove(previous)
+            self._entries[name] = entry
+            self.total_bytes += stat.st_size
+
+        with self._lock:
+            self._evict(keep='')
+        if self._entries:
+            logger.info(f"💾 Local cache {self.cache_dir}: {len(self._entries)} objects, "
+                        f"{self.total_bytes / 1024 / 1024:.0f}MB")
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -7,9 +7,11 @@ MFT features are the same as HFT features but available for all timeframes (1m a
 
 import logging
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
-from .data_client import DataClient
+from typing import List, Dict, Any, Optional, Union
+from .data_client import DataClient, date_strings
+from .parquet_optimizer import filter_table_by_time, validate_return_type, combine_tables_by_key, convert_table
 
 logger = logging.getLogger(__name__)
 
@@ -42,14 +44,19 @@ class MFTFeaturesReader:
             # Options chain features (if available)
             'skew_25d_put_call_ratio', 'atm_mark_iv'
         ]
+        
+        # Identifying columns always read alongside the features
+        self.base_columns = ['timestamp', 'symbol', 'exchange', 'timeframe']
     
     def get_mft_features(
         self, 
         instrument_id: str, 
         timeframe: str, 
         start_date: datetime, 
-        end_date: datetime
-    ) -> pd.DataFrame:
+        end_date: datetime,
+        columns: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Union[pd.DataFrame, pa.Table]:
         """
         Get MFT features for a specific instrument and timeframe
         
@@ -58,67 +65,94 @@ class MFTFeaturesReader:
             timeframe: Timeframe ('1m', '5m', '15m', '1h', '4h', '24h')
             start_date: Start date (UTC)
             end_date: End date (UTC)
+            columns: Feature columns to read (default: all MFT feature columns)
+            return_type: 'pandas', 'arrow' or 'polars'
             
         Returns:
-            DataFrame with MFT features
+            DataFrame (or Arrow table / polars DataFrame) with MFT features
         """
-        if timeframe not in self.supported_timeframes:
-            raise ValueError(f"MFT features available for {self.supported_timeframes}, got: {timeframe}")
+        return self.get_mft_features_for_instruments(
+            [instrument_id], timeframe, start_date, end_date, columns, return_type
+        )[instrument_id]
+    
+    def get_mft_features_for_instruments(
+        self,
+        instrument_ids: List[str],
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+        columns: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Dict[str, Union[pd.DataFrame, pa.Table]]:
+        """
+        Get MFT features for several instruments over a date range
         
-        all_features = []
-        current_date = start_date
+        Every (instrument, day) file is read concurrently through
+        DataClient.read_parquet_files. Filtering and concatenation stay in
+        Arrow; results are converted once at the end.
         
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            # Construct file path
-            # Pattern: processed_candles/by_date/day-{date}/timeframe-{timeframe}/{instrument_id}.parquet
-            blob_name = f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet"
-            
-            try:
-                df = self.data_client.read_parquet_file(blob_name)
-                
-                if not df.empty:
-                    # Ensure timestamp column is datetime
-                    if 'timestamp' in df.columns:
-                        df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    
-                    # Filter by date range if needed
-                    if 'timestamp' in df.columns:
-                        df = df[(df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)]
-                    
-                    # Extract only MFT feature columns
-                    mft_df = self._extract_mft_features(df)
-                    
-                    if not mft_df.empty:
-                        all_features.append(mft_df)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to read MFT features for {instrument_id} {timeframe} on {date_str}: {e}")
-                continue
+        Args:
+            instrument_ids: Instrument keys
+            timeframe: Timeframe ('1m', '5m', '15m', '1h', '4h', '24h')
+            start_date: Start date (UTC)
+            end_date: End date (UTC)
+            columns: Feature columns to read (default: all MFT feature columns)
+            return_type: 'pandas', 'arrow' or 'polars'
             
-            # Move to next day
-            from datetime import timedelta
-            current_date += timedelta(days=1)
+        Returns:
+            Dictionary mapping instrument key to MFT features, in request order
+        """
+        validate_return_type(return_type)
+        if timeframe not in self.supported_timeframes:
+            raise ValueError(f"MFT features available for {self.supported_timeframes}, got: {timeframe}")
         
-        if not all_features:
-            return pd.DataFrame()
+        # Pattern: processed_candles/by_date/day-{date}/timeframe-{timeframe}/{instrument_id}.parquet
+        requests = [
+            (instrument_id, f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet")
+            for instrument_id in instrument_ids
+            for date_str in date_strings(start_date, end_date)
+        ]
         
-        # Combine all days
-        result = pd.concat(all_features, ignore_index=True)
+        tables = self.data_client.read_parquet_files(
+            [blob_name for _, blob_name in requests],
+            reader=lambda blob_name: self._read_mft_features(blob_name, start_date, end_date, columns)
+        )
+        
+        return combine_tables_by_key(
+            instrument_ids,
+            [(instrument_id, table) for (instrument_id, _), table in zip(requests, tables)],
+            sort_column='timestamp',
+            return_type=return_type
+        )
+    
+    def _read_mft_features(
+        self,
+        blob_name: str,
+        start_date: datetime,
+        end_date: datetime,
+        columns: Optional[List[str]] = None
+    ) -> pa.Table:
+        """Read one day's file as an Arrow table, filtered to the date range and reduced to MFT feature columns"""
+        # Only the projected column chunks are fetched and decoded
+        table = self.data_client.read_parquet_table(blob_name, columns=self._projection(columns))
         
-        # Sort by timestamp
-        if 'timestamp' in result.columns:
-            result = result.sort_values('timestamp')
+        # Filter by date range in Arrow
+        if 'timestamp' in table.column_names:
+            start_us = int(start_date.timestamp() * 1_000_000)
+            end_us = int(end_date.timestamp() * 1_000_000)
+            table = filter_table_by_time(table, 'timestamp', start_us, end_us)
         
-        return result
+        # Extract only MFT feature columns
+        return table.select(self._feature_columns(table.column_names, columns))
     
     def get_mft_features_for_date(
         self, 
         instrument_id: str, 
         timeframe: str, 
-        date: datetime
-    ) -> pd.DataFrame:
+        date: datetime,
+        columns: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Union[pd.DataFrame, pa.Table]:
         """
         Get MFT features for a specific instrument, timeframe, and single date
         
@@ -126,53 +160,61 @@ class MFTFeaturesReader:
             instrument_id: Instrument key
             timeframe: Timeframe ('1m', '5m', '15m', '1h', '4h', '24h')
             date: Specific date
+            columns: Feature columns to read (default: all MFT feature columns)
+            return_type: 'pandas', 'arrow' or 'polars'
             
         Returns:
-            DataFrame with MFT features for that date
+            MFT features for that date
         """
+        validate_return_type(return_type)
         date_str = date.strftime('%Y-%m-%d')
         blob_name = f"processed_candles/by_date/day-{date_str}/timeframe-{timeframe}/{instrument_id}.parquet"
         
         try:
-            df = self.data_client.read_parquet_file(blob_name)
-            
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            return self._extract_mft_features(df)
+            table = self.data_client.read_parquet_table(blob_name, columns=self._projection(columns))
+            return convert_table(table.select(self._feature_columns(table.column_names, columns)), return_type)
             
         except Exception as e:
             logger.warning(f"Failed to read MFT features for {instrument_id} {timeframe} on {date_str}: {e}")
-            return pd.DataFrame()
+            return convert_table(None, return_type)
     
-    def _extract_mft_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _projection(self, columns: Optional[List[str]] = None) -> List[str]:
+        """Columns to read: the base columns plus the requested (default: all MFT) features"""
+        return self.base_columns + list(columns or self.mft_columns)
+    
+    def _extract_mft_features(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Extract MFT feature columns from a candle DataFrame
         
         Args:
             df: DataFrame with candle data
+            columns: Feature columns to keep (default: all MFT feature columns)
             
         Returns:
             DataFrame with only MFT feature columns
         """
-        # Start with basic columns that should always be present
-        base_columns = ['timestamp', 'symbol', 'exchange', 'timeframe']
+        result_columns = self._feature_columns(list(df.columns), columns)
+        
+        if not result_columns:
+            return pd.DataFrame()
+        
+        return df[result_columns].copy()
+    
+    def _feature_columns(self, available: List[str], columns: Optional[List[str]] = None) -> List[str]:
+        """Base columns followed by the requested (default: all MFT) feature columns present in available"""
         result_columns = []
         
         # Add base columns if they exist
-        for col in base_columns:
-            if col in df.columns:
+        for col in self.base_columns:
+            if col in available:
                 result_columns.append(col)
         
-        # Add MFT feature columns that exist in the DataFrame
-        for col in self.mft_columns:
-            if col in df.columns:
+        # Add MFT feature columns that exist
+        for col in columns or self.mft_columns:
+            if col in available:
                 result_columns.append(col)
         
-        if not result_columns:
-            return pd.DataFrame()
-        
-        return df[result_columns].copy()
+        return result_columns
     
     def get_available_mft_features(self, instrument_id: str, date: datetime) -> Dict[str, List[str]]:
         """
@@ -229,7 +271,7 @@ class MFTFeaturesReader:
             
             if blob.exists():
                 try:
-                    df = self.data_client.read_parquet_file(blob_name)
+                    df = self.data_client.read_parquet_file(blob_name, columns=self._projection())
                     mft_df = self._extract_mft_features(df)
                     
                     summary['timeframes'][timeframe] = {
@@ -0,0 +1,284 @@
+"""
+Parquet Footer Cache for GCS Files
+
+Process-wide LRU cache of parsed ``FileMetaData`` for GCS Parquet objects,
+keyed by blob name and generation. Repeated queries against the same file
+open it with the cached footer, size and generation - no metadata request,
+no footer fetch - and reuse the per-row-group timestamp bounds instead of
+re-scanning statistics. Ranged reads are pinned to the cached generation,
+so an overwritten object fails with 412 and is re-opened fresh.
+
+Footers can optionally be persisted to a local directory so they survive
+process restarts (set PARQUET_METADATA_CACHE_DIR).
+"""
+
+import bisect
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pyarrow.parquet as pq
+from google.cloud.exceptions import PreconditionFailed
+
+from .gcs_range_file import GCSRangeFile
+from .parquet_optimizer import row_groups_in_range, _to_microseconds
+
+logger = logging.getLogger(__name__)
+
+# Default number of footers kept in memory
+DEFAULT_METADATA_CACHE_ENTRIES = 1024
+
+
+@dataclass
+class CachedFooter:
+    """Footer of one object generation plus lazily computed row group bounds"""
+    name: str
+    generation: int
+    size: int
+    metadata: pq.FileMetaData
+    _bounds: Dict[str, Optional[List[Tuple[int, int]]]] = field(default_factory=dict, repr=False)
+
+    def open(self, blob) -> Tuple[pq.ParquetFile, GCSRangeFile]:
+        """Open the object for ranged reads without fetching the footer again"""
+        range_file = GCSRangeFile(blob, size=self.size, generation=self.generation)
+        return pq.ParquetFile(range_file, metadata=self.metadata, pre_buffer=True), range_file
+
+    def row_groups_in_range(self, column: str, start_us: int, end_us: int) -> List[int]:
+        """Row groups overlapping [start_us, end_us], from cached per-row-group bounds"""
+        bounds = self._row_group_bounds(column)
+        if bounds is None:
+            return row_groups_in_range(self.metadata, column, start_us, end_us)
+        # Sorted files: row group minimums are non-decreasing, so skip everything starting after end_us
+        last = bisect.bisect_right([low for low, _ in bounds], end_us)
+        return [i for i in range(last) if bounds[i][1] >= start_us]
+
+    def time_range(self, column: str) -> Optional[Tuple[int, int]]:
+        """(min_us, max_us) of a column over the whole file from row group statistics, if available"""
+        if column not in self.metadata.schema.names:
+            return None
+        column_index = self.metadata.schema.names.index(column)
+        low, high = None, None
+        for i in range(self.metadata.num_row_groups):
+            stats = self.metadata.row_group(i).column(column_index).statistics
+            if stats is None or not stats.has_min_max:
+                return None
+            low = _to_microseconds(stats.min) if low is None else min(low, _to_microseconds(stats.min))
+            high = _to_microseconds(stats.max) if high is None else max(high, _to_microseconds(stats.max))
+        return (low, high) if low is not None else None
+
+    def summary(self, time_columns: Tuple[str, ...] = ('timestamp', 'local_timestamp')) -> Dict[str, Any]:
+        """Row count, schema, sizes and time range of the file, from the footer alone"""
+        compressed_size = sum(
+            self.metadata.row_group(i).column(j).total_compressed_size
+            for i in range(self.metadata.num_row_groups)
+            for j in range(self.metadata.num_columns)
+        )
+        time_column = next((name for name in time_columns if name in self.metadata.schema.names), None)
+        time_range = self.time_range(time_column) if time_column else None
+        return {
+            'num_rows': self.metadata.num_rows,
+            'num_row_groups': self.metadata.num_row_groups,
+            'columns': self.metadata.schema.to_arrow_schema().names,
+            'file_size': self.size,
+            'compressed_size': compressed_size,
+            'generation': self.generation,
+            'time_column': time_column,
+            'min_timestamp_us': time_range[0] if time_range else None,
+            'max_timestamp_us': time_range[1] if time_range else None
+        }
+
+    def _row_group_bounds(self, column: str) -> Optional[List[Tuple[int, int]]]:
+        """(min_us, max_us) per row group, or None when the bounds are missing or unsorted"""
+        if column not in self._bounds:
+            bounds = None
+            if column in self.metadata.schema.names:
+                column_index = self.metadata.schema.names.index(column)
+                bounds = []
+                for i in range(self.metadata.num_row_groups):
+                    stats = self.metadata.row_group(i).column(column_index).statistics
+                    if stats is None or not stats.has_min_max:
+                        bounds = None
+                        break
+                    bounds.append((_to_microseconds(stats.min), _to_microseconds(stats.max)))
+                if bounds and any(bounds[i][0] > bounds[i + 1][0] for i in range(len(bounds) - 1)):
+                    bounds = None
+            self._bounds[column] = bounds
+        return self._bounds[column]
+
+
+class ParquetMetadataCache:
+    """Thread-safe LRU of CachedFooter entries keyed by (blob name, generation)"""
+
+    def __init__(self, max_entries: int = DEFAULT_METADATA_CACHE_ENTRIES, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: 'OrderedDict[Tuple[str, int], CachedFooter]' = OrderedDict()
+        self._latest: Dict[str, int] = {}  # blob name -> newest cached generation
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, generation: Optional[int] = None) -> Optional[CachedFooter]:
+        """Cached footer for a generation, or for the newest cached generation when not given"""
+        with self._lock:
+            generation = generation if generation is not None else self._latest.get(name)
+            entry = self._entries.get((name, generation)) if generation is not None else None
+            if entry is not None:
+                self._entries.move_to_end((name, generation))
+                self.hits += 1
+                return entry
+
+        entry = self._load_from_disk(name, generation)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._insert(entry)
+        return entry
+
+    def put(self, name: str, generation: int, size: int, metadata: pq.FileMetaData) -> CachedFooter:
+        entry = CachedFooter(name=name, generation=generation, size=size, metadata=metadata)
+        self._insert(entry)
+        self._save_to_disk(entry)
+        return entry
+
+    def invalidate(self, name: str):
+        """Drop every cached generation of a blob (e.g. after a 412 on an overwritten object)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+            self._latest.pop(name, None)
+        if self.cache_dir:
+            for path in self._disk_paths(name):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def open(self, blob) -> Tuple[CachedFooter, pq.ParquetFile, GCSRangeFile]:
+        """Open a blob with its cached footer, fetching and caching the footer on a miss
+        
+        The newest cached generation is used without checking the blob, so this
+        is only safe when the footer is followed by reads through the returned
+        range file - they are pinned with if_generation_match and fail on an
+        overwritten object (see read). Use footer when only the metadata is needed.
+        """
+        entry = self.get(blob.name)
+        if entry is not None:
+            parquet_file, range_file = entry.open(blob)
+            return entry, parquet_file, range_file
+        return self._open_fresh(blob)
+
+    def footer(self, blob) -> CachedFooter:
+        """Footer of the blob's current generation
+        
+        One metadata request checks the generation; the footer itself is
+        fetched (last few KB only) just on a cache miss.
+        """
+        blob.reload()
+        entry = self.get(blob.name, blob.generation)
+        if entry is not None:
+            return entry
+        return self._open_fresh(blob, size=blob.size, generation=blob.generation)[0]
+
+    def read(self, blob, read_fn: Callable[[CachedFooter, pq.ParquetFile, GCSRangeFile], Any]) -> Any:
+        """Run read_fn on the opened blob, re-opening once if the cached generation was overwritten"""
+        entry = self.get(blob.name)
+        if entry is None:
+            return read_fn(*self._open_fresh(blob))
+        try:
+            return read_fn(entry, *entry.open(blob))
+        except PreconditionFailed:
+            logger.info(f"♻️ {blob.name} changed since its footer was cached, re-opening")
+            self.invalidate(blob.name)
+            return read_fn(*self._open_fresh(blob))
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _open_fresh(self, blob, size: Optional[int] = None,
+                    generation: Optional[int] = None) -> Tuple[CachedFooter, pq.ParquetFile, GCSRangeFile]:
+        range_file = GCSRangeFile(blob, size=size, generation=generation)  # Metadata request unless size and generation are known
+        parquet_file = pq.ParquetFile(range_file, pre_buffer=True)
+        entry = self.put(blob.name, range_file.generation, range_file.size, parquet_file.metadata)
+        return entry, parquet_file, range_file
+
+    def _insert(self, entry: CachedFooter):
+        with self._lock:
+            self._entries[(entry.name, entry.generation)] = entry
+            self._entries.move_to_end((entry.name, entry.generation))
+            if entry.generation >= self._latest.get(entry.name, entry.generation):
+                self._latest[entry.name] = entry.generation
+            while len(self._entries) > self.max_entries:
+                (name, generation), _ = self._entries.popitem(last=False)
+                if self._latest.get(name) == generation:
+                    del self._latest[name]
+
+    def _disk_prefix(self, name: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(name.encode('utf-8')).hexdigest())
+
+    def _disk_paths(self, name: str) -> List[str]:
+        prefix = self._disk_prefix(name)
+        directory, stem = os.path.split(prefix)
+        if not os.path.isdir(directory):
+            return []
+        return [os.path.join(directory, f) for f in os.listdir(directory) if f.startswith(stem + '-')]
+
+    def _load_from_disk(self, name: str, generation: Optional[int]) -> Optional[CachedFooter]:
+        """Footer persisted as {sha1(name)}-{generation}-{size}.footer"""
+        if not self.cache_dir:
+            return None
+        candidates = []
+        for path in self._disk_paths(name):
+            try:
+                file_generation, file_size = (int(part) for part in os.path.basename(path)[:-len('.footer')].split('-')[1:3])
+            except ValueError:
+                continue
+            if generation is None or file_generation == generation:
+                candidates.append((file_generation, file_size, path))
+        if not candidates:
+            return None
+
+        file_generation, file_size, path = max(candidates)
+        try:
+            metadata = pq.read_metadata(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable cached footer {path}: {e}")
+            return None
+        return CachedFooter(name=name, generation=file_generation, size=file_size, metadata=metadata)
+
+    def _save_to_disk(self, entry: CachedFooter):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = f"{self._disk_prefix(entry.name)}-{entry.generation}-{entry.size}.footer"
+            tmp_path = f"{path}.tmp"
+            entry.metadata.write_metadata_file(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not persist footer for {entry.name}: {e}")
+
+
+_metadata_cache: Optional[ParquetMetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_parquet_metadata_cache() -> ParquetMetadataCache:
+    """Process-wide footer cache, sized by PARQUET_METADATA_CACHE_ENTRIES and
+    optionally persisted under PARQUET_METADATA_CACHE_DIR"""
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            _metadata_cache = ParquetMetadataCache(
+                max_entries=int(os.getenv('PARQUET_METADATA_CACHE_ENTRIES', str(DEFAULT_METADATA_CACHE_ENTRIES))),
+                cache_dir=os.getenv('PARQUET_METADATA_CACHE_DIR') or None
+            )
+        return _metadata_cache
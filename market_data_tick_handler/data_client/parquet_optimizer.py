@@ -9,11 +9,13 @@ This module provides optimized Parquet reading with:
 """
 
 import logging
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional, Tuple, Iterator
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Union
 import io
 from google.cloud import storage
 from google.cloud.exceptions import NotFound
@@ -21,12 +23,152 @@ from google.cloud.exceptions import NotFound
 logger = logging.getLogger(__name__)
 
 
+def _to_microseconds(value) -> int:
+    """Row group statistic (int64 microseconds or timestamp) as epoch microseconds"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(pd.Timestamp(value).value // 1000)
+    return int(value)
+
+
+def row_groups_in_range(metadata: pq.FileMetaData, column: str, start_us: int, end_us: int) -> List[int]:
+    """Indices of row groups whose statistics for column overlap [start_us, end_us]
+    
+    Row groups without statistics are kept since they cannot be ruled out.
+    """
+    column_index = metadata.schema.names.index(column)
+    relevant_row_groups = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column_index).statistics
+        if stats is None or not stats.has_min_max:
+            relevant_row_groups.append(i)
+        elif not (_to_microseconds(stats.max) < start_us or _to_microseconds(stats.min) > end_us):
+            relevant_row_groups.append(i)
+    return relevant_row_groups
+
+
+def filter_table_by_time(table: pa.Table, column: str, start_us: int, end_us: int) -> pa.Table:
+    """Rows of table (or record batch) whose column (int64 microseconds or timestamp) lies in [start_us, end_us]"""
+    values = table.column(column)
+    if pa.types.is_timestamp(values.type):
+        values = pc.cast(pc.cast(values, pa.timestamp('us', values.type.tz)), pa.int64())
+    mask = pc.and_(pc.greater_equal(values, start_us), pc.less_equal(values, end_us))
+    return table.filter(mask)
+
+
+def row_group_byte_range(metadata: pq.FileMetaData, index: int) -> Tuple[int, int]:
+    """File byte range [start, end) covered by a row group's column chunks"""
+    row_group = metadata.row_group(index)
+    start, end = None, 0
+    for i in range(row_group.num_columns):
+        column = row_group.column(i)
+        offsets = [column.data_page_offset]
+        if column.has_dictionary_page:
+            offsets.append(column.dictionary_page_offset)
+        column_start = min(offsets)
+        start = column_start if start is None else min(start, column_start)
+        end = max(end, column_start + column.total_compressed_size)
+    return start or 0, end
+
+
+def with_datetime_columns(data, columns: Tuple[str, ...] = ('timestamp', 'local_timestamp')):
+    """Table or record batch with int64 microsecond columns cast to timestamp[us] (a zero-copy cast)"""
+    arrays = [
+        pc.cast(array, pa.timestamp('us')) if name in columns and pa.types.is_integer(array.type) else array
+        for name, array in zip(data.schema.names, data.columns)
+    ]
+    return type(data).from_arrays(arrays, names=data.schema.names)
+
+
+# Result types the data_client readers can return
+RETURN_TYPES = ('pandas', 'arrow', 'polars')
+
+
+def validate_return_type(return_type: str):
+    if return_type not in RETURN_TYPES:
+        raise ValueError(f"Unsupported return_type: {return_type}. Supported: {list(RETURN_TYPES)}")
+
+
+def combine_tables(tables: List[pa.Table], sort_column: Union[str, Tuple[str, ...], None] = None) -> Optional[pa.Table]:
+    """Concatenate tables without copying, sorting only if not already in order
+    
+    Schemas are unified like pd.concat: missing columns are null-filled and
+    differing column types promoted. sort_column may list candidates, of which
+    the first present is used.
+    """
+    tables = [table for table in tables if table is not None and table.num_rows]
+    if not tables:
+        return None
+    table = tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options='permissive')
+    candidates = (sort_column,) if isinstance(sort_column, str) else (sort_column or ())
+    sort_by = next((name for name in candidates if name in table.column_names), None)
+    if sort_by and not is_sorted(table.column(sort_by)):
+        table = table.sort_by(sort_by)
+    return table
+
+
+def is_sorted(values: pa.ChunkedArray) -> bool:
+    """Whether values are non-decreasing (nulls ignored)"""
+    if len(values) < 2:
+        return True
+    return pc.all(pc.less_equal(values.slice(0, len(values) - 1), values.slice(1))).as_py() is not False
+
+
+def combine_tables_by_key(
+    keys: List[str],
+    keyed_tables: List[Tuple[str, Optional[pa.Table]]],
+    sort_column: Union[str, Tuple[str, ...], None] = None,
+    return_type: str = 'pandas'
+) -> Dict[str, Any]:
+    """Combine (key, table) pairs into one result per key, in the order of keys"""
+    grouped = {key: [] for key in keys}
+    for key, table in keyed_tables:
+        grouped[key].append(table)
+    return {key: convert_table(combine_tables(tables, sort_column), return_type) for key, tables in grouped.items()}
+
+
+def convert_table(table: Optional[pa.Table], return_type: str = 'pandas'):
+    """Table as the requested return type - the only place reader results leave Arrow"""
+    if table is None:
+        table = pa.table({})
+    if return_type == 'arrow':
+        return table
+    if return_type == 'polars':
+        try:
+            import polars as pl
+        except ImportError:
+            logger.error("❌ polars package not installed. Install with: pip install polars")
+            raise
+        return pl.from_arrow(table)
+    return table.to_pandas()
+
+
+def project_columns(schema_names: List[str], columns: Optional[List[str]]) -> Optional[List[str]]:
+    """Requested columns present in the file (None reads every column)"""
+    if columns is None:
+        return None
+    return [name for name in dict.fromkeys(columns) if name in schema_names]
+
+
+def merge_time_windows(windows: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Union of possibly overlapping [start, end] windows as sorted, disjoint windows"""
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
 class ParquetOptimizer:
     """Optimized Parquet reader with sparse data support"""
     
     def __init__(self, bucket: storage.Bucket):
+        from .parquet_metadata_cache import get_parquet_metadata_cache
         self.bucket = bucket
-        self._metadata_cache = {}
+        self._metadata_cache = get_parquet_metadata_cache()
     
     def get_optimized_tick_data(
         self,
@@ -83,57 +225,51 @@ class ParquetOptimizer:
         data_type: str,
         chunk_size: int
     ) -> Iterator[pd.DataFrame]:
-        """Read with Parquet predicate pushdown for optimal performance"""
+        """Read with Parquet predicate pushdown for optimal performance
         
-        # Download the Parquet file
-        blob = self.bucket.blob(blob_name)
-        parquet_data = blob.download_as_bytes()
-        
-        # Create PyArrow file from bytes
-        parquet_file = pa.BufferReader(parquet_data)
-        parquet_table = pq.ParquetFile(parquet_file)
+        The file is opened through HTTP Range requests: only the footer and
+        the column chunks of row groups overlapping the query are fetched.
+        Footers come from the shared metadata cache, so repeated queries on a
+        file skip the footer fetch and the row group statistics scan.
+        """
+        # Convert timestamps to microseconds for comparison
+        start_us = int(start_time.timestamp() * 1_000_000)
+        end_us = int(end_time.timestamp() * 1_000_000)
         
-        # Get metadata for row group statistics
-        metadata = parquet_table.metadata
-        schema = parquet_table.schema
+        def open_first_row_group(footer, parquet_table, range_file):
+            # Find timestamp column
+            timestamp_col = next((name for name in footer.metadata.schema.names if name in ['timestamp', 'local_timestamp']), None)
+            if not timestamp_col:
+                return None
+            
+            # Filter row groups using cached row group statistics
+            relevant_row_groups = footer.row_groups_in_range(timestamp_col, start_us, end_us)
+            
+            # Reading the first row group validates the cached generation before anything is yielded
+            first_table = parquet_table.read_row_group(relevant_row_groups[0]) if relevant_row_groups else None
+            return parquet_table, range_file, timestamp_col, relevant_row_groups, first_table
         
-        # Find timestamp column
-        timestamp_col = None
-        for i, field in enumerate(schema):
-            if field.name in ['timestamp', 'local_timestamp']:
-                timestamp_col = field.name
-                break
+        opened = self._metadata_cache.read(self.bucket.blob(blob_name), open_first_row_group)
         
-        if not timestamp_col:
+        if opened is None:
             logger.warning(f"No timestamp column found in {blob_name}")
             return
         
-        # Convert timestamps to microseconds for comparison
-        start_us = int(start_time.timestamp() * 1_000_000)
-        end_us = int(end_time.timestamp() * 1_000_000)
-        
-        # Filter row groups using metadata statistics
-        relevant_row_groups = []
-        for i in range(metadata.num_row_groups):
-            row_group = metadata.row_group(i)
-            col_stats = row_group.column(0)  # Assuming timestamp is first column
-            
-            if col_stats.statistics:
-                min_val = col_stats.statistics.min
-                max_val = col_stats.statistics.max
-                
-                # Check if this row group overlaps with our time range
-                if not (max_val < start_us or min_val > end_us):
-                    relevant_row_groups.append(i)
+        parquet_table, range_file, timestamp_col, relevant_row_groups, table = opened
         
         if not relevant_row_groups:
             logger.info(f"No relevant row groups found for time range {start_time} to {end_time}")
             return
         
         # Read only relevant row groups
-        for row_group_idx in relevant_row_groups:
-            table = parquet_table.read_row_group(row_group_idx)
-            df = table.to_pandas()
+        for position, row_group_idx in enumerate(relevant_row_groups):
+            if position > 0:
+                table = parquet_table.read_row_group(row_group_idx)
+            logger.debug(f"Read row group {row_group_idx} of {blob_name}: {range_file.bytes_fetched / 1024 / 1024:.1f}MB "
+                         f"of {range_file.size / 1024 / 1024:.1f}MB fetched in {range_file.requests} requests")
+            
+            # Apply final timestamp filter on the raw microseconds before converting
+            df = filter_table_by_time(table, timestamp_col, start_us, end_us).to_pandas()
             
             # Convert timestamp columns
             if 'timestamp' in df.columns:
@@ -141,12 +277,6 @@ class ParquetOptimizer:
             if 'local_timestamp' in df.columns:
                 df['local_timestamp'] = pd.to_datetime(df['local_timestamp'], unit='us')
             
-            # Apply final timestamp filter
-            if 'timestamp' in df.columns:
-                df = df[(df['timestamp'] >= start_time) & (df['timestamp'] <= end_time)]
-            elif 'local_timestamp' in df.columns:
-                df = df[(df['local_timestamp'] >= start_time) & (df['local_timestamp'] <= end_time)]
-            
             if not df.empty:
                 df['data_type'] = data_type
                 
@@ -156,6 +286,59 @@ class ParquetOptimizer:
                     if not chunk.empty:
                         yield chunk
     
+    def stream_batches(
+        self,
+        blob_name: str,
+        start_time: datetime,
+        end_time: datetime,
+        batch_size: int = 10000,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream a tick file as record batches filtered to [start_time, end_time]
+        
+        Only row groups overlapping the range are fetched, one at a time through
+        ranged reads, and decoded batch_size rows at a time with
+        ParquetFile.iter_batches, so memory is bounded by a single row group
+        however large the day is. Rows are filtered with Arrow compute.
+        """
+        # Convert timestamps to microseconds for comparison
+        start_us = int(start_time.timestamp() * 1_000_000)
+        end_us = int(end_time.timestamp() * 1_000_000)
+        
+        def open_batches(footer, parquet_table, _):
+            # Find timestamp column
+            timestamp_col = next((name for name in footer.metadata.schema.names if name in ['timestamp', 'local_timestamp']), None)
+            if not timestamp_col:
+                return None
+            
+            # Filter row groups using cached row group statistics
+            relevant_row_groups = footer.row_groups_in_range(timestamp_col, start_us, end_us)
+            projection = project_columns(footer.metadata.schema.names, [timestamp_col] + list(columns)) if columns is not None else None
+            
+            # One row group per iter_batches call, so pre-buffered column chunks are released as we go
+            batches = (
+                batch
+                for row_group_idx in relevant_row_groups
+                for batch in parquet_table.iter_batches(batch_size=batch_size, row_groups=[row_group_idx], columns=projection)
+            )
+            
+            # Decoding the first batch validates the cached generation before anything is yielded
+            return timestamp_col, batches, next(batches, None)
+        
+        opened = self._metadata_cache.read(self.bucket.blob(blob_name), open_batches)
+        
+        if opened is None:
+            logger.warning(f"No timestamp column found in {blob_name}")
+            return
+        
+        timestamp_col, batches, batch = opened
+        
+        while batch is not None:
+            batch = filter_table_by_time(batch, timestamp_col, start_us, end_us)
+            if batch.num_rows:
+                yield batch
+            batch = next(batches, None)
+    
     def _read_with_pandas_filtering(
         self,
         blob_name: str,
@@ -222,23 +405,15 @@ class ParquetOptimizer:
             blob_name = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet"
             
             try:
-                blob = self.bucket.blob(blob_name)
-                parquet_data = blob.download_as_bytes()
-                
-                # Create PyArrow file
-                parquet_file = pa.BufferReader(parquet_data)
-                parquet_table = pq.ParquetFile(parquet_file)
+                # Byte offsets are returned to the caller, so the footer must match the current
+                # generation - one metadata request, and the footer is fetched only on a miss
+                footer = self._metadata_cache.footer(self.bucket.blob(blob_name))
                 
                 # Get metadata
-                metadata = parquet_table.metadata
-                schema = parquet_table.schema
+                metadata = footer.metadata
                 
                 # Find timestamp column
-                timestamp_col = None
-                for i, field in enumerate(schema):
-                    if field.name in ['timestamp', 'local_timestamp']:
-                        timestamp_col = field.name
-                        break
+                timestamp_col = next((name for name in metadata.schema.names if name in ['timestamp', 'local_timestamp']), None)
                 
                 if not timestamp_col:
                     continue
@@ -255,22 +430,13 @@ class ParquetOptimizer:
                     start_us = int(partition_start.timestamp() * 1_000_000)
                     end_us = int(partition_end.timestamp() * 1_000_000)
                     
-                    relevant_row_groups = []
-                    for j in range(metadata.num_row_groups):
-                        row_group = metadata.row_group(j)
-                        col_stats = row_group.column(0)
-                        
-                        if col_stats.statistics:
-                            min_val = col_stats.statistics.min
-                            max_val = col_stats.statistics.max
-                            
-                            if not (max_val < start_us or min_val > end_us):
-                                relevant_row_groups.append(j)
+                    relevant_row_groups = footer.row_groups_in_range(timestamp_col, start_us, end_us)
                     
                     if relevant_row_groups:
-                        # Calculate byte range for these row groups
-                        byte_start = min(metadata.row_group(i).total_byte_size for i in relevant_row_groups)
-                        byte_end = max(metadata.row_group(i).total_byte_size for i in relevant_row_groups)
+                        # File byte range spanned by these row groups
+                        byte_ranges = [row_group_byte_range(metadata, j) for j in relevant_row_groups]
+                        byte_start = min(start for start, _ in byte_ranges)
+                        byte_end = max(end for _, end in byte_ranges)
                         
                         partitions.append((partition_start, partition_end, byte_start, byte_end))
                 
@@ -282,6 +448,81 @@ class ParquetOptimizer:
         
         return ranges
     
+    def get_tick_data_windows(
+        self,
+        instrument_id: str,
+        date: datetime,
+        windows: List[Tuple[datetime, datetime]],
+        data_types: Optional[List[str]] = None
+    ) -> List[pd.DataFrame]:
+        """
+        Get tick data for many time windows of one day, reading each file once
+        
+        Overlapping windows are merged, the union of their row groups is read
+        in a single pass per data type, and each window is sliced out of the
+        sorted timestamps with searchsorted.
+        
+        Args:
+            instrument_id: Instrument key
+            date: Date for the data
+            windows: (start_time, end_time) pairs (UTC), inclusive
+            data_types: List of data types to retrieve
+            
+        Returns:
+            One DataFrame per window, in the order requested
+        """
+        if data_types is None:
+            data_types = ['trades']
+        
+        date_str = date.strftime('%Y-%m-%d')
+        bounds = [(int(start.timestamp() * 1_000_000), int(end.timestamp() * 1_000_000)) for start, end in windows]
+        merged = merge_time_windows(bounds)
+        window_frames = [[] for _ in windows]
+        
+        for data_type in data_types:
+            blob_name = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet"
+            
+            def read_union(footer, parquet_table, _):
+                timestamp_col = next((name for name in footer.metadata.schema.names if name in ['timestamp', 'local_timestamp']), None)
+                if not timestamp_col:
+                    return None, None
+                row_groups = sorted({i for start_us, end_us in merged
+                                     for i in footer.row_groups_in_range(timestamp_col, start_us, end_us)})
+                return timestamp_col, parquet_table.read_row_groups(row_groups) if row_groups else None
+            
+            try:
+                timestamp_col, table = self._metadata_cache.read(self.bucket.blob(blob_name), read_union)
+            except Exception as e:
+                logger.warning(f"Failed to read {data_type} data for {instrument_id} on {date_str}: {e}")
+                continue
+            
+            if table is None or table.num_rows == 0:
+                continue
+            
+            # Sorted int64 microseconds for searchsorted
+            values = table.column(timestamp_col)
+            if pa.types.is_timestamp(values.type):
+                values = pc.cast(pc.cast(values, pa.timestamp('us', values.type.tz)), pa.int64())
+            timestamps = values.to_numpy()
+            if np.any(timestamps[1:] < timestamps[:-1]):
+                order = np.argsort(timestamps, kind='stable')
+                table, timestamps = table.take(order), timestamps[order]
+            
+            df = table.to_pandas()
+            if 'timestamp' in df.columns:
+                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='us')
+            if 'local_timestamp' in df.columns:
+                df['local_timestamp'] = pd.to_datetime(df['local_timestamp'], unit='us')
+            df['data_type'] = data_type
+            
+            starts = np.searchsorted(timestamps, [start_us for start_us, _ in bounds], side='left')
+            ends = np.searchsorted(timestamps, [end_us for _, end_us in bounds], side='right')
+            for frames, lo, hi in zip(window_frames, starts, ends):
+                if hi > lo:
+                    frames.append(df.iloc[lo:hi])
+        
+        return [pd.concat(frames, ignore_index=True) if frames else pd.DataFrame() for frames in window_frames]
+    
     def create_optimized_parquet(
         self,
         df: pd.DataFrame,
@@ -357,30 +598,17 @@ class SparseDataAccessor:
         if data_types is None:
             data_types = ['trades']
         
-        results = {}
-        
-        for candle_time in candle_times:
-            # Calculate time range with buffer
-            start_time = candle_time - timedelta(minutes=buffer_minutes)
-            end_time = candle_time + timedelta(minutes=buffer_minutes)
-            
-            # Get data for this time range
-            data_chunks = list(self.optimizer.get_optimized_tick_data(
-                instrument_id=instrument_id,
-                start_time=start_time,
-                end_time=end_time,
-                date=date,
-                data_types=data_types,
-                use_predicate_pushdown=True,
-                chunk_size=10000
-            ))
-            
-            if data_chunks:
-                results[candle_time] = pd.concat(data_chunks, ignore_index=True)
-            else:
-                results[candle_time] = pd.DataFrame()
+        # One batched read per file for all candle windows
+        windows = [(candle_time - timedelta(minutes=buffer_minutes), candle_time + timedelta(minutes=buffer_minutes))
+                   for candle_time in candle_times]
+        frames = self.optimizer.get_tick_data_windows(
+            instrument_id=instrument_id,
+            date=date,
+            windows=windows,
+            data_types=data_types
+        )
         
-        return results
+        return dict(zip(candle_times, frames))
     
     def get_candle_data_efficiently(
         self,
@@ -404,17 +632,20 @@ class SparseDataAccessor:
             DataFrame with candle data
         """
         if sparse_candles:
-            # Load only specific candles
-            all_data = []
+            # Load only specific candles, one batched read per day
+            candles_by_day = {}
             for candle_time in sparse_candles:
+                candles_by_day.setdefault(candle_time.date(), []).append(candle_time)
+            
+            all_data = []
+            for day, candle_times in candles_by_day.items():
                 data = self.get_sparse_candles(
                     instrument_id=instrument_id,
-                    candle_times=[candle_time],
-                    date=candle_time.date(),
+                    candle_times=candle_times,
+                    date=day,
                     data_types=['trades']
                 )
-                if candle_time in data and not data[candle_time].empty:
-                    all_data.append(data[candle_time])
+                all_data.extend(data[candle_time] for candle_time in candle_times if not data[candle_time].empty)
             
             if all_data:
                 return pd.concat(all_data, ignore_index=True)
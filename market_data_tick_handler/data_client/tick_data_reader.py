@@ -8,13 +8,18 @@ Supports sparse data access for backtesting scenarios.
 
 import logging
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, Union, Iterator
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple
 import io
 from google.cloud import storage
 
-from .data_client import DataClient
-from .parquet_optimizer import ParquetOptimizer, SparseDataAccessor
+from .data_client import DataClient, date_strings, summary_time_range
+from .gcs_object_index import get_gcs_object_index
+from .parquet_optimizer import (
+    ParquetOptimizer, SparseDataAccessor, filter_table_by_time, with_datetime_columns,
+    validate_return_type, combine_tables_by_key
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +41,9 @@ class TickDataReader:
         start_time: datetime, 
         end_time: datetime, 
         date: datetime,
-        data_types: Optional[List[str]] = None
-    ) -> pd.DataFrame:
+        data_types: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Union[pd.DataFrame, pa.Table]:
         """
         Get tick data for a specific instrument and time range
         
@@ -47,58 +53,96 @@ class TickDataReader:
             end_time: End timestamp (UTC)
             date: Date for the data (used to find the correct file)
             data_types: List of data types to retrieve (default: ['trades'])
+            return_type: 'pandas', 'arrow' or 'polars'
             
         Returns:
-            DataFrame with filtered tick data
+            DataFrame (or Arrow table / polars DataFrame) with filtered tick data
         """
+        validate_return_type(return_type)
         if data_types is None:
             data_types = ['trades']
         
         date_str = date.strftime('%Y-%m-%d')
-        all_data = []
+        requests = [
+            (instrument_id, f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet", data_type)
+            for data_type in data_types
+        ]
+        return self._read_tick_files([instrument_id], requests, start_time, end_time, return_type)[instrument_id]
+    
+    def get_tick_data_for_instruments(
+        self,
+        instrument_ids: List[str],
+        start_time: datetime,
+        end_time: datetime,
+        data_types: Optional[List[str]] = None,
+        return_type: str = 'pandas'
+    ) -> Dict[str, Union[pd.DataFrame, pa.Table]]:
+        """
+        Get tick data for several instruments over a multi-day time range
         
-        for data_type in data_types:
-            # Construct file path
-            blob_name = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet"
+        Every (instrument, day, data type) file is read concurrently through
+        DataClient.read_parquet_files. Filtering, timestamp handling and
+        concatenation stay in Arrow; results are converted once at the end.
+        
+        Args:
+            instrument_ids: Instrument keys
+            start_time: Start timestamp (UTC)
+            end_time: End timestamp (UTC)
+            data_types: List of data types to retrieve (default: ['trades'])
+            return_type: 'pandas', 'arrow' or 'polars'
             
-            try:
-                # Read the parquet file
-                df = self.data_client.read_parquet_file(blob_name)
-                
-                # Convert timestamp columns to datetime if they exist
-                if 'timestamp' in df.columns:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='us')
-                if 'local_timestamp' in df.columns:
-                    df['local_timestamp'] = pd.to_datetime(df['local_timestamp'], unit='us')
-                
-                # Filter by timestamp range using Parquet's built-in predicate pushdown
-                # This leverages row group statistics for efficient filtering
-                if 'timestamp' in df.columns:
-                    df = df[(df['timestamp'] >= start_time) & (df['timestamp'] <= end_time)]
-                elif 'local_timestamp' in df.columns:
-                    df = df[(df['local_timestamp'] >= start_time) & (df['local_timestamp'] <= end_time)]
-                
-                if not df.empty:
-                    df['data_type'] = data_type
-                    all_data.append(df)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to read {data_type} data for {instrument_id} on {date_str}: {e}")
-                continue
+        Returns:
+            Dictionary mapping instrument key to filtered tick data, in request order
+        """
+        validate_return_type(return_type)
+        if data_types is None:
+            data_types = ['trades']
         
-        if not all_data:
-            return pd.DataFrame()
+        requests = [
+            (instrument_id, f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet", data_type)
+            for instrument_id in instrument_ids
+            for date_str in date_strings(start_time, end_time)
+            for data_type in data_types
+        ]
+        return self._read_tick_files(instrument_ids, requests, start_time, end_time, return_type)
+    
+    def _read_tick_files(
+        self,
+        instrument_ids: List[str],
+        requests: List[Tuple[str, str, str]],
+        start_time: datetime,
+        end_time: datetime,
+        return_type: str
+    ) -> Dict[str, Union[pd.DataFrame, pa.Table]]:
+        """Read (instrument_id, blob_name, data_type) files concurrently and combine per instrument"""
+        data_types = {blob_name: data_type for _, blob_name, data_type in requests}
+        tables = self.data_client.read_parquet_files(
+            [blob_name for _, blob_name, _ in requests],
+            reader=lambda blob_name: self._read_tick_table(blob_name, data_types[blob_name], start_time, end_time)
+        )
         
-        # Combine all data types
-        result = pd.concat(all_data, ignore_index=True)
+        # Combine all days and data types, sorted by timestamp
+        return combine_tables_by_key(
+            instrument_ids,
+            [(instrument_id, table) for (instrument_id, _, _), table in zip(requests, tables)],
+            sort_column=('timestamp', 'local_timestamp'),
+            return_type=return_type
+        )
+    
+    def _read_tick_table(self, blob_name: str, data_type: str, start_time: datetime, end_time: datetime) -> pa.Table:
+        """Read one tick file as an Arrow table filtered to [start_time, end_time]"""
+        table = self.data_client.read_parquet_table(blob_name)
         
-        # Sort by timestamp
-        if 'timestamp' in result.columns:
-            result = result.sort_values('timestamp')
-        elif 'local_timestamp' in result.columns:
-            result = result.sort_values('local_timestamp')
+        # Filter by timestamp range on the raw microseconds
+        timestamp_col = next((name for name in ['timestamp', 'local_timestamp'] if name in table.column_names), None)
+        if timestamp_col:
+            start_us = int(start_time.timestamp() * 1_000_000)
+            end_us = int(end_time.timestamp() * 1_000_000)
+            table = filter_table_by_time(table, timestamp_col, start_us, end_us)
         
-        return result
+        # Convert timestamp columns to datetime and tag the data type
+        table = with_datetime_columns(table)
+        return table.append_column('data_type', pa.repeat(data_type, table.num_rows))
     
     def get_tick_data_optimized(
         self,
@@ -213,21 +257,28 @@ class TickDataReader:
         end_time: datetime, 
         date: datetime,
         data_types: Optional[List[str]] = None,
-        chunk_size: int = 10000
-    ):
+        chunk_size: int = 10000,
+        columns: Optional[List[str]] = None,
+        as_arrow: bool = False
+    ) -> Iterator[Union[pd.DataFrame, pa.RecordBatch]]:
         """
         Generator that yields chunks of tick data for memory-efficient processing
         
+        Row groups overlapping the time range are decoded chunk_size rows at a
+        time and filtered in Arrow, so the full day is never materialised.
+        
         Args:
             instrument_id: Instrument key
             start_time: Start timestamp (UTC)
             end_time: End timestamp (UTC)
             date: Date for the data
             data_types: List of data types to retrieve
-            chunk_size: Number of rows per chunk
+            chunk_size: Maximum number of rows per chunk
+            columns: Columns to read (default: all columns)
+            as_arrow: Yield Arrow RecordBatches instead of DataFrames
             
         Yields:
-            DataFrame chunks of tick data
+            DataFrame (or RecordBatch) chunks of tick data
         """
         if data_types is None:
             data_types = ['trades']
@@ -238,25 +289,17 @@ class TickDataReader:
             blob_name = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet"
             
             try:
-                # Read parquet file in chunks
-                df = self.data_client.read_parquet_file(blob_name)
-                
-                # Convert timestamps
-                if 'timestamp' in df.columns:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='us')
-                if 'local_timestamp' in df.columns:
-                    df['local_timestamp'] = pd.to_datetime(df['local_timestamp'], unit='us')
-                
-                # Filter by timestamp range
-                if 'timestamp' in df.columns:
-                    df = df[(df['timestamp'] >= start_time) & (df['timestamp'] <= end_time)]
-                elif 'local_timestamp' in df.columns:
-                    df = df[(df['local_timestamp'] >= start_time) & (df['local_timestamp'] <= end_time)]
-                
-                # Yield in chunks
-                for i in range(0, len(df), chunk_size):
-                    chunk = df.iloc[i:i + chunk_size].copy()
-                    if not chunk.empty:
+                for batch in self.parquet_optimizer.stream_batches(blob_name, start_time, end_time, chunk_size, columns):
+                    # Convert timestamps
+                    batch = with_datetime_columns(batch)
+                    
+                    if as_arrow:
+                        yield pa.RecordBatch.from_arrays(
+                            batch.columns + [pa.repeat(data_type, batch.num_rows)],
+                            names=batch.schema.names + ['data_type']
+                        )
+                    else:
+                        chunk = batch.to_pandas()
                         chunk['data_type'] = data_type
                         yield chunk
                         
@@ -274,21 +317,9 @@ class TickDataReader:
         Returns:
             List of instrument keys
         """
-        date_str = date.strftime('%Y-%m-%d')
-        instruments = set()
-        
-        # Check trades data type
-        blob_pattern = f"raw_tick_data/by_date/day-{date_str}/data_type-trades/"
-        blobs = list(self.client.list_blobs("market-data-tick", prefix=blob_pattern))
-        
-        for blob in blobs:
-            if blob.name.endswith('.parquet'):
-                # Extract instrument ID from filename
-                filename = blob.name.split('/')[-1]
-                instrument_id = filename.replace('.parquet', '')
-                instruments.add(instrument_id)
-        
-        return sorted(list(instruments))
+        # Trades files of the day, from the in-memory object index instead of a bucket listing
+        object_index = get_gcs_object_index(self.client.bucket("market-data-tick"))
+        return object_index.instruments(date.strftime('%Y-%m-%d'), 'raw_tick_data', 'trades')
     
     def get_data_summary(self, instrument_id: str, date: datetime) -> Dict[str, Any]:
         """
@@ -301,39 +332,57 @@ class TickDataReader:
         Returns:
             Dictionary with data summary
         """
-        date_str = date.strftime('%Y-%m-%d')
-        summary = {
-            'instrument_id': instrument_id,
-            'date': date_str,
-            'data_types': {},
-            'total_records': 0
-        }
+        return self.get_data_summaries([instrument_id], date)[instrument_id]
+    
+    def get_data_summaries(self, instrument_ids: List[str], date: datetime) -> Dict[str, Dict[str, Any]]:
+        """
+        Get data summaries for many instruments from Parquet footers only
         
+        Record counts, columns, sizes and time ranges all come from the footer,
+        so no row data is downloaded. Files are summarised concurrently.
+        
+        Args:
+            instrument_ids: Instrument keys
+            date: Date to check
+            
+        Returns:
+            Dictionary mapping instrument key to its data summary
+        """
+        date_str = date.strftime('%Y-%m-%d')
         data_types = ['trades', 'book_snapshot_5', 'derivative_ticker', 'liquidations', 'options_chain']
         
-        for data_type in data_types:
-            blob_name = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet"
-            blob = self.bucket.blob(blob_name)
+        requests = [
+            (instrument_id, data_type, f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/{instrument_id}.parquet")
+            for instrument_id in instrument_ids
+            for data_type in data_types
+        ]
+        file_summaries = self.data_client.summarize_parquet_files([blob_name for _, _, blob_name in requests])
+        
+        summaries = {
+            instrument_id: {
+                'instrument_id': instrument_id,
+                'date': date_str,
+                'data_types': {},
+                'total_records': 0
+            }
+            for instrument_id in instrument_ids
+        }
+        
+        for (instrument_id, data_type, _), file_summary in zip(requests, file_summaries):
+            summary = summaries[instrument_id]
+            if not file_summary['available'] or 'error' in file_summary:
+                summary['data_types'][data_type] = file_summary
+                continue
             
-            if blob.exists():
-                try:
-                    # Read just the first few rows to get count
-                    df = self.data_client.read_parquet_file(blob_name)
-                    summary['data_types'][data_type] = {
-                        'available': True,
-                        'record_count': len(df),
-                        'file_size': blob.size or 0,
-                        'columns': list(df.columns)
-                    }
-                    summary['total_records'] += len(df)
-                except Exception as e:
-                    summary['data_types'][data_type] = {
-                        'available': True,
-                        'error': str(e)
-                    }
-            else:
-                summary['data_types'][data_type] = {
-                    'available': False
-                }
+            summary['data_types'][data_type] = {
+                'available': True,
+                'record_count': file_summary['num_rows'],
+                'file_size': file_summary['file_size'],
+                'compressed_size': file_summary['compressed_size'],
+                'row_groups': file_summary['num_row_groups'],
+                'columns': file_summary['columns'],
+                'time_range': summary_time_range(file_summary)
+            }
+            summary['total_records'] += file_summary['num_rows']
         
-        return summary
+        return summaries
@@ -0,0 +1,171 @@
+"""
+Adaptive Concurrency Control for Tardis Downloads
+
+AIMD (additive increase, multiplicative decrease) limit on concurrent
+requests. The limit grows by one step per completed window while aggregate
+throughput keeps climbing, and is cut multiplicatively on congestion
+signals: 429s, timeouts, or time to first byte inflating well above the
+baseline. Time to first byte is used rather than whole-transfer time, which
+grows with file size rather than with congestion. The baseline follows the
+lowest recent windows and decays towards higher ones, so a lucky early
+window does not pin it forever. A server Retry-After pauses all new requests.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Async concurrency limit tuned from per-request timings
+
+    A window closes after ``limit`` completed requests (roughly one round
+    trip of the whole pool). At that point the window's throughput and
+    median time to first byte decide whether the limit grows or holds. Congestion
+    signals shrink it immediately, at most once per cooldown so a burst
+    of simultaneous 429s counts as a single event.
+    """
+
+    def __init__(self,
+                 initial_limit: int = 16,
+                 min_limit: int = 1,
+                 max_limit: int = 256,
+                 increase_step: int = 1,
+                 decrease_factor: float = 0.7,
+                 latency_tolerance: float = 3.0,
+                 throughput_tolerance: float = 0.05,
+                 decrease_cooldown: float = 2.0,
+                 baseline_decay: float = 0.1):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.throughput_tolerance = throughput_tolerance
+        self.decrease_cooldown = decrease_cooldown
+        self.baseline_decay = baseline_decay  # Share of the gap to a slower window the baseline moves each window
+
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+
+        # Current window
+        self._window_start = time.monotonic()
+        self._window_latencies: List[float] = []
+        self._window_bytes = 0
+
+        # History used for increase / inflation decisions
+        self._last_throughput: Optional[float] = None
+        self._baseline_latency: Optional[float] = None
+
+        # Statistics
+        self.stats = {
+            'increases': 0,
+            'decreases': 0,
+            'rate_limited': 0,
+            'timeouts': 0,
+            'latency_inflations': 0,
+            'peak_limit': self.limit,
+        }
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one request slot for the duration of the block"""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
+    async def acquire(self):
+        """Wait for a free slot and for any Retry-After pause to pass"""
+        while True:
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.in_flight < self.limit)
+                # A pause may have started while we waited for a slot
+                if self._paused_until <= time.monotonic():
+                    self.in_flight += 1
+                    return
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record_success(self, first_byte_time: float, nbytes: int = 0):
+        """Feed a completed request's time to first byte and size; may grow or shrink the limit"""
+        self._window_latencies.append(first_byte_time)
+        self._window_bytes += nbytes
+        if len(self._window_latencies) >= self.limit:
+            self._close_window()
+
+    def record_rate_limited(self, retry_after: Optional[float] = None):
+        """Back off on HTTP 429 and pause new requests for Retry-After seconds"""
+        self.stats['rate_limited'] += 1
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self._decrease('rate limited' + (f", pausing {retry_after:.1f}s" if retry_after else ''))
+
+    def record_timeout(self):
+        self.stats['timeouts'] += 1
+        self._decrease('request timeout')
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'limit': self.limit, 'in_flight': self.in_flight}
+
+    def _close_window(self):
+        elapsed = max(time.monotonic() - self._window_start, 1e-6)
+        throughput = self._window_bytes / elapsed
+        latency = statistics.median(self._window_latencies)
+        self._reset_window()
+
+        baseline = self._baseline_latency
+        if baseline is None or latency < baseline:
+            self._baseline_latency = latency
+        else:
+            # Drift towards slower windows so the baseline tracks the current network, not the best ever
+            self._baseline_latency = baseline + self.baseline_decay * (latency - baseline)
+            if latency > baseline * self.latency_tolerance:
+                self.stats['latency_inflations'] += 1
+                self._last_throughput = throughput
+                self._decrease(f"first byte {latency:.2f}s vs baseline {baseline:.2f}s")
+                return
+
+        climbing = (self._last_throughput is None
+                    or throughput >= self._last_throughput * (1 - self.throughput_tolerance))
+        self._last_throughput = throughput
+        if climbing and self.limit < self.max_limit:
+            self._set_limit(self.limit + self.increase_step)
+            self.stats['increases'] += 1
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit < self.limit:
+            logger.info(f"📉 Concurrency {self.limit} -> {new_limit} ({reason})")
+            self._set_limit(new_limit)
+            self.stats['decreases'] += 1
+        self._reset_window()
+
+    def _set_limit(self, limit: int):
+        self.limit = limit
+        self.stats['peak_limit'] = max(self.stats['peak_limit'], limit)
+
+    def _reset_window(self):
+        self._window_start = time.monotonic()
+        self._window_latencies = []
+        self._window_bytes = 0
@@ -0,0 +1,117 @@
+"""
+Backfill Progress Checkpoint
+
+Persists which dates and (instrument_key, data_type) files a multi-day
+backfill has already uploaded, so a killed VM resumes where it stopped.
+Fully completed dates are compacted to a single entry to keep the file small.
+The checkpoint lives on local disk or, for preemptible VMs, in GCS
+(``gs://bucket/path.json``).
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background checkpoint writes during a backfill
+CHECKPOINT_FLUSH_INTERVAL = 30
+
+
+class BackfillCheckpoint:
+    """Resumable record of completed backfill dates and files
+
+    ``scope`` identifies the run (data types, venues, shard, ...). A stored
+    checkpoint with a different scope is ignored so changing the run
+    parameters never skips work that was not done.
+    """
+
+    def __init__(self, path: str, scope: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.scope = scope or {}
+        self.completed_dates: Set[str] = set()
+        self.completed_files: Dict[str, Set[str]] = {}
+        self._dirty = False
+
+    def load(self) -> bool:
+        """Load an existing checkpoint; returns True when progress was restored"""
+        raw = self._read()
+        if raw is None:
+            return False
+
+        data = json.loads(raw)
+        if data.get('scope', {}) != self.scope:
+            logger.warning(f"⚠️ Ignoring backfill checkpoint {self.path}: scope changed "
+                           f"({data.get('scope')} -> {self.scope})")
+            return False
+
+        self.completed_dates = set(data.get('completed_dates', []))
+        self.completed_files = {date: set(files) for date, files in data.get('completed_files', {}).items()}
+        logger.info(f"📌 Resuming backfill from {self.path}: {len(self.completed_dates)} dates complete, "
+                    f"{sum(len(f) for f in self.completed_files.values())} files in partial dates")
+        return True
+
+    def is_date_complete(self, date_str: str) -> bool:
+        return date_str in self.completed_dates
+
+    def completed_for(self, date_str: str) -> Set[Tuple[str, str]]:
+        """(instrument_key, data_type) pairs already uploaded for a partially completed date"""
+        return {tuple(entry.rsplit('|', 1)) for entry in self.completed_files.get(date_str, ())}
+
+    def record_file(self, date_str: str, instrument_key: str, data_type: str):
+        self.completed_files.setdefault(date_str, set()).add(f"{instrument_key}|{data_type}")
+        self._dirty = True
+
+    def complete_date(self, date_str: str):
+        """Mark a date fully done and drop its per-file entries"""
+        self.completed_dates.add(date_str)
+        self.completed_files.pop(date_str, None)
+        self._dirty = True
+
+    def dumps(self) -> Optional[str]:
+        """Serialize pending changes (call on the event loop), or None if nothing changed"""
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return json.dumps({
+            'scope': self.scope,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'completed_dates': sorted(self.completed_dates),
+            'completed_files': {date: sorted(files) for date, files in self.completed_files.items()},
+        })
+
+    def save(self):
+        """Write pending changes synchronously"""
+        payload = self.dumps()
+        if payload is not None:
+            self.write(payload)
+
+    def write(self, payload: str):
+        """Write a serialized checkpoint (blocking - safe to run on a worker thread)"""
+        if self.path.startswith('gs://'):
+            self._blob().upload_from_string(payload, content_type='application/json')
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> Optional[str]:
+        if self.path.startswith('gs://'):
+            blob = self._blob()
+            return blob.download_as_text() if blob.exists() else None
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return f.read()
+
+    def _blob(self):
+        from ..utils.gcs_client import get_shared_gcs_bucket
+        bucket_name, _, blob_path = self.path[len('gs://'):].partition('/')
+        return get_shared_gcs_bucket(bucket_name).blob(blob_path)
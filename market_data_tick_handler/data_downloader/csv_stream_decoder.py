@@ -0,0 +1,274 @@
+"""
+Streaming CSV Decoder for Tardis Downloads
+
+Incrementally decompresses Tardis .csv.gz chunks as they arrive from the
+network and decodes them into typed Arrow RecordBatches following
+tardis_schema.md. Peak memory is bounded by the block size rather than
+the size of the daily file.
+"""
+
+import logging
+import zlib
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+logger = logging.getLogger(__name__)
+
+# Default amount of decompressed CSV text parsed per block (bytes)
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Columns used only for validation - dropped after the first block
+VALIDATION_COLUMNS = ('exchange', 'symbol')
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Arrow column types per data type according to tardis_schema.md
+TARDIS_COLUMN_TYPES: Dict[str, Dict[str, pa.DataType]] = {
+    'trades': {
+        'exchange': pa.string(),
+        'symbol': pa.string(),
+        'timestamp': pa.int64(),
+        'local_timestamp': pa.int64(),
+        'id': pa.string(),
+        'side': pa.string(),
+        'price': pa.float64(),
+        'amount': pa.float64(),
+    },
+    'liquidations': {
+        'exchange': pa.string(),
+        'symbol': pa.string(),
+        'timestamp': pa.int64(),
+        'local_timestamp': pa.int64(),
+        'id': pa.string(),
+        'side': pa.string(),
+        'price': pa.float64(),
+        'amount': pa.float64(),
+    },
+    'derivative_ticker': {
+        'exchange': pa.string(),
+        'symbol': pa.string(),
+        'timestamp': pa.int64(),
+        'local_timestamp': pa.int64(),
+        'funding_timestamp': pa.int64(),
+        'funding_rate': pa.float64(),
+        'predicted_funding_rate': pa.float64(),
+        'open_interest': pa.float64(),
+        'last_price': pa.float64(),
+        'index_price': pa.float64(),
+        'mark_price': pa.float64(),
+    },
+    'options_chain': {
+        'exchange': pa.string(),
+        'symbol': pa.string(),
+        'timestamp': pa.int64(),
+        'local_timestamp': pa.int64(),
+        'type': pa.string(),
+        'strike_price': pa.float64(),
+        'expiration': pa.int64(),
+        'open_interest': pa.float64(),
+        'last_price': pa.float64(),
+        'bid_price': pa.float64(),
+        'bid_amount': pa.float64(),
+        'bid_iv': pa.float64(),
+        'ask_price': pa.float64(),
+        'ask_amount': pa.float64(),
+        'ask_iv': pa.float64(),
+        'mark_price': pa.float64(),
+        'mark_iv': pa.float64(),
+        'underlying_index': pa.string(),
+        'underlying_price': pa.float64(),
+        'delta': pa.float64(),
+        'gamma': pa.float64(),
+        'vega': pa.float64(),
+        'theta': pa.float64(),
+        'rho': pa.float64(),
+    },
+    'book_snapshot_5': {
+        'exchange': pa.string(),
+        'symbol': pa.string(),
+        'timestamp': pa.int64(),
+        'local_timestamp': pa.int64(),
+    },
+}
+
+# Nullable pandas dtypes used by TardisConnector._parse_csv_data
+PANDAS_TYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.string(): pd.StringDtype(),
+}
+
+# Convert Tardis format (asks[0].price) to BigQuery-compatible format (ask_price_1)
+for _i in range(5):
+    for _side in ('ask', 'bid'):
+        TARDIS_COLUMN_TYPES['book_snapshot_5'][f'{_side}s[{_i}].price'] = pa.float64()
+        TARDIS_COLUMN_TYPES['book_snapshot_5'][f'{_side}s[{_i}].amount'] = pa.float64()
+
+BOOK_SNAPSHOT_RENAMES = {
+    f'{side}s[{i}].{field}': f'{side}_{"price" if field == "price" else "volume"}_{i + 1}'
+    for i in range(5)
+    for side in ('ask', 'bid')
+    for field in ('price', 'amount')
+}
+
+
+class TardisCsvStreamDecoder:
+    """Incremental gzip -> CSV -> Arrow decoder for a single Tardis file
+
+    Feed raw response chunks with ``feed`` and call ``finish`` once the
+    stream is exhausted. Both return the typed RecordBatches decoded so far
+    with the validation columns (exchange, symbol) already dropped.
+    """
+
+    def __init__(self, data_type: str, block_size: int = DEFAULT_BLOCK_SIZE,
+                 tardis_exchange: str = None, tardis_symbol: str = None):
+        self.data_type = data_type
+        self.block_size = block_size
+        self.tardis_exchange = tardis_exchange
+        self.tardis_symbol = tardis_symbol
+
+        self._decompressor = None
+        self._compressed: Optional[bool] = None
+        self._pending = bytearray()
+        self._header: Optional[List[str]] = None
+        self._column_types: Dict[str, pa.DataType] = dict(TARDIS_COLUMN_TYPES.get(data_type, {}))
+        self._include_columns: Optional[List[str]] = None
+        self._output_names: Optional[List[str]] = None
+        self.schema: Optional[pa.Schema] = None
+
+        # Statistics
+        self.bytes_in = 0
+        self.bytes_decoded = 0
+        self.rows = 0
+
+    def feed(self, chunk: bytes) -> List[pa.RecordBatch]:
+        """Feed a raw (possibly gzipped) chunk and return any complete batches"""
+        if not chunk:
+            return []
+        self.bytes_in += len(chunk)
+        self._pending += self._decompress(chunk)
+
+        if self._header is None and not self._read_header():
+            return []
+
+        if len(self._pending) < self.block_size:
+            return []
+
+        # Only parse up to the last complete line
+        cut = self._pending.rfind(b'\n')
+        if cut < 0:
+            return []
+        block = bytes(self._pending[:cut + 1])
+        del self._pending[:cut + 1]
+        return self._parse_block(block)
+
+    def finish(self) -> List[pa.RecordBatch]:
+        """Flush the decompressor and decode any remaining buffered rows"""
+        if self._decompressor is not None:
+            self._pending += self._decompressor.flush()
+            self._decompressor = None
+
+        if self._header is None and not self._read_header(final=True):
+            return []
+
+        if not self._pending.strip():
+            self._pending.clear()
+            return []
+
+        block = bytes(self._pending)
+        self._pending.clear()
+        return self._parse_block(block)
+
+    def _decompress(self, chunk: bytes) -> bytes:
+        """Decompress a chunk, auto-detecting gzip from the first bytes"""
+        if self._compressed is None:
+            self._compressed = chunk[:2] == GZIP_MAGIC
+            if self._compressed:
+                self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+        if not self._compressed:
+            return chunk
+
+        output = self._decompressor.decompress(chunk)
+        # Concatenated gzip members - start a new decompressor for the remainder
+        while self._decompressor.eof and self._decompressor.unused_data:
+            remainder = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            output += self._decompressor.decompress(remainder)
+        return output
+
+    def _read_header(self, final: bool = False) -> bool:
+        """Consume the CSV header line once it is fully buffered"""
+        newline = self._pending.find(b'\n')
+        if newline < 0:
+            if not final or not self._pending.strip():
+                return False
+            newline = len(self._pending)
+
+        header_line = bytes(self._pending[:newline]).decode('utf-8').strip()
+        del self._pending[:newline + 1]
+        if not header_line:
+            return False
+
+        self._header = header_line.split(',')
+        return True
+
+    def _parse_block(self, block: bytes) -> List[pa.RecordBatch]:
+        """Parse a block of complete CSV lines into typed RecordBatches"""
+        read_options = pacsv.ReadOptions(column_names=self._header, use_threads=True)
+        convert_options = pacsv.ConvertOptions(
+            column_types=self._column_types,
+            include_columns=self._include_columns,
+            strings_can_be_null=True,
+        )
+        table = pacsv.read_csv(pa.BufferReader(block), read_options=read_options,
+                               convert_options=convert_options)
+        self.bytes_decoded += len(block)
+
+        if self.schema is None:
+            table = self._lock_schema(table)
+        elif self._output_names is not None:
+            table = table.rename_columns(self._output_names)
+
+        self.rows += table.num_rows
+        return [batch for batch in table.to_batches() if batch.num_rows > 0]
+
+    def _lock_schema(self, table: pa.Table) -> pa.Table:
+        """Validate the first block and fix column types for the remainder"""
+        self._validate(table)
+
+        # Pin inferred types so every later block decodes to the same schema
+        for name, column_type in zip(table.column_names, table.schema.types):
+            if name not in self._column_types:
+                self._column_types[name] = pa.string() if pa.types.is_null(column_type) else column_type
+        table = table.cast(pa.schema([(name, self._column_types[name]) for name in table.column_names]))
+
+        # Drop validation columns after validation and skip them when parsing later blocks
+        self._include_columns = [name for name in table.column_names if name not in VALIDATION_COLUMNS]
+        table = table.select(self._include_columns)
+
+        if self.data_type == 'book_snapshot_5':
+            self._output_names = [BOOK_SNAPSHOT_RENAMES.get(name, name) for name in self._include_columns]
+            table = table.rename_columns(self._output_names)
+
+        self.schema = table.schema
+        return table
+
+    def _validate(self, table: pa.Table):
+        """Validate that the stream matches the expected exchange and symbol"""
+        for column, expected in (('exchange', self.tardis_exchange), ('symbol', self.tardis_symbol)):
+            if expected is None or column not in table.column_names or table.num_rows == 0:
+                continue
+            actual_values = pc.unique(table.column(column)).to_pylist()
+            if len(actual_values) > 1:
+                logger.warning(f"Multiple {column}s in {self.data_type} data: {actual_values}")
+            elif actual_values[0] is not None and actual_values[0].upper() != expected.upper():
+                logger.warning(f"{column.capitalize()} mismatch in {self.data_type}: expected {expected}, got {actual_values[0]}")
+
+
+def table_to_dataframe(table: pa.Table) -> pd.DataFrame:
+    """Convert a decoded table to pandas with the same dtypes as the buffered parser"""
+    return table.to_pandas(types_mapper=PANDAS_TYPES.get, self_destruct=True)
@@ -7,19 +7,29 @@ following UNIVERSAL_PARTITIONING_STRATEGY.md format.
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
 from google.cloud import storage
-import tempfile
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 import os
 import gc  # For garbage collection
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 from .instrument_reader import InstrumentReader
 from .tardis_connector import TardisConnector
+from .pipeline_scheduler import PipelineItem, PipelineScheduler
+from .size_history import FileSizeHistory, list_sizes_from_gcs
+from .sharding import hash_shard, weighted_shard_assignment
+from .backfill_checkpoint import BackfillCheckpoint, CHECKPOINT_FLUSH_INTERVAL
+from .gcs_manifest import ExistingObjectManifest, list_existing_files
+from ..data_client.gcs_object_index import get_gcs_object_index
+from .parquet_stream_writer import ParquetStreamWriter, PARQUET_WRITE_OPTIONS, DEFAULT_ROW_GROUP_SIZE
 from ..utils.memory_monitor import get_memory_monitor, log_memory_status
+from ..utils.parquet_buffer import ParquetUploadBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +53,37 @@ class DownloadOrchestrator:
         self.max_parallel_uploads = max_parallel_uploads or config.tardis.max_parallel_uploads
         self.max_workers = max_workers or config.tardis.download_max_workers
         self.batch_size = config.service.batch_size  # Use BATCH_SIZE environment variable
+        self.streaming_download = config.tardis.streaming_download  # Stream batches straight into Parquet row groups
+        
+        # Bounded upload stage - blocking GCS uploads run on worker threads so downloads keep flowing
+        self.upload_executor = ThreadPoolExecutor(max_workers=self.max_parallel_uploads, thread_name_prefix='gcs-upload')
+        self.upload_semaphore = asyncio.Semaphore(self.max_parallel_uploads)
+        self.upload_chunk_size = config.gcp.upload_chunk_size_mb * 1024 * 1024
+        self.upload_spill_threshold_mb = config.gcp.upload_spill_threshold_mb
+        
+        # Pipelined scheduler - continuous per-file download/parse/upload stages instead of batch barriers
+        self.pipeline_scheduler = config.tardis.pipeline_scheduler
+        self.parse_workers = config.tardis.parse_workers
+        self.max_bytes_in_flight = config.tardis.max_bytes_in_flight_mb * 1024 * 1024
+        self.parse_executor = ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix='tardis-parse')
+        
+        # Size-aware scheduling - largest files start first so a late giant doesn't set the wall clock
+        self.size_aware_scheduling = config.tardis.size_aware_scheduling
+        self.size_history_path = config.tardis.size_history_path
+        self.size_history_lookback_days = config.tardis.size_history_lookback_days
+        self.size_history = FileSizeHistory()
+        self.sharding_mode = config.sharding.mode  # 'hash' (stable blake2b) or 'weighted' (balanced by expected bytes)
+        self.sharding_size_snapshot = config.sharding.size_snapshot  # Pinned sizes every VM weights by identically
+        self.backfill_checkpoint_path = config.tardis.backfill_checkpoint_path
+        
+        # Incremental mode - files already in GCS are skipped before any Tardis request
+        self.skip_existing = config.tardis.skip_existing
+        self.existing_manifest_path = config.tardis.existing_manifest_path
+        self.existing_manifest = ExistingObjectManifest()
+        self._existing_manifest_loaded = False
+        
+        # Per-day object index used for discovery - every upload is recorded and flushed at batch ends
+        self.object_index = get_gcs_object_index(self.bucket)
         
         # Memory monitoring and batching
         self.memory_monitor = get_memory_monitor(threshold_percent=75.0)  # Lower threshold for proactive cleanup
@@ -57,6 +98,15 @@ class DownloadOrchestrator:
             'memory_usage_samples': []
         }
     
+    async def close(self):
+        """Close the Tardis session and shut down the upload and parse worker threads
+        
+        Call once the orchestrator is no longer needed - runs reuse the worker
+        pools, so they are not shut down at the end of each download.
+        """
+        await self.tardis_connector.close()
+        self.upload_executor.shutdown(wait=True)
+        self.parse_executor.shutdown(wait=True)
     
     async def download_and_upload_data(self, date: datetime, 
                                      venues: list = None,
@@ -98,13 +148,25 @@ class DownloadOrchestrator:
         
         # Apply sharding if specified
         if shard_index is not None and total_shards is not None:
-            targets = self._apply_sharding(targets, shard_index, total_shards)
+            targets = self._apply_sharding(targets, shard_index, total_shards, date=date, data_types=data_types)
             logger.info(f"Applied sharding: shard {shard_index}/{total_shards}, processing {len(targets)} instruments")
         
+        skipped_existing = 0
+        if self.skip_existing and targets:
+            targets, skipped_existing = self._skip_existing_files(targets, date, data_types)
+            if not targets:
+                logger.info(f"✅ All {skipped_existing} files already exist in GCS for {date.strftime('%Y-%m-%d')}")
+                self._save_existing_manifest()
+                return {'status': 'success', 'processed': 0, 'failed': 0, 'uploaded_files': [],
+                        'skipped_existing': skipped_existing}
+        
         if not targets:
             logger.warning("No download targets found")
             return {'status': 'no_targets', 'processed': 0}
         
+        if self.size_aware_scheduling:
+            targets = self._schedule_by_size(targets, date, data_types)
+        
         logger.info(f"Processing {len(targets)} instruments with {self.max_workers} workers and {self.max_parallel_downloads} parallel downloads")
         
         # Performance tracking
@@ -115,36 +177,41 @@ class DownloadOrchestrator:
             'failed': 0,
             'uploaded_files': [],
             'total_instruments': len(targets),
+            'skipped_existing': skipped_existing,
             'start_time': start_time
         }
         
         try:
-            # Process instruments in batches to manage memory
-            for batch_start in range(0, len(targets), self.batch_size):
-                batch_end = min(batch_start + self.batch_size, len(targets))
-                batch_targets = targets[batch_start:batch_end]
-                
-                batch_num = batch_start//self.batch_size + 1
-                total_batches = (len(targets) + self.batch_size - 1) // self.batch_size
-                logger.info(f"📦 Processing batch {batch_num}/{total_batches}: instruments {batch_start+1}-{batch_end} of {len(targets)} ({(batch_num-1)/total_batches*100:.1f}% complete)")
-                
-                # Process batch with parallel downloads
-                batch_results = await self._process_batch_parallel(batch_targets, date, data_types)
-                
-                # Update results
-                results['processed'] += batch_results['processed']
-                results['failed'] += batch_results['failed']
-                results['uploaded_files'].extend(batch_results['uploaded_files'])
-                
-                # Log progress
-                elapsed = time.time() - start_time
-                rate = results['processed'] / elapsed if elapsed > 0 else 0
-                eta = (len(targets) - results['processed'] - results['failed']) / rate if rate > 0 else 0
-                logger.info(f"🚀 Progress: {results['processed'] + results['failed']}/{len(targets)} processed ({(results['processed'] + results['failed'])/len(targets)*100:.1f}%), {rate:.1f} files/sec, ETA: {eta/60:.1f} min")
-                
-                # Force garbage collection after each batch to prevent memory leaks
-                gc.collect()
-                log_memory_status(f"after_batch_{batch_num}")
+            if self.pipeline_scheduler:
+                # Continuous pipeline - no per-batch barrier on the slowest instrument
+                await self._process_targets_pipelined(targets, date, data_types, results, start_time)
+            else:
+                # Process instruments in batches to manage memory
+                for batch_start in range(0, len(targets), self.batch_size):
+                    batch_end = min(batch_start + self.batch_size, len(targets))
+                    batch_targets = targets[batch_start:batch_end]
+                    
+                    batch_num = batch_start//self.batch_size + 1
+                    total_batches = (len(targets) + self.batch_size - 1) // self.batch_size
+                    logger.info(f"📦 Processing batch {batch_num}/{total_batches}: instruments {batch_start+1}-{batch_end} of {len(targets)} ({(batch_num-1)/total_batches*100:.1f}% complete)")
+                    
+                    # Process batch with parallel downloads
+                    batch_results = await self._process_batch_parallel(batch_targets, date, data_types)
+                    
+                    # Update results
+                    results['processed'] += batch_results['processed']
+                    results['failed'] += batch_results['failed']
+                    results['uploaded_files'].extend(batch_results['uploaded_files'])
+                    
+                    # Log progress
+                    elapsed = time.time() - start_time
+                    rate = results['processed'] / elapsed if elapsed > 0 else 0
+                    eta = (len(targets) - results['processed'] - results['failed']) / rate if rate > 0 else 0
+                    logger.info(f"🚀 Progress: {results['processed'] + results['failed']}/{len(targets)} processed ({(results['processed'] + results['failed'])/len(targets)*100:.1f}%), {rate:.1f} files/sec, ETA: {eta/60:.1f} min")
+                    
+                    # Force garbage collection after each batch to prevent memory leaks
+                    gc.collect()
+                    log_memory_status(f"after_batch_{batch_num}")
                 
         finally:
             # Always close the connector, even if an error occurs
@@ -154,6 +221,8 @@ class DownloadOrchestrator:
             self.upload_batch.clear()
             self.upload_batch_size = 0
             gc.collect()
+            self._save_size_history()
+            self._save_existing_manifest()
         
         # Log performance summary
         self.log_performance_summary()
@@ -205,7 +274,7 @@ class DownloadOrchestrator:
         
         # Apply sharding if specified
         if shard_index is not None and total_shards is not None:
-            targets = self._apply_sharding(targets, shard_index, total_shards)
+            targets = self._apply_sharding(targets, shard_index, total_shards, date=date, data_types=data_types)
             logger.info(f"Applied sharding: shard {shard_index}/{total_shards}, processing {len(targets)} missing instruments")
         
         # Apply max_instruments limit
@@ -213,6 +282,18 @@ class DownloadOrchestrator:
             targets = targets[:max_instruments]
             logger.info(f"Limited to {max_instruments} instruments")
         
+        # The missing data report may be stale - drop files uploaded since it was generated
+        skipped_existing = 0
+        if self.skip_existing:
+            targets, skipped_existing = self._skip_existing_files(targets, date, data_types)
+            if not targets:
+                logger.info(f"✅ All {skipped_existing} reported files already exist in GCS for {date.strftime('%Y-%m-%d')}")
+                self._save_existing_manifest()
+                return {'status': 'no_missing_data', 'processed': 0, 'skipped_existing': skipped_existing}
+        
+        if self.size_aware_scheduling:
+            targets = self._schedule_by_size(targets, date, data_types)
+        
         logger.info(f"🎯 Processing {len(targets)} missing instruments with {self.max_workers} workers and {self.max_parallel_downloads} parallel downloads")
         logger.info(f"⚙️  Configuration: Batch size={self.batch_size}, Memory threshold=85%, Upload parallelism={self.max_parallel_uploads}")
         
@@ -224,36 +305,41 @@ class DownloadOrchestrator:
             'failed': 0,
             'uploaded_files': [],
             'total_missing_instruments': len(targets),
+            'skipped_existing': skipped_existing,
             'start_time': start_time
         }
         
         try:
-            # Process instruments in batches to manage memory
-            for batch_start in range(0, len(targets), self.batch_size):
-                batch_end = min(batch_start + self.batch_size, len(targets))
-                batch_targets = targets[batch_start:batch_end]
-                
-                batch_num = batch_start//self.batch_size + 1
-                total_batches = (len(targets) + self.batch_size - 1) // self.batch_size
-                logger.info(f"📦 Processing batch {batch_num}/{total_batches}: instruments {batch_start+1}-{batch_end} of {len(targets)} ({(batch_num-1)/total_batches*100:.1f}% complete)")
-                
-                # Process batch with parallel downloads
-                batch_results = await self._process_batch_parallel(batch_targets, date, data_types)
-                
-                # Update results
-                results['processed'] += batch_results['processed']
-                results['failed'] += batch_results['failed']
-                results['uploaded_files'].extend(batch_results['uploaded_files'])
-                
-                # Log progress
-                elapsed = time.time() - start_time
-                rate = results['processed'] / elapsed if elapsed > 0 else 0
-                eta = (len(targets) - results['processed'] - results['failed']) / rate if rate > 0 else 0
-                logger.info(f"🚀 Progress: {results['processed'] + results['failed']}/{len(targets)} processed ({(results['processed'] + results['failed'])/len(targets)*100:.1f}%), {rate:.1f} files/sec, ETA: {eta/60:.1f} min")
-                
-                # Force garbage collection after each batch to prevent memory leaks
-                gc.collect()
-                log_memory_status(f"after_missing_batch_{batch_num}")
+            if self.pipeline_scheduler:
+                # Continuous pipeline - no per-batch barrier on the slowest instrument
+                await self._process_targets_pipelined(targets, date, data_types, results, start_time)
+            else:
+                # Process instruments in batches to manage memory
+                for batch_start in range(0, len(targets), self.batch_size):
+                    batch_end = min(batch_start + self.batch_size, len(targets))
+                    batch_targets = targets[batch_start:batch_end]
+                    
+                    batch_num = batch_start//self.batch_size + 1
+                    total_batches = (len(targets) + self.batch_size - 1) // self.batch_size
+                    logger.info(f"📦 Processing batch {batch_num}/{total_batches}: instruments {batch_start+1}-{batch_end} of {len(targets)} ({(batch_num-1)/total_batches*100:.1f}% complete)")
+                    
+                    # Process batch with parallel downloads
+                    batch_results = await self._process_batch_parallel(batch_targets, date, data_types)
+                    
+                    # Update results
+                    results['processed'] += batch_results['processed']
+                    results['failed'] += batch_results['failed']
+                    results['uploaded_files'].extend(batch_results['uploaded_files'])
+                    
+                    # Log progress
+                    elapsed = time.time() - start_time
+                    rate = results['processed'] / elapsed if elapsed > 0 else 0
+                    eta = (len(targets) - results['processed'] - results['failed']) / rate if rate > 0 else 0
+                    logger.info(f"🚀 Progress: {results['processed'] + results['failed']}/{len(targets)} processed ({(results['processed'] + results['failed'])/len(targets)*100:.1f}%), {rate:.1f} files/sec, ETA: {eta/60:.1f} min")
+                    
+                    # Force garbage collection after each batch to prevent memory leaks
+                    gc.collect()
+                    log_memory_status(f"after_missing_batch_{batch_num}")
                 
         finally:
             # Always close the connector, even if an error occurs
@@ -263,6 +349,8 @@ class DownloadOrchestrator:
             self.upload_batch.clear()
             self.upload_batch_size = 0
             gc.collect()
+            self._save_size_history()
+            self._save_existing_manifest()
         
         # Log performance summary
         self.log_performance_summary()
@@ -270,6 +358,232 @@ class DownloadOrchestrator:
         logger.info(f"Missing data download completed: {results['processed']} processed, {results['failed']} failed")
         return results
     
+    async def backfill_date_range(self, start_date: datetime, end_date: datetime,
+                                  venues: list = None,
+                                  instrument_types: list = None,
+                                  data_types: list = None,
+                                  max_instruments: int = None,
+                                  shard_index: int = None,
+                                  total_shards: int = None,
+                                  checkpoint_path: str = None) -> dict:
+        """
+        Download a date range through one pipeline and one Tardis session
+        
+        All (date, instrument, data_type) files share a single work queue, so
+        day boundaries overlap instead of draining the pipeline every day. The
+        next day's instrument definitions are read while the current day is
+        downloading. Progress is checkpointed so a killed VM resumes where it
+        stopped.
+        
+        Args:
+            start_date: First date to download
+            end_date: Last date to download (inclusive)
+            venues: List of venues to include
+            instrument_types: List of instrument types to include
+            data_types: List of data types to download
+            max_instruments: Maximum number of instruments per day
+            shard_index: Shard index for distributed processing (0-based)
+            total_shards: Total number of shards for distributed processing
+            checkpoint_path: Local path or gs:// URI of the progress checkpoint
+                (defaults to TARDIS_BACKFILL_CHECKPOINT_PATH, disabled when empty)
+            
+        Returns:
+            dict: Backfill results summary
+        """
+        total_days = (end_date - start_date).days + 1
+        logger.info(f"🚀 Starting backfill of {total_days} days: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        
+        checkpoint_path = checkpoint_path or self.backfill_checkpoint_path
+        checkpoint = None
+        if checkpoint_path:
+            checkpoint = BackfillCheckpoint(checkpoint_path, scope={
+                'venues': sorted(venues) if venues else None,
+                'instrument_types': sorted(instrument_types) if instrument_types else None,
+                'data_types': sorted(data_types) if data_types else None,
+                'max_instruments': max_instruments,
+                'shard_index': shard_index,
+                'total_shards': total_shards
+            })
+            checkpoint.load()
+        
+        start_time = time.time()
+        results = {
+            'status': 'success',
+            'total_days': total_days,
+            'processed_days': 0,
+            'skipped_days': 0,
+            'processed': 0,
+            'failed': 0,
+            'skipped': 0,
+            'skipped_existing': 0,
+            'uploaded_files': [],
+            'errors': [],
+            'start_time': start_time
+        }
+        progress = self._create_pipeline_progress(results, start_time)
+        days = {}  # date_str -> {'remaining': files in flight, 'failed': failed files, 'enqueued': all files queued}
+        
+        def finish_day(date_str: str):
+            day = days[date_str]
+            if not day['enqueued'] or day['remaining'] > 0:
+                return
+            results['processed_days'] += 1
+            if day['failed']:
+                logger.warning(f"⚠️ Finished {date_str} with {day['failed']} failed files")
+            else:
+                logger.info(f"✅ Finished {date_str} ({results['processed_days']}/{total_days - results['skipped_days']} days)")
+                if checkpoint:
+                    checkpoint.complete_date(date_str)
+            del days[date_str]
+        
+        def on_complete(item: PipelineItem, gcs_file: str, error: Exception):
+            date_str = item.date.strftime('%Y-%m-%d')
+            days[date_str]['remaining'] -= 1
+            if error is not None:
+                days[date_str]['failed'] += 1
+            elif checkpoint:
+                checkpoint.record_file(date_str, item.instrument_key, item.data_type)
+            self._on_pipeline_file_complete(progress, item, gcs_file, error)
+            finish_day(date_str)
+        
+        def fetch_day(date: datetime, unlisted_types: List[str]) -> Tuple[List[Dict], Dict[str, Set[str]], List[Tuple[str, str, int]]]:
+            # Blocking GCS reads only - runs on a worker thread while the pipeline keeps downloading.
+            # The manifest and size history are shared with the event loop, so the listings
+            # are returned and merged there instead of being recorded here.
+            targets = self.instrument_reader.get_download_targets(
+                date=date,
+                venues=venues,
+                instrument_types=instrument_types,
+                max_instruments=max_instruments
+            )
+            if targets and shard_index is not None and total_shards is not None:
+                targets = self._apply_sharding(targets, shard_index, total_shards, date=date, data_types=data_types)
+            listing = {}
+            if targets and unlisted_types:
+                listing = list_existing_files(self.bucket, date, unlisted_types)
+            sizes = []
+            if targets and self.size_aware_scheduling and self.size_history_lookback_days > 0:
+                try:
+                    sizes = list_sizes_from_gcs(self.bucket, date, self.size_history_lookback_days)
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not load file sizes from GCS: {e}")
+            return targets, listing, sizes
+        
+        async def produce_items():
+            loop = asyncio.get_running_loop()
+            pending_dates = []
+            current_date = start_date
+            while current_date <= end_date:
+                if checkpoint and checkpoint.is_date_complete(current_date.strftime('%Y-%m-%d')):
+                    results['skipped_days'] += 1
+                else:
+                    pending_dates.append(current_date)
+                current_date += timedelta(days=1)
+            
+            if results['skipped_days']:
+                logger.info(f"⏭️  Skipping {results['skipped_days']} days already completed in checkpoint")
+            
+            # Local caches are read once up front; only GCS listings are fetched per day
+            if self.skip_existing:
+                self._load_existing_manifest_cache()
+            if self.size_aware_scheduling:
+                self._load_size_history_cache()
+            requested_data_types = data_types or ['trades', 'book_snapshot_5', 'derivative_ticker', 'liquidations', 'options_chain']
+            
+            def prefetch(date: datetime):
+                unlisted_types = []
+                if self.skip_existing:
+                    listed = self.existing_manifest.listed.get(date.strftime('%Y-%m-%d'), set())
+                    unlisted_types = [dt for dt in requested_data_types if dt not in listed]
+                return loop.run_in_executor(None, fetch_day, date, unlisted_types)
+            
+            # Prefetch the next day's targets while the current day's files are queued
+            next_targets = prefetch(pending_dates[0]) if pending_dates else None
+            for i, date in enumerate(pending_dates):
+                date_str = date.strftime('%Y-%m-%d')
+                try:
+                    targets, listing, sizes = await next_targets
+                    if listing:
+                        self.existing_manifest.merge_listing(date_str, listing)
+                    self.size_history.record_sizes(sizes)
+                    if targets and self.skip_existing:
+                        targets, skipped_existing = self._skip_existing_files(targets, date, data_types)
+                        results['skipped_existing'] += skipped_existing
+                except Exception as e:
+                    results['errors'].append(f"Error loading targets for {date_str}: {e}")
+                    logger.error(f"❌ Could not load download targets for {date_str}: {e}")
+                    targets = None  # Not complete - retried on resume
+                next_targets = prefetch(pending_dates[i + 1]) if i + 1 < len(pending_dates) else None
+                
+                if targets is None:
+                    continue
+                if not targets:
+                    # Nothing to download (no instruments, sharded away, or already in GCS) - done for this scope
+                    logger.warning(f"No download targets found for {date_str}")
+                    days[date_str] = {'remaining': 0, 'failed': 0, 'enqueued': True}
+                    finish_day(date_str)
+                    continue
+                
+                progress['total'] += len(targets)
+                items = self._build_pipeline_items(
+                    targets, date, data_types, progress,
+                    skip_files=checkpoint.completed_for(date_str) if checkpoint else None
+                )
+                logger.info(f"📅 Queued {date_str}: {len(targets)} instruments, {len(items)} files")
+                
+                days[date_str] = {'remaining': len(items), 'failed': 0, 'enqueued': False}
+                for item in items:
+                    yield item
+                days[date_str]['enqueued'] = True
+                finish_day(date_str)
+        
+        pending_write = {'future': None}  # In-flight checkpoint write - cancelling the flusher does not stop it
+        
+        async def flush_checkpoint():
+            loop = asyncio.get_running_loop()
+            while True:
+                await asyncio.sleep(CHECKPOINT_FLUSH_INTERVAL)
+                payload = checkpoint.dumps()
+                if payload is not None:
+                    pending_write['future'] = loop.run_in_executor(None, checkpoint.write, payload)
+                    try:
+                        # Shielded so cancelling the flusher leaves the future pending until the thread finishes
+                        await asyncio.shield(pending_write['future'])
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not write backfill checkpoint: {e}")
+        
+        flusher = asyncio.ensure_future(flush_checkpoint()) if checkpoint else None
+        try:
+            await self._run_pipeline(produce_items(), on_complete)
+        finally:
+            if flusher:
+                flusher.cancel()
+                # Let an in-flight write finish so the final save cannot be overwritten by an older payload
+                if pending_write['future'] is not None:
+                    try:
+                        await pending_write['future']
+                    except Exception:
+                        pass  # Already logged by the flusher
+                payload = checkpoint.dumps()
+                if payload is not None:
+                    try:
+                        await asyncio.get_running_loop().run_in_executor(None, checkpoint.write, payload)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not write backfill checkpoint: {e}")
+            
+            # One shared session for the whole range - closed only once
+            await self.tardis_connector.close()
+            gc.collect()
+            self._save_size_history()
+            self._save_existing_manifest()
+        
+        self.log_performance_summary()
+        
+        logger.info(f"Backfill completed: {results['processed_days']} days, {results['processed']} processed, "
+                   f"{results['failed']} failed, {results['skipped']} skipped, {results['skipped_days']} days already complete, "
+                   f"{results['skipped_existing']} files already in GCS")
+        return results
+    
     def _convert_missing_data_to_targets(self, missing_df: pd.DataFrame, venues: list = None, 
                                        instrument_types: list = None, data_types: list = None) -> List[Dict]:
         """Convert missing data DataFrame to download targets using instrument definitions"""
@@ -409,16 +723,7 @@ class DownloadOrchestrator:
                 download_start = time.time()
                 try:
                     # Validate data types against instrument definition
-                    requested_data_types = data_types or ['trades', 'book_snapshot_5', 'derivative_ticker', 'liquidations', 'options_chain']
-                    instrument_data_types = target.get('data_types', '').split(',') if target.get('data_types') else []
-                    
-                    # Filter to only valid data types for this instrument
-                    valid_data_types = []
-                    for data_type in requested_data_types:
-                        if data_type in instrument_data_types:
-                            valid_data_types.append(data_type)
-                        else:
-                            logger.info(f"Skipping {data_type} for {target['instrument_key']} - not available in instrument definition (available: {instrument_data_types})")
+                    valid_data_types = self._get_valid_data_types(target, data_types)
                     
                     if not valid_data_types:
                         logger.warning(f"No valid data types for {target['instrument_key']}, skipping download")
@@ -428,6 +733,18 @@ class DownloadOrchestrator:
                             'instrument_key': target['instrument_key']
                         }
                     
+                    # Pipelined path: decoded batches go straight into Parquet row groups
+                    if self.streaming_download:
+                        uploaded_files = await self._stream_to_gcs(target, date, valid_data_types)
+                        download_time = time.time() - download_start
+                        self.performance_metrics['total_download_time'] += download_time
+                        return {
+                            'success': True,
+                            'instrument_key': target['instrument_key'],
+                            'download_time': download_time,
+                            'uploaded_files': uploaded_files
+                        }
+                    
                     # Download data
                     download_results = await self.tardis_connector.download_daily_data_direct(
                         tardis_exchange=target['tardis_exchange'],
@@ -519,21 +836,314 @@ class DownloadOrchestrator:
             'batch_time': batch_time
         }
     
-    def _apply_sharding(self, targets: List[Dict], shard_index: int, total_shards: int) -> List[Dict]:
-        """Apply sharding to distribute instruments across multiple VMs"""
-        if shard_index < 0 or shard_index >= total_shards:
-            raise ValueError(f"Shard index {shard_index} must be between 0 and {total_shards-1}")
+    def _load_size_history(self, date: datetime):
+        """Seed the size history from the local index and previous days in GCS (best effort)"""
+        self._load_size_history_cache()
+        
+        if self.size_history_lookback_days > 0:
+            try:
+                self.size_history.load_from_gcs(self.bucket, date, self.size_history_lookback_days)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not load file sizes from GCS: {e}")
+    
+    def _load_size_history_cache(self):
+        """Seed the size history from the local index, if configured (best effort)"""
+        if not self.size_history_path:
+            return
+        try:
+            self.size_history.load(self.size_history_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load size history from {self.size_history_path}: {e}")
+    
+    def _save_size_history(self):
+        """Persist sizes observed in this run to the local index, if configured"""
+        if not self.size_history_path or not len(self.size_history):
+            return
+        try:
+            self.size_history.save(self.size_history_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save size history to {self.size_history_path}: {e}")
+    
+    def _schedule_by_size(self, targets: List[Dict], date: datetime, data_types: List[str]) -> List[Dict]:
+        """Order targets largest-first by expected bytes from the size history"""
+        self._load_size_history(date)
+        ordered = self.size_history.order_largest_first(targets, data_types)
+        
+        if ordered:
+            largest = ordered[0]
+            expected_mb = self.size_history.estimate_target(largest, self._get_valid_data_types(largest, data_types, log_skipped=False)) / 1024 / 1024
+            logger.info(f"📏 Size-aware scheduling: {len(ordered)} instruments, largest first: "
+                       f"{largest['instrument_key']} (~{expected_mb:.1f}MB expected)")
+        return ordered
+    
+    def _get_valid_data_types(self, target: Dict, data_types: List[str], log_skipped: bool = True) -> List[str]:
+        """Filter the requested data types to those available in the instrument definition"""
+        requested_data_types = data_types or ['trades', 'book_snapshot_5', 'derivative_ticker', 'liquidations', 'options_chain']
+        instrument_data_types = target.get('data_types', '').split(',') if target.get('data_types') else []
+        
+        valid_data_types = []
+        for data_type in requested_data_types:
+            if data_type in instrument_data_types:
+                valid_data_types.append(data_type)
+            elif log_skipped:
+                logger.info(f"Skipping {data_type} for {target['instrument_key']} - not available in instrument definition (available: {instrument_data_types})")
+        
+        return valid_data_types
+    
+    def _skip_existing_files(self, targets: List[Dict], date: datetime, data_types: List[str]) -> Tuple[List[Dict], int]:
+        """Drop files already in GCS; returns the remaining targets and the number of files skipped
+        
+        Targets with some files present keep only their missing data types.
+        Targets with no valid data types are passed through so they are still
+        reported as failures.
+        """
+        date_str = date.strftime('%Y-%m-%d')
+        self._load_existing_manifest(date, data_types)
         
-        sharded_targets = []
+        remaining = []
+        skipped_files = 0
         for target in targets:
-            # Use hash of instrument_key for consistent sharding
-            instrument_key = target['instrument_key']
-            hash_value = hash(instrument_key)
-            target_shard = abs(hash_value) % total_shards
+            valid_data_types = self._get_valid_data_types(target, data_types, log_skipped=False)
+            missing = [dt for dt in valid_data_types
+                       if not self.existing_manifest.contains(date_str, dt, target['instrument_key'])]
+            skipped_files += len(valid_data_types) - len(missing)
+            if not valid_data_types or len(missing) == len(valid_data_types):
+                remaining.append(target)
+            elif missing:
+                remaining.append({**target, 'data_types': ','.join(missing)})
+        
+        logger.info(f"⏭️  Skip-existing: {skipped_files} files already in GCS for {date_str}, "
+                   f"{len(remaining)}/{len(targets)} instruments still need downloads")
+        return remaining, skipped_files
+    
+    def _load_existing_manifest(self, date: datetime, data_types: List[str]):
+        """Fill the manifest for a day from the local cache or one GCS listing per data type"""
+        self._load_existing_manifest_cache()
+        
+        requested_data_types = data_types or ['trades', 'book_snapshot_5', 'derivative_ticker', 'liquidations', 'options_chain']
+        if not self.existing_manifest.has_day(date.strftime('%Y-%m-%d'), requested_data_types):
+            self.existing_manifest.load_from_gcs(self.bucket, date, requested_data_types)
+    
+    def _load_existing_manifest_cache(self):
+        """Load the local manifest cache once per orchestrator, if configured"""
+        if not self.existing_manifest_path or self._existing_manifest_loaded:
+            return
+        self._existing_manifest_loaded = True
+        try:
+            self.existing_manifest.load(self.existing_manifest_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load existing-file manifest from {self.existing_manifest_path}: {e}")
+    
+    def _save_existing_manifest(self):
+        """Flush this run's uploads to the GCS object index and persist the manifest to the local cache, if configured"""
+        self.object_index.flush()
+        if not self.skip_existing or not self.existing_manifest_path:
+            return
+        try:
+            self.existing_manifest.save(self.existing_manifest_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save existing-file manifest to {self.existing_manifest_path}: {e}")
+    
+    def _record_upload(self, instrument_key: str, data_type: str, date: datetime, file_size_mb: float):
+        """Track a finished upload in the size history and the existing-file manifest"""
+        self.size_history.record(instrument_key, data_type, int(file_size_mb * 1024 * 1024))
+        if self.skip_existing:
+            self.existing_manifest.add(date.strftime('%Y-%m-%d'), data_type, instrument_key)
+    
+    async def _process_targets_pipelined(self, targets: List[Dict], date: datetime, data_types: List[str],
+                                         results: Dict[str, Any], start_time: float):
+        """Process targets through the continuous download -> parse -> upload pipeline
+        
+        Work is scheduled per (instrument, data_type) file, so one huge file only
+        occupies a single worker. Instrument results are aggregated into results
+        as each instrument's last file completes.
+        """
+        progress = self._create_pipeline_progress(results, start_time, total=len(targets))
+        items = self._build_pipeline_items(targets, date, data_types, progress)
+        
+        await self._run_pipeline(items, functools.partial(self._on_pipeline_file_complete, progress))
+    
+    def _create_pipeline_progress(self, results: Dict[str, Any], start_time: float, total: int = 0) -> Dict[str, Any]:
+        """Per-instrument bookkeeping shared by the pipeline completion callbacks"""
+        return {'results': results, 'start_time': start_time, 'total': total, 'instruments': {}}
+    
+    def _build_pipeline_items(self, targets: List[Dict], date: datetime, data_types: List[str],
+                              progress: Dict[str, Any], skip_files: set = None) -> List[PipelineItem]:
+        """Expand targets into per-file pipeline items and register each instrument's pending files
+        
+        skip_files holds (instrument_key, data_type) pairs that are already done
+        and are not scheduled again.
+        """
+        results = progress['results']
+        date_str = date.strftime('%Y-%m-%d')
+        items = []
+        for target in targets:
+            valid_data_types = self._get_valid_data_types(target, data_types)
+            if not valid_data_types:
+                logger.warning(f"No valid data types for {target['instrument_key']}, skipping download")
+                results['failed'] += 1
+                continue
+            
+            if skip_files:
+                valid_data_types = [dt for dt in valid_data_types if (target['instrument_key'], dt) not in skip_files]
+                if not valid_data_types:
+                    results['skipped'] = results.get('skipped', 0) + 1
+                    continue
             
-            if target_shard == shard_index:
-                sharded_targets.append(target)
+            progress['instruments'][(date_str, target['instrument_key'])] = {
+                'remaining': len(valid_data_types), 'uploaded_files': [], 'errors': []
+            }
+            items.extend(PipelineItem(target=target, data_type=data_type, date=date) for data_type in valid_data_types)
+        
+        if self.size_aware_scheduling:
+            # Reserve expected bytes up front and start the largest files first
+            for item in items:
+                item.estimated_bytes = self.size_history.estimate(item.instrument_key, item.data_type)
+            items.sort(key=lambda item: item.estimated_bytes, reverse=True)
+        
+        return items
+    
+    def _on_pipeline_file_complete(self, progress: Dict[str, Any], item: PipelineItem, gcs_file: str, error: Exception):
+        """Roll a finished file up into its instrument and log progress when the instrument is done"""
+        results = progress['results']
+        state_key = (item.date.strftime('%Y-%m-%d'), item.instrument_key)
+        state = progress['instruments'][state_key]
+        state['remaining'] -= 1
+        if error is not None:
+            logger.error(f"❌ Failed to process {item.data_type} for {item.instrument_key}: {error}")
+            state['errors'].append(f"{item.data_type}: {error}")
+        else:
+            state['uploaded_files'].append(gcs_file)
+        
+        if state['remaining'] > 0:
+            return
+        
+        total = progress['total']
+        done = results['processed'] + results['failed'] + results.get('skipped', 0) + 1
+        if state['errors']:
+            results['failed'] += 1
+            logger.warning(f"  ⚠️  {done}/{total}: {item.instrument_key} - {'; '.join(state['errors'])}")
+        else:
+            results['processed'] += 1
+            results['uploaded_files'].extend(state['uploaded_files'])
+            logger.info(f"  ✅ {done}/{total}: {item.instrument_key}")
+        del progress['instruments'][state_key]
+        
+        if done % self.batch_size == 0 or done == total:
+            elapsed = time.time() - progress['start_time']
+            rate = results['processed'] / elapsed if elapsed > 0 else 0
+            eta = (total - done) / rate if rate > 0 else 0
+            logger.info(f"🚀 Progress: {done}/{total} processed ({done/total*100:.1f}%), {rate:.1f} files/sec, ETA: {eta/60:.1f} min")
+            log_memory_status(f"pipeline_{done}_instruments")
+    
+    async def _run_pipeline(self, items, on_complete) -> Dict[str, Any]:
+        """Run items (list or async iterable) through a PipelineScheduler built from this orchestrator's settings"""
+        scheduler = PipelineScheduler(
+            download=self._pipeline_stream if self.streaming_download else self._pipeline_download,
+            parse=None if self.streaming_download else self._pipeline_parse,
+            upload=self._pipeline_upload,
+            download_workers=self.max_workers,
+            parse_workers=self.parse_workers,
+            upload_workers=self.max_parallel_uploads,
+            max_bytes_in_flight=self.max_bytes_in_flight,
+            on_complete=on_complete
+        )
+        
+        logger.info(f"🚀 Pipelining {len(items) if isinstance(items, list) else 'streamed'} files: {self.max_workers} download, "
+                   f"{self.parse_workers} parse, {self.max_parallel_uploads} upload workers, "
+                   f"{self.max_bytes_in_flight / 1024 / 1024:.0f}MB in flight")
+        stats = await scheduler.run(items)
+        
+        self.performance_metrics['total_download_time'] += stats['stage_time']['download']
+        self.performance_metrics['total_upload_time'] += stats['stage_time']['upload']
+        logger.info(f"✅ Pipeline completed: {stats['completed']} files, {stats['failed']} failed, "
+                   f"peak {stats['peak_bytes_in_flight'] / 1024 / 1024:.1f}MB in flight")
+        return stats
+    
+    async def _pipeline_download(self, item: PipelineItem) -> bytes:
+        """Pipeline download stage - fetch the raw compressed file"""
+        return await self.tardis_connector.fetch_daily_file(
+            item.target['tardis_exchange'], item.target['tardis_symbol'], item.date, item.data_type
+        )
+    
+    async def _pipeline_parse(self, item: PipelineItem, data: bytes) -> pd.DataFrame:
+        """Pipeline parse stage - decode on the parse pool so the event loop keeps downloading"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_executor, functools.partial(
+            self.tardis_connector.parse_daily_file,
+            data, item.data_type, item.target['tardis_exchange'], item.target['tardis_symbol']
+        ))
+    
+    async def _pipeline_stream(self, item: PipelineItem) -> ParquetUploadBuffer:
+        """Pipeline download stage for streaming mode - download and decode straight into Parquet"""
+        return await self._stream_to_buffer(item.target, item.date, item.data_type)
+    
+    async def _pipeline_upload(self, item: PipelineItem, payload) -> str:
+        """Pipeline upload stage - upload a DataFrame or a finished Parquet buffer"""
+        gcs_path = self._create_gcs_path(item.target, item.date, item.data_type)
+        
+        if isinstance(payload, ParquetUploadBuffer):
+            with payload:
+                blob = self.bucket.blob(gcs_path)
+                file_size_mb = await self._run_upload(self._upload_buffer_with_retry, blob, payload, gcs_path)
+        else:
+            if payload.empty:
+                logger.info(f"📭 Uploading empty {item.data_type} file with schema for {item.instrument_key}")
+            file_size_mb = await self._run_upload(self._write_and_upload_dataframe, payload, gcs_path)
+        
+        self.performance_metrics['total_data_size_mb'] += file_size_mb
+        self.performance_metrics['total_files_processed'] += 1
+        self._record_upload(item.instrument_key, item.data_type, item.date, file_size_mb)
+        return f"gs://{self.gcs_bucket}/{gcs_path}"
+    
+    def _apply_sharding(self, targets: List[Dict], shard_index: int, total_shards: int,
+                        date: datetime = None, data_types: List[str] = None) -> List[Dict]:
+        """Apply sharding to distribute instruments across multiple VMs
+        
+        Assignment is deterministic across processes. In weighted mode (needs
+        date) instruments are bin-packed by expected bytes so shards finish
+        at about the same time.
+        """
+        if shard_index < 0 or shard_index >= total_shards:
+            raise ValueError(f"Shard index {shard_index} must be between 0 and {total_shards-1}")
+        
+        if self.sharding_mode == 'weighted' and date is not None:
+            return self._apply_weighted_sharding(targets, shard_index, total_shards, date, data_types)
+        
+        # Stable hash of instrument_key - the same on every VM regardless of PYTHONHASHSEED
+        return [target for target in targets if hash_shard(target['instrument_key'], total_shards) == shard_index]
+    
+    def _apply_weighted_sharding(self, targets: List[Dict], shard_index: int, total_shards: int,
+                                 date: datetime, data_types: List[str]) -> List[Dict]:
+        """Bin-pack instruments into shards by expected bytes from the pinned size snapshot
+        
+        Weights must be identical on every VM, so they come only from the
+        immutable snapshot - never from live listings or a per-VM local index.
+        Without a readable snapshot, hash sharding is used.
+        """
+        if not self.sharding_size_snapshot:
+            logger.warning("⚠️ Weighted sharding needs a pinned size snapshot (SHARDING_SIZE_SNAPSHOT), "
+                           "falling back to hash sharding")
+            return [target for target in targets if hash_shard(target['instrument_key'], total_shards) == shard_index]
         
+        history = FileSizeHistory()
+        try:
+            history.load_snapshot(self.gcs_client, self.sharding_size_snapshot)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load size snapshot for weighted sharding, falling back to hash sharding: {e}")
+            return [target for target in targets if hash_shard(target['instrument_key'], total_shards) == shard_index]
+        
+        weights = {
+            target['instrument_key']: history.estimate_target(target, self._get_valid_data_types(target, data_types, log_skipped=False))
+            for target in targets
+        }
+        assignment = weighted_shard_assignment(weights, total_shards)
+        sharded_targets = [target for target in targets if assignment[target['instrument_key']] == shard_index]
+        
+        shard_bytes = sum(weights[target['instrument_key']] for target in sharded_targets)
+        mean_bytes = sum(weights.values()) / total_shards if total_shards else 0
+        logger.info(f"⚖️  Weighted sharding: shard {shard_index} expects {shard_bytes / 1024 / 1024:.1f}MB "
+                   f"(mean {mean_bytes / 1024 / 1024:.1f}MB per shard)")
         return sharded_targets
     
     async def _add_to_upload_batch(self, upload_task: Dict[str, Any]):
@@ -555,17 +1165,22 @@ class DownloadOrchestrator:
         if not self.upload_batch:
             return
         
+        # Take ownership of the pending batch so instruments finishing during the upload start a new one
+        upload_batch = self.upload_batch
+        self.upload_batch = []
+        self.upload_batch_size = 0
+        
         upload_start_time = time.time()
-        logger.info(f"📤 Uploading batch of {len(self.upload_batch)} instruments to GCS")
+        logger.info(f"📤 Uploading batch of {len(upload_batch)} instruments to GCS")
         
-        # Create upload tasks for parallel execution
+        # Create upload tasks for parallel execution (bounded by the upload pool)
         upload_tasks = []
-        for upload_task in self.upload_batch:
-            task = self._upload_single_to_gcs(
+        for upload_task in upload_batch:
+            task = asyncio.ensure_future(self._upload_single_to_gcs(
                 upload_task['download_results'],
                 upload_task['target'],
                 upload_task['date']
-            )
+            ))
             upload_tasks.append(task)
         
         # Execute all uploads in parallel with connection pooling and timeout
@@ -590,7 +1205,7 @@ class DownloadOrchestrator:
         for i, result in enumerate(upload_results):
             if isinstance(result, Exception):
                 failed_uploads += 1
-                logger.error(f"❌ Upload failed for {self.upload_batch[i]['target']['instrument_key']}: {result}")
+                logger.error(f"❌ Upload failed for {upload_batch[i]['target']['instrument_key']}: {result}")
             else:
                 successful_uploads += 1
                 total_files += len(result)
@@ -602,9 +1217,8 @@ class DownloadOrchestrator:
         logger.info(f"✅ Batch upload completed: {successful_uploads} successful, {failed_uploads} failed, "
                    f"{total_files} files, {upload_time:.2f}s")
         
-        # Clear the batch and force garbage collection
-        self.upload_batch.clear()
-        self.upload_batch_size = 0
+        # Release the batch and force garbage collection
+        upload_batch.clear()
         gc.collect()
         
         # Log memory status after upload
@@ -612,7 +1226,17 @@ class DownloadOrchestrator:
     
     async def _upload_single_to_gcs(self, download_results: dict, target: dict, date: datetime) -> list:
         """Upload a single instrument's data to GCS (used in batched uploads)"""
-        uploaded_files = []
+        # Re-raise failures so the batch upload can track them
+        return await self._upload_dataframes(download_results, target, date, raise_on_error=True)
+    
+    async def _upload_to_gcs(self, download_results: dict, target: dict, date: datetime) -> list:
+        """Upload downloaded data to GCS with optimized single partition strategy"""
+        return await self._upload_dataframes(download_results, target, date, raise_on_error=False)
+    
+    async def _upload_dataframes(self, download_results: dict, target: dict, date: datetime,
+                                 raise_on_error: bool) -> list:
+        """Upload every data type of one instrument concurrently on the upload pool"""
+        pending_uploads = []
         
         for data_type, df in download_results.items():
             # Skip if df is None (indicating download failure) or empty list (no data available)
@@ -635,177 +1259,182 @@ class DownloadOrchestrator:
             
             # Create single partition path (optimized strategy)
             gcs_path = self._create_gcs_path(target, date, data_type)
+            pending_uploads.append((data_type, gcs_path, df))
+        
+        results = await asyncio.gather(
+            *[self._run_upload(self._write_and_upload_dataframe, df, gcs_path)
+              for _, gcs_path, df in pending_uploads],
+            return_exceptions=True
+        )
+        
+        uploaded_files = []
+        upload_error = None
+        for (data_type, gcs_path, _), result in zip(pending_uploads, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ Failed to upload {data_type} data: {result}")
+                upload_error = upload_error or result
+                continue
+            
+            self.performance_metrics['total_data_size_mb'] += result
+            self._record_upload(target['instrument_key'], data_type, date, result)
+            uploaded_files.append(f"gs://{self.gcs_bucket}/{gcs_path}")
+            logger.debug(f"📤 Uploaded {data_type} data: {gcs_path}")
+        
+        if upload_error is not None and raise_on_error:
+            raise upload_error
+        
+        return uploaded_files
+    
+    async def _run_upload(self, func, *args):
+        """Run a blocking upload on the bounded upload pool without blocking the event loop"""
+        async with self.upload_semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.upload_executor, functools.partial(func, *args))
+    
+    def _write_and_upload_dataframe(self, df: pd.DataFrame, gcs_path: str) -> float:
+        """Serialize a DataFrame to an in-memory Parquet buffer and upload it (runs on an upload worker thread)"""
+        # Upload to GCS
+        blob = self.bucket.blob(gcs_path)
+        
+        with ParquetUploadBuffer(self.upload_spill_threshold_mb) as buffer:
+            # Sort by timestamp for optimal row group distribution
+            if 'timestamp' in df.columns:
+                df = df.sort_values('timestamp')
+            elif 'local_timestamp' in df.columns:
+                df = df.sort_values('local_timestamp')
             
+            # Use optimized Parquet settings for efficient sparse data access
+            buffer.write_dataframe(
+                df,
+                index=False, 
+                engine='pyarrow',
+                row_group_size=DEFAULT_ROW_GROUP_SIZE,  # ~1MB per row group for efficient filtering
+                **PARQUET_WRITE_OPTIONS
+            )
+            return self._upload_buffer_with_retry(blob, buffer, gcs_path)
+    
+    def _calculate_upload_timeout(self, file_size_mb: float) -> int:
+        """Calculate upload timeout based on file size with configurable adaptive rates"""
+        from ..config import get_config
+        config = get_config()
+        
+        if file_size_mb < 10:
+            upload_rate = config.gcp.upload_rate_small
+            buffer_time = config.gcp.upload_buffer_small
+        elif file_size_mb < 100:
+            upload_rate = config.gcp.upload_rate_medium
+            buffer_time = config.gcp.upload_buffer_medium
+        else:
+            upload_rate = config.gcp.upload_rate_large
+            buffer_time = config.gcp.upload_buffer_large
+        
+        calculated_timeout = max(config.gcp.upload_timeout_base, int(file_size_mb / upload_rate) + buffer_time)
+        logger.info(f"⏱️  Using timeout: {calculated_timeout}s for {file_size_mb:.1f}MB file (rate: {upload_rate}MB/s)")
+        return calculated_timeout
+    
+    def _upload_buffer_with_retry(self, blob, buffer: ParquetUploadBuffer, gcs_path: str) -> float:
+        """Upload a Parquet buffer to GCS, retrying once with a longer timeout
+        
+        Blocking - call through _run_upload. Buffers larger than the configured
+        chunk size use resumable chunked uploads. Returns the size in MB.
+        """
+        # Size-based timeout comes straight from the buffer length
+        file_size = buffer.size
+        file_size_mb = file_size / 1024 / 1024
+        logger.info(f"📁 Parquet file size: {file_size_mb:.2f} MB{' (spilled to disk)' if buffer.spilled else ''}")
+        
+        if file_size > self.upload_chunk_size:
+            blob.chunk_size = self.upload_chunk_size
+        
+        calculated_timeout = self._calculate_upload_timeout(file_size_mb)
+        
+        # Add timeout and retry logic for GCS upload
+        try:
+            logger.info(f"🚀 Starting GCS upload for {gcs_path}...")
+            buffer.upload(blob, timeout=calculated_timeout)
+            logger.info(f"✅ GCS upload completed for {gcs_path}")
+        except Exception as upload_error:
+            logger.error(f"GCS upload failed for {gcs_path}: {upload_error}")
+            # Retry once with a longer timeout
+            retry_timeout = min(calculated_timeout * 2, 600)  # Max 10 minutes
             try:
-                # Upload to GCS
-                blob = self.bucket.blob(gcs_path)
-                
-                with tempfile.NamedTemporaryFile(suffix='.parquet') as tmp_file:
-                    # Sort by timestamp for optimal row group distribution
-                    if 'timestamp' in df.columns:
-                        df = df.sort_values('timestamp')
-                    elif 'local_timestamp' in df.columns:
-                        df = df.sort_values('local_timestamp')
-                    
-                    # Use optimized Parquet settings for efficient sparse data access
-                    df.to_parquet(
-                        tmp_file.name, 
-                        index=False, 
-                        engine='pyarrow',
-                        compression='snappy',
-                        row_group_size=100000,  # ~1MB per row group for efficient filtering
-                        data_page_size=1024 * 1024,  # 1MB data pages
-                        use_dictionary=True,  # Dictionary encoding for repeated values
-                        write_statistics=True,  # Enable statistics for predicate pushdown
-                        use_deprecated_int96_timestamps=False  # Use modern timestamp format
-                    )
-                    # Get actual file size and calculate appropriate timeout
-                    import os
-                    file_size = os.path.getsize(tmp_file.name)
-                    file_size_mb = file_size / 1024 / 1024
-                    logger.info(f"📁 Parquet file size: {file_size_mb:.2f} MB")
-                    
-                    # Calculate timeout based on file size with configurable adaptive rates
-                    from ..config import get_config
-                    config = get_config()
-                    
-                    if file_size_mb < 10:
-                        upload_rate = config.gcp.upload_rate_small
-                        buffer_time = config.gcp.upload_buffer_small
-                    elif file_size_mb < 100:
-                        upload_rate = config.gcp.upload_rate_medium
-                        buffer_time = config.gcp.upload_buffer_medium
-                    else:
-                        upload_rate = config.gcp.upload_rate_large
-                        buffer_time = config.gcp.upload_buffer_large
-                    
-                    calculated_timeout = max(config.gcp.upload_timeout_base, int(file_size_mb / upload_rate) + buffer_time)
-                    logger.info(f"⏱️  Using timeout: {calculated_timeout}s for {file_size_mb:.1f}MB file (rate: {upload_rate}MB/s)")
-                    
-                    # Add timeout and retry logic for GCS upload
-                    try:
-                        logger.info(f"🚀 Starting GCS upload for {gcs_path}...")
-                        blob.upload_from_filename(tmp_file.name, timeout=calculated_timeout)
-                        logger.info(f"✅ GCS upload completed for {gcs_path}")
-                    except Exception as upload_error:
-                        logger.error(f"GCS upload failed for {gcs_path}: {upload_error}")
-                        # Retry once with a longer timeout
-                        retry_timeout = min(calculated_timeout * 2, 600)  # Max 10 minutes
-                        try:
-                            logger.info(f"🔄 Retrying GCS upload for {gcs_path} with {retry_timeout}s timeout...")
-                            blob.upload_from_filename(tmp_file.name, timeout=retry_timeout)
-                            logger.info(f"✅ GCS upload retry succeeded for {gcs_path}")
-                        except Exception as retry_error:
-                            logger.error(f"GCS upload retry failed for {gcs_path}: {retry_error}")
-                            raise
-                
-                uploaded_files.append(f"gs://{self.gcs_bucket}/{gcs_path}")
-                logger.debug(f"📤 Uploaded {data_type} data: {gcs_path}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to upload {data_type} data: {e}")
-                # Re-raise the exception so the batch upload can track it as a failure
+                logger.info(f"🔄 Retrying GCS upload for {gcs_path} with {retry_timeout}s timeout...")
+                buffer.upload(blob, timeout=retry_timeout)
+                logger.info(f"✅ GCS upload retry succeeded for {gcs_path}")
+            except Exception as retry_error:
+                logger.error(f"GCS upload retry failed for {gcs_path}: {retry_error}")
                 raise
         
-        return uploaded_files
+        # Row count and time range come from the footer still in the buffer; the upload itself succeeded,
+        # so an index failure must not fail the file (the day's index can be rebuilt from listings)
+        try:
+            self.object_index.record_upload(blob, source=buffer.sink)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record {gcs_path} in the object index: {e}")
+        return file_size_mb
     
-    async def _upload_to_gcs(self, download_results: dict, target: dict, date: datetime) -> list:
-        """Upload downloaded data to GCS with optimized single partition strategy"""
+    async def _stream_to_gcs(self, target: dict, date: datetime, data_types: List[str]) -> list:
+        """Stream each data type from Tardis straight into Parquet row groups, then upload
+        
+        Only one row group per data type is held in memory at a time, so the
+        instrument never sits in the upload batch as a full DataFrame.
+        """
         uploaded_files = []
+        failed_data_types = []
         
-        for data_type, df in download_results.items():
-            # Skip if df is None (indicating download failure) or empty list (no data available)
-            if df is None:
-                # Download failed - this should be tracked as an error
-                raise Exception(f"Download failed for {data_type}")
-            elif isinstance(df, list) and len(df) == 0:
-                # No data available - skip upload but don't treat as error
-                continue
-            
-            # No need to add metadata columns - they're available from:
-            # - data_type: in GCS path structure
-            # - date: in timestamp columns
-            # - venue: extractable from instrument_key
-            # - instrument_key: filename
-            
-            # Log if this is an empty file
-            if df.empty:
-                logger.info(f"📭 Uploading empty {data_type} file with schema for {target['instrument_key']}")
-            
-            # Create single partition path (optimized strategy)
+        for data_type in data_types:
             gcs_path = self._create_gcs_path(target, date, data_type)
             
             try:
-                # Upload to GCS
-                blob = self.bucket.blob(gcs_path)
-                
-                with tempfile.NamedTemporaryFile(suffix='.parquet') as tmp_file:
-                    # Sort by timestamp for optimal row group distribution
-                    if 'timestamp' in df.columns:
-                        df = df.sort_values('timestamp')
-                    elif 'local_timestamp' in df.columns:
-                        df = df.sort_values('local_timestamp')
-                    
-                    # Use optimized Parquet settings for efficient sparse data access
-                    df.to_parquet(
-                        tmp_file.name, 
-                        index=False, 
-                        engine='pyarrow',
-                        compression='snappy',
-                        row_group_size=100000,  # ~1MB per row group for efficient filtering
-                        data_page_size=1024 * 1024,  # 1MB data pages
-                        use_dictionary=True,  # Dictionary encoding for repeated values
-                        write_statistics=True,  # Enable statistics for predicate pushdown
-                        use_deprecated_int96_timestamps=False  # Use modern timestamp format
-                    )
-                    # Get actual file size and calculate appropriate timeout
-                    import os
-                    file_size = os.path.getsize(tmp_file.name)
-                    file_size_mb = file_size / 1024 / 1024
-                    logger.info(f"📁 Parquet file size: {file_size_mb:.2f} MB")
-                    
-                    # Calculate timeout based on file size with configurable adaptive rates
-                    from ..config import get_config
-                    config = get_config()
-                    
-                    if file_size_mb < 10:
-                        upload_rate = config.gcp.upload_rate_small
-                        buffer_time = config.gcp.upload_buffer_small
-                    elif file_size_mb < 100:
-                        upload_rate = config.gcp.upload_rate_medium
-                        buffer_time = config.gcp.upload_buffer_medium
-                    else:
-                        upload_rate = config.gcp.upload_rate_large
-                        buffer_time = config.gcp.upload_buffer_large
-                    
-                    calculated_timeout = max(config.gcp.upload_timeout_base, int(file_size_mb / upload_rate) + buffer_time)
-                    logger.info(f"⏱️  Using timeout: {calculated_timeout}s for {file_size_mb:.1f}MB file (rate: {upload_rate}MB/s)")
-                    
-                    # Add timeout and retry logic for GCS upload
-                    try:
-                        logger.info(f"🚀 Starting GCS upload for {gcs_path}...")
-                        blob.upload_from_filename(tmp_file.name, timeout=calculated_timeout)
-                        logger.info(f"✅ GCS upload completed for {gcs_path}")
-                    except Exception as upload_error:
-                        logger.error(f"GCS upload failed for {gcs_path}: {upload_error}")
-                        # Retry once with a longer timeout
-                        retry_timeout = min(calculated_timeout * 2, 600)  # Max 10 minutes
-                        try:
-                            logger.info(f"🔄 Retrying GCS upload for {gcs_path} with {retry_timeout}s timeout...")
-                            blob.upload_from_filename(tmp_file.name, timeout=retry_timeout)
-                            logger.info(f"✅ GCS upload retry succeeded for {gcs_path}")
-                        except Exception as retry_error:
-                            logger.error(f"GCS upload retry failed for {gcs_path}: {retry_error}")
-                            raise
+                with await self._stream_to_buffer(target, date, data_type) as buffer:
+                    blob = self.bucket.blob(gcs_path)
+                    file_size_mb = await self._run_upload(self._upload_buffer_with_retry, blob, buffer, gcs_path)
+                    self.performance_metrics['total_data_size_mb'] += file_size_mb
+                    self._record_upload(target['instrument_key'], data_type, date, file_size_mb)
                 
                 uploaded_files.append(f"gs://{self.gcs_bucket}/{gcs_path}")
-                logger.info(f"📤 Uploaded {data_type} data: {gcs_path}")
                 
             except Exception as e:
-                logger.error(f"❌ Failed to upload {data_type} data: {e}")
+                logger.error(f"❌ Failed to stream {data_type} data for {target['instrument_key']}: {e}")
+                failed_data_types.append(data_type)
+        
+        self.performance_metrics['total_files_processed'] += len(uploaded_files)
+        
+        if failed_data_types:
+            raise Exception(f"Streaming download failed for {', '.join(failed_data_types)}")
         
         return uploaded_files
     
+    async def _stream_to_buffer(self, target: dict, date: datetime, data_type: str) -> ParquetUploadBuffer:
+        """Stream one data type from Tardis into a finished Parquet buffer (caller closes it)"""
+        buffer = ParquetUploadBuffer(self.upload_spill_threshold_mb)
+        try:
+            writer = ParquetStreamWriter(buffer.sink)
+            try:
+                async for batch in self.tardis_connector.stream_daily_data(
+                    tardis_exchange=target['tardis_exchange'],
+                    tardis_symbol=target['tardis_symbol'],
+                    date=date,
+                    data_type=data_type
+                ):
+                    writer.write_batch(batch)
+                
+                if writer.rows == 0:
+                    logger.info(f"📭 Uploading empty {data_type} file with schema for {target['instrument_key']}")
+                    empty_df = self.tardis_connector._create_empty_dataframe_with_schema(data_type)
+                    writer.schema = pa.Schema.from_pandas(empty_df, preserve_index=False)
+            finally:
+                stats = writer.close()
+        except BaseException:
+            buffer.close()
+            raise
+        
+        logger.info(f"Streamed {stats['rows']} {data_type} records in {stats['row_groups']} row groups "
+                   f"for {target['instrument_key']}")
+        if not writer.globally_sorted:
+            logger.debug(f"{data_type} row groups for {target['instrument_key']} overlap in time (sorted per row group only)")
+        return buffer
+    
     def _create_gcs_path(self, target: dict, date: datetime, data_type: str) -> str:
         """Create single GCS path with optimized by_date partition strategy"""
         instrument_key = target['instrument_key']
@@ -859,6 +1488,7 @@ class DownloadOrchestrator:
         logger.info(f"  Configuration:")
         logger.info(f"    Max Workers: {metrics['config']['max_workers']}")
         logger.info(f"    Max Parallel Downloads: {metrics['config']['max_parallel_downloads']}")
+        logger.info(f"    Max Parallel Uploads: {metrics['config']['max_parallel_uploads']}")
         logger.info(f"    Batch Size: {metrics['config']['batch_size']}")
         logger.info(f"  Timing:")
         logger.info(f"    Total Download Time: {metrics['total_download_time']:.2f}s")
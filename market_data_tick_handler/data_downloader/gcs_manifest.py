@@ -0,0 +1,106 @@
+"""
+Existing Object Manifest for Incremental Downloads
+
+In-memory set of (date, data_type, instrument_key) files already present in
+GCS. Each day is built from one prefix listing per
+``raw_tick_data/by_date/day-{date}/data_type-{data_type}/``, or read from a
+cached local JSON manifest, so already-uploaded files are skipped before any
+Tardis request is made.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def list_existing_files(bucket, date: datetime, data_types: Iterable[str]) -> Dict[str, Set[str]]:
+    """Instrument keys with a non-empty Parquet file per data type of a day, one prefix listing each
+
+    Only reads GCS, so it can run on a worker thread; the result is merged
+    into a manifest with ExistingObjectManifest.merge_listing.
+    """
+    date_str = date.strftime('%Y-%m-%d')
+    listing = {}
+    for data_type in data_types:
+        prefix = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/"
+        instrument_keys = listing.setdefault(data_type, set())
+        for blob in bucket.list_blobs(prefix=prefix):
+            name = blob.name[len(prefix):]
+            # Zero-byte objects are interrupted uploads, not valid Parquet files
+            if '/' not in name and name.endswith('.parquet') and blob.size:
+                instrument_keys.add(name[:-len('.parquet')])
+    return listing
+
+
+class ExistingObjectManifest:
+    """Per-day index of uploaded (data_type, instrument_key) files"""
+
+    def __init__(self):
+        self.days: Dict[str, Set[Tuple[str, str]]] = {}
+        self.listed: Dict[str, Set[str]] = {}  # date -> data types whose prefix has been listed
+        self._dirty = False
+
+    def has_day(self, date_str: str, data_types: Iterable[str]) -> bool:
+        """Whether every requested data type of the day has been listed or cached"""
+        return set(data_types) <= self.listed.get(date_str, set())
+
+    def contains(self, date_str: str, data_type: str, instrument_key: str) -> bool:
+        return (data_type, instrument_key) in self.days.get(date_str, ())
+
+    def add(self, date_str: str, data_type: str, instrument_key: str):
+        """Record a file uploaded during this run"""
+        self.days.setdefault(date_str, set()).add((data_type, instrument_key))
+        self._dirty = True
+
+    def load_from_gcs(self, bucket, date: datetime, data_types: Iterable[str]) -> int:
+        """List each day/data_type prefix once and record the Parquet files found"""
+        date_str = date.strftime('%Y-%m-%d')
+        unlisted = [data_type for data_type in data_types if data_type not in self.listed.get(date_str, ())]
+        return self.merge_listing(date_str, list_existing_files(bucket, date, unlisted))
+
+    def merge_listing(self, date_str: str, listing: Dict[str, Set[str]]) -> int:
+        """Record a listing from list_existing_files and mark its data types as listed"""
+        entries = self.days.setdefault(date_str, set())
+        listed = self.listed.setdefault(date_str, set())
+        loaded = 0
+        for data_type, instrument_keys in listing.items():
+            entries.update((data_type, instrument_key) for instrument_key in instrument_keys)
+            listed.add(data_type)
+            loaded += len(instrument_keys)
+        self._dirty = True
+
+        logger.info(f"🗂️  Found {loaded} existing files in GCS for {date_str}")
+        return loaded
+
+    def load(self, path: str) -> int:
+        """Load a cached manifest written by save (missing files are ignored)"""
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            data = json.load(f)
+        loaded = 0
+        for date_str, day in data.items():
+            self.listed.setdefault(date_str, set()).update(day['listed'])
+            self.days.setdefault(date_str, set()).update(tuple(entry.split('|', 1)) for entry in day['files'])
+            loaded += len(day['files'])
+        logger.info(f"🗂️  Loaded {loaded} manifest entries for {len(data)} days from {path}")
+        return loaded
+
+    def save(self, path: str):
+        """Write the manifest as {date: {"listed": [...], "files": ["data_type|instrument_key"]}} if it changed"""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({date_str: {'listed': sorted(self.listed.get(date_str, ())),
+                                  'files': sorted(f"{dt}|{key}" for dt, key in entries)}
+                       for date_str, entries in self.days.items()}, f)
+        os.replace(tmp_path, path)
+        self._dirty = False
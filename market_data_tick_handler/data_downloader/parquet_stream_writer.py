@@ -0,0 +1,139 @@
+"""
+Streaming Parquet Writer for Tick Data
+
+Writes Arrow RecordBatches into a Parquet file one row group at a time while
+a download is still in flight, so at most one row group per instrument is
+held in memory. Uses the same Parquet settings as the buffered upload path.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# ~1MB per row group for efficient filtering (matches DownloadOrchestrator uploads)
+DEFAULT_ROW_GROUP_SIZE = 100000
+
+# Optimized Parquet settings for efficient sparse data access
+PARQUET_WRITE_OPTIONS: Dict[str, Any] = {
+    'compression': 'snappy',
+    'data_page_size': 1024 * 1024,  # 1MB data pages
+    'use_dictionary': True,  # Dictionary encoding for repeated values
+    'write_statistics': True,  # Enable statistics for predicate pushdown
+    'use_deprecated_int96_timestamps': False,  # Use modern timestamp format
+}
+
+
+class ParquetStreamWriter:
+    """Incremental RecordBatch -> Parquet row group writer
+
+    Batches are buffered until ``row_group_size`` rows are available and then
+    flushed as a single row group. Each row group is sorted by ``sort_column``
+    so row group statistics stay tight for predicate pushdown.
+
+    Only the order within each row group is guaranteed. Rows already flushed
+    cannot be reordered, so the file is globally sorted only if the input
+    never goes back further than the current row group. Tardis files arrive
+    in local_timestamp order, so exchange timestamps can straddle a row group
+    boundary. ``globally_sorted`` reports whether row group ranges ended up
+    non-overlapping. Readers must not assume global order: the footer cache
+    only bisects row groups whose statistics are monotonic.
+    """
+
+    def __init__(self, where: Any, schema: Optional[pa.Schema] = None,
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 sort_column: Optional[str] = 'timestamp'):
+        self.where = where
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.sort_column = sort_column
+
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._buffer: List[pa.RecordBatch] = []
+        self._buffered_rows = 0
+        self._closed = False
+
+        # Statistics
+        self.rows = 0
+        self.row_groups = 0
+        self.globally_sorted = True  # Each row group starts at or after the previous one's maximum
+        self._last_max = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write_batch(self, batch: pa.RecordBatch):
+        """Buffer a batch and flush complete row groups"""
+        if self._closed:
+            raise RuntimeError("Cannot write to a closed ParquetStreamWriter")
+        if batch.num_rows == 0:
+            return
+
+        if self.schema is None:
+            self.schema = batch.schema
+
+        self._buffer.append(batch)
+        self._buffered_rows += batch.num_rows
+        self.rows += batch.num_rows
+
+        while self._buffered_rows >= self.row_group_size:
+            self._flush_row_group(self.row_group_size)
+
+    def close(self) -> Dict[str, int]:
+        """Flush the remaining rows and finalize the Parquet footer"""
+        if self._closed:
+            return self.get_stats()
+
+        if self._buffered_rows > 0:
+            self._flush_row_group(self._buffered_rows)
+
+        if self._writer is None and self.schema is not None:
+            # No rows at all - still write an empty file carrying the schema
+            self._open_writer()
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        self._closed = True
+        logger.debug(f"Closed Parquet stream: {self.rows} rows in {self.row_groups} row groups")
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get rows received and row groups flushed so far"""
+        return {'rows': self.rows, 'row_groups': self.row_groups}
+
+    def _open_writer(self):
+        """Open the underlying ParquetWriter with the repo's Parquet settings"""
+        self._writer = pq.ParquetWriter(self.where, self.schema, **PARQUET_WRITE_OPTIONS)
+
+    def _flush_row_group(self, num_rows: int):
+        """Write the first num_rows buffered rows as one row group"""
+        table = pa.Table.from_batches(self._buffer, schema=self.schema)
+        row_group = table.slice(0, num_rows)
+        remainder = table.slice(num_rows)
+
+        if self.sort_column and self.sort_column in row_group.column_names:
+            row_group = row_group.sort_by(self.sort_column)
+            bounds = pc.min_max(row_group.column(self.sort_column))
+            low, high = bounds['min'].as_py(), bounds['max'].as_py()
+            if low is not None:
+                if self._last_max is not None and low < self._last_max:
+                    self.globally_sorted = False
+                self._last_max = high if self._last_max is None else max(self._last_max, high)
+
+        if self._writer is None:
+            self._open_writer()
+        self._writer.write_table(row_group, row_group_size=num_rows)
+
+        self.row_groups += 1
+
+        self._buffer = remainder.to_batches()
+        self._buffered_rows = remainder.num_rows
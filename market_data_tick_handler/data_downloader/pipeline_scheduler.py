@@ -0,0 +1,225 @@
+"""
+Pipelined Download Scheduler
+
+Runs per-file work through separate bounded download, parse and upload
+stages connected by queues. Idle workers in each stage pull the next file
+from a shared queue, so a long-tail file only occupies one worker instead
+of holding back a whole batch. Admission into the pipeline is limited by
+the number of bytes in flight rather than by instrument counts.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Admission estimate for files with no size information (bytes)
+DEFAULT_ESTIMATED_BYTES = 1024 * 1024
+
+
+@dataclass
+class PipelineItem:
+    """A single (instrument, data_type) file moving through the pipeline"""
+    target: Dict[str, Any]
+    data_type: str
+    date: Optional[datetime] = None
+    estimated_bytes: int = DEFAULT_ESTIMATED_BYTES
+    reserved_bytes: int = 0
+
+    @property
+    def instrument_key(self) -> str:
+        return self.target['instrument_key']
+
+
+def payload_nbytes(payload: Any) -> int:
+    """Approximate memory held by a stage payload"""
+    if payload is None:
+        return 0
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return len(payload)
+    if isinstance(payload, pd.DataFrame):
+        # deep=True counts the contents of object/string columns (ids, sides, symbols), not just pointers
+        return int(payload.memory_usage(index=False, deep=True).sum())
+    nbytes = getattr(payload, 'nbytes', None)  # Arrow tables and record batches
+    if isinstance(nbytes, int):
+        return nbytes
+    size = getattr(payload, 'size', None)
+    return size if isinstance(size, int) else 0
+
+
+class ByteBudget:
+    """Async semaphore counted in bytes, used for pipeline backpressure
+
+    ``acquire`` waits until the reservation fits under the limit. A single
+    reservation larger than the whole budget is admitted once nothing else
+    is in flight so oversized files cannot deadlock the pipeline.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self.peak = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, nbytes: int):
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight == 0 or self.in_flight + nbytes <= self.max_bytes
+            )
+            self._add(nbytes)
+
+    async def resize(self, old_bytes: int, new_bytes: int):
+        """Replace a reservation with the actual size once a stage knows it"""
+        async with self._condition:
+            self._add(new_bytes - old_bytes)
+            if new_bytes < old_bytes:
+                self._condition.notify_all()
+
+    async def release(self, nbytes: int):
+        async with self._condition:
+            self._add(-nbytes)
+            self._condition.notify_all()
+
+    def _add(self, nbytes: int):
+        self.in_flight += nbytes
+        self.peak = max(self.peak, self.in_flight)
+
+
+class PipelineScheduler:
+    """Continuous download -> parse -> upload scheduler
+
+    Stage callables receive the item and the previous stage's payload and
+    return the next payload. ``parse`` is optional for sources that decode
+    while downloading. ``on_complete(item, result, error)`` is called once
+    per item after its upload finishes or any stage fails.
+    """
+
+    def __init__(self,
+                 download: Callable[[PipelineItem], Awaitable[Any]],
+                 upload: Callable[[PipelineItem, Any], Awaitable[Any]],
+                 parse: Optional[Callable[[PipelineItem, Any], Awaitable[Any]]] = None,
+                 download_workers: int = 4,
+                 parse_workers: int = 4,
+                 upload_workers: int = 4,
+                 max_bytes_in_flight: int = 2048 * 1024 * 1024,
+                 on_complete: Optional[Callable[[PipelineItem, Any, Optional[BaseException]], None]] = None):
+        self.download = download
+        self.parse = parse
+        self.upload = upload
+        self.download_workers = download_workers
+        self.parse_workers = parse_workers
+        self.upload_workers = upload_workers
+        self.budget = ByteBudget(max_bytes_in_flight)
+        self.on_complete = on_complete
+
+        # Statistics
+        self.stats = {
+            'completed': 0,
+            'failed': 0,
+            'stage_time': {'download': 0.0, 'parse': 0.0, 'upload': 0.0},
+        }
+
+    async def run(self, items: Union[Iterable[PipelineItem], AsyncIterable[PipelineItem]]) -> Dict[str, Any]:
+        """Process all items in source order and return pipeline statistics
+
+        items may be an async iterable so very large workloads (e.g. multi-day
+        backfills) are produced lazily while earlier items are in flight.
+        """
+        download_queue: asyncio.Queue = asyncio.Queue(maxsize=self.download_workers * 2)
+        parse_queue: asyncio.Queue = asyncio.Queue(maxsize=self.parse_workers)
+        upload_queue: asyncio.Queue = asyncio.Queue(maxsize=self.upload_workers)
+
+        next_after_download = parse_queue if self.parse else upload_queue
+        workers: List[asyncio.Task] = [
+            asyncio.create_task(self._worker('download', download_queue, next_after_download))
+            for _ in range(self.download_workers)
+        ]
+        if self.parse:
+            workers += [asyncio.create_task(self._worker('parse', parse_queue, upload_queue))
+                        for _ in range(self.parse_workers)]
+        workers += [asyncio.create_task(self._worker('upload', upload_queue, None))
+                    for _ in range(self.upload_workers)]
+
+        try:
+            await self._feed(items, download_queue)
+            # Each stage only hands off before marking its own item done, so joining in order drains everything
+            await download_queue.join()
+            await parse_queue.join()
+            await upload_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get completed/failed counts, per-stage busy time and peak bytes in flight"""
+        return {**self.stats, 'peak_bytes_in_flight': self.budget.peak}
+
+    @staticmethod
+    async def _feed(items, queue: asyncio.Queue):
+        """Feed the download queue, waiting for space so the source is consumed lazily"""
+        if hasattr(items, '__aiter__'):
+            async for item in items:
+                await queue.put(item)
+        else:
+            for item in items:
+                await queue.put(item)
+
+    async def _worker(self, stage: str, queue: asyncio.Queue, next_queue: Optional[asyncio.Queue]):
+        """Pull items from a stage queue until cancelled"""
+        while True:
+            item, payload = await self._next(stage, queue)
+            try:
+                start_time = time.time()
+                try:
+                    if stage == 'download':
+                        await self.budget.acquire(item.estimated_bytes)
+                        item.reserved_bytes = item.estimated_bytes
+                        result = await self.download(item)
+                    elif stage == 'parse':
+                        result = await self.parse(item, payload)
+                    else:
+                        result = await self.upload(item, payload)
+                except Exception as e:
+                    self.stats['stage_time'][stage] += time.time() - start_time
+                    await self._finish(item, None, e)
+                    continue
+                self.stats['stage_time'][stage] += time.time() - start_time
+                del payload
+
+                if next_queue is None:
+                    await self._finish(item, result, None)
+                else:
+                    # Re-account the reservation with what this stage actually holds
+                    actual_bytes = payload_nbytes(result)
+                    await self.budget.resize(item.reserved_bytes, actual_bytes)
+                    item.reserved_bytes = actual_bytes
+                    await next_queue.put((item, result))
+            finally:
+                queue.task_done()
+
+    @staticmethod
+    async def _next(stage: str, queue: asyncio.Queue):
+        """Get the next (item, payload) pair - the download queue holds bare items"""
+        entry = await queue.get()
+        return (entry, None) if stage == 'download' else entry
+
+    async def _finish(self, item: PipelineItem, result: Any, error: Optional[BaseException]):
+        """Release the item's bytes and report the outcome"""
+        await self.budget.release(item.reserved_bytes)
+        item.reserved_bytes = 0
+
+        self.stats['failed' if error else 'completed'] += 1
+        if self.on_complete is not None:
+            try:
+                self.on_complete(item, result, error)
+            except Exception as e:
+                logger.error(f"❌ Pipeline completion callback failed for {item.instrument_key}: {e}")
@@ -0,0 +1,40 @@
+"""
+Deterministic Sharding for Distributed Downloads
+
+Python's built-in hash() is salted per process (PYTHONHASHSEED), so VMs
+could disagree on shard membership. These helpers use a stable blake2b
+hash so every VM computes the same assignment, plus a weighted mode that
+balances expected bytes instead of instrument counts.
+"""
+
+import hashlib
+from typing import Dict, List
+
+
+def stable_hash(key: str) -> int:
+    """64-bit hash of a string that is identical across processes and machines"""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def hash_shard(key: str, total_shards: int) -> int:
+    """Shard index for a key by stable hash"""
+    return stable_hash(key) % total_shards
+
+
+def weighted_shard_assignment(weights: Dict[str, int], total_shards: int) -> Dict[str, int]:
+    """Assign keys to shards so the expected bytes per shard are balanced
+
+    Greedy longest-processing-time bin packing: keys are taken largest first
+    and each goes to the currently lightest shard. Ties are broken by stable
+    hash and shard index, so the result depends only on the weights and not
+    on input order - every VM computes the same assignment.
+    """
+    loads: List[int] = [0] * total_shards
+    assignment: Dict[str, int] = {}
+
+    for key in sorted(weights, key=lambda k: (-weights[k], stable_hash(k), k)):
+        shard = min(range(total_shards), key=lambda i: (loads[i], i))
+        assignment[key] = shard
+        loads[shard] += weights[key]
+
+    return assignment
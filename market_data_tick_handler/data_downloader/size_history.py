@@ -0,0 +1,155 @@
+"""
+File Size History for Download Scheduling
+
+Keeps the last known Parquet size of every (instrument_key, data_type) file
+so the orchestrator can start the largest files first. Sizes are seeded from
+blob sizes of previous days in GCS and/or a local JSON index, and updated
+with the sizes uploaded during a run. Weighted sharding instead loads a
+pinned snapshot of the index, so every VM sees the same sizes.
+"""
+
+import json
+import logging
+import os
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fallback size for files with no history for their data type (bytes)
+DEFAULT_FILE_SIZE_BYTES = 1024 * 1024
+
+
+def parse_snapshot_uri(uri: str) -> Tuple[str, str, int]:
+    """(bucket, object name, generation) of a gs://bucket/object#generation snapshot URI"""
+    path, _, generation = uri[len('gs://'):].partition('#')
+    bucket_name, _, name = path.partition('/')
+    if not bucket_name or not name or not generation.isdigit():
+        raise ValueError(f"Size snapshot must be gs://bucket/object#generation, got {uri}")
+    return bucket_name, name, int(generation)
+
+
+def list_sizes_from_gcs(bucket, date: datetime, lookback_days: int = 1) -> List[Tuple[str, str, int]]:
+    """(instrument_key, data_type, bytes) of the files of the days before date, oldest day first
+
+    Only reads GCS, so it can run on a worker thread; the result is recorded
+    with FileSizeHistory.record_sizes.
+    """
+    sizes = []
+    for days_back in range(lookback_days, 0, -1):
+        day = date - timedelta(days=days_back)
+        prefix = f"raw_tick_data/by_date/day-{day.strftime('%Y-%m-%d')}/"
+        for blob in bucket.list_blobs(prefix=prefix):
+            # Path format: raw_tick_data/by_date/day-2024-01-15/data_type-trades/{instrument_key}.parquet
+            parts = blob.name.split('/')
+            if len(parts) >= 5 and parts[3].startswith('data_type-') and blob.name.endswith('.parquet'):
+                sizes.append((parts[4][:-len('.parquet')], parts[3][len('data_type-'):], blob.size or 0))
+    return sizes
+
+
+class FileSizeHistory:
+    """Per-(instrument_key, data_type) file size index"""
+
+    def __init__(self, default_bytes: int = DEFAULT_FILE_SIZE_BYTES):
+        self.default_bytes = default_bytes
+        self.sizes: Dict[Tuple[str, str], int] = {}
+        self._data_type_medians: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def record(self, instrument_key: str, data_type: str, nbytes: int):
+        """Record the latest known size of a file"""
+        self.sizes[(instrument_key, data_type)] = int(nbytes)
+        self._data_type_medians = None
+
+    def estimate(self, instrument_key: str, data_type: str) -> int:
+        """Expected file size - falls back to the data type median, then the default"""
+        size = self.sizes.get((instrument_key, data_type))
+        if size is not None:
+            return size
+        return self._medians().get(data_type, self.default_bytes)
+
+    def estimate_target(self, target: Dict, data_types: Iterable[str]) -> int:
+        """Expected total bytes for an instrument across the given data types"""
+        return sum(self.estimate(target['instrument_key'], data_type) for data_type in data_types)
+
+    def load_from_gcs(self, bucket, date: datetime, lookback_days: int = 1) -> int:
+        """Seed sizes from blob listings of the days before date (newest day wins)"""
+        loaded = self.record_sizes(list_sizes_from_gcs(bucket, date, lookback_days))
+        logger.info(f"📏 Loaded {loaded} file sizes from {lookback_days} previous day(s) in GCS")
+        return loaded
+
+    def record_sizes(self, sizes: Iterable[Tuple[str, str, int]]) -> int:
+        """Record (instrument_key, data_type, bytes) entries in order, as returned by list_sizes_from_gcs"""
+        loaded = 0
+        for instrument_key, data_type, nbytes in sizes:
+            self.record(instrument_key, data_type, nbytes)
+            loaded += 1
+        return loaded
+
+    def load(self, path: str) -> int:
+        """Load a local JSON index written by save (missing files are ignored)"""
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            entries = json.load(f)
+        self._record_entries(entries)
+        logger.info(f"📏 Loaded {len(entries)} file sizes from {path}")
+        return len(entries)
+
+    def load_snapshot(self, client, uri: str) -> int:
+        """Load a pinned snapshot written by save: gs://bucket/object#generation or a local path
+
+        A GCS snapshot is read at its pinned generation, so every process loading
+        the same URI gets the same sizes however the bucket changes meanwhile.
+        Unlike load, a missing snapshot is an error.
+        """
+        if not uri.startswith('gs://'):
+            if not os.path.exists(uri):
+                raise FileNotFoundError(f"Size snapshot not found: {uri}")
+            return self.load(uri)
+
+        bucket_name, name, generation = parse_snapshot_uri(uri)
+        blob = client.bucket(bucket_name).blob(name, generation=generation)
+        entries = json.loads(blob.download_as_bytes())
+        self._record_entries(entries)
+        logger.info(f"📏 Loaded {len(entries)} file sizes from {uri}")
+        return len(entries)
+
+    def save(self, path: str):
+        """Write the index as {"instrument_key|data_type": bytes}"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({f"{key}|{data_type}": nbytes for (key, data_type), nbytes in self.sizes.items()}, f)
+        os.replace(tmp_path, path)
+
+    def order_largest_first(self, targets: List[Dict], data_types: Optional[List[str]] = None) -> List[Dict]:
+        """Sort targets by expected total bytes, largest first (stable for ties)
+
+        Only data types available for the instrument (and requested, if
+        data_types is given) count towards its expected size.
+        """
+        def expected(target: Dict) -> int:
+            types = [t for t in (target.get('data_types') or '').split(',') if t]
+            if data_types:
+                types = [t for t in types if t in data_types]
+            return self.estimate_target(target, types)
+        return sorted(targets, key=expected, reverse=True)
+
+    def _record_entries(self, entries: Dict[str, int]):
+        for key, nbytes in entries.items():
+            instrument_key, _, data_type = key.rpartition('|')
+            self.record(instrument_key, data_type, nbytes)
+
+    def _medians(self) -> Dict[str, int]:
+        if self._data_type_medians is None:
+            by_type: Dict[str, List[int]] = {}
+            for (_, data_type), nbytes in self.sizes.items():
+                by_type.setdefault(data_type, []).append(nbytes)
+            self._data_type_medians = {dt: int(statistics.median(v)) for dt, v in by_type.items()}
+        return self._data_type_medians
@@ -9,15 +9,17 @@ import asyncio
 import aiohttp
 import gzip
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple, AsyncIterator
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 import time
 import random
 import json
 from decimal import Decimal
 import pandas as pd
+import pyarrow as pa
 import io
 import sys
 
@@ -27,15 +29,20 @@ sys.path.insert(0, str(project_root))
 
 from market_data_tick_handler.models import TradeData, BookSnapshot, DerivativeTicker, Liquidations, TickData, OptionsChain
 from ..config import get_config
+from .csv_stream_decoder import TardisCsvStreamDecoder, table_to_dataframe
+from .adaptive_concurrency import AdaptiveConcurrencyLimiter
 
 logger = logging.getLogger(__name__)
 
+# Network read size when streaming response bodies
+STREAM_CHUNK_SIZE = 256 * 1024
+
 class TokenBucket:
     """Token bucket rate limiter"""
     
     def __init__(self, capacity: int, refill_period: int):
         self.capacity = capacity
-        self.tokens = capacity
+        self.tokens = float(capacity)
         self.last_refill = time.time()
         self.refill_period = refill_period  # seconds
     
@@ -53,19 +60,14 @@ class TokenBucket:
         return await self.acquire(tokens)
     
     async def _refill(self):
-        """Refill tokens based on time elapsed"""
+        """Refill tokens continuously based on time elapsed"""
         now = time.time()
         time_passed = now - self.last_refill
         
-        if time_passed >= self.refill_period:
-            # Full refill
-            self.tokens = self.capacity
-            self.last_refill = now
-        else:
-            # Partial refill based on time passed
-            tokens_to_add = int((time_passed / self.refill_period) * self.capacity)
-            self.tokens = min(self.capacity, self.tokens + tokens_to_add)
-            self.last_refill = now
+        # Fractional tokens are kept - truncating them on every call would
+        # stop the bucket from refilling under frequent acquires
+        self.tokens = min(self.capacity, self.tokens + (time_passed / self.refill_period) * self.capacity)
+        self.last_refill = now
 
 class RetryStrategy:
     """Base class for retry strategies"""
@@ -89,7 +91,7 @@ class RetryStrategy:
             try:
                 return await operation(*args, **kwargs)
             except Exception as e:
-                if attempt == self.max_retries:
+                if attempt == self.max_retries or not self.should_retry(e):
                     raise e
                 
                 # Improve error message logging
@@ -98,6 +100,10 @@ class RetryStrategy:
                 logger.warning(f"Attempt {attempt + 1} failed: {error_msg}. Retrying in {delay:.2f}s")
                 await asyncio.sleep(delay)
     
+    def should_retry(self, error: Exception) -> bool:
+        """Whether an error is worth another attempt"""
+        return True
+    
     def _calculate_delay(self, attempt: int, error: Exception) -> float:
         """Calculate delay before retry"""
         return 1.0  # Base implementation
@@ -118,21 +124,50 @@ class ExponentialBackoffRetry(RetryStrategy):
         jitter = random.uniform(0, delay * 0.1)
         return delay + jitter
 
-class RateLimitRetry(RetryStrategy):
-    """Rate limit specific retry strategy"""
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RateLimitRetry(ExponentialBackoffRetry):
+    """Rate limit aware retry strategy
     
-    def __init__(self, max_retries: int = 10):
-        super().__init__(max_retries)
+    Retries 429s, 5xx responses, timeouts and connection errors. A 429 or
+    503 waits for the server's Retry-After when given, everything else
+    backs off exponentially with jitter. Other 4xx responses (e.g. a 404
+    for a day with no data) fail immediately.
+    """
+    
+    def __init__(self, max_retries: int = 10, base_delay: float = 1.0, max_delay: float = 60.0):
+        super().__init__(max_retries, base_delay, max_delay)
+    
+    def should_retry(self, error: Exception) -> bool:
+        """Retry throttling, server errors and transient network failures only"""
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status == 429 or error.status >= 500
+        return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
     
     def _calculate_delay(self, attempt: int, error: Exception) -> float:
         """Calculate delay based on rate limit error"""
-        if hasattr(error, 'response') and error.response:
-            retry_after = error.response.headers.get('Retry-After')
-            if retry_after:
-                return float(retry_after)
+        headers = getattr(error, 'headers', None)
+        if headers:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after
         
-        # Default to exponential backoff with longer delays
-        return min(60.0, 2 ** attempt)
+        # Default to exponential backoff
+        return super()._calculate_delay(attempt, error)
 
 @dataclass
 class TardisResponse:
@@ -153,17 +188,29 @@ class TardisConnector:
         self.timeout = self.config.tardis.timeout
         self.max_concurrent = max_concurrent or self.config.tardis.max_concurrent
         self.rate_limit_per_vm = rate_limit_per_vm or self.config.tardis.rate_limit_per_vm
+        self.max_retries = self.config.tardis.max_retries
+        self.connection_pool_size = self.config.tardis.connection_pool_size
         
         # Rate limiting
         self.rate_limiter = TokenBucket(self.rate_limit_per_vm, 86400)  # 1M per day
         self.semaphore = asyncio.Semaphore(self.max_concurrent)
         
-        # Retry strategies - fail fast to save time
-        self.retry_strategies = {
-            'network': ExponentialBackoffRetry(max_retries=0, base_delay=0.0),  # No retries - fail fast
-            'rate_limit': RateLimitRetry(max_retries=0),  # No retries - fail fast
-            'api_error': ExponentialBackoffRetry(max_retries=0, base_delay=0.0)  # No retries - fail fast
-        }
+        # Adaptive concurrency replaces the fixed semaphore when enabled
+        self.concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if self.config.tardis.adaptive_concurrency:
+            self.concurrency_limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=self.max_concurrent,
+                min_limit=self.config.tardis.min_concurrent,
+                # Slots beyond the connection pool would only queue inside aiohttp
+                max_limit=min(self.config.tardis.adaptive_max_concurrent, self.connection_pool_size)
+            )
+        
+        # Retries only for throttling, server errors and transient network failures
+        self.retry_strategy = RateLimitRetry(max_retries=self.max_retries)
+        
+        # Streaming decode settings
+        self.streaming_download = self.config.tardis.streaming_download
+        self.stream_block_size = self.config.tardis.stream_block_size
         
         # Session management
         self._session: Optional[aiohttp.ClientSession] = None
@@ -198,10 +245,10 @@ class TardisConnector:
                 'Keep-Alive': 'timeout=300, max=100'  # Keep alive for 5 minutes, max 100 requests
             }
             
-            # Optimized connection pooling for Tardis API
+            # Keep-alive connection pool - all requests go to the single Tardis datasets host
             connector = aiohttp.TCPConnector(
-                limit=200,                    # Total connection pool size
-                limit_per_host=50,            # Connections per host (Tardis)
+                limit=self.connection_pool_size,           # Total connection pool size
+                limit_per_host=self.connection_pool_size,  # Concurrency is bounded by the semaphore/limiter
                 keepalive_timeout=300,        # Keep connections alive for 5 minutes
                 enable_cleanup_closed=True,   # Clean up closed connections
                 force_close=False,            # Don't force close connections
@@ -219,6 +266,35 @@ class TardisConnector:
         if self._session and not self._session.closed:
             await self._session.close()
     
+    def _request_slot(self):
+        """Concurrency slot for one request - adaptive limiter or fixed semaphore"""
+        if self.concurrency_limiter is not None:
+            return self.concurrency_limiter.slot()
+        return self.semaphore
+    
+    def _raise_for_status(self, response: aiohttp.ClientResponse):
+        """Raise ClientResponseError (with headers) for HTTP errors, signalling 429s to the limiter"""
+        if response.status < 400:
+            return
+        if response.status == 429 and self.concurrency_limiter is not None:
+            self.concurrency_limiter.record_rate_limited(parse_retry_after(response.headers.get('Retry-After')))
+        raise aiohttp.ClientResponseError(
+            request_info=response.request_info,
+            history=response.history,
+            status=response.status,
+            message="Rate limit exceeded" if response.status == 429 else f"HTTP {response.status}",
+            headers=response.headers
+        )
+    
+    def _record_timeout(self):
+        if self.concurrency_limiter is not None:
+            self.concurrency_limiter.record_timeout()
+    
+    def _record_timing(self, first_byte_time: float, nbytes: int):
+        """Feed a successful request's time to first byte to the adaptive limiter"""
+        if self.concurrency_limiter is not None:
+            self.concurrency_limiter.record_success(first_byte_time, nbytes)
+    
     async def _make_request(self, url: str, params: Dict[str, Any] = None) -> TardisResponse:
         """Make HTTP request with retry logic"""
         await self._create_session()
@@ -228,31 +304,18 @@ class TardisConnector:
             raise RuntimeError("Failed to create aiohttp session")
         
         async def _request():
-            async with self.semaphore:
+            async with self._request_slot():
                 await self.rate_limiter.acquire()
                 
                 start_time = time.time()
                 try:
                     async with self._session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                        first_byte_time = time.time() - start_time  # Headers received
                         content = await response.read()
                         response_time = time.time() - start_time
+                        self._raise_for_status(response)
                         
-                        if response.status == 429:
-                            raise aiohttp.ClientResponseError(
-                                request_info=response.request_info,
-                                history=response.history,
-                                status=429,
-                                message="Rate limit exceeded"
-                            )
-                        
-                        if response.status >= 400:
-                            raise aiohttp.ClientResponseError(
-                                request_info=response.request_info,
-                                history=response.history,
-                                status=response.status,
-                                message=f"HTTP {response.status}"
-                            )
-                        
+                        self._record_timing(first_byte_time, len(content))
                         return TardisResponse(
                             data=content,
                             status_code=response.status,
@@ -261,20 +324,11 @@ class TardisConnector:
                             response_time=response_time
                         )
                 except asyncio.TimeoutError:
+                    self._record_timeout()
                     raise aiohttp.ServerTimeoutError(f"Request timeout after {self.timeout}s")
-                except aiohttp.ClientConnectorError as e:
-                    raise aiohttp.ClientConnectorError(f"Connection error: {e}")
-                except aiohttp.ClientError as e:
-                    raise aiohttp.ClientError(f"Client error: {e}")
         
-        # Determine retry strategy based on error type
-        try:
-            return await self.retry_strategies['network'].execute(_request)
-        except aiohttp.ClientResponseError as e:
-            if e.status == 429:
-                return await self.retry_strategies['rate_limit'].execute(_request)
-            else:
-                return await self.retry_strategies['api_error'].execute(_request)
+        # Error types are kept intact so the strategy can tell 429s and 5xx from permanent failures
+        return await self.retry_strategy.execute(_request)
     
     def _decompress_data(self, data: bytes, content_encoding: str) -> bytes:
         """Decompress data based on content encoding"""
@@ -697,11 +751,102 @@ class TardisConnector:
         
         return await self.download_daily_data_direct(tardis_exchange, tardis_symbol, date, data_types)
 
+    def _build_data_url(self, tardis_exchange: str, tardis_symbol: str, date: datetime, data_type: str) -> str:
+        """Build the datasets URL for a single daily file"""
+        return f"{self.base_url}/v1/{tardis_exchange}/{data_type}/{date.strftime('%Y/%m/%d')}/{tardis_symbol}.csv.gz"
+    
+    async def stream_daily_data(self, tardis_exchange: str, tardis_symbol: str, date: datetime,
+                                data_type: str, block_size: int = None) -> AsyncIterator[pa.RecordBatch]:
+        """Stream a daily file as typed Arrow RecordBatches
+        
+        Chunks are decompressed and decoded as they arrive from the network, so
+        peak memory is bounded by block_size rather than by the file size.
+        """
+        await self._create_session()
+        
+        # Safety check - ensure session is created
+        if self._session is None:
+            raise RuntimeError("Failed to create aiohttp session")
+        
+        url = self._build_data_url(tardis_exchange, tardis_symbol, date, data_type)
+        logger.debug(f"Streaming URL: {url}")
+        
+        decoder = TardisCsvStreamDecoder(
+            data_type,
+            block_size=block_size or self.stream_block_size,
+            tardis_exchange=tardis_exchange,
+            tardis_symbol=tardis_symbol
+        )
+        # Bound the idle time between chunks rather than the whole transfer
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        
+        attempt = 0
+        while True:
+            try:
+                async with self._request_slot():
+                    await self.rate_limiter.acquire()
+                    
+                    start_time = time.time()
+                    async with self._session.get(url, timeout=timeout) as response:
+                        first_byte_time = time.time() - start_time  # Headers received
+                        self._raise_for_status(response)
+                        
+                        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            for batch in decoder.feed(chunk):
+                                yield batch
+                    
+                    for batch in decoder.finish():
+                        yield batch
+                    self._record_timing(first_byte_time, decoder.bytes_in)
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self._record_timeout()
+                # Batches already yielded cannot be taken back, so only retry before the first byte
+                if (decoder.bytes_in or attempt >= self.retry_strategy.max_retries
+                        or not self.retry_strategy.should_retry(e)):
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise aiohttp.ServerTimeoutError(f"Stream read timeout after {self.timeout}s")
+                    raise
+                delay = self.retry_strategy._calculate_delay(attempt, e)
+                attempt += 1
+                logger.warning(f"Attempt {attempt} for {url} failed: {e}. Retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        
+        logger.debug(f"Streamed {decoder.rows} {data_type} rows ({decoder.bytes_in / 1024 / 1024:.1f}MB compressed) "
+                     f"for {tardis_exchange}:{tardis_symbol} in {time.time() - start_time:.2f}s")
+    
+    async def _download_data_type_streaming(self, tardis_exchange: str, tardis_symbol: str,
+                                            date: datetime, data_type: str) -> pd.DataFrame:
+        """Download a single data type through the streaming decoder"""
+        batches = [batch async for batch in self.stream_daily_data(tardis_exchange, tardis_symbol, date, data_type)]
+        
+        if not batches:
+            logger.info(f"📭 No data available for {data_type} ({tardis_exchange}:{tardis_symbol}) - creating empty file with schema")
+            return self._create_empty_dataframe_with_schema(data_type)
+        
+        # Single conversion to pandas - no intermediate bytes/str copies of the file
+        table = pa.Table.from_batches(batches)
+        del batches
+        df = table_to_dataframe(table)
+        del table
+        
+        logger.info(f"Downloaded {len(df)} {data_type} records for {tardis_exchange}:{tardis_symbol} (streamed)")
+        return df
+    
     async def download_daily_data_direct(self, tardis_exchange: str, tardis_symbol: str, 
-                                       date: datetime, data_types: List[str]) -> Dict[str, Any]:
-        """Download daily data directly using tardis_exchange and tardis_symbol"""
+                                       date: datetime, data_types: List[str],
+                                       streaming: bool = None) -> Dict[str, Any]:
+        """Download daily data directly using tardis_exchange and tardis_symbol
+        
+        When streaming is enabled (defaults to TARDIS_STREAMING_DOWNLOAD) the
+        response body is decoded incrementally instead of being buffered whole.
+        """
         logger.info(f"Downloading data for {tardis_exchange}:{tardis_symbol} on {date.date()}")
         
+        if streaming is None:
+            streaming = self.streaming_download
+        
         result = {}
         
         for data_type in data_types:
@@ -710,8 +855,14 @@ class TardisConnector:
                 continue
             
             try:
+                if streaming:
+                    result[data_type] = await self._download_data_type_streaming(
+                        tardis_exchange, tardis_symbol, date, data_type
+                    )
+                    continue
+                
                 # Build URL
-                url = f"{self.base_url}/v1/{tardis_exchange}/{data_type}/{date.strftime('%Y/%m/%d')}/{tardis_symbol}.csv.gz"
+                url = self._build_data_url(tardis_exchange, tardis_symbol, date, data_type)
                 logger.debug(f"Requesting URL: {url}")
                 
                 # Make request
@@ -728,25 +879,7 @@ class TardisConnector:
                     data = response.data
                 
                 # Parse CSV data directly to DataFrame with proper typing
-                df = self._parse_csv_data(data, data_type, tardis_exchange, tardis_symbol)
-                
-                if not df.empty:
-                    # Validate that downloaded data matches expected exchange/symbol
-                    self._validate_tardis_data(df, tardis_exchange, tardis_symbol, data_type)
-                    
-                    # Drop exchange and symbol columns after validation
-                    df_cleaned = self._drop_validation_columns(df)
-                    
-                    # Clear original DataFrame to free memory
-                    del df
-                    
-                    result[data_type] = df_cleaned
-                    logger.info(f"Downloaded {len(df_cleaned)} {data_type} records for {tardis_exchange}:{tardis_symbol}")
-                else:
-                    logger.info(f"📭 No data available for {data_type} ({tardis_exchange}:{tardis_symbol}) - creating empty file with schema")
-                    # Create empty DataFrame with correct schema instead of empty list
-                    empty_df = self._create_empty_dataframe_with_schema(data_type)
-                    result[data_type] = empty_df
+                result[data_type] = self._dataframe_from_csv(data, data_type, tardis_exchange, tardis_symbol)
                 
                 # Clear response data to free memory
                 del data
@@ -757,6 +890,44 @@ class TardisConnector:
         
         return result
     
+    async def fetch_daily_file(self, tardis_exchange: str, tardis_symbol: str,
+                               date: datetime, data_type: str) -> bytes:
+        """Fetch the raw (still compressed) bytes of a single daily file
+        
+        Used by the pipelined scheduler, which decodes files in a separate
+        parse stage via parse_daily_file.
+        """
+        url = self._build_data_url(tardis_exchange, tardis_symbol, date, data_type)
+        logger.debug(f"Requesting URL: {url}")
+        response = await self._make_request(url)
+        return response.data
+    
+    def parse_daily_file(self, data: bytes, data_type: str, tardis_exchange: str,
+                         tardis_symbol: str) -> pd.DataFrame:
+        """Decompress and decode raw bytes from fetch_daily_file (blocking, thread safe)"""
+        if data[:2] == b'\x1f\x8b':
+            data = self._decompress_data(data, 'gzip')
+        return self._dataframe_from_csv(data, data_type, tardis_exchange, tardis_symbol)
+    
+    def _dataframe_from_csv(self, data: bytes, data_type: str, tardis_exchange: str,
+                            tardis_symbol: str) -> pd.DataFrame:
+        """Parse, validate and clean decompressed CSV, or return the empty schema frame"""
+        df = self._parse_csv_data(data, data_type, tardis_exchange, tardis_symbol)
+        
+        if df.empty:
+            logger.info(f"📭 No data available for {data_type} ({tardis_exchange}:{tardis_symbol}) - creating empty file with schema")
+            # Create empty DataFrame with correct schema instead of empty list
+            return self._create_empty_dataframe_with_schema(data_type)
+        
+        # Validate that downloaded data matches expected exchange/symbol
+        self._validate_tardis_data(df, tardis_exchange, tardis_symbol, data_type)
+        
+        # Drop exchange and symbol columns after validation
+        df_cleaned = self._drop_validation_columns(df)
+        
+        logger.info(f"Downloaded {len(df_cleaned)} {data_type} records for {tardis_exchange}:{tardis_symbol}")
+        return df_cleaned
+    
     def _create_empty_dataframe_with_schema(self, data_type: str) -> pd.DataFrame:
         """Create an empty DataFrame with the correct schema for the data type"""
         if data_type == 'trades':
@@ -954,7 +1125,8 @@ class TardisConnector:
             'tokens_remaining': self.rate_limiter.tokens,
             'capacity': self.rate_limiter.capacity,
             'refill_period': self.rate_limiter.refill_period,
-            'max_concurrent': self.max_concurrent
+            'max_concurrent': self.max_concurrent,
+            'adaptive_concurrency': self.concurrency_limiter.get_stats() if self.concurrency_limiter else None
         }
     
     async def close(self):
@@ -965,6 +1137,7 @@ class TardisConnector:
         self._session = None
         self.rate_limiter = None
         self.semaphore = None
+        self.concurrency_limiter = None
 
 # Convenience function for creating connector
 async def create_tardis_connector(api_key: str = None) -> TardisConnector:
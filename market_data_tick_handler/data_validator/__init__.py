@@ -10,6 +10,8 @@ from datetime import datetime, timezone, timedelta
 from google.cloud import storage
 import logging
 
+from ..data_client.gcs_object_index import get_gcs_object_index
+
 logger = logging.getLogger(__name__)
 
 class DataValidator:
@@ -92,24 +94,9 @@ class DataValidator:
     def _get_available_data(self, date: datetime, venues: list = None, 
                            instrument_types: list = None) -> list:
         """Get instruments that actually have data in GCS for a given date"""
-        available_instruments = []
-        
-        # Check raw_tick_data partition using optimized single partition strategy
-        date_str = date.strftime('%Y-%m-%d')
-        prefix = f"raw_tick_data/by_date/day-{date_str}/"
-        
-        blobs = list(self.bucket.list_blobs(prefix=prefix))
-        
-        for blob in blobs:
-            if blob.name.endswith('.parquet'):
-                # Extract instrument key from path
-                # Path format: raw_tick_data/by_date/day-2024-01-15/data_type-trades/{instrument_key}.parquet
-                parts = blob.name.split('/')
-                if len(parts) >= 5 and parts[3].startswith('data_type-'):
-                    instrument_key = parts[4].replace('.parquet', '')
-                    available_instruments.append(instrument_key)
-        
-        return list(set(available_instruments))  # Remove duplicates
+        # Answered from the per-day object index of raw_tick_data instead of listing the bucket
+        # Pattern: raw_tick_data/by_date/day-{date}/data_type-{type}/{instrument_key}.parquet
+        return get_gcs_object_index(self.bucket).instruments(date.strftime('%Y-%m-%d'), 'raw_tick_data')
     
     def _find_missing_data(self, expected: list, available: list, date: datetime) -> list:
         """Find instruments that are expected but not available"""
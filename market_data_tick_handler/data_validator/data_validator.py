@@ -10,6 +10,8 @@ from datetime import datetime, timezone, timedelta
 from google.cloud import storage
 import logging
 
+from ..data_client.gcs_object_index import get_gcs_object_index
+
 logger = logging.getLogger(__name__)
 
 class DataValidator:
@@ -138,26 +140,9 @@ class DataValidator:
     def _get_available_data(self, date: datetime, venues: list = None, 
                            instrument_types: list = None) -> list:
         """Get instruments that actually have data in GCS for a given date"""
-        available_instruments = []
-        
-        # Check raw_tick_data partition using current optimized single partition strategy
+        # Answered from the per-day object index of raw_tick_data instead of listing the bucket
         # Pattern: raw_tick_data/by_date/day-{date}/data_type-{type}/{instrument_key}.parquet
-        date_str = date.strftime('%Y-%m-%d')
-        prefix = f"raw_tick_data/by_date/day-{date_str}/"
-        
-        blobs = list(self.bucket.list_blobs(prefix=prefix))
-        
-        for blob in blobs:
-            if blob.name.endswith('.parquet'):
-                # Extract instrument key from path
-                # Path format: raw_tick_data/by_date/day-2024-01-15/data_type-trades/{instrument_key}.parquet
-                parts = blob.name.split('/')
-                if len(parts) >= 5 and parts[3].startswith('data_type-'):
-                    # The instrument key is the filename without .parquet extension
-                    instrument_key = parts[4].replace('.parquet', '')
-                    available_instruments.append(instrument_key)
-        
-        return list(set(available_instruments))  # Remove duplicates
+        return get_gcs_object_index(self.bucket).instruments(date.strftime('%Y-%m-%d'), 'raw_tick_data')
     
     def _find_missing_data(self, expected: list, available: list, date: datetime) -> list:
         """Find instruments that are expected but not available"""
@@ -252,25 +237,8 @@ class DataValidator:
     def _get_available_data_by_type(self, date: datetime, data_type: str, 
                                   venues: list = None, instrument_types: list = None) -> list:
         """Get instruments that actually have data in GCS for a specific data type and date"""
-        available_instruments = []
-        
-        # Check raw_tick_data partition for specific data type
-        date_str = date.strftime('%Y-%m-%d')
-        prefix = f"raw_tick_data/by_date/day-{date_str}/data_type-{data_type}/"
-        
-        blobs = list(self.bucket.list_blobs(prefix=prefix))
-        
-        for blob in blobs:
-            if blob.name.endswith('.parquet'):
-                # Extract instrument key from path
-                # Path format: raw_tick_data/by_date/day-2024-01-15/data_type-trades/{instrument_key}.parquet
-                parts = blob.name.split('/')
-                if len(parts) >= 5 and parts[3] == f'data_type-{data_type}':
-                    # The instrument key is the filename without .parquet extension
-                    instrument_key = parts[4].replace('.parquet', '')
-                    available_instruments.append(instrument_key)
-        
-        return list(set(available_instruments))  # Remove duplicates
+        # Path format: raw_tick_data/by_date/day-2024-01-15/data_type-trades/{instrument_key}.parquet
+        return get_gcs_object_index(self.bucket).instruments(date.strftime('%Y-%m-%d'), 'raw_tick_data', data_type)
     
     def _find_missing_data_by_type(self, expected: list, available: list, date: datetime, data_type: str) -> list:
         """Find instruments that are expected but not available for a specific data type"""
@@ -9,7 +9,6 @@ import pandas as pd
 from datetime import datetime, timezone
 from google.cloud import storage
 from google.cloud.storage import retry
-import tempfile
 from pathlib import Path
 import logging
 from typing import List, Dict, Any
@@ -17,6 +16,8 @@ from pydantic import ValidationError
 import io
 
 from ..models import InstrumentDefinition
+from ..data_client.gcs_object_index import get_gcs_object_index
+from ..utils.parquet_buffer import ParquetUploadBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -83,25 +84,28 @@ class InstrumentGCSUploader:
         by_date_path = f"instrument_availability/by_date/day-{date.strftime('%Y-%m-%d')}/instruments.parquet"
         
         try:
-            buffer = tempfile.NamedTemporaryFile(suffix='.parquet')
-            # Use optimized Parquet settings for efficient querying
-            df_clean.to_parquet(
-                buffer.name, 
-                index=False, 
-                engine='pyarrow',
-                compression='snappy',
-                row_group_size=100000,  # ~1MB per row group for efficient filtering
-                data_page_size=1024 * 1024,  # 1MB data pages
-                use_dictionary=True,  # Dictionary encoding for repeated values
-                write_statistics=True,  # Enable statistics for predicate pushdown
-                use_deprecated_int96_timestamps=False  # Use modern timestamp format
-            )
-            blob = self.bucket.blob(by_date_path)
-            blob.upload_from_filename(
-                buffer.name,
-                timeout=300,  # 5 minutes timeout for daily files
-                retry=retry.DEFAULT_RETRY.with_deadline(300)
-            )
+            with ParquetUploadBuffer() as buffer:
+                # Use optimized Parquet settings for efficient querying
+                buffer.write_dataframe(
+                    df_clean,
+                    index=False, 
+                    engine='pyarrow',
+                    compression='snappy',
+                    row_group_size=100000,  # ~1MB per row group for efficient filtering
+                    data_page_size=1024 * 1024,  # 1MB data pages
+                    use_dictionary=True,  # Dictionary encoding for repeated values
+                    write_statistics=True,  # Enable statistics for predicate pushdown
+                    use_deprecated_int96_timestamps=False  # Use modern timestamp format
+                )
+                blob = self.bucket.blob(by_date_path)
+                buffer.upload(
+                    blob,
+                    timeout=300,  # 5 minutes timeout for daily files
+                    retry=retry.DEFAULT_RETRY.with_deadline(300)
+                )
+                object_index = get_gcs_object_index(self.bucket)
+                object_index.record_upload(blob, source=buffer.sink)
+            object_index.flush()
             
             gcs_path = f"gs://{self.gcs_bucket}/{by_date_path}"
             logger.info(f"✅ Uploaded instrument definitions: {by_date_path}")
@@ -136,27 +140,27 @@ class InstrumentGCSUploader:
             blob = self.bucket.blob(aggregate_path)
             
             # Convert DataFrame to bytes with optimized Parquet settings
-            buffer = tempfile.NamedTemporaryFile(suffix='.parquet')
-            df_clean.to_parquet(
-                buffer.name, 
-                index=False, 
-                engine='pyarrow',
-                compression='snappy',
-                row_group_size=100000,  # ~1MB per row group for efficient filtering
-                data_page_size=1024 * 1024,  # 1MB data pages
-                use_dictionary=True,  # Dictionary encoding for repeated values
-                write_statistics=True,  # Enable statistics for predicate pushdown
-                use_deprecated_int96_timestamps=False  # Use modern timestamp format
-            )
-            
-            # Upload to GCS with extended timeout for large files
-            # Large files need more time and chunked upload
-            logger.info(f"📤 Uploading large aggregate file ({len(df_clean):,} rows) to GCS...")
-            blob.upload_from_filename(
-                buffer.name,
-                timeout=600,  # 10 minutes timeout for large files
-                retry=retry.DEFAULT_RETRY.with_deadline(600)  # 10 minutes total deadline
-            )
+            with ParquetUploadBuffer() as buffer:
+                buffer.write_dataframe(
+                    df_clean,
+                    index=False, 
+                    engine='pyarrow',
+                    compression='snappy',
+                    row_group_size=100000,  # ~1MB per row group for efficient filtering
+                    data_page_size=1024 * 1024,  # 1MB data pages
+                    use_dictionary=True,  # Dictionary encoding for repeated values
+                    write_statistics=True,  # Enable statistics for predicate pushdown
+                    use_deprecated_int96_timestamps=False  # Use modern timestamp format
+                )
+                
+                # Upload to GCS with extended timeout for large files
+                # Large files need more time and chunked upload
+                logger.info(f"📤 Uploading large aggregate file ({len(df_clean):,} rows, {buffer.size_mb:.2f} MB) to GCS...")
+                buffer.upload(
+                    blob,
+                    timeout=600,  # 10 minutes timeout for large files
+                    retry=retry.DEFAULT_RETRY.with_deadline(600)  # 10 minutes total deadline
+                )
             
             logger.info(f"✅ Uploaded aggregate definitions: {aggregate_path}")
             return f"gs://{self.gcs_bucket}/{aggregate_path}"
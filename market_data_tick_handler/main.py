@@ -68,6 +68,9 @@ class ModeHandler:
     async def run(self, **kwargs):
         """Override in subclasses to implement specific mode logic"""
         raise NotImplementedError
+    
+    async def close(self):
+        """Release resources held across runs (override in subclasses that own any)"""
 
 class InstrumentGenerationHandler(ModeHandler):
     """Handles instrument definition generation and GCS upload"""
@@ -273,16 +276,24 @@ class TickDataDownloadHandler(ModeHandler):
             max_workers=config.tardis.download_max_workers
         )
     
+    async def close(self):
+        await self.download_orchestrator.close()
+    
     async def run(self, start_date: datetime, end_date: datetime,
                   venues: List[str] = None, instrument_types: List[str] = None,
                   data_types: List[str] = None, max_instruments: int = None,
                   shard_index: int = None, total_shards: int = None, 
-                  force_download: bool = False, **kwargs):
+                  force_download: bool = False, backfill: bool = False,
+                  checkpoint_path: str = None, **kwargs):
         """Download tick data and upload to GCS"""
         
         # Calculate total days for progress tracking
         total_days = (end_date - start_date).days + 1
         
+        if backfill:
+            return await self._run_backfill(start_date, end_date, venues, instrument_types, data_types,
+                                            max_instruments, shard_index, total_shards, checkpoint_path)
+        
         if force_download:
             logger.info(f"🚀 Starting FORCE tick data download from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
             logger.info(f"⚠️  FORCE mode: Will download all data regardless of existing files")
@@ -364,6 +375,26 @@ class TickDataDownloadHandler(ModeHandler):
         logger.info(f"❌ Errors: {len(results['errors'])}")
         
         return results
+    
+    async def _run_backfill(self, start_date: datetime, end_date: datetime,
+                            venues: List[str], instrument_types: List[str], data_types: List[str],
+                            max_instruments: int, shard_index: int, total_shards: int,
+                            checkpoint_path: str = None) -> dict:
+        """Download the whole range through one pipelined backfill (all data, resumable via checkpoint)"""
+        logger.info(f"🚀 Starting BACKFILL from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        logger.info(f"⚠️  BACKFILL mode: Downloads all data; completed days/files are skipped via the checkpoint")
+        
+        return summarize_backfill(await self.download_orchestrator.backfill_date_range(
+            start_date=start_date,
+            end_date=end_date,
+            venues=venues,
+            instrument_types=instrument_types,
+            data_types=data_types,
+            max_instruments=max_instruments,
+            shard_index=shard_index,
+            total_shards=total_shards,
+            checkpoint_path=checkpoint_path
+        ))
 
 class MissingDataDownloadHandler(ModeHandler):
     """Handles downloading only missing data based on missing data reports"""
@@ -376,6 +407,9 @@ class MissingDataDownloadHandler(ModeHandler):
             max_workers=config.tardis.download_max_workers
         )
     
+    async def close(self):
+        await self.download_orchestrator.close()
+    
     async def run(self, start_date: datetime, end_date: datetime,
                   venues: List[str] = None, instrument_types: List[str] = None,
                   data_types: List[str] = None, max_instruments: int = None,
@@ -713,6 +747,9 @@ class FullPipelineHandler(ModeHandler):
             max_workers=config.tardis.download_max_workers
         )
     
+    async def close(self):
+        await self.download_orchestrator.close()
+    
     async def run(self, start_date: datetime, end_date: datetime,
                   exchanges: List[str] = None, venues: List[str] = None,
                   instrument_types: List[str] = None, data_types: List[str] = None, **kwargs):
@@ -745,7 +782,9 @@ class FullPipelineHandler(ModeHandler):
                 venues=venues,
                 instrument_types=instrument_types,
                 data_types=data_types,
-                max_instruments=kwargs.get('max_instruments')
+                max_instruments=kwargs.get('max_instruments'),
+                backfill=kwargs.get('backfill', False),
+                checkpoint_path=kwargs.get('checkpoint_path')
             )
             results['data_download'] = download_results
             
@@ -773,13 +812,28 @@ class FullPipelineHandler(ModeHandler):
     async def _download_data_with_orchestrator(self, start_date: datetime, end_date: datetime,
                                              venues: List[str] = None, instrument_types: List[str] = None,
                                              data_types: List[str] = None, max_instruments: int = None,
-                                             shard_index: int = None, total_shards: int = None) -> dict:
+                                             shard_index: int = None, total_shards: int = None,
+                                             backfill: bool = False, checkpoint_path: str = None) -> dict:
         """Use DownloadOrchestrator directly for better functionality"""
         logger.info(f"📥 Starting tick data download from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
         
         if data_types is None:
             data_types = ['trades', 'book_snapshot_5', 'derivative_ticker', 'liquidations', 'options_chain']
         
+        if backfill:
+            # One pipeline and session across the whole range instead of one per day
+            return summarize_backfill(await self.download_orchestrator.backfill_date_range(
+                start_date=start_date,
+                end_date=end_date,
+                venues=venues,
+                instrument_types=instrument_types,
+                data_types=data_types,
+                max_instruments=max_instruments,
+                shard_index=shard_index,
+                total_shards=total_shards,
+                checkpoint_path=checkpoint_path
+            ))
+        
         results = {
             'total_days': 0,
             'processed_days': 0,
@@ -844,9 +898,10 @@ class CandleProcessingHandler(ModeHandler):
         
         # Import here to avoid circular imports
         from market_data_tick_handler.data_client.data_client import DataClient
-        from market_data_tick_handler.candle_processor.historical_candle_processor import HistoricalCandleProcessor, ProcessingConfig
-        from market_data_tick_handler.candle_processor.aggregated_candle_processor import AggregatedCandleProcessor, AggregationConfig
-        from market_data_tick_handler.candle_processor.book_snapshot_processor import BookSnapshotProcessor, BookSnapshotConfig
+        from market_data_tick_handler.candle_processor.historical_candle_processor import ProcessingConfig
+        from market_data_tick_handler.candle_processor.aggregated_candle_processor import AggregationConfig
+        from market_data_tick_handler.candle_processor.book_snapshot_processor import BookSnapshotConfig
+        from market_data_tick_handler.candle_processor.multi_timeframe_candle_processor import MultiTimeframeCandleProcessor
         
         # Initialize components
         data_client = DataClient(self.gcs_bucket, self.config)
@@ -869,10 +924,8 @@ class CandleProcessingHandler(ModeHandler):
             levels=5
         )
         
-        # Initialize processors
-        historical_processor = HistoricalCandleProcessor(data_client, processing_config)
-        aggregated_processor = AggregatedCandleProcessor(data_client, aggregation_config)
-        book_processor = BookSnapshotProcessor(data_client, book_config)
+        # Initialize processor (all timeframes and book snapshots from one load per instrument-day)
+        processor = MultiTimeframeCandleProcessor(data_client, processing_config, aggregation_config, book_config)
         
         # Get list of instruments to process
         # This would need to be implemented based on your instrument selection logic
@@ -893,32 +946,19 @@ class CandleProcessingHandler(ModeHandler):
             
             for instrument_id in instruments:
                 try:
-                    # Process historical candles (15s, 1m)
-                    historical_result = await historical_processor.process_day(
-                        instrument_id, current_date, self.gcs_bucket
-                    )
-                    
-                    # Process aggregated candles (5m, 15m, 1h, 4h, 24h)
-                    aggregated_result = await aggregated_processor.process_day(
-                        instrument_id, current_date, self.gcs_bucket
-                    )
-                    
-                    # Process book snapshots
-                    book_result = book_processor.process_day(
+                    # Process every candle timeframe (15s to 24h) and book snapshots in one pass
+                    day_result = await processor.process_day(
                         instrument_id, current_date, self.gcs_bucket
                     )
                     
                     # Aggregate results
                     results['instruments_processed'] += 1
                     results['total_candles_generated'] += (
-                        sum(tf.get('candle_count', 0) for tf in historical_result['timeframes'].values()) +
-                        sum(tf.get('candle_count', 0) for tf in aggregated_result['timeframes'].values()) +
-                        sum(tf.get('snapshot_count', 0) for tf in book_result['timeframes'].values())
+                        sum(tf.get('candle_count', 0) for tf in day_result['timeframes'].values()) +
+                        sum(tf.get('snapshot_count', 0) for tf in day_result['book_timeframes'].values())
                     )
                     
-                    results['errors'].extend(historical_result.get('errors', []))
-                    results['errors'].extend(aggregated_result.get('errors', []))
-                    results['errors'].extend(book_result.get('errors', []))
+                    results['errors'].extend(day_result.get('errors', []))
                     
                 except Exception as e:
                     error_msg = f"Failed to process {instrument_id} on {current_date.strftime('%Y-%m-%d')}: {e}"
@@ -1737,6 +1777,25 @@ class BigQueryUploadHandler(ModeHandler):
         return result
 
 
+def summarize_backfill(backfill_result: dict) -> dict:
+    """Convert backfill results to the per-day download summary format and log it"""
+    results = {
+        'total_days': backfill_result['total_days'],
+        'processed_days': backfill_result['processed_days'] + backfill_result['skipped_days'],
+        'total_downloads': backfill_result['processed'],
+        'failed_downloads': backfill_result['failed'],
+        'errors': backfill_result['errors']
+    }
+    
+    logger.info('🎉 TICK DATA BACKFILL COMPLETED')
+    logger.info(f"📊 Total days: {results['total_days']}")
+    logger.info(f"✅ Processed days: {results['processed_days']} ({backfill_result['skipped_days']} from checkpoint)")
+    logger.info(f"📈 Total downloads: {results['total_downloads']}")
+    logger.info(f"❌ Failed downloads: {results['failed_downloads']}")
+    logger.info(f"❌ Errors: {len(results['errors'])}")
+    
+    return results
+
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
@@ -1750,6 +1809,9 @@ Examples:
   # Download tick data
   python -m market_data_tick_handler.main. --mode download --start-date 2023-05-23 --end-date 2023-05-25 --venues deribit --data-types trades book_snapshot_5
   
+  # Resumable multi-day backfill (one pipeline and session for the whole range)
+  python -m market_data_tick_handler.main. --mode download --backfill --start-date 2023-01-01 --end-date 2023-12-31 --checkpoint-file gs://my-bucket/backfill/2023.json
+  
   # Run full pipeline
   python -m market_data_tick_handler.main. --mode full-pipeline-ticks --start-date 2023-05-23 --end-date 2023-05-25
   
@@ -1833,6 +1895,16 @@ Examples:
         action='store_true',
         help='Force download even if data already exists (overrides missing data check)'
     )
+    parser.add_argument(
+        '--backfill',
+        action='store_true',
+        help='Download the whole date range through one pipelined, resumable backfill (download and full-pipeline modes)'
+    )
+    parser.add_argument(
+        '--checkpoint-file',
+        type=str,
+        help='Backfill progress checkpoint (local path or gs://bucket/path.json, defaults to TARDIS_BACKFILL_CHECKPOINT_PATH)'
+    )
     parser.add_argument(
         '--upload-to-bigquery',
         action='store_true',
@@ -1905,6 +1977,7 @@ async def main():
     """Main entry point with enhanced monitoring and error handling"""
     error_handler = ErrorHandler(logger)
     context = ErrorContext(operation="main", component="main.py")
+    handler = None
     
     try:
         # Start performance monitoring
@@ -1989,7 +2062,9 @@ async def main():
                 max_instruments=args.max_instruments,
                 shard_index=args.shard_index,
                 total_shards=args.total_shards,
-                force_download=args.force_download
+                force_download=args.force_download,
+                backfill=args.backfill,
+                checkpoint_path=args.checkpoint_file
             )
         elif args.mode == 'validate':
             handler = DataValidationHandler(config)
@@ -2035,7 +2110,9 @@ async def main():
                 exchanges=exchanges,  # Use derived exchanges instead of args.exchanges
                 venues=venues,
                 instrument_types=args.instrument_types,
-                data_types=data_types
+                data_types=data_types,
+                backfill=args.backfill,
+                checkpoint_path=args.checkpoint_file
             )
         elif args.mode == 'candle-processing':
             handler = CandleProcessingHandler(config)
@@ -2111,6 +2188,9 @@ async def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if handler is not None:
+            await handler.close()
 
 if __name__ == '__main__':
     asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+In-Memory Parquet Upload Buffer
+
+Serializes Parquet output into memory and uploads the buffer to GCS directly,
+avoiding the write-to-temp-file / re-read round trip. Output only spills to a
+local temporary file once it grows beyond a configurable threshold.
+"""
+
+import logging
+import tempfile
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default size above which buffered Parquet output spills to local disk
+DEFAULT_SPILL_THRESHOLD_MB = 256
+
+
+class ParquetUploadBuffer:
+    """Spooled Parquet sink that stays in memory up to the spill threshold
+
+    Use ``sink`` as the destination for ``df.to_parquet`` or a
+    ``pq.ParquetWriter`` and then ``upload`` the buffer to a blob.
+    """
+
+    def __init__(self, spill_threshold_mb: float = DEFAULT_SPILL_THRESHOLD_MB):
+        self.spill_threshold_bytes = int(spill_threshold_mb * 1024 * 1024)
+        self._file = tempfile.SpooledTemporaryFile(max_size=self.spill_threshold_bytes, suffix='.parquet')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def sink(self):
+        """File-like destination for Parquet writers"""
+        return self._file
+
+    @property
+    def size(self) -> int:
+        """Number of bytes written to the buffer"""
+        position = self._file.tell()
+        self._file.seek(0, 2)
+        size = self._file.tell()
+        self._file.seek(position)
+        return size
+
+    @property
+    def size_mb(self) -> float:
+        """Buffer size in MB (used for size-based upload timeouts)"""
+        return self.size / 1024 / 1024
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the buffer exceeded the threshold and moved to local disk"""
+        return self.size > self.spill_threshold_bytes
+
+    def write_dataframe(self, df: pd.DataFrame, **to_parquet_kwargs: Any):
+        """Serialize a DataFrame into the buffer"""
+        df.to_parquet(self._file, **to_parquet_kwargs)
+
+    def upload(self, blob, **upload_kwargs: Any):
+        """Upload the buffered bytes to a blob, rewinding first so retries resend everything"""
+        size = self.size
+        self._file.seek(0)
+        logger.debug(f"Uploading {size / 1024 / 1024:.2f}MB Parquet buffer "
+                     f"({'spilled to disk' if self.spilled else 'in memory'}) to {blob.name}")
+        blob.upload_from_file(self._file, size=size, **upload_kwargs)
+
+    def close(self):
+        """Release the buffer (memory or temporary file)"""
+        self._file.close()
@@ -0,0 +1,86 @@
+"""
+Unit tests for the vectorized book snapshot engine
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from market_data_tick_handler.candle_processor.book_snapshot_engine import sample_book_snapshots
+
+DATE = datetime(2023, 5, 23, tzinfo=timezone.utc)
+DAY_START_US = int(DATE.timestamp() * 1_000_000)
+LEVELS = 5
+
+
+def _book(rows: int = 3_000, seed: int = 5) -> pd.DataFrame:
+    """Book snapshots over the first two hours, shuffled, with a thin ask side on some rows"""
+    rng = np.random.default_rng(seed)
+    snapshot_us = DAY_START_US + rng.integers(0, 7_200_000_000, rows)
+    mid = 27_000 + rng.standard_normal(rows).cumsum()
+    book = {'timestamp': pd.to_datetime(snapshot_us, unit='us')}
+    for level in range(1, LEVELS + 1):
+        book[f'bid_price_{level}'] = mid - 0.5 * level
+        book[f'bid_volume_{level}'] = rng.exponential(1.0, rows)
+        book[f'ask_price_{level}'] = mid + 0.5 * level
+        book[f'ask_volume_{level}'] = rng.exponential(1.0, rows)
+    book = pd.DataFrame(book)
+    book.loc[book.index % 7 == 0, 'ask_price_5'] = np.nan
+    return book
+
+
+def _reference(snapshot: pd.Series) -> dict:
+    """Per-snapshot features computed level by level"""
+    bids = [(snapshot[f'bid_price_{n}'], snapshot[f'bid_volume_{n}']) for n in range(1, LEVELS + 1)]
+    asks = [(snapshot[f'ask_price_{n}'], snapshot[f'ask_volume_{n}']) for n in range(1, LEVELS + 1)]
+    mid = (bids[0][0] + asks[0][0]) / 2
+    total_bid, total_ask = sum(v for _, v in bids), sum(v for _, v in asks)
+    return {
+        'mid_price': mid,
+        'spread_bps': (asks[0][0] - bids[0][0]) / mid * 10000,
+        'bid_distance_3': (bids[2][0] - mid) / mid * 10000,
+        'volume_imbalance': (total_bid - total_ask) / (total_bid + total_ask),
+        'ask_volume_ratio_2': asks[1][1] / total_ask,
+        'bid_vwap': sum(p * v for p, v in bids) / total_bid,
+        'ask_levels_filled': sum(1 for p, _ in asks if not np.isnan(p)),
+    }
+
+
+class TestBookSnapshotEngine:
+    """Test searchsorted sampling and matrix features against a per-interval scan"""
+
+    def test_first_snapshot_of_each_interval_for_every_timeframe(self):
+        """Test each interval takes its earliest snapshot, and empty intervals are NaN"""
+        book = _book()
+        snapshots = sample_book_snapshots(book, DATE, ['15s', '1m', '1h', '24h'], LEVELS, 'BTC-USDT', 'binance')
+
+        assert {tf: len(df) for tf, df in snapshots.items()} == {'15s': 5760, '1m': 1440, '1h': 24, '24h': 1}
+        for timeframe, seconds in (('15s', 15), ('1m', 60), ('1h', 3600)):
+            df = snapshots[timeframe]
+            for i in range(min(40, len(df))):
+                start = pd.Timestamp(DAY_START_US + i * seconds * 1_000_000, unit='us')
+                in_interval = book[(book['timestamp'] >= start)
+                                   & (book['timestamp'] < start + pd.Timedelta(seconds=seconds))]
+                row = df.iloc[i]
+                if in_interval.empty:
+                    assert np.isnan(row['mid_price']) and np.isnan(row['ask_levels_filled'])
+                    assert row['snapshot_timestamp'] == start.tz_localize('UTC')
+                    continue
+                closest = in_interval.loc[in_interval['timestamp'].idxmin()]
+                assert row['snapshot_timestamp'] == closest['timestamp'].tz_localize('UTC')
+                assert row['timestamp_out'] == row['snapshot_timestamp'] + pd.Timedelta(milliseconds=200)
+                assert row['bid_price_1'] == closest['bid_price_1']
+                for name, value in _reference(closest).items():
+                    np.testing.assert_allclose(row[name], value, err_msg=f"{timeframe} {name}")
+
+        assert snapshots['24h']['snapshot_timestamp'].iloc[0] == book['timestamp'].min().tz_localize('UTC')
+
+    def test_missing_book_gives_empty_snapshots(self):
+        """Test a day without book data still yields NaN snapshots at every boundary"""
+        snapshots = sample_book_snapshots(pd.DataFrame(), DATE, ['1h'], LEVELS, 'BTC-USDT', 'binance')
+
+        df = snapshots['1h']
+        assert len(df) == 24
+        assert df['mid_price'].isna().all()
+        assert (df['timestamp_out'] - df['timestamp'] == pd.Timedelta(milliseconds=200)).all()
@@ -0,0 +1,99 @@
+"""
+Unit tests for the vectorized candle engine
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from market_data_tick_handler.candle_processor.candle_engine import aggregate_timeframes, build_candles, candle_frame
+from market_data_tick_handler.streaming_service.candle_processor.candle_data import CandleBuilder
+
+DATE = datetime(2023, 5, 23, tzinfo=timezone.utc)
+DAY_START_US = int(DATE.timestamp() * 1_000_000)
+
+
+def _trades(rows: int = 20_000, seed: int = 7) -> pd.DataFrame:
+    """Random trades over the first hour, clustered so some 15s buckets stay empty"""
+    rng = np.random.default_rng(seed)
+    offsets_us = np.sort(rng.integers(0, 3_600_000_000, rows) // 40_000_000 * 40_000_000
+                         + rng.integers(0, 5_000_000, rows))
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(DAY_START_US + offsets_us, unit='us'),
+        'local_timestamp': DAY_START_US + offsets_us + rng.integers(1_000, 50_000, rows),
+        'price': 27_000 + rng.standard_normal(rows).cumsum(),
+        'amount': rng.exponential(0.05, rows),
+    })
+
+
+def _builder_candle(trades: pd.DataFrame, start: datetime, interval: timedelta) -> dict:
+    """Reference candle: feed the interval's trades through CandleBuilder one by one"""
+    in_bucket = trades[(trades['timestamp'] >= start.replace(tzinfo=None))
+                       & (trades['timestamp'] < (start + interval).replace(tzinfo=None))]
+    builder = CandleBuilder(symbol='BTC-USDT', exchange='binance', timeframe='15s', timestamp_in=start)
+    for price, amount in zip(in_bucket['price'], in_bucket['amount']):
+        builder.add_trade(price, amount)
+    return {'trades': len(in_bucket), 'open': builder.open, 'high': builder.high, 'low': builder.low,
+            'close': builder.close, 'volume': builder.volume, 'vwap': builder.vwap,
+            'last_local_us': in_bucket['local_timestamp'].max() if len(in_bucket) else None}
+
+
+class TestCandleEngine:
+    """Test vectorized candles against the per-trade CandleBuilder"""
+
+    def test_candles_are_bit_identical_to_builder(self):
+        """Test every bucket of the day matches CandleBuilder exactly, empty buckets included"""
+        trades = _trades()
+        candles = build_candles(trades, DATE, 15, 'BTC-USDT', 'binance', '15s')
+
+        assert len(candles) == 5760
+        assert candles['timestamp'].iloc[1] == pd.Timestamp('2023-05-23 00:00:15', tz='UTC')
+
+        interval = timedelta(seconds=15)
+        for i in range(0, 260):
+            start = DATE + i * interval
+            expected = _builder_candle(trades, start, interval)
+            candle = candles.iloc[i]
+            assert candle['trade_count'] == expected['trades']
+            if expected['trades'] == 0:
+                assert np.isnan(candle['open']) and candle['volume'] == 0.0 and np.isnan(candle['vwap'])
+                assert candle['timestamp_out'] == pd.Timestamp(start) + pd.Timedelta(milliseconds=200)
+                continue
+            for column in ('open', 'high', 'low', 'close', 'volume', 'vwap'):
+                assert candle[column] == expected[column], column
+            assert candle['timestamp_out'] == pd.Timestamp(int(expected['last_local_us']) + 200_000, unit='us', tz='UTC')
+
+    def test_unsorted_trades_keep_frame_order_within_buckets(self):
+        """Test shuffled input still opens/closes each bucket with its first/last trade in frame order"""
+        trades = _trades(rows=2_000).sample(frac=1.0, random_state=3).reset_index(drop=True)
+        candles = build_candles(trades, DATE, 60, 'BTC-USDT', 'binance', '1m')
+
+        first_bucket = trades[trades['timestamp'] < pd.Timestamp('2023-05-23 00:01:00')]
+        assert candles['open'].iloc[0] == first_bucket['price'].iloc[0]
+        assert candles['close'].iloc[0] == first_bucket['price'].iloc[-1]
+        assert candles['trade_count'].sum() == len(trades)
+
+    def test_no_trades_gives_empty_day(self):
+        """Test a day without trades yields NaN candles with zero volume"""
+        candles = build_candles(pd.DataFrame(), DATE, 60, 'BTC-USDT', 'binance', '1m')
+
+        assert len(candles) == 1440
+        assert candles['open'].isna().all()
+        assert (candles['volume'] == 0.0).all()
+        assert (candles['trade_count'] == 0).all()
+
+    def test_rolled_up_timeframes_match_direct_build(self):
+        """Test every timeframe rolled up from 15s equals building it straight from the trades"""
+        trades = _trades()
+        aggregates = aggregate_timeframes(trades, DATE, ['24h', '15s', '1m', '5m', '15m', '1h', '4h'])
+
+        for timeframe, seconds in (('1m', 60), ('5m', 300), ('15m', 900), ('1h', 3600), ('4h', 14400), ('24h', 86400)):
+            rolled = candle_frame(aggregates[timeframe], 'BTC-USDT', 'binance', timeframe)
+            direct = build_candles(trades, DATE, seconds, 'BTC-USDT', 'binance', timeframe)
+
+            assert len(rolled) == len(direct) == 86400 // seconds
+            for column in ('timestamp', 'timestamp_out', 'open', 'high', 'low', 'close', 'trade_count'):
+                pd.testing.assert_series_equal(rolled[column], direct[column], check_names=False)
+            np.testing.assert_allclose(rolled['volume'], direct['volume'], rtol=1e-12)
+            np.testing.assert_allclose(rolled['vwap'], direct['vwap'], rtol=1e-12)
@@ -0,0 +1,60 @@
+"""
+Unit tests for rolling 1m candles up into higher timeframes
+"""
+
+import numpy as np
+import pandas as pd
+
+from market_data_tick_handler.candle_processor.candle_engine import build_candles
+from market_data_tick_handler.candle_processor.candle_rollup import HFT_AGGREGATION_RULES, rollup_candles
+from market_data_tick_handler.candle_processor.hft_feature_engine import HFT_FEATURE_COLUMNS
+from tests.unit.candle_processor.test_candle_engine import DATE, _trades
+
+
+def _one_minute_candles(with_features: bool = True) -> pd.DataFrame:
+    """1m candles from random trades, with a few HFT feature columns filled in"""
+    candles = build_candles(_trades(), DATE, 60, 'BTC-USDT', 'binance', '1m')
+    if with_features:
+        rng = np.random.default_rng(3)
+        has_trades = candles['trade_count'] > 0
+        candles['size_avg'] = np.where(has_trades, rng.exponential(0.05, len(candles)), np.nan)
+        candles['delay_max'] = np.where(has_trades, rng.uniform(1, 50, len(candles)), np.nan)
+        candles['funding_rate'] = np.where(np.arange(len(candles)) % 8 == 0, np.arange(len(candles)) * 1e-6, np.nan)
+    return candles
+
+
+class TestCandleRollup:
+    """Test one-call roll-up against direct builds and per-interval reductions"""
+
+    def test_ohlcv_matches_building_from_trades(self):
+        """Test rolled-up OHLC and counts equal candles built straight from the trades"""
+        rolled = rollup_candles(_one_minute_candles(False), DATE, ['5m', '15m', '1h', '4h', '24h'],
+                                'BTC-USDT', 'binance')
+
+        for timeframe, seconds in (('5m', 300), ('15m', 900), ('1h', 3600), ('4h', 14400), ('24h', 86400)):
+            direct = build_candles(_trades(), DATE, seconds, 'BTC-USDT', 'binance', timeframe)
+            candles = rolled[timeframe]
+            assert len(candles) == 86400 // seconds
+            for column in ('timestamp', 'open', 'high', 'low', 'close', 'trade_count'):
+                pd.testing.assert_series_equal(candles[column], direct[column], check_names=False)
+            np.testing.assert_allclose(candles['volume'], direct['volume'], rtol=1e-12)
+            np.testing.assert_allclose(candles['vwap'], direct['vwap'], rtol=1e-12)
+            assert list(candles.columns[:12]) == ['symbol', 'exchange', 'timeframe', 'timestamp', 'timestamp_out',
+                                                  'open', 'high', 'low', 'close', 'volume', 'trade_count', 'vwap']
+
+    def test_hft_features_follow_column_rules(self):
+        """Test each HFT column reduces by its declared rule within its interval"""
+        one_minute = _one_minute_candles()
+        candles = rollup_candles(one_minute, DATE, ['15m'], 'BTC-USDT', 'binance', HFT_AGGREGATION_RULES)['15m']
+
+        assert set(HFT_FEATURE_COLUMNS) <= set(candles.columns)
+        for i in range(4):
+            interval = one_minute.iloc[i * 15:(i + 1) * 15]
+            row = candles.iloc[i]
+            np.testing.assert_allclose(row['size_avg'], (interval['size_avg'] * interval['trade_count']).sum()
+                                       / interval['trade_count'][interval['size_avg'].notna()].sum())
+            np.testing.assert_allclose(row['delay_max'], interval['delay_max'].max())
+            np.testing.assert_allclose(row['funding_rate'], interval['funding_rate'].dropna().iloc[-1])
+            assert row['timestamp_out'] == interval['timestamp_out'].max() + pd.Timedelta(milliseconds=200)
+        assert np.isnan(candles['mark_price']).all()  # Not among the 1m columns
+        assert np.isnan(candles['oi_change']).all()
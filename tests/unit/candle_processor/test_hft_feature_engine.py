@@ -0,0 +1,90 @@
+"""
+Unit tests for the vectorized HFT feature engine
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from market_data_tick_handler.candle_processor.hft_feature_engine import HFT_FEATURE_COLUMNS, compute_hft_features
+
+DATE = datetime(2023, 5, 23, tzinfo=timezone.utc)
+DAY_START_US = int(DATE.timestamp() * 1_000_000)
+INTERVAL_US = 60_000_000
+CANDLES_US = DAY_START_US + np.arange(1440, dtype=np.int64) * INTERVAL_US
+
+
+def _day_data(rows: int = 5_000, seed: int = 11) -> dict:
+    """Trades, liquidations and derivative ticker updates over the first 30 minutes (loaded as naive datetimes)"""
+    rng = np.random.default_rng(seed)
+    trade_us = np.sort(DAY_START_US + rng.integers(0, 1_800_000_000, rows))
+    liquidation_us = np.sort(DAY_START_US + rng.integers(0, 1_800_000_000, 40))
+    ticker_us = DAY_START_US + np.arange(0, 1_800_000_000, 150_000_000)
+    return {
+        'trades': pd.DataFrame({
+            'timestamp': pd.to_datetime(trade_us, unit='us'),
+            'local_timestamp': pd.to_datetime(trade_us + rng.integers(1_000, 90_000, rows), unit='us'),
+            'price': 27_000 + rng.standard_normal(rows).cumsum(),
+            'amount': rng.exponential(0.05, rows),
+        }),
+        'liquidations': pd.DataFrame({
+            'timestamp': pd.to_datetime(liquidation_us, unit='us'),
+            'amount': rng.exponential(1.0, 40),
+        }),
+        'derivative_ticker': pd.DataFrame({
+            'timestamp': pd.to_datetime(ticker_us, unit='us'),
+            'funding_rate': np.arange(len(ticker_us)) * 1e-5,
+            'mark_price': 27_000 + np.arange(len(ticker_us), dtype=np.float64),
+        }),
+    }
+
+
+def _in_candle(df: pd.DataFrame, i: int) -> pd.DataFrame:
+    start = pd.Timestamp(int(CANDLES_US[i]), unit='us')
+    return df[(df['timestamp'] >= start) & (df['timestamp'] < start + pd.Timedelta(minutes=1))]
+
+
+class TestHFTFeatureEngine:
+    """Test grouped features against a direct per-candle computation"""
+
+    def test_trade_and_liquidation_features_are_scoped_to_each_candle(self):
+        """Test each candle only sees its own trades and liquidations"""
+        day_data = _day_data()
+        features = compute_hft_features(day_data, CANDLES_US, INTERVAL_US)
+
+        assert set(features) == set(HFT_FEATURE_COLUMNS)
+        for i in range(30):
+            trades = _in_candle(day_data['trades'], i)
+            delays = (trades['local_timestamp'] - trades['timestamp']).dt.total_seconds() * 1000
+            assert features['trade_count'][i] == len(trades)
+            np.testing.assert_allclose(features['size_avg'][i], trades['amount'].mean())
+            np.testing.assert_allclose(features['price_vwap'][i],
+                                       (trades['price'] * trades['amount']).sum() / trades['amount'].sum())
+            np.testing.assert_allclose(features['delay_median'][i], delays.median())
+            np.testing.assert_allclose(features['delay_min'][i], delays.min())
+            np.testing.assert_allclose(features['delay_max'][i], delays.max())
+            np.testing.assert_allclose(features['delay_mean'][i], delays.mean())
+
+            liquidations = _in_candle(day_data['liquidations'], i)
+            if liquidations.empty:
+                assert np.isnan(features['liquidation_count'][i])
+            else:
+                assert features['liquidation_count'][i] == len(liquidations)
+                np.testing.assert_allclose(features['liquidation_buy_volume'][i], liquidations['amount'].sum() / 2)
+
+        # Candles after the last trade have no trade features
+        assert np.isnan(features['trade_count'][30:]).all()
+        assert np.isnan(features['delay_median'][30:]).all()
+
+    def test_derivative_features_are_last_values_before_close(self):
+        """Test ticker fields carry the latest update strictly before each candle's close"""
+        features = compute_hft_features(_day_data(), CANDLES_US, INTERVAL_US)
+
+        # Updates every 2.5 minutes from midnight: candle i closes at (i + 1) minutes
+        expected = [min(np.ceil((i + 1) / 2.5) - 1, 11) for i in range(40)]
+        np.testing.assert_allclose(features['funding_rate'][:40], np.array(expected) * 1e-5)
+        assert features['mark_price'][1] == 27_000.0
+        assert features['mark_price'][2] == 27_001.0  # The 2.5 minute update lands inside candle 2
+        assert features['mark_price'][-1] == 27_011.0  # Carried forward after the last update
+        assert np.isnan(features['index_price']).all()
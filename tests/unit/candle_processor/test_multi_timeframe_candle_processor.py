@@ -0,0 +1,75 @@
+"""
+Unit tests for the single-pass multi-timeframe candle processor
+"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data_tick_handler.candle_processor.book_snapshot_processor import BookSnapshotConfig
+from market_data_tick_handler.candle_processor.multi_timeframe_candle_processor import MultiTimeframeCandleProcessor
+from market_data_tick_handler.data_client import gcs_object_index
+from tests.unit.candle_processor.test_candle_engine import DATE, DAY_START_US, _trades
+from tests.unit.data_client.test_gcs_object_index import StoreBucket
+
+INSTRUMENT = 'BINANCE:SPOT_PAIR:BTC-USDT'
+TIMEFRAMES = ['15s', '1m', '5m', '15m', '1h', '4h', '24h']
+
+
+def _raw_files() -> dict:
+    """Raw tick files as stored (integer microsecond timestamps)"""
+    trades = _trades(rows=2_000)
+    trades['timestamp'] = trades['timestamp'].to_numpy(dtype='datetime64[us]').astype(np.int64)
+    book_us = DAY_START_US + np.arange(0, 3_600_000_000, 10_000_000)
+    book = {'timestamp': book_us}
+    for level in range(1, 6):
+        book[f'bid_price_{level}'] = 27_000 - 0.5 * level
+        book[f'bid_volume_{level}'] = 1.0
+        book[f'ask_price_{level}'] = 27_000 + 0.5 * level
+        book[f'ask_volume_{level}'] = 2.0
+    prefix = "raw_tick_data/by_date/day-2023-05-23"
+    return {
+        f"{prefix}/data_type-trades/{INSTRUMENT}.parquet": trades,
+        f"{prefix}/data_type-book_snapshot_5/{INSTRUMENT}.parquet": pd.DataFrame(book),
+    }
+
+
+@pytest.fixture
+def data_client(monkeypatch):
+    monkeypatch.setattr(gcs_object_index, '_object_indexes', {})
+    bucket = StoreBucket()
+    files = _raw_files()
+    client = Mock()
+    client.gcs_bucket = bucket.name
+    client.client.bucket.return_value = bucket
+    client.read_parquet_file.side_effect = lambda blob_name: files.get(blob_name, pd.DataFrame()).copy()
+    return client
+
+
+class TestMultiTimeframeCandleProcessor:
+    """Test one process_day call builds and uploads every timeframe"""
+
+    @pytest.mark.asyncio
+    async def test_process_day_uploads_every_timeframe(self, data_client):
+        """Test candles and book snapshots for 15s to 24h land in the bucket and the object index"""
+        processor = MultiTimeframeCandleProcessor(data_client, book_config=BookSnapshotConfig(levels=5))
+
+        results = await processor.process_day(INSTRUMENT, DATE)
+
+        assert results['errors'] == []
+        assert list(results['timeframes']) == TIMEFRAMES
+        assert list(results['book_timeframes']) == TIMEFRAMES
+        assert results['timeframes']['1m']['candle_count'] == 1440
+        assert results['book_timeframes']['1h']['snapshot_count'] == 24
+
+        bucket = data_client.client.bucket()
+        for timeframe in TIMEFRAMES:
+            assert f"processed_candles/by_date/day-2023-05-23/timeframe-{timeframe}/{INSTRUMENT}.parquet" in bucket.objects
+            assert (f"processed_book_snapshots/by_date/day-2023-05-23/timeframe-{timeframe}/{INSTRUMENT}.parquet"
+                    in bucket.objects)
+
+        # Written candles are recorded in the object index in one flush
+        index = gcs_object_index.GCSObjectIndex(bucket)
+        assert index.instruments('2023-05-23', 'processed_candles', '24h') == [INSTRUMENT]
@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the data client tests
+"""
+
+import pytest
+
+from market_data_tick_handler.data_client import parquet_metadata_cache
+from market_data_tick_handler.data_client.data_client import DataClient
+
+
+@pytest.fixture(autouse=True)
+def fresh_metadata_cache():
+    """Isolate tests from the process-wide footer cache"""
+    parquet_metadata_cache._metadata_cache = None
+    yield
+    parquet_metadata_cache._metadata_cache = None
+
+
+@pytest.fixture
+def data_client():
+    """Factory for a DataClient over a fake bucket - no credentials, no local cache"""
+    def make(bucket) -> DataClient:
+        client = DataClient.__new__(DataClient)
+        client.client = None
+        client.bucket = bucket
+        client.local_cache = None
+        client.read_max_workers = 4
+        return client
+    return make
@@ -0,0 +1,124 @@
+"""
+Unit tests for concurrent multi-day, multi-instrument reads
+"""
+
+import io
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from market_data_tick_handler.data_client.candle_data_reader import CandleDataReader
+from market_data_tick_handler.data_client.data_client import date_strings
+from tests.unit.data_client.test_gcs_range_file import FakeBlob, FakeBucket
+
+INSTRUMENTS = ['BINANCE:SPOT_PAIR:BTC-USDT', 'BINANCE:SPOT_PAIR:ETH-USDT']
+DATES = ['2023-05-23', '2023-05-24', '2023-05-25']
+
+
+def _candle_file(date_str: str, close: float) -> bytes:
+    """One day of hourly candles"""
+    rows = 24
+    table = pa.table({
+        'timestamp': pa.array(pd.date_range(date_str, periods=rows, freq='1h', tz='UTC')),
+        'close': pa.array([close] * rows),
+    })
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
+
+
+def _candle_blobs():
+    return [
+        FakeBlob(f"processed_candles/by_date/day-{date_str}/timeframe-1h/{instrument_id}.parquet",
+                 _candle_file(date_str, float(i)))
+        for i, instrument_id in enumerate(INSTRUMENTS)
+        for date_str in DATES
+    ]
+
+
+class TestBulkReads:
+    """Test DataClient.read_parquet_files and the readers built on it"""
+
+    def test_date_strings_cover_partial_days(self):
+        """Test a range starting mid-day still includes the last day"""
+        start = datetime(2023, 5, 23, 18, tzinfo=timezone.utc)
+        end = datetime(2023, 5, 25, 6, tzinfo=timezone.utc)
+
+        assert date_strings(start, end) == DATES
+
+    def test_results_keep_request_order(self, data_client):
+        """Test results follow blob order even when earlier reads finish last"""
+        client = data_client(FakeBucket([]))
+        delays = {'a': 0.05, 'b': 0.0, 'c': 0.02}
+
+        def reader(blob_name):
+            time.sleep(delays[blob_name])
+            return pd.DataFrame({'name': [blob_name]})
+
+        frames = client.read_parquet_files(['a', 'b', 'c'], reader=reader)
+
+        assert [df['name'][0] for df in frames] == ['a', 'b', 'c']
+
+    def test_failed_reads_return_none_and_are_counted(self, data_client):
+        """Test a missing object yields None and shows up in the read stats"""
+        blobs = _candle_blobs()
+        client = data_client(FakeBucket(blobs))
+
+        frames = client.read_parquet_files([blobs[0].name, 'missing.parquet'])
+        stats = client.get_read_stats()
+
+        assert len(frames[0]) == 24
+        assert frames[1] is None
+        assert stats['files'] == 2
+        assert stats['failed'] == 1
+        assert stats['rows'] == 24
+        assert [request['blob_name'] for request in stats['requests']] == [blobs[0].name, 'missing.parquet']
+
+    def test_decoded_bytes_count_string_payloads(self, data_client):
+        """Test read stats count the strings of object columns, not just their pointers"""
+        client = data_client(FakeBucket([]))
+        symbols = pd.DataFrame({'symbol': pd.Series(['BINANCE:SPOT_PAIR:BTC-USDT'] * 100, dtype=object)})
+
+        client.read_parquet_files(['a'], reader=lambda blob_name: symbols)
+
+        assert client.get_read_stats()['bytes'] > symbols.memory_usage(index=False).sum()
+
+    def test_candles_for_instruments_concatenates_each_instrument(self, data_client):
+        """Test every (instrument, day) file is read once and grouped per instrument"""
+        blobs = _candle_blobs()
+        reader = CandleDataReader(data_client(FakeBucket(blobs)))
+        start = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        end = datetime(2023, 5, 25, 23, tzinfo=timezone.utc)
+
+        result = reader.get_candles_for_instruments(INSTRUMENTS, '1h', start, end, columns=['close'])
+
+        assert list(result) == INSTRUMENTS
+        for i, instrument_id in enumerate(INSTRUMENTS):
+            assert len(result[instrument_id]) == 72
+            assert result[instrument_id]['timestamp'].is_monotonic_increasing
+            assert (result[instrument_id]['close'] == float(i)).all()
+        assert reader.data_client.get_read_stats()['files'] == 6
+
+    def test_candles_as_arrow(self, data_client):
+        """Test return_type='arrow' keeps the combined result in Arrow"""
+        blobs = _candle_blobs()
+        reader = CandleDataReader(data_client(FakeBucket(blobs)))
+        start = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        end = datetime(2023, 5, 24, 11, tzinfo=timezone.utc)
+
+        table = reader.get_candles(INSTRUMENTS[0], '1h', start, end, columns=['close'], return_type='arrow')
+
+        assert isinstance(table, pa.Table)
+        assert table.column_names == ['timestamp', 'close']
+        assert table.num_rows == 36
+
+    def test_unsupported_return_type(self, data_client):
+        """Test an unknown return_type is rejected before any read"""
+        reader = CandleDataReader(data_client(FakeBucket([])))
+
+        with pytest.raises(ValueError):
+            reader.get_candles(INSTRUMENTS[0], '1h', datetime(2023, 5, 23), datetime(2023, 5, 23), return_type='numpy')
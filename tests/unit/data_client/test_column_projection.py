@@ -0,0 +1,90 @@
+"""
+Unit tests for column projection in the feature and candle readers
+"""
+
+import io
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from market_data_tick_handler.data_client.candle_data_reader import CandleDataReader
+from market_data_tick_handler.data_client.hft_features_reader import HFTFeaturesReader
+from market_data_tick_handler.data_client.local_block_cache import LocalBlockCache
+from tests.unit.data_client.test_gcs_range_file import FakeBlob, FakeBucket
+
+CANDLES_BLOB = 'processed_candles/by_date/day-2023-05-23/timeframe-1m/BINANCE:SPOT_PAIR:BTC-USDT.parquet'
+
+
+def _wide_candle_file(rows: int = 1440, extra_columns: int = 200) -> bytes:
+    """One day of 1m candles with many feature columns"""
+    columns = {
+        'timestamp': pa.array(pd.date_range('2023-05-23', periods=rows, freq='1min', tz='UTC')),
+        'symbol': pa.array(['BTC-USDT'] * rows),
+        'open': pa.array(np.random.rand(rows)),
+        'close': pa.array(np.random.rand(rows)),
+        'buy_volume_sum': pa.array(np.random.rand(rows)),
+        'funding_rate': pa.array(np.random.rand(rows)),
+    }
+    for i in range(extra_columns):
+        columns[f'feature_{i}'] = pa.array(np.random.rand(rows))
+    buffer = io.BytesIO()
+    pq.write_table(pa.table(columns), buffer, row_group_size=360)
+    return buffer.getvalue()
+
+
+class TestColumnProjection:
+    """Test readers fetch only the projected column chunks"""
+
+    def test_hft_reader_reads_feature_columns_only(self, data_client):
+        """Test the default HFT projection skips unrelated columns, ignoring features absent from the file"""
+        blob = FakeBlob(CANDLES_BLOB, _wide_candle_file())
+        reader = HFTFeaturesReader(data_client(FakeBucket([blob])))
+
+        df = reader.get_hft_features_for_date('BINANCE:SPOT_PAIR:BTC-USDT', '1m', datetime(2023, 5, 23))
+
+        assert list(df.columns) == ['timestamp', 'symbol', 'buy_volume_sum', 'funding_rate']
+        assert len(df) == 1440
+        assert sum(end - start + 1 for start, end in blob.ranges) < len(blob.data) / 5
+
+    def test_hft_reader_explicit_columns(self, data_client):
+        """Test a caller-supplied projection narrows the features further"""
+        blob = FakeBlob(CANDLES_BLOB, _wide_candle_file())
+        reader = HFTFeaturesReader(data_client(FakeBucket([blob])))
+
+        df = reader.get_hft_features_for_date('BINANCE:SPOT_PAIR:BTC-USDT', '1m', datetime(2023, 5, 23),
+                                              columns=['funding_rate'])
+
+        assert list(df.columns) == ['timestamp', 'symbol', 'funding_rate']
+
+    def test_candle_reader_projects_row_groups(self, data_client):
+        """Test get_candles reads only the OHLCV columns of the overlapping row groups"""
+        blob = FakeBlob(CANDLES_BLOB, _wide_candle_file())
+        reader = CandleDataReader(data_client(FakeBucket([blob])))
+        start = datetime(2023, 5, 23, 1, tzinfo=timezone.utc)
+
+        df = reader.get_candles('BINANCE:SPOT_PAIR:BTC-USDT', '1m', start, datetime(2023, 5, 23, 2, tzinfo=timezone.utc))
+
+        assert list(df.columns) == ['timestamp', 'symbol', 'open', 'close']
+        assert len(df) == 61
+        assert sum(end - start + 1 for start, end in blob.ranges) < len(blob.data) / 10
+
+    def test_candle_reader_uses_local_cache(self, data_client, tmp_path):
+        """Test get_candles reads the local copy when a local cache is configured"""
+        blob = FakeBlob(CANDLES_BLOB, _wide_candle_file())
+        client = data_client(FakeBucket([blob]))
+        client.local_cache = LocalBlockCache(str(tmp_path), max_bytes=100 * 1024 * 1024)
+        reader = CandleDataReader(client)
+        start = datetime(2023, 5, 23, 1, tzinfo=timezone.utc)
+        end = datetime(2023, 5, 23, 2, tzinfo=timezone.utc)
+
+        first = reader.get_candles('BINANCE:SPOT_PAIR:BTC-USDT', '1m', start, end)
+        second = reader.get_candles('BINANCE:SPOT_PAIR:BTC-USDT', '1m', start, end)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert list(first.columns) == ['timestamp', 'symbol', 'open', 'close']
+        assert len(first) == 61
+        assert len(blob.ranges) == 1  # One download, then served from disk
+        assert client.local_cache.get_stats()['hits'] == 1
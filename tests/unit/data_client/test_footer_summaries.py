@@ -0,0 +1,52 @@
+"""
+Unit tests for footer-only data summaries
+"""
+
+from datetime import datetime, timezone
+
+import pandas as pd
+from google.cloud.exceptions import NotFound
+
+from market_data_tick_handler.data_client.tick_data_reader import TickDataReader
+from tests.unit.data_client.test_gcs_range_file import FakeBlob, FakeBucket, _trades_file
+
+INSTRUMENTS = ['BINANCE:SPOT_PAIR:BTC-USDT', 'BINANCE:SPOT_PAIR:ETH-USDT']
+DATE = datetime(2023, 5, 23, tzinfo=timezone.utc)
+
+
+class MissingBlob(FakeBlob):
+    def reload(self):
+        raise NotFound(self.name)
+
+
+class SparseBucket(FakeBucket):
+    """Bucket where unknown names behave like missing GCS objects"""
+
+    def blob(self, name):
+        return self.blobs.get(name) or MissingBlob(name, b'')
+
+
+class TestFooterSummaries:
+    """Test summaries are built from Parquet footers without reading row data"""
+
+    def test_data_summaries_read_footers_only(self, data_client):
+        """Test record counts and time ranges come from the footer and missing files are reported"""
+        blobs = [
+            FakeBlob(f"raw_tick_data/by_date/day-2023-05-23/data_type-trades/{instrument_id}.parquet", _trades_file())
+            for instrument_id in INSTRUMENTS
+        ]
+        reader = TickDataReader(data_client(SparseBucket(blobs)))
+
+        summaries = reader.get_data_summaries(INSTRUMENTS, DATE)
+
+        for instrument_id, blob in zip(INSTRUMENTS, blobs):
+            summary = summaries[instrument_id]
+            trades = summary['data_types']['trades']
+            assert summary['total_records'] == 100_000
+            assert trades['record_count'] == 100_000
+            assert trades['row_groups'] == 10
+            assert trades['columns'] == ['exchange', 'timestamp', 'price']
+            assert trades['file_size'] == len(blob.data)
+            assert trades['time_range']['start'] == pd.Timestamp('2023-05-23', tz='UTC')
+            assert summary['data_types']['book_snapshot_5'] == {'available': False}
+            assert sum(end - start + 1 for start, end in blob.ranges) < len(blob.data) / 5
@@ -0,0 +1,147 @@
+"""
+Unit tests for the per-day GCS object index
+"""
+
+from google.cloud.exceptions import Forbidden, PreconditionFailed
+
+from market_data_tick_handler.data_client.gcs_object_index import (
+    GCSObjectIndex, index_blob_name, parse_blob_name
+)
+from tests.unit.data_client.test_gcs_range_file import _trades_file
+
+DATE = '2023-05-23'
+TRADES = f"raw_tick_data/by_date/day-{DATE}/data_type-trades/BINANCE:SPOT_PAIR:BTC-USDT.parquet"
+BOOK = f"raw_tick_data/by_date/day-{DATE}/data_type-book_snapshot_5/BINANCE:SPOT_PAIR:ETH-USDT.parquet"
+CANDLES = f"processed_candles/by_date/day-{DATE}/timeframe-1m/BINANCE:SPOT_PAIR:BTC-USDT.parquet"
+
+
+class StoredBlob:
+    """Generation-checked in-memory object like google.cloud.storage.Blob"""
+
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.size = None
+        self.generation = None
+
+    def upload_from_string(self, data, content_type=None, if_generation_match=None):
+        current = self.bucket.objects.get(self.name)
+        if if_generation_match is not None and if_generation_match != (current[1] if current else 0):
+            raise PreconditionFailed("conditionNotMet")
+        self.bucket.next_generation += 1
+        self.bucket.objects[self.name] = (data, self.bucket.next_generation)
+        self.size, self.generation = len(data), self.bucket.next_generation
+
+    def download_as_bytes(self):
+        return self.bucket.objects[self.name][0]
+
+
+class StoreBucket:
+    name = 'test-bucket'
+
+    def __init__(self):
+        self.objects = {}
+        self.next_generation = 0
+        self.listings = []
+
+    def put(self, name, data):
+        self.blob(name).upload_from_string(data)
+
+    def blob(self, name):
+        return StoredBlob(self, name)
+
+    def get_blob(self, name):
+        if name not in self.objects:
+            return None
+        blob = self.blob(name)
+        blob.size, blob.generation = len(self.objects[name][0]), self.objects[name][1]
+        return blob
+
+    def list_blobs(self, prefix):
+        self.listings.append(prefix)
+        return [self.get_blob(name) for name in sorted(self.objects) if name.startswith(prefix)]
+
+
+class ReadOnlyBlob(StoredBlob):
+    def upload_from_string(self, data, content_type=None, if_generation_match=None):
+        raise Forbidden("storage.objects.create")
+
+
+class ReadOnlyBucket(StoreBucket):
+    """Bucket whose credentials can list and read but not write"""
+
+    def blob(self, name):
+        return ReadOnlyBlob(self, name)
+
+
+class TestGCSObjectIndex:
+    """Test discovery is answered from the index and writers keep it current"""
+
+    def test_parse_blob_name(self):
+        """Test the three by_date layouts are recognised and other names are not"""
+        assert parse_blob_name(TRADES) == ('raw_tick_data', DATE, 'trades', 'BINANCE:SPOT_PAIR:BTC-USDT')
+        assert parse_blob_name(CANDLES) == ('processed_candles', DATE, '1m', 'BINANCE:SPOT_PAIR:BTC-USDT')
+        assert parse_blob_name(f"instrument_availability/by_date/day-{DATE}/instruments.parquet") == \
+            ('instrument_availability', DATE, 'instruments', '')
+        assert parse_blob_name('instrument_availability/aggregate/all.parquet') is None
+        assert parse_blob_name(index_blob_name(DATE)) is None
+
+    def test_missing_index_is_built_once_from_listings(self):
+        """Test the first query lists the day, persists the index, and later queries do not list again"""
+        bucket = StoreBucket()
+        bucket.put(TRADES, _trades_file(rows=1_000))
+        bucket.put(BOOK, _trades_file(rows=1_000))
+        bucket.put(CANDLES, _trades_file(rows=1_000))
+
+        index = GCSObjectIndex(bucket)
+        assert index.instruments(DATE) == ['BINANCE:SPOT_PAIR:BTC-USDT', 'BINANCE:SPOT_PAIR:ETH-USDT']
+        assert index.instruments(DATE, 'raw_tick_data', 'trades') == ['BINANCE:SPOT_PAIR:BTC-USDT']
+        assert [entry['blob_name'] for entry in index.entries(DATE, 'processed_candles', '1m')] == [CANDLES]
+        assert index_blob_name(DATE) in bucket.objects
+        listings = len(bucket.listings)
+
+        # A new process loads the persisted index without listing
+        reloaded = GCSObjectIndex(bucket)
+        assert reloaded.exists(BOOK)
+        assert len(bucket.listings) == listings
+
+    def test_read_only_client_keeps_listing_in_memory(self):
+        """Test a client that cannot write the index still answers discovery from the listing"""
+        bucket = ReadOnlyBucket()
+        StoreBucket.blob(bucket, TRADES).upload_from_string(_trades_file(rows=1_000))
+
+        index = GCSObjectIndex(bucket)
+        assert index.instruments(DATE, 'raw_tick_data', 'trades') == ['BINANCE:SPOT_PAIR:BTC-USDT']
+        assert index_blob_name(DATE) not in bucket.objects
+        listings = len(bucket.listings)
+
+        # The in-memory day is reused until the TTL expires
+        assert index.exists(TRADES)
+        assert len(bucket.listings) == listings
+
+    def test_recorded_uploads_carry_footer_stats_and_merge_across_writers(self):
+        """Test concurrent writers both land in the index with row counts and time ranges"""
+        bucket = StoreBucket()
+        bucket.put(TRADES, _trades_file(rows=1_000))
+        GCSObjectIndex(bucket).instruments(DATE)  # Persist the initial index
+
+        first, second = GCSObjectIndex(bucket), GCSObjectIndex(bucket)
+        data = _trades_file(rows=500)
+        book_blob = bucket.blob(BOOK)
+        book_blob.upload_from_string(data)
+        first.record_upload(book_blob, data=data)
+        candles_blob = bucket.blob(CANDLES)
+        candles_blob.upload_from_string(data)
+        second.record_upload(candles_blob, data=data)
+
+        # Each flush re-reads the index under a generation match, so neither drops the other's entry
+        assert first.flush() == 1
+        assert second.flush() == 1
+
+        index = GCSObjectIndex(bucket)
+        book = index.get(BOOK)
+        assert book['row_count'] == 500
+        assert book['generation'] == book_blob.generation
+        assert book['max_ts'] - book['min_ts'] == 499 * 1_000_000
+        assert index.exists(CANDLES)
+        assert index.get(TRADES)['row_count'] is None  # Listed, not recorded
@@ -0,0 +1,112 @@
+"""
+Unit tests for ranged GCS reads used by ParquetOptimizer
+"""
+
+import io
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from google.cloud.exceptions import PreconditionFailed
+
+from market_data_tick_handler.data_client.gcs_range_file import GCSRangeFile
+from market_data_tick_handler.data_client.parquet_optimizer import ParquetOptimizer
+
+DAY_START_US = int(datetime(2023, 5, 23, tzinfo=timezone.utc).timestamp() * 1_000_000)
+
+
+class FakeBlob:
+    """In-memory blob serving ranged downloads like google.cloud.storage.Blob"""
+
+    def __init__(self, name: str, data: bytes, generation: int = 1):
+        self.name = name
+        self.data = data
+        self.size = None
+        self.generation = None
+        self._generation = generation
+        self.ranges = []
+
+    def reload(self):
+        self.size = len(self.data)
+        self.generation = self._generation
+
+    def download_as_bytes(self, start=None, end=None, if_generation_match=None, checksum='auto'):
+        if if_generation_match is not None and if_generation_match != self._generation:
+            raise PreconditionFailed("conditionNotMet")
+        self.ranges.append((start, end))
+        if start is None:
+            return self.data
+        return self.data[start:end + 1]
+
+    def download_to_filename(self, filename, if_generation_match=None):
+        if if_generation_match is not None and if_generation_match != self._generation:
+            raise PreconditionFailed("conditionNotMet")
+        self.ranges.append((0, len(self.data) - 1))
+        with open(filename, 'wb') as f:
+            f.write(self.data)
+
+
+class FakeBucket:
+    def __init__(self, blobs):
+        self.blobs = {blob.name: blob for blob in blobs}
+
+    def blob(self, name):
+        return self.blobs[name]
+
+
+def _trades_file(rows: int = 100_000, row_group_size: int = 10_000) -> bytes:
+    """One trade per second from midnight, 10 row groups"""
+    table = pa.table({
+        'exchange': pa.array(['binance'] * rows),
+        'timestamp': pa.array(DAY_START_US + np.arange(rows, dtype='int64') * 1_000_000),
+        'price': pa.array(np.random.rand(rows)),
+    })
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
+class TestGCSRangeFile:
+    """Test GCSRangeFile class"""
+
+    def test_seek_and_read(self):
+        """Test reads at arbitrary offsets map to single ranged requests"""
+        blob = FakeBlob('x', bytes(range(256)) * 1024)
+        range_file = GCSRangeFile(blob, footer_prefetch=1024)
+
+        range_file.seek(10)
+        assert range_file.read(5) == bytes(range(10, 15))
+        range_file.seek(-4, io.SEEK_END)
+        assert range_file.read() == bytes(range(252, 256))
+        assert blob.ranges == [(10, 14), (len(blob.data) - 1024, len(blob.data) - 1)]
+
+    def test_generation_is_pinned(self):
+        """Test an overwrite after open fails instead of mixing file versions"""
+        blob = FakeBlob('x', b'0' * 100)
+        range_file = GCSRangeFile(blob, footer_prefetch=0)
+        blob._generation = 2
+
+        with pytest.raises(PreconditionFailed):
+            range_file.read(10)
+
+
+class TestParquetOptimizerRangedReads:
+    """Test predicate pushdown only fetches overlapping row groups"""
+
+    def test_predicate_pushdown_fetches_only_overlapping_row_groups(self):
+        """Test a 5-minute query fetches the footer plus one row group, not the whole file"""
+        name = 'raw_tick_data/by_date/day-2023-05-23/data_type-trades/BINANCE:SPOT_PAIR:BTC-USDT.parquet'
+        blob = FakeBlob(name, _trades_file())
+        optimizer = ParquetOptimizer(FakeBucket([blob]))
+        start = datetime(2023, 5, 23, 3, 0, tzinfo=timezone.utc)
+
+        chunks = list(optimizer._read_with_predicate_pushdown(
+            name, start, datetime(2023, 5, 23, 3, 5, tzinfo=timezone.utc), 'trades', 10_000
+        ))
+
+        fetched = sum(end - start + 1 for start, end in blob.ranges)
+        assert len(blob.ranges) == 2  # Footer + one coalesced row group
+        assert fetched < len(blob.data) / 5
+        assert sum(len(chunk) for chunk in chunks) == 301
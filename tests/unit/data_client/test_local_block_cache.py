@@ -0,0 +1,56 @@
+"""
+Unit tests for the local disk cache of GCS Parquet objects
+"""
+
+import pyarrow.parquet as pq
+
+from market_data_tick_handler.data_client.local_block_cache import LocalBlockCache
+from tests.unit.data_client.test_gcs_range_file import FakeBlob, _trades_file
+
+
+class TestLocalBlockCache:
+    """Test LocalBlockCache class"""
+
+    def test_second_read_is_served_locally(self, tmp_path):
+        """Test a repeated read maps the local copy instead of downloading again"""
+        blob = FakeBlob('trades.parquet', _trades_file(rows=1000, row_group_size=100))
+        cache = LocalBlockCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+        with cache.open(blob) as source:
+            first = pq.read_table(source)
+        with cache.open(blob) as source:
+            second = pq.read_table(source)
+
+        assert first.equals(second)
+        assert len(blob.ranges) == 1
+        assert cache.get_stats()['hits'] == 1
+
+    def test_new_generation_replaces_stale_copy(self, tmp_path):
+        """Test an overwritten object is downloaded again and the old file removed"""
+        blob = FakeBlob('trades.parquet', _trades_file(rows=1000, row_group_size=100))
+        cache = LocalBlockCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+        cache.get_path(blob)
+
+        blob.data = _trades_file(rows=500, row_group_size=100)
+        blob._generation = 2
+        with cache.open(blob) as source:
+            assert pq.read_table(source).num_rows == 500
+        assert len([f for f in tmp_path.iterdir() if f.suffix == '.parquet']) == 1
+
+    def test_eviction_respects_budget_and_policy(self, tmp_path):
+        """Test LRU evicts the least recently read object and LFU the least frequently read one"""
+        data = _trades_file(rows=1000, row_group_size=100)
+        for policy, evicted in [('lru', 'b'), ('lfu', 'a')]:
+            blobs = {name: FakeBlob(name, data) for name in 'abc'}
+            cache = LocalBlockCache(str(tmp_path / policy), max_bytes=2 * len(data), policy=policy)
+            # b is read most often, a most recently
+            for name in ['a', 'b', 'b', 'b', 'b', 'a', 'c']:
+                cache.get_path(blobs[name])
+
+            assert cache.get_stats()['evictions'] == 1
+            assert cache.total_bytes <= cache.max_bytes
+            assert set(cache._entries) == set('abc') - {evicted}
+
+        # The index is rebuilt from disk on restart
+        restarted = LocalBlockCache(str(tmp_path / 'lru'), max_bytes=2 * len(data))
+        assert set(restarted._entries) == {'a', 'c'}
@@ -0,0 +1,86 @@
+"""
+Unit tests for the process-wide Parquet footer cache
+"""
+
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from market_data_tick_handler.data_client.parquet_metadata_cache import ParquetMetadataCache
+from market_data_tick_handler.data_client.parquet_optimizer import ParquetOptimizer, row_group_byte_range
+from tests.unit.data_client.test_gcs_range_file import (
+    DAY_START_US, FakeBlob, FakeBucket, _trades_file
+)
+
+TRADES_BLOB = 'raw_tick_data/by_date/day-2023-05-23/data_type-trades/BINANCE:SPOT_PAIR:BTC-USDT.parquet'
+
+
+def _query(optimizer: ParquetOptimizer, hour: int) -> int:
+    chunks = optimizer._read_with_predicate_pushdown(
+        TRADES_BLOB,
+        datetime(2023, 5, 23, hour, 0, tzinfo=timezone.utc),
+        datetime(2023, 5, 23, hour, 5, tzinfo=timezone.utc),
+        'trades', 10_000
+    )
+    return sum(len(chunk) for chunk in chunks)
+
+
+class TestParquetMetadataCache:
+    """Test ParquetMetadataCache class"""
+
+    def test_repeated_queries_skip_footer_fetch(self):
+        """Test a second query on the same file fetches only its row group"""
+        blob = FakeBlob(TRADES_BLOB, _trades_file())
+        optimizer = ParquetOptimizer(FakeBucket([blob]))
+
+        assert _query(optimizer, 1) == 301
+        blob.ranges.clear()
+        blob.size = blob.generation = None  # A fresh blob handle has no metadata loaded
+
+        assert _query(optimizer, 2) == 301
+        assert len(blob.ranges) == 1  # Row group only - no footer or metadata request
+        assert blob.size is None
+        assert optimizer._metadata_cache.get_stats()['hits'] == 1
+
+    def test_overwritten_object_is_reopened(self):
+        """Test a new generation invalidates the cached footer and the query still succeeds"""
+        blob = FakeBlob(TRADES_BLOB, _trades_file())
+        optimizer = ParquetOptimizer(FakeBucket([blob]))
+        assert _query(optimizer, 1) == 301
+
+        blob.data = _trades_file(rows=50_000, row_group_size=5_000)
+        blob._generation = 2
+
+        assert _query(optimizer, 3) == 301
+        assert optimizer._metadata_cache.get(TRADES_BLOB).generation == 2
+        assert optimizer._metadata_cache.get(TRADES_BLOB, generation=1) is None
+
+    def test_sparse_ranges_follow_overwritten_object(self):
+        """Test byte ranges come from the current generation's footer, not a stale cached one"""
+        blob = FakeBlob(TRADES_BLOB, _trades_file())
+        optimizer = ParquetOptimizer(FakeBucket([blob]))
+        date = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        first = optimizer.get_sparse_data_ranges('BINANCE:SPOT_PAIR:BTC-USDT', date, time_partition_minutes=60)
+
+        blob.data = _trades_file(rows=50_000, row_group_size=5_000)
+        blob._generation = 2
+        second = optimizer.get_sparse_data_ranges('BINANCE:SPOT_PAIR:BTC-USDT', date, time_partition_minutes=60)
+
+        metadata = pq.ParquetFile(pa.BufferReader(blob.data)).metadata
+        assert second['trades'] != first['trades']
+        assert second['trades'][0][2:] == row_group_byte_range(metadata, 0)
+        assert optimizer._metadata_cache.get(TRADES_BLOB).generation == 2
+
+    def test_lru_eviction_and_disk_persistence(self, tmp_path):
+        """Test the least recently used footer is evicted and reloaded from disk"""
+        metadata = pq.ParquetFile(pa.BufferReader(_trades_file(rows=1000, row_group_size=100))).metadata
+        cache = ParquetMetadataCache(max_entries=2, cache_dir=str(tmp_path))
+        for name in ['a', 'b', 'c']:
+            cache.put(name, 7, 1234, metadata)
+
+        assert cache.get_stats()['entries'] == 2
+        restored = cache.get('a')
+        assert (restored.generation, restored.size) == (7, 1234)
+        assert restored.metadata.num_row_groups == 10
+        assert restored.row_groups_in_range('timestamp', DAY_START_US + 250_000_000, DAY_START_US + 420_000_000) == [2, 3, 4]
@@ -0,0 +1,67 @@
+"""
+Unit tests for batched sparse tick data access
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+
+from market_data_tick_handler.data_client.parquet_optimizer import (
+    ParquetOptimizer, SparseDataAccessor, combine_tables, merge_time_windows
+)
+from tests.unit.data_client.test_gcs_range_file import FakeBlob, FakeBucket, _trades_file
+
+TRADES_BLOB = 'raw_tick_data/by_date/day-2023-05-23/data_type-trades/BINANCE:SPOT_PAIR:BTC-USDT.parquet'
+
+
+def test_merge_time_windows():
+    """Test overlapping and touching windows collapse into disjoint ranges"""
+    assert merge_time_windows([(10, 20), (0, 5), (15, 30), (30, 31), (40, 50)]) == [(0, 5), (10, 31), (40, 50)]
+
+
+class TestSparseDataAccessor:
+    """Test SparseDataAccessor class"""
+
+    def test_sparse_candles_read_file_once(self):
+        """Test many candle windows fetch the footer and the needed row groups in one pass"""
+        blob = FakeBlob(TRADES_BLOB, _trades_file())
+        accessor = SparseDataAccessor(ParquetOptimizer(FakeBucket([blob])))
+        day = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        candle_times = [day + timedelta(minutes=m) for m in (10, 12, 14, 20, 300)]
+
+        results = accessor.get_sparse_candles('BINANCE:SPOT_PAIR:BTC-USDT', candle_times, day, buffer_minutes=1)
+
+        assert len(blob.ranges) == 2  # Footer + one coalesced read of the union of row groups
+        assert [len(results[t]) for t in candle_times] == [121] * 5
+        first = results[candle_times[0]]
+        assert first['timestamp'].iloc[0] == datetime(2023, 5, 23, 0, 9)
+        assert first['timestamp'].iloc[-1] == datetime(2023, 5, 23, 0, 11)
+        assert (first['data_type'] == 'trades').all()
+
+    def test_candle_data_efficiently_batches_per_day(self):
+        """Test sparse candles on the same day share one read"""
+        blob = FakeBlob(TRADES_BLOB, _trades_file())
+        accessor = SparseDataAccessor(ParquetOptimizer(FakeBucket([blob])))
+        day = datetime(2023, 5, 23, tzinfo=timezone.utc)
+
+        df = accessor.get_candle_data_efficiently(
+            'BINANCE:SPOT_PAIR:BTC-USDT', '1m', day, day + timedelta(days=1),
+            sparse_candles=[day + timedelta(minutes=30), day + timedelta(hours=5)]
+        )
+
+        assert len(df) == 2 * 601
+        assert len(blob.ranges) == 2
+
+
+def test_combine_tables_sorts_only_out_of_order_input():
+    """Test tables are concatenated with unified schemas and sorted when needed"""
+    early = pa.table({'timestamp': [1, 2], 'price': [1.0, 2.0]})
+    late = pa.table({'timestamp': [3, 4], 'price': [3.0, 4.0], 'side': ['buy', 'sell']})
+
+    in_order = combine_tables([early, late], sort_column='timestamp')
+    reversed_order = combine_tables([late, None, early], sort_column=('local_timestamp', 'timestamp'))
+
+    assert in_order.column('timestamp').to_pylist() == [1, 2, 3, 4]
+    assert in_order.column('side').to_pylist() == [None, None, 'buy', 'sell']
+    assert reversed_order.column('timestamp').to_pylist() == [1, 2, 3, 4]
+    assert combine_tables([None]) is None
@@ -0,0 +1,45 @@
+"""
+Unit tests for the streaming TickDataReader
+"""
+
+from datetime import datetime, timezone
+
+import pyarrow as pa
+
+from market_data_tick_handler.data_client.tick_data_reader import TickDataReader
+from tests.unit.data_client.test_gcs_range_file import FakeBlob, FakeBucket, _trades_file
+
+TRADES_BLOB = 'raw_tick_data/by_date/day-2023-05-23/data_type-trades/BINANCE:SPOT_PAIR:BTC-USDT.parquet'
+DATE = datetime(2023, 5, 23, tzinfo=timezone.utc)
+START = datetime(2023, 5, 23, 1, tzinfo=timezone.utc)
+END = datetime(2023, 5, 23, 1, 59, 59, tzinfo=timezone.utc)
+
+
+class TestTickDataStreaming:
+    """Test get_tick_data_streaming reads batch by batch"""
+
+    def test_streams_filtered_chunks(self, data_client):
+        """Test chunks are bounded by chunk_size and only overlapping row groups are fetched"""
+        blob = FakeBlob(TRADES_BLOB, _trades_file())
+        reader = TickDataReader(data_client(FakeBucket([blob])))
+
+        chunks = list(reader.get_tick_data_streaming('BINANCE:SPOT_PAIR:BTC-USDT', START, END, DATE, chunk_size=1000))
+
+        assert sum(len(chunk) for chunk in chunks) == 3600
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        assert (chunks[0]['data_type'] == 'trades').all()
+        assert chunks[0]['timestamp'].iloc[0] == START.replace(tzinfo=None)
+        assert sum(end - start + 1 for start, end in blob.ranges) < len(blob.data) / 3
+
+    def test_yields_record_batches(self, data_client):
+        """Test as_arrow yields RecordBatches with the projected columns"""
+        blob = FakeBlob(TRADES_BLOB, _trades_file())
+        reader = TickDataReader(data_client(FakeBucket([blob])))
+
+        batches = list(reader.get_tick_data_streaming('BINANCE:SPOT_PAIR:BTC-USDT', START, END, DATE,
+                                                      columns=['price'], as_arrow=True))
+
+        assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+        assert batches[0].schema.names == ['timestamp', 'price', 'data_type']
+        assert batches[0].schema.field('timestamp').type == pa.timestamp('us')
+        assert sum(batch.num_rows for batch in batches) == 3600
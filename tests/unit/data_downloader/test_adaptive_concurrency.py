@@ -0,0 +1,148 @@
+"""
+Unit tests for adaptive download concurrency and rate-limit aware retries
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import aiohttp
+import pytest
+
+from market_data_tick_handler.data_downloader.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from market_data_tick_handler.data_downloader.tardis_connector import RateLimitRetry, parse_retry_after
+
+
+def _response_error(status: int, headers=None) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(request_info=Mock(), history=(), status=status, headers=headers)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test AdaptiveConcurrencyLimiter class"""
+
+    def test_increases_while_throughput_climbs(self):
+        """Test the limit grows by one step per window of completed requests"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+
+        for _ in range(2):
+            limiter.record_success(0.1, 1000)
+        assert limiter.limit == 3
+
+        for _ in range(3):
+            limiter.record_success(0.1, 1000)
+        assert limiter.limit == 3  # Capped at max_limit
+
+    def test_backs_off_on_rate_limit_once_per_cooldown(self):
+        """Test a burst of 429s cuts the limit multiplicatively only once"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=20, min_limit=2, decrease_factor=0.5)
+
+        for _ in range(5):
+            limiter.record_rate_limited()
+
+        assert limiter.limit == 10
+        assert limiter.get_stats()['decreases'] == 1
+        assert limiter.get_stats()['rate_limited'] == 5
+
+    def test_backs_off_on_latency_inflation(self):
+        """Test a window with latency far above the baseline shrinks the limit"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, latency_tolerance=2.0,
+                                             decrease_factor=0.5)
+        for _ in range(4):
+            limiter.record_success(0.1, 1000)
+        assert limiter.limit == 5
+
+        for _ in range(5):
+            limiter.record_success(1.0, 1000)
+
+        assert limiter.limit == 2
+        assert limiter.get_stats()['latency_inflations'] == 1
+
+    def test_baseline_decays_towards_sustained_latency(self):
+        """Test a lasting rise in time to first byte backs off once, then becomes the new baseline"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_tolerance=2.0, decrease_factor=0.5,
+                                             decrease_cooldown=0.0, baseline_decay=0.5)
+        for _ in range(4):
+            limiter.record_success(0.1)
+        assert limiter.limit == 5
+
+        for _ in range(5):
+            limiter.record_success(0.3)
+        assert limiter.limit == 2
+
+        # Baseline moved halfway to 0.3, so the same latency no longer counts as inflation
+        for _ in range(2):
+            limiter.record_success(0.3)
+        assert limiter.limit == 3
+        assert limiter.get_stats()['latency_inflations'] == 1
+
+    @pytest.mark.asyncio
+    async def test_slots_bounded_by_limit(self):
+        """Test no more than limit requests hold a slot at once"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(10)))
+
+        assert peak == 3
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_new_requests(self):
+        """Test Retry-After holds back new slots until the pause has passed"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        limiter.record_rate_limited(retry_after=0.2)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async with limiter.slot():
+            waited = loop.time() - start
+
+        assert waited >= 0.15
+
+
+class TestRateLimitRetry:
+    """Test RateLimitRetry strategy"""
+
+    def test_parse_retry_after(self):
+        """Test delta-seconds and HTTP date forms of Retry-After"""
+        assert parse_retry_after('7') == 7.0
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+        assert parse_retry_after('soon') is None
+        assert parse_retry_after(None) is None
+
+    def test_retries_throttling_and_transient_errors_only(self):
+        """Test 429/5xx/timeouts are retried but other client errors fail fast"""
+        strategy = RateLimitRetry(max_retries=3)
+
+        assert strategy.should_retry(_response_error(429))
+        assert strategy.should_retry(_response_error(503))
+        assert strategy.should_retry(asyncio.TimeoutError())
+        assert not strategy.should_retry(_response_error(404))
+        assert not strategy.should_retry(ValueError('bad csv'))
+
+    def test_delay_honours_retry_after(self):
+        """Test the server's Retry-After wins over exponential backoff"""
+        strategy = RateLimitRetry(max_retries=3, base_delay=1.0)
+
+        assert strategy._calculate_delay(0, _response_error(429, {'Retry-After': '12'})) == 12.0
+        assert 1.0 <= strategy._calculate_delay(0, _response_error(429)) <= 1.1
+
+    @pytest.mark.asyncio
+    async def test_execute_does_not_retry_not_found(self):
+        """Test a 404 is raised after a single attempt"""
+        strategy = RateLimitRetry(max_retries=3)
+        calls = 0
+
+        async def operation():
+            nonlocal calls
+            calls += 1
+            raise _response_error(404)
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            await strategy.execute(operation)
+        assert calls == 1
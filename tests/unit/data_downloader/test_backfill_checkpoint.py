@@ -0,0 +1,44 @@
+"""
+Unit tests for the backfill progress checkpoint
+"""
+
+from market_data_tick_handler.data_downloader.backfill_checkpoint import BackfillCheckpoint
+
+
+class TestBackfillCheckpoint:
+    """Test BackfillCheckpoint class"""
+
+    def test_round_trip_and_compaction(self, tmp_path):
+        """Test completed files and dates survive a restart and full dates are compacted"""
+        path = str(tmp_path / 'checkpoints' / 'backfill.json')
+        scope = {'data_types': ['trades']}
+        checkpoint = BackfillCheckpoint(path, scope=scope)
+        checkpoint.record_file('2023-05-23', 'BINANCE:SPOT_PAIR:BTC-USDT', 'trades')
+        checkpoint.record_file('2023-05-24', 'DERIBIT:OPTION:BTC-USD-230526-30000-C', 'trades')
+        checkpoint.complete_date('2023-05-23')
+        checkpoint.save()
+
+        resumed = BackfillCheckpoint(path, scope=scope)
+        assert resumed.load()
+        assert resumed.is_date_complete('2023-05-23')
+        assert resumed.completed_for('2023-05-23') == set()
+        assert resumed.completed_for('2023-05-24') == {('DERIBIT:OPTION:BTC-USD-230526-30000-C', 'trades')}
+
+    def test_scope_change_ignores_checkpoint(self, tmp_path):
+        """Test a checkpoint written for other run parameters does not skip any work"""
+        path = str(tmp_path / 'backfill.json')
+        checkpoint = BackfillCheckpoint(path, scope={'data_types': ['trades']})
+        checkpoint.complete_date('2023-05-23')
+        checkpoint.save()
+
+        other = BackfillCheckpoint(path, scope={'data_types': ['trades', 'book_snapshot_5']})
+        assert not other.load()
+        assert not other.is_date_complete('2023-05-23')
+
+    def test_save_only_writes_changes(self, tmp_path):
+        """Test nothing is written until progress is recorded"""
+        path = tmp_path / 'backfill.json'
+        checkpoint = BackfillCheckpoint(str(path))
+        checkpoint.save()
+        assert not path.exists()
+        assert not BackfillCheckpoint(str(path)).load()
@@ -0,0 +1,78 @@
+"""
+Unit tests for the streaming Tardis CSV decoder
+"""
+
+import gzip
+
+import pandas as pd
+import pyarrow as pa
+
+from market_data_tick_handler.data_downloader.csv_stream_decoder import (
+    TardisCsvStreamDecoder, table_to_dataframe
+)
+
+
+def _decode(payload: bytes, data_type: str, block_size: int = 1024, chunk_size: int = 100):
+    """Feed payload through the decoder in small chunks and collect all batches"""
+    decoder = TardisCsvStreamDecoder(data_type, block_size=block_size,
+                                     tardis_exchange='binance', tardis_symbol='BTCUSDT')
+    batches = []
+    for i in range(0, len(payload), chunk_size):
+        batches.extend(decoder.feed(payload[i:i + chunk_size]))
+    batches.extend(decoder.finish())
+    return decoder, batches
+
+
+class TestTardisCsvStreamDecoder:
+    """Test TardisCsvStreamDecoder class"""
+
+    def test_trades_gzip_multiple_blocks(self):
+        """Test gzipped trades decode into typed batches across block boundaries"""
+        rows = ["exchange,symbol,timestamp,local_timestamp,id,side,price,amount"]
+        rows += [f"binance,BTCUSDT,{1684800000000000 + i},{1684800000000100 + i},t{i},buy,{50000 + i}.5,0.1"
+                 for i in range(500)]
+        payload = gzip.compress(("\n".join(rows) + "\n").encode())
+
+        decoder, batches = _decode(payload, 'trades')
+
+        assert len(batches) > 1
+        table = pa.Table.from_batches(batches)
+        assert table.num_rows == 500
+        assert decoder.rows == 500
+        assert table.column_names == ['timestamp', 'local_timestamp', 'id', 'side', 'price', 'amount']
+        assert table.schema.field('timestamp').type == pa.int64()
+        assert table.schema.field('price').type == pa.float64()
+        assert table.schema.field('id').type == pa.string()
+        assert table.column('timestamp')[499].as_py() == 1684800000000499
+
+    def test_book_snapshot_columns_renamed(self):
+        """Test book snapshot levels are renamed to BigQuery-compatible columns"""
+        payload = (b"exchange,symbol,timestamp,local_timestamp,asks[0].price,asks[0].amount,"
+                   b"bids[0].price,bids[0].amount\n"
+                   b"binance,BTCUSDT,1,2,50000.0,1.0,49950.0,2.0\n")
+
+        _, batches = _decode(payload, 'book_snapshot_5')
+
+        table = pa.Table.from_batches(batches)
+        assert table.column_names == ['timestamp', 'local_timestamp', 'ask_price_1', 'ask_volume_1',
+                                      'bid_price_1', 'bid_volume_1']
+        assert table.column('bid_price_1')[0].as_py() == 49950.0
+
+    def test_empty_and_header_only(self):
+        """Test empty bodies and header-only files produce no batches"""
+        assert _decode(b"", 'trades')[1] == []
+        assert _decode(gzip.compress(b"exchange,symbol,timestamp\n"), 'trades')[1] == []
+
+    def test_table_to_dataframe_nullable_dtypes(self):
+        """Test conversion keeps the nullable dtypes used by the buffered parser"""
+        payload = (b"exchange,symbol,timestamp,local_timestamp,id,side,price,amount\n"
+                   b"binance,BTCUSDT,1,2,,buy,1.5,2\n"
+                   b"binance,BTCUSDT,3,4,abc,sell,,3\n")
+
+        _, batches = _decode(payload, 'trades')
+        df = table_to_dataframe(pa.Table.from_batches(batches))
+
+        assert df['timestamp'].dtype == pd.Int64Dtype()
+        assert df['id'].dtype == pd.StringDtype()
+        assert pd.isna(df['id'].iloc[0])
+        assert pd.isna(df['price'].iloc[1])
@@ -2,7 +2,12 @@
 Unit tests for download orchestrator
 """
 
+import asyncio
+import json
+import threading
+import time
 import pytest
+import pandas as pd
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timezone
 from market_data_tick_handler.data_downloader.download_orchestrator import DownloadOrchestrator
@@ -50,17 +55,15 @@ class TestDownloadOrchestrator:
             for i in range(10)
         ]
         
-        # Test shard 0 of 3
+        # Stable blake2b assignment - identical on every VM regardless of PYTHONHASHSEED
         sharded = orchestrator._apply_sharding(targets, 0, 3)
-        assert len(sharded) == 4  # 10/3 = 3.33, so shard 0 gets 4 items
+        assert len(sharded) == 2
         
-        # Test shard 1 of 3
         sharded = orchestrator._apply_sharding(targets, 1, 3)
-        assert len(sharded) == 3  # Shard 1 gets 3 items
+        assert len(sharded) == 5
         
-        # Test shard 2 of 3
         sharded = orchestrator._apply_sharding(targets, 2, 3)
-        assert len(sharded) == 3  # Shard 2 gets 3 items
+        assert len(sharded) == 3
         
         # Verify all items are accounted for
         all_sharded = []
@@ -301,3 +304,286 @@ class TestDownloadOrchestrator:
             assert result['processed'] == 5  # 5 batches * 1 processed each
             assert result['failed'] == 0
             assert len(result['uploaded_files']) == 5
+
+
+@pytest.fixture
+def upload_orchestrator():
+    """Orchestrator with GCS and Instrument reader patched out"""
+    with patch('market_data_tick_handler.utils.gcs_client.get_shared_gcs_client'), \
+         patch('market_data_tick_handler.utils.gcs_client.get_shared_gcs_bucket'), \
+         patch('market_data_tick_handler.data_downloader.download_orchestrator.InstrumentReader'):
+        orchestrator = DownloadOrchestrator(
+            gcs_bucket="test-bucket",
+            api_key="TD.test",
+            max_parallel_uploads=2
+        )
+    orchestrator.bucket = Mock()
+    return orchestrator
+
+
+class TestDownloadOrchestratorUploads:
+    """Test the bounded, non-blocking upload stage"""
+    
+    @pytest.mark.asyncio
+    async def test_uploads_bounded_by_max_parallel_uploads(self, upload_orchestrator):
+        """Test uploads run off the event loop with at most max_parallel_uploads in flight"""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        
+        def slow_upload(file_obj, size, timeout):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+        
+        upload_orchestrator.bucket.blob.return_value.upload_from_file.side_effect = slow_upload
+        df = pd.DataFrame({'timestamp': [2, 1], 'price': [1.0, 2.0]})
+        date = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        
+        results = await asyncio.gather(*[
+            upload_orchestrator._upload_single_to_gcs(
+                {'trades': df, 'liquidations': df},
+                {'instrument_key': f'BINANCE:SPOT_PAIR:BTC-USDT-{i}'},
+                date
+            )
+            for i in range(3)
+        ])
+        
+        assert sum(len(files) for files in results) == 6
+        assert state['peak'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_upload_single_raises_on_failure(self, upload_orchestrator):
+        """Test batched uploads still surface failures to the batch"""
+        upload_orchestrator.bucket.blob.return_value.upload_from_file.side_effect = IOError("boom")
+        df = pd.DataFrame({'timestamp': [1], 'price': [1.0]})
+        date = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        
+        with pytest.raises(IOError):
+            await upload_orchestrator._upload_single_to_gcs({'trades': df}, {'instrument_key': 'X'}, date)
+        
+        # Non-batched path logs and continues
+        assert await upload_orchestrator._upload_to_gcs({'trades': df}, {'instrument_key': 'X'}, date) == []
+    
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_worker_pools(self, upload_orchestrator):
+        """Test close stops the upload and parse threads and closes the Tardis session"""
+        upload_orchestrator.tardis_connector.close = AsyncMock()
+        
+        await upload_orchestrator.close()
+        
+        upload_orchestrator.tardis_connector.close.assert_awaited_once()
+        with pytest.raises(RuntimeError):
+            upload_orchestrator.upload_executor.submit(print)
+        with pytest.raises(RuntimeError):
+            upload_orchestrator.parse_executor.submit(print)
+
+
+class TestDownloadOrchestratorPipeline:
+    """Test the pipelined per-file scheduler"""
+    
+    @pytest.mark.asyncio
+    async def test_pipelined_results_aggregated_per_instrument(self, upload_orchestrator):
+        """Test file outcomes roll up into per-instrument processed/failed counts"""
+        async def fetch(tardis_exchange, tardis_symbol, date, data_type):
+            if tardis_symbol == 'ETHUSDT' and data_type == 'liquidations':
+                raise IOError("HTTP 500")
+            return b'raw'
+        
+        upload_orchestrator.tardis_connector = Mock()
+        upload_orchestrator.tardis_connector.fetch_daily_file.side_effect = fetch
+        upload_orchestrator.tardis_connector.parse_daily_file.return_value = pd.DataFrame({'timestamp': [1], 'price': [1.0]})
+        targets = [
+            {'instrument_key': f'BINANCE-FUTURES:PERPETUAL:{base}-USDT', 'tardis_exchange': 'binance-futures',
+             'tardis_symbol': f'{base}USDT', 'data_types': 'trades,liquidations'}
+            for base in ('BTC', 'ETH')
+        ] + [{'instrument_key': 'X', 'tardis_exchange': 'binance', 'tardis_symbol': 'X', 'data_types': 'quotes'}]
+        results = {'processed': 0, 'failed': 0, 'uploaded_files': []}
+        
+        await upload_orchestrator._process_targets_pipelined(
+            targets, datetime(2023, 5, 23, tzinfo=timezone.utc), ['trades', 'liquidations'], results, time.time()
+        )
+        
+        assert results['processed'] == 1
+        assert results['failed'] == 2
+        assert sorted(results['uploaded_files']) == [
+            'gs://test-bucket/raw_tick_data/by_date/day-2023-05-23/data_type-liquidations/BINANCE-FUTURES:PERPETUAL:BTC-USDT.parquet',
+            'gs://test-bucket/raw_tick_data/by_date/day-2023-05-23/data_type-trades/BINANCE-FUTURES:PERPETUAL:BTC-USDT.parquet',
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_backfill_resumes_from_checkpoint(self, upload_orchestrator, tmp_path):
+        """Test a re-run only retries failed files and skips completed days"""
+        fail = {'enabled': True}
+        
+        async def fetch(tardis_exchange, tardis_symbol, date, data_type):
+            if fail['enabled'] and date.day == 24 and data_type == 'liquidations':
+                raise IOError("HTTP 500")
+            return b'raw'
+        
+        upload_orchestrator.tardis_connector = Mock()
+        upload_orchestrator.tardis_connector.close = AsyncMock()
+        upload_orchestrator.tardis_connector.fetch_daily_file.side_effect = fetch
+        upload_orchestrator.tardis_connector.parse_daily_file.return_value = pd.DataFrame({'timestamp': [1], 'price': [1.0]})
+        upload_orchestrator.instrument_reader = Mock()
+        upload_orchestrator.instrument_reader.get_download_targets.return_value = [
+            {'instrument_key': 'BINANCE-FUTURES:PERPETUAL:BTC-USDT', 'tardis_exchange': 'binance-futures',
+             'tardis_symbol': 'BTCUSDT', 'data_types': 'trades,liquidations'}
+        ]
+        checkpoint_path = str(tmp_path / 'backfill.json')
+        start, end = datetime(2023, 5, 23, tzinfo=timezone.utc), datetime(2023, 5, 24, tzinfo=timezone.utc)
+        
+        first = await upload_orchestrator.backfill_date_range(start, end, data_types=['trades', 'liquidations'],
+                                                             checkpoint_path=checkpoint_path)
+        assert (first['processed'], first['failed'], first['processed_days']) == (1, 1, 2)
+        assert upload_orchestrator.tardis_connector.fetch_daily_file.call_count == 4
+        upload_orchestrator.tardis_connector.close.assert_awaited_once()
+        
+        fail['enabled'] = False
+        upload_orchestrator.tardis_connector.fetch_daily_file.reset_mock()
+        second = await upload_orchestrator.backfill_date_range(start, end, data_types=['trades', 'liquidations'],
+                                                              checkpoint_path=checkpoint_path)
+        
+        assert second['skipped_days'] == 1
+        assert (second['processed'], second['failed']) == (1, 0)
+        upload_orchestrator.tardis_connector.fetch_daily_file.assert_called_once()
+        assert upload_orchestrator.tardis_connector.fetch_daily_file.call_args.args[3] == 'liquidations'
+    
+    @pytest.mark.asyncio
+    async def test_backfill_checkpoints_days_without_targets(self, upload_orchestrator, tmp_path):
+        """Test a day with no targets is completed, but a day whose targets failed to load is retried"""
+        upload_orchestrator.tardis_connector = Mock()
+        upload_orchestrator.tardis_connector.close = AsyncMock()
+        upload_orchestrator.instrument_reader = Mock()
+        
+        def targets(date, **kwargs):
+            if date.day == 24:
+                raise IOError("GCS unavailable")
+            return []
+        
+        upload_orchestrator.instrument_reader.get_download_targets.side_effect = targets
+        checkpoint_path = str(tmp_path / 'backfill.json')
+        start, end = datetime(2023, 5, 23, tzinfo=timezone.utc), datetime(2023, 5, 24, tzinfo=timezone.utc)
+        
+        first = await upload_orchestrator.backfill_date_range(start, end, checkpoint_path=checkpoint_path)
+        assert first['processed_days'] == 1
+        assert len(first['errors']) == 1
+        
+        upload_orchestrator.instrument_reader.get_download_targets.reset_mock()
+        second = await upload_orchestrator.backfill_date_range(start, end, checkpoint_path=checkpoint_path)
+        
+        assert second['skipped_days'] == 1
+        upload_orchestrator.instrument_reader.get_download_targets.assert_called_once()
+        assert upload_orchestrator.instrument_reader.get_download_targets.call_args.kwargs['date'].day == 24
+
+
+    @pytest.mark.asyncio
+    async def test_backfill_final_checkpoint_waits_for_in_flight_write(self, upload_orchestrator, tmp_path):
+        """Test the final checkpoint save starts only after a periodic write still running on a thread"""
+        upload_orchestrator.tardis_connector = Mock()
+        upload_orchestrator.tardis_connector.close = AsyncMock()
+        
+        async def fetch(tardis_exchange, tardis_symbol, date, data_type):
+            await asyncio.sleep(0.05 if data_type == 'liquidations' else 0)
+            return b'raw'
+        
+        upload_orchestrator.tardis_connector.fetch_daily_file.side_effect = fetch
+        upload_orchestrator.tardis_connector.parse_daily_file.return_value = pd.DataFrame({'timestamp': [1], 'price': [1.0]})
+        upload_orchestrator.instrument_reader = Mock()
+        upload_orchestrator.instrument_reader.get_download_targets.return_value = [
+            {'instrument_key': 'BINANCE-FUTURES:PERPETUAL:BTC-USDT', 'tardis_exchange': 'binance-futures',
+             'tardis_symbol': 'BTCUSDT', 'data_types': 'trades,liquidations'}
+        ]
+        writes = []
+        active = threading.Semaphore(1)
+        
+        def write(self, payload):
+            assert active.acquire(blocking=False), "checkpoint writes overlapped"
+            try:
+                time.sleep(0.1)
+                writes.append(payload)
+            finally:
+                active.release()
+        
+        date = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        with patch('market_data_tick_handler.data_downloader.download_orchestrator.CHECKPOINT_FLUSH_INTERVAL', 0.02), \
+                patch('market_data_tick_handler.data_downloader.backfill_checkpoint.BackfillCheckpoint.write', write):
+            results = await upload_orchestrator.backfill_date_range(date, date, data_types=['trades', 'liquidations'],
+                                                                   checkpoint_path=str(tmp_path / 'backfill.json'))
+        
+        assert results['processed_days'] == 1
+        assert len(writes) == 2
+        assert '2023-05-23' in json.loads(writes[-1])['completed_dates']
+
+
+class TestDownloadOrchestratorSkipExisting:
+    """Test incremental downloads that skip files already in GCS"""
+    
+    def test_skip_existing_files_narrows_targets(self, upload_orchestrator):
+        """Test existing files are dropped per data type before any Tardis request"""
+        existing = Mock()
+        existing.name = 'raw_tick_data/by_date/day-2023-05-23/data_type-trades/BINANCE-FUTURES:PERPETUAL:BTC-USDT.parquet'
+        existing.size = 1024
+        upload_orchestrator.bucket.list_blobs.side_effect = lambda prefix: [existing] if existing.name.startswith(prefix) else []
+        targets = [
+            {'instrument_key': f'BINANCE-FUTURES:PERPETUAL:{base}-USDT', 'data_types': data_types}
+            for base, data_types in (('BTC', 'trades,liquidations'), ('ETH', 'trades'))
+        ]
+        date = datetime(2023, 5, 23, tzinfo=timezone.utc)
+        
+        remaining, skipped = upload_orchestrator._skip_existing_files(targets, date, ['trades', 'liquidations'])
+        
+        assert skipped == 1
+        assert [(t['instrument_key'], t['data_types']) for t in remaining] == [
+            ('BINANCE-FUTURES:PERPETUAL:BTC-USDT', 'liquidations'),
+            ('BINANCE-FUTURES:PERPETUAL:ETH-USDT', 'trades'),
+        ]
+        assert upload_orchestrator.bucket.list_blobs.call_count == 2
+        
+        # A second pass over the same day reuses the manifest
+        upload_orchestrator._skip_existing_files(targets, date, ['trades'])
+        assert upload_orchestrator.bucket.list_blobs.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_backfill_merges_listings_on_the_event_loop(self, upload_orchestrator):
+        """Test day listings are fetched on a worker thread but recorded by the event loop"""
+        blobs = []
+        for day, size in ((23, 2048), (24, 1024)):
+            blob = Mock()
+            blob.name = f'raw_tick_data/by_date/day-2023-05-{day}/data_type-trades/BINANCE-FUTURES:PERPETUAL:BTC-USDT.parquet'
+            blob.size = size
+            blobs.append(blob)
+        upload_orchestrator.bucket.list_blobs.side_effect = lambda prefix: [b for b in blobs if b.name.startswith(prefix)]
+        upload_orchestrator.skip_existing = True
+        upload_orchestrator.existing_manifest_path = None
+        upload_orchestrator.size_aware_scheduling = True
+        upload_orchestrator.size_history_path = None
+        upload_orchestrator.size_history_lookback_days = 1
+        upload_orchestrator.tardis_connector = Mock()
+        upload_orchestrator.tardis_connector.close = AsyncMock()
+        upload_orchestrator.tardis_connector.fetch_daily_file = AsyncMock(return_value=b'raw')
+        upload_orchestrator.tardis_connector.parse_daily_file.return_value = pd.DataFrame({'timestamp': [1], 'price': [1.0]})
+        upload_orchestrator.instrument_reader = Mock()
+        upload_orchestrator.instrument_reader.get_download_targets.return_value = [
+            {'instrument_key': 'BINANCE-FUTURES:PERPETUAL:BTC-USDT', 'tardis_exchange': 'binance-futures',
+             'tardis_symbol': 'BTCUSDT', 'data_types': 'trades,liquidations'}
+        ]
+        start = end = datetime(2023, 5, 24, tzinfo=timezone.utc)
+        upload_orchestrator.existing_manifest.merge_listing = Mock(wraps=upload_orchestrator.existing_manifest.merge_listing)
+        upload_orchestrator.size_history.record_sizes = Mock(wraps=upload_orchestrator.size_history.record_sizes)
+        
+        with patch.object(upload_orchestrator.existing_manifest, 'load_from_gcs') as load_from_gcs:
+            results = await upload_orchestrator.backfill_date_range(start, end, data_types=['trades', 'liquidations'])
+        
+        load_from_gcs.assert_not_called()
+        upload_orchestrator.existing_manifest.merge_listing.assert_called_once_with(
+            '2023-05-24', {'trades': {'BINANCE-FUTURES:PERPETUAL:BTC-USDT'}, 'liquidations': set()}
+        )
+        upload_orchestrator.size_history.record_sizes.assert_called_once_with(
+            [('BINANCE-FUTURES:PERPETUAL:BTC-USDT', 'trades', 2048)]
+        )
+        assert results['skipped_existing'] == 1
+        upload_orchestrator.tardis_connector.fetch_daily_file.assert_called_once()
+        assert upload_orchestrator.tardis_connector.fetch_daily_file.call_args.args[3] == 'liquidations'
@@ -0,0 +1,71 @@
+"""
+Unit tests for the existing-object manifest used by incremental downloads
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from market_data_tick_handler.data_downloader.gcs_manifest import ExistingObjectManifest, list_existing_files
+
+
+def _blob(name: str, size: int) -> Mock:
+    blob = Mock()
+    blob.name = name
+    blob.size = size
+    return blob
+
+
+class TestExistingObjectManifest:
+    """Test ExistingObjectManifest class"""
+
+    def test_load_from_gcs_lists_each_prefix_once(self):
+        """Test one listing per day/data_type prefix and zero-byte objects are ignored"""
+        trades_prefix = 'raw_tick_data/by_date/day-2023-05-23/data_type-trades/'
+        bucket = Mock()
+        bucket.list_blobs.side_effect = lambda prefix: {
+            trades_prefix: [
+                _blob(trades_prefix + 'BINANCE:SPOT_PAIR:BTC-USDT.parquet', 5000),
+                _blob(trades_prefix + 'BINANCE:SPOT_PAIR:ETH-USDT.parquet', 0),
+            ],
+        }.get(prefix, [])
+        manifest = ExistingObjectManifest()
+        date = datetime(2023, 5, 23, tzinfo=timezone.utc)
+
+        assert manifest.load_from_gcs(bucket, date, ['trades', 'liquidations']) == 1
+        manifest.load_from_gcs(bucket, date, ['trades'])
+
+        assert bucket.list_blobs.call_count == 2
+        assert manifest.has_day('2023-05-23', ['trades', 'liquidations'])
+        assert not manifest.has_day('2023-05-23', ['options_chain'])
+        assert manifest.contains('2023-05-23', 'trades', 'BINANCE:SPOT_PAIR:BTC-USDT')
+        assert not manifest.contains('2023-05-23', 'trades', 'BINANCE:SPOT_PAIR:ETH-USDT')
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test the cached manifest keeps listed prefixes and uploads from the run"""
+        path = str(tmp_path / 'cache' / 'manifest.json')
+        manifest = ExistingObjectManifest()
+        manifest.load_from_gcs(Mock(list_blobs=Mock(return_value=[])), datetime(2023, 5, 23), ['trades'])
+        manifest.add('2023-05-23', 'trades', 'DERIBIT:OPTION:BTC-USD-230526-30000-C')
+        manifest.save(path)
+
+        reloaded = ExistingObjectManifest()
+        assert reloaded.load(path) == 1
+        assert reloaded.has_day('2023-05-23', ['trades'])
+        assert reloaded.contains('2023-05-23', 'trades', 'DERIBIT:OPTION:BTC-USD-230526-30000-C')
+        assert ExistingObjectManifest().load(str(tmp_path / 'missing.json')) == 0
+
+    def test_merge_listing_marks_empty_prefixes_listed(self):
+        """Test a listing fetched off the manifest is merged, including data types with no files"""
+        bucket = Mock()
+        bucket.list_blobs.side_effect = lambda prefix: [
+            _blob('raw_tick_data/by_date/day-2023-05-23/data_type-trades/BINANCE:SPOT_PAIR:BTC-USDT.parquet', 5000),
+        ] if prefix.endswith('data_type-trades/') else []
+        manifest = ExistingObjectManifest()
+
+        listing = list_existing_files(bucket, datetime(2023, 5, 23, tzinfo=timezone.utc), ['trades', 'liquidations'])
+
+        assert listing == {'trades': {'BINANCE:SPOT_PAIR:BTC-USDT'}, 'liquidations': set()}
+        assert not manifest.has_day('2023-05-23', ['trades'])
+        assert manifest.merge_listing('2023-05-23', listing) == 1
+        assert manifest.has_day('2023-05-23', ['trades', 'liquidations'])
+        assert manifest.contains('2023-05-23', 'trades', 'BINANCE:SPOT_PAIR:BTC-USDT')
@@ -0,0 +1,76 @@
+"""
+Unit tests for the streaming Parquet writer
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from market_data_tick_handler.data_downloader.parquet_stream_writer import ParquetStreamWriter
+
+
+def _batch(start: int, num_rows: int) -> pa.RecordBatch:
+    """Create a trades-like batch with descending timestamps"""
+    timestamps = list(range(start + num_rows - 1, start - 1, -1))
+    return pa.RecordBatch.from_pydict({
+        'timestamp': pa.array(timestamps, pa.int64()),
+        'price': pa.array([float(t) for t in timestamps], pa.float64()),
+    })
+
+
+class TestParquetStreamWriter:
+    """Test ParquetStreamWriter class"""
+
+    def test_row_groups_written_incrementally(self, tmp_path):
+        """Test batches are flushed as fixed-size row groups before close"""
+        path = str(tmp_path / 'trades.parquet')
+        writer = ParquetStreamWriter(path, row_group_size=100)
+
+        for i in range(5):
+            writer.write_batch(_batch(i * 70, 70))
+        assert writer.row_groups == 3  # 350 rows -> 3 full row groups flushed so far
+
+        stats = writer.close()
+        assert stats == {'rows': 350, 'row_groups': 4}
+
+        metadata = pq.ParquetFile(path).metadata
+        assert metadata.num_rows == 350
+        assert [metadata.row_group(i).num_rows for i in range(4)] == [100, 100, 100, 50]
+
+    def test_row_groups_sorted_by_timestamp(self, tmp_path):
+        """Test each row group is sorted so statistics stay tight"""
+        path = str(tmp_path / 'trades.parquet')
+        with ParquetStreamWriter(path, row_group_size=50) as writer:
+            writer.write_batch(_batch(0, 50))
+
+        timestamps = pq.read_table(path).column('timestamp').to_pylist()
+        assert timestamps == sorted(timestamps)
+
+    def test_global_order_reported(self, tmp_path):
+        """Test row groups are sorted individually and overlap between them is reported"""
+        in_order = ParquetStreamWriter(str(tmp_path / 'in_order.parquet'), row_group_size=50)
+        for i in range(3):
+            in_order.write_batch(_batch(i * 50, 50))
+        in_order.close()
+        assert in_order.globally_sorted
+
+        path = str(tmp_path / 'late.parquet')
+        late = ParquetStreamWriter(path, row_group_size=50)
+        late.write_batch(_batch(100, 50))
+        late.write_batch(_batch(0, 50))  # Arrives after a later row group was flushed
+        late.close()
+        assert not late.globally_sorted
+
+        table = pq.read_table(path)
+        assert table.column('timestamp').to_pylist() == list(range(100, 150)) + list(range(0, 50))
+
+    def test_empty_file_with_schema(self, tmp_path):
+        """Test an empty file carrying the schema is written when no rows arrive"""
+        path = str(tmp_path / 'empty.parquet')
+        schema = pa.schema([('timestamp', pa.int64()), ('price', pa.float64())])
+
+        stats = ParquetStreamWriter(path, schema=schema).close()
+
+        assert stats == {'rows': 0, 'row_groups': 0}
+        table = pq.read_table(path)
+        assert table.num_rows == 0
+        assert table.schema.names == ['timestamp', 'price']
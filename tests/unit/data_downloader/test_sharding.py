@@ -0,0 +1,49 @@
+"""
+Unit tests for deterministic sharding
+"""
+
+import os
+import subprocess
+import sys
+
+from market_data_tick_handler.data_downloader import sharding
+from market_data_tick_handler.data_downloader.sharding import (
+    hash_shard, stable_hash, weighted_shard_assignment
+)
+
+
+class TestSharding:
+    """Test sharding helpers"""
+
+    def test_stable_hash_independent_of_hash_seed(self):
+        """Test shard membership does not change with PYTHONHASHSEED"""
+        # Load sharding.py alone - importing the package would pull in the full config
+        code = ("import importlib.util, sys; "
+                "spec = importlib.util.spec_from_file_location('sharding', sys.argv[1]); "
+                "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module); "
+                "print(module.stable_hash('BINANCE:SPOT_PAIR:BTC-USDT'))")
+        outputs = {
+            subprocess.run([sys.executable, '-c', code, sharding.__file__], capture_output=True, text=True, check=True,
+                           env={**os.environ, 'PYTHONHASHSEED': seed}).stdout.strip()
+            for seed in ('1', '2')
+        }
+        assert outputs == {str(stable_hash('BINANCE:SPOT_PAIR:BTC-USDT'))}
+        assert 0 <= hash_shard('BINANCE:SPOT_PAIR:BTC-USDT', 7) < 7
+
+    def test_weighted_assignment_balances_bytes(self):
+        """Test a few giant instruments are spread out and shards end up within a few percent"""
+        weights = {f'GIANT-{i}': 1000 for i in range(3)}
+        weights.update({f'SMALL-{i}': 10 + i % 7 for i in range(600)})
+
+        assignment = weighted_shard_assignment(weights, 3)
+
+        loads = [sum(w for k, w in weights.items() if assignment[k] == shard) for shard in range(3)]
+        assert sorted(assignment[f'GIANT-{i}'] for i in range(3)) == [0, 1, 2]
+        assert max(loads) - min(loads) <= 0.02 * max(loads)
+
+    def test_weighted_assignment_independent_of_input_order(self):
+        """Test every VM computes the same assignment whatever order targets arrive in"""
+        weights = {f'I-{i}': (i * 37) % 11 for i in range(50)}
+        reversed_weights = dict(reversed(list(weights.items())))
+
+        assert weighted_shard_assignment(weights, 4) == weighted_shard_assignment(reversed_weights, 4)
@@ -0,0 +1,96 @@
+"""
+Unit tests for the file size history used by size-aware scheduling
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from market_data_tick_handler.data_downloader.size_history import FileSizeHistory, parse_snapshot_uri
+
+
+def _blob(name: str, size: int) -> Mock:
+    blob = Mock()
+    blob.name = name
+    blob.size = size
+    return blob
+
+
+class TestFileSizeHistory:
+    """Test FileSizeHistory class"""
+
+    def test_estimate_falls_back_to_data_type_median(self):
+        """Test unknown files are estimated from their data type, then the default"""
+        history = FileSizeHistory(default_bytes=7)
+        history.record('A', 'trades', 100)
+        history.record('B', 'trades', 300)
+        history.record('C', 'trades', 200)
+
+        assert history.estimate('A', 'trades') == 100
+        assert history.estimate('NEW', 'trades') == 200
+        assert history.estimate('NEW', 'options_chain') == 7
+
+    def test_load_from_gcs_parses_blob_paths(self):
+        """Test sizes are read from the by_date layout of the previous day"""
+        bucket = Mock()
+        bucket.list_blobs.return_value = [
+            _blob('raw_tick_data/by_date/day-2023-05-22/data_type-trades/BINANCE:SPOT_PAIR:BTC-USDT.parquet', 5000),
+            _blob('raw_tick_data/by_date/day-2023-05-22/data_type-trades/_SUCCESS', 0),
+        ]
+        history = FileSizeHistory()
+
+        loaded = history.load_from_gcs(bucket, datetime(2023, 5, 23, tzinfo=timezone.utc))
+
+        assert loaded == 1
+        bucket.list_blobs.assert_called_once_with(prefix='raw_tick_data/by_date/day-2023-05-22/')
+        assert history.estimate('BINANCE:SPOT_PAIR:BTC-USDT', 'trades') == 5000
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test the local JSON index round-trips instrument keys containing colons"""
+        path = str(tmp_path / 'index' / 'sizes.json')
+        history = FileSizeHistory()
+        history.record('DERIBIT:OPTION:BTC-USD-230526-30000-C', 'options_chain', 42)
+        history.save(path)
+
+        reloaded = FileSizeHistory()
+        assert reloaded.load(path) == 1
+        assert reloaded.estimate('DERIBIT:OPTION:BTC-USD-230526-30000-C', 'options_chain') == 42
+        assert FileSizeHistory().load(str(tmp_path / 'missing.json')) == 0
+
+    def test_load_snapshot_reads_pinned_generation(self):
+        """Test a GCS snapshot is read at the generation in its URI"""
+        client = Mock()
+        client.bucket.return_value.blob.return_value.download_as_bytes.return_value = \
+            b'{"BINANCE:SPOT_PAIR:BTC-USDT|trades": 5000}'
+        history = FileSizeHistory()
+
+        assert history.load_snapshot(client, 'gs://sizes-bucket/sharding/sizes.json#1684800000000000') == 1
+
+        client.bucket.assert_called_once_with('sizes-bucket')
+        client.bucket.return_value.blob.assert_called_once_with('sharding/sizes.json', generation=1684800000000000)
+        assert history.estimate('BINANCE:SPOT_PAIR:BTC-USDT', 'trades') == 5000
+
+    def test_snapshot_uri_must_pin_generation(self, tmp_path):
+        """Test unpinned GCS URIs and missing local snapshots are rejected"""
+        assert parse_snapshot_uri('gs://b/dir/sizes.json#7') == ('b', 'dir/sizes.json', 7)
+        with pytest.raises(ValueError):
+            parse_snapshot_uri('gs://b/dir/sizes.json')
+        with pytest.raises(FileNotFoundError):
+            FileSizeHistory().load_snapshot(Mock(), str(tmp_path / 'missing.json'))
+
+    def test_order_largest_first(self):
+        """Test targets are ordered by expected bytes over their requested data types"""
+        history = FileSizeHistory(default_bytes=1)
+        history.record('SMALL', 'trades', 10)
+        history.record('BIG', 'trades', 10)
+        history.record('BIG', 'book_snapshot_5', 1000)
+        history.record('MID', 'trades', 500)
+        targets = [
+            {'instrument_key': 'SMALL', 'data_types': 'trades'},
+            {'instrument_key': 'MID', 'data_types': 'trades'},
+            {'instrument_key': 'BIG', 'data_types': 'trades,book_snapshot_5'},
+        ]
+
+        assert [t['instrument_key'] for t in history.order_largest_first(targets)] == ['BIG', 'MID', 'SMALL']
+        assert [t['instrument_key'] for t in history.order_largest_first(targets, ['trades'])] == ['MID', 'SMALL', 'BIG']
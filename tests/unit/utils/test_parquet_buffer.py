@@ -0,0 +1,53 @@
+"""
+Unit tests for the in-memory Parquet upload buffer
+"""
+
+import io
+from unittest.mock import Mock
+
+import pandas as pd
+
+from market_data_tick_handler.utils.parquet_buffer import ParquetUploadBuffer
+
+
+class TestParquetUploadBuffer:
+    """Test ParquetUploadBuffer class"""
+
+    def test_upload_from_memory(self):
+        """Test a small DataFrame is serialized in memory and uploaded in full"""
+        df = pd.DataFrame({'timestamp': [3, 1, 2], 'price': [1.0, 2.0, 3.0]})
+        blob = Mock()
+        uploaded = {}
+
+        def _capture(file_obj, size, **kwargs):
+            uploaded['data'] = file_obj.read()
+            uploaded['size'] = size
+            uploaded['kwargs'] = kwargs
+
+        blob.upload_from_file.side_effect = _capture
+
+        with ParquetUploadBuffer() as buffer:
+            buffer.write_dataframe(df, index=False, engine='pyarrow')
+            assert not buffer.spilled
+            buffer.upload(blob, timeout=60)
+
+        assert uploaded['size'] == len(uploaded['data'])
+        assert uploaded['kwargs'] == {'timeout': 60}
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(uploaded['data'])), df)
+
+    def test_spills_above_threshold(self):
+        """Test buffers larger than the threshold spill to disk and still upload everything"""
+        df = pd.DataFrame({'value': [float(i) for i in range(50000)]})
+        blob = Mock()
+
+        with ParquetUploadBuffer(spill_threshold_mb=0.01) as buffer:
+            buffer.write_dataframe(df, index=False, engine='pyarrow', compression=None)
+            assert buffer.spilled
+
+            # Repeated uploads (retries) always resend the whole buffer
+            buffer.upload(blob)
+            buffer.upload(blob)
+            expected_size = buffer.size
+
+        sizes = [call.kwargs['size'] for call in blob.upload_from_file.call_args_list]
+        assert sizes == [expected_size, expected_size]